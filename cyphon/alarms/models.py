@@ -71,6 +71,31 @@ class AlarmManager(GetByNameManager, FindEnabledMixin, BaseClass):
         for alarm in alarms:
             alarm.process(doc_obj)
 
+    @close_old_connections
+    def process_many(self, doc_objs):
+        """Inspect a batch of documents with Alarms.
+
+        Relevant Alarms are found once for each |Collection| in the
+        batch, rather than once for each document.
+
+        Parameters
+        ----------
+        doc_objs : |list| of |DocumentObj|
+            The documents that Alarms should inspect.
+
+        Returns
+        -------
+        None
+
+        """
+        alarms_by_collection = {}
+        for doc_obj in doc_objs:
+            if doc_obj.collection not in alarms_by_collection:
+                alarms = list(self.find_relevant(doc_obj.distillery))
+                alarms_by_collection[doc_obj.collection] = alarms
+            for alarm in alarms_by_collection[doc_obj.collection]:
+                alarm.process(doc_obj)
+
 
 class Alarm(models.Model, BaseClass):
     """
@@ -20,11 +20,12 @@ Defines a ModelAdmin subclass for Alerts and registers Alerts with Django Admin.
 
 # third party
 from django.contrib import admin
+from django.db.models import Max, Min
 from django.utils.translation import ugettext_lazy as _
 
 # local
 from tags.admin import TagRelationInlineAdmin
-from .models import Alert, Analysis, Comment
+from .models import Alert, AlertCount, Analysis, Comment
 
 
 @admin.register(Analysis)
@@ -177,11 +178,25 @@ class AlertAdmin(admin.ModelAdmin):
         else:
             return '%s alerts were' % rows_updated
 
+    @staticmethod
+    def _update_counted(queryset, **kwargs):
+        """
+        Helper method that bulk updates fields tracked by |AlertCounts|.
+        Since a bulk update bypasses the signals that maintain the
+        counts, the counts for the affected hours are rebuilt afterward.
+        """
+        dates = queryset.aggregate(start=Min('created_date'),
+                                   end=Max('created_date'))
+        rows_updated = queryset.update(**kwargs)
+        if rows_updated:
+            AlertCount.objects.rebuild(start=dates['start'], end=dates['end'])
+        return rows_updated
+
     def set_status_to_new(self, request, queryset):
         """
         Allows bulk update of Alert status to "New."
         """
-        rows_updated = queryset.update(status='NEW')
+        rows_updated = self._update_counted(queryset, status='NEW')
         self.message_user(request, '%s successfully marked as New.'
                           % self._format_msg(rows_updated))
 
@@ -189,7 +204,7 @@ class AlertAdmin(admin.ModelAdmin):
         """
         Allows bulk update of Alert status to "Busy."
         """
-        rows_updated = queryset.update(status='BUSY')
+        rows_updated = self._update_counted(queryset, status='BUSY')
         self.message_user(request, '%s successfully marked as Busy.'
                           % self._format_msg(rows_updated))
 
@@ -197,7 +212,7 @@ class AlertAdmin(admin.ModelAdmin):
         """
         Allows bulk update of Alert status to "Done."
         """
-        rows_updated = queryset.update(status='DONE')
+        rows_updated = self._update_counted(queryset, status='DONE')
         self.message_user(request, '%s successfully marked as Done.'
                           % self._format_msg(rows_updated))
 
@@ -205,7 +220,7 @@ class AlertAdmin(admin.ModelAdmin):
         """
         Allows bulk update of Alert level to "Critical."
         """
-        rows_updated = queryset.update(level='CRITICAL')
+        rows_updated = self._update_counted(queryset, level='CRITICAL')
         self.message_user(request, '%s successfully marked as critical priority.'
                           % self._format_msg(rows_updated))
 
@@ -213,7 +228,7 @@ class AlertAdmin(admin.ModelAdmin):
         """
         Allows bulk update of Alert level to "High."
         """
-        rows_updated = queryset.update(level='HIGH')
+        rows_updated = self._update_counted(queryset, level='HIGH')
         self.message_user(request, '%s successfully marked as high priority.'
                           % self._format_msg(rows_updated))
 
@@ -221,7 +236,7 @@ class AlertAdmin(admin.ModelAdmin):
         """
         Allows bulk update of Alert level to "Medium."
         """
-        rows_updated = queryset.update(level='MEDIUM')
+        rows_updated = self._update_counted(queryset, level='MEDIUM')
         self.message_user(request, '%s successfully marked as medium priority.'
                           % self._format_msg(rows_updated))
 
@@ -229,7 +244,7 @@ class AlertAdmin(admin.ModelAdmin):
         """
         Allows bulk update of Alert level to "Low."
         """
-        rows_updated = queryset.update(level='LOW')
+        rows_updated = self._update_counted(queryset, level='LOW')
         self.message_user(request, '%s successfully marked as low priority.'
                           % self._format_msg(rows_updated))
 
@@ -35,7 +35,6 @@ from categories.models import Category
 from cyphon.choices import ALERT_LEVEL_CHOICES, ALERT_STATUS_CHOICES
 from distilleries.models import Distillery
 from tags.models import Tag
-from utils.dbutils.dbutils import join_query
 from warehouses.models import Warehouse
 from .models import Alert
 
@@ -100,58 +99,32 @@ class AlertFilter(FilterSet):
     class Meta:
         model = Alert
 
-        # List content field last so it will have fewer Alerts to
-        # filter. The content filter requires a query to the Distillery
-        # associated with the Alert. It's best to filter out as many
-        # records as possible before constructing that query.
+        # List content field last so the other filters are applied
+        # first. The content filter matches Alerts' search text.
         fields = ['collection', 'after', 'before', 'level', 'status',
                   'assigned_user', 'content']
 
     @staticmethod
-    def _get_data_query(distillery, value):
+    def _filter_by_value(queryset, value):
         """
-
-        """
-        text_fields = distillery.get_text_fields()
-        field_names = [field.field_name for field in text_fields]
-        field_keys = [name.replace('.', '__') for name in field_names]
-        queries = []
-
-        for key in field_keys:
-            query_exp = 'data__%s' % key
-            kwarg = {query_exp: value}
-            queries.append(Q(**kwarg))
-
-        field_query = join_query(queries, 'OR')
-        return Q(distillery=distillery) & field_query
-
-    @staticmethod
-    def _get_title_query(value):
-        """
-
-        """
-        return Q(title__icontains=value)
-
-    def _filter_by_value(self, queryset, value):
-        """
-
+        Takes a QuerySet of Alerts and a string value. Returns a filtered
+        QuerySet of Alerts whose search text includes the value, ignoring
+        case.
+
+        The search text holds the title, the values of the data's text
+        fields, the analysis notes, and the comments. This matches every
+        Alert that the former per-field lookups matched (a title
+        containing the value, or a text field equal to it), and also
+        Alerts whose text fields, notes, or comments contain the value.
         """
-        distilleries = Distillery.objects.filter(alerts__in=queryset).distinct()
-
-        if distilleries:
-            queries = [self._get_data_query(distillery, value) \
-                       for distillery in distilleries]
-            data_query = join_query(queries, 'OR')
-            title_query = self._get_title_query(value)
-            return queryset.filter(title_query | data_query)
-        else:
-            return queryset.none()
+        return queryset.filter(search_text__icontains=value)
 
     # @timeit
     def filter_by_content(self, queryset, name, value):
         """
         Takes a QuerySet of Alerts and a string value. Returns a filtered
-        QuerySet of Alerts whose data includes the given value.
+        QuerySet of Alerts whose title, data, analysis notes, or comments
+        include the given value.
         """
         if not value:
             return queryset
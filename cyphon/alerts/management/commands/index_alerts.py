@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines a command for indexing the search text of |Alerts|.
+"""
+
+# third party
+from django.core.management.base import BaseCommand
+
+# local
+from alerts.models import Alert
+
+
+class Command(BaseCommand):
+    """
+    Fills in the search text of Alerts that don't have any, such as
+    Alerts created before keyword searches used the search_text field.
+    """
+
+    help = 'Index the search text of Alerts that have not been indexed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of Alerts to update in each transaction.'
+        )
+
+    def handle(self, *args, **options):
+        updated = Alert.objects.update_search_text(
+            batch_size=options['batch_size'])
+        self.stdout.write('Indexed %s alerts.' % updated)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models.functions import Trunc
+import django.db.models.deletion
+import pytz
+
+
+def populate_alert_counts(apps, schema_editor):
+    """Count existing Alerts by hour, Distillery, alarm, level, and status."""
+    Alert = apps.get_model('alerts', 'Alert')
+    AlertCount = apps.get_model('alerts', 'AlertCount')
+    rows = Alert.objects.annotate(
+        hour=Trunc('created_date', 'hour', tzinfo=pytz.utc)
+    ).values(
+        'hour', 'distillery_id', 'alarm_type_id', 'alarm_id', 'level', 'status'
+    ).annotate(count=models.Count('id')).order_by()
+    AlertCount.objects.bulk_create(
+        [AlertCount(**row) for row in rows.iterator()],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('distilleries', '0004_remove_name_null'),
+        ('alerts', '0014_remove_alert_notes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(db_index=True)),
+                ('alarm_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('level', models.CharField(choices=[('CRITICAL', 'Critical'), ('HIGH', 'High'), ('MEDIUM', 'Medium'), ('LOW', 'Low'), ('INFO', 'Info')], max_length=20)),
+                ('status', models.CharField(choices=[('NEW', 'New'), ('BUSY', 'Busy'), ('DONE', 'Done')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('alarm_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+                ('distillery', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='distilleries.Distillery')),
+            ],
+            options={
+                'ordering': ['hour'],
+            },
+        ),
+        migrations.RunPython(
+            populate_alert_counts,
+            reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+# frozen copy of cyphon.choices.TEXT_FIELDS, so later changes to it
+# don't change what this migration indexes
+TEXT_FIELDS = [
+    'CharField',
+    'ChoiceField',
+    'EmailField',
+    'GenericIPAddressField',
+    'ListField',
+    'TextField',
+    'URLField',
+]
+
+
+def get_dict_value(field_name, data):
+    """Return the value of a dotted field name in a dict, or None."""
+    value = data
+    for key in field_name.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _get_bottle_text_fields(bottle, parent_name=None):
+    """Return the names of a Bottle's text fields, including nested ones."""
+    field_names = []
+    for field in bottle.fields.all():
+        if parent_name:
+            field_name = '%s.%s' % (parent_name, field.field_name)
+        else:
+            field_name = field.field_name
+        if field.field_type == 'EmbeddedDocument':
+            if field.embedded_doc:
+                field_names.extend(
+                    _get_bottle_text_fields(field.embedded_doc, field_name))
+        elif field.field_type in TEXT_FIELDS:
+            field_names.append(field_name)
+    return field_names
+
+
+def _get_text_fields(distillery):
+    """Return the names of the text fields in a Distillery's Container."""
+    container = distillery.container
+    field_names = []
+    if container.label:
+        label_key = settings.DISTILLERIES['LABEL_KEY']
+        field_names.extend(
+            '%s.%s' % (label_key, field.field_name)
+            for field in container.label.fields.all()
+            if field.field_type in TEXT_FIELDS
+        )
+    field_names.extend(_get_bottle_text_fields(container.bottle))
+    return field_names
+
+
+def populate_search_text(apps, schema_editor):
+    """Index the title, text fields, notes, and comments of each Alert."""
+    Alert = apps.get_model('alerts', 'Alert')
+    Analysis = apps.get_model('alerts', 'Analysis')
+    Comment = apps.get_model('alerts', 'Comment')
+    Distillery = apps.get_model('distilleries', 'Distillery')
+
+    text_fields = {
+        distillery.pk: _get_text_fields(distillery)
+        for distillery in Distillery.objects.select_related(
+            'container__bottle', 'container__label')
+    }
+    last_pk = 0
+
+    while True:
+        alerts = list(
+            Alert.objects.filter(pk__gt=last_pk, search_text__isnull=True)
+            .order_by('pk')
+            .values('pk', 'title', 'data', 'distillery_id')[:BATCH_SIZE]
+        )
+        if not alerts:
+            return
+
+        alert_ids = [alert['pk'] for alert in alerts]
+        notes = dict(Analysis.objects.filter(alert_id__in=alert_ids)
+                     .values_list('alert_id', 'notes'))
+        comments = {}
+        for alert_id, content in Comment.objects.filter(
+                alert_id__in=alert_ids).order_by('id')\
+                .values_list('alert_id', 'content'):
+            comments.setdefault(alert_id, []).append(content)
+
+        for alert in alerts:
+            values = [alert['title']]
+            if alert['data']:
+                for field_name in text_fields.get(alert['distillery_id'], []):
+                    value = get_dict_value(field_name, alert['data'])
+                    if value is not None:
+                        values.append(str(value))
+            values.append(notes.get(alert['pk']))
+            values.extend(comments.get(alert['pk'], []))
+            Alert.objects.filter(pk=alert['pk']).update(
+                search_text='\n'.join(value for value in values if value))
+
+        last_pk = alert_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bottles', '0001_initial'),
+        ('containers', '0002_auto_20170320_1223'),
+        ('distilleries', '0004_remove_name_null'),
+        ('labels', '0001_initial'),
+        ('alerts', '0015_alertcount'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='alert',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        # fill in the search text before the index is built, so the
+        # index isn't updated for every row
+        migrations.RunPython(
+            populate_search_text,
+            reverse_code=migrations.RunPython.noop
+        ),
+        # icontains lookups compare UPPER(search_text), so the trigram
+        # index is built on the same expression
+        migrations.RunSQL(
+            sql='CREATE INDEX alerts_alert_search_text_trgm '
+                'ON alerts_alert USING gin (UPPER(search_text) gin_trgm_ops);',
+            reverse_sql='DROP INDEX IF EXISTS alerts_alert_search_text_trgm;',
+        ),
+    ]
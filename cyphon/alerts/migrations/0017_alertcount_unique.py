@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+KEY_FIELDS = ('hour', 'distillery_id', 'alarm_type_id', 'alarm_id', 'level',
+              'status')
+
+
+def merge_duplicate_counts(apps, schema_editor):
+    """Combine AlertCounts that have the same rollup key."""
+    AlertCount = apps.get_model('alerts', 'AlertCount')
+    duplicates = AlertCount.objects.values(*KEY_FIELDS).annotate(
+        total=models.Sum('count'),
+        rows=models.Count('id')
+    ).filter(rows__gt=1).order_by()
+
+    for duplicate in duplicates:
+        total = duplicate.pop('total')
+        duplicate.pop('rows')
+        pks = list(AlertCount.objects.filter(**duplicate)
+                   .order_by('pk').values_list('pk', flat=True))
+        AlertCount.objects.filter(pk__in=pks[1:]).delete()
+        AlertCount.objects.filter(pk=pks[0]).update(count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0016_alert_search_text'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_counts,
+            reverse_code=migrations.RunPython.noop
+        ),
+        migrations.AlterUniqueTogether(
+            name='alertcount',
+            unique_together=set([('hour', 'distillery', 'alarm_type',
+                                   'alarm_id', 'level', 'status')]),
+        ),
+        # NULLs are distinct in a unique constraint, so the nullable key
+        # fields are coalesced for keys without a Distillery or alarm
+        migrations.RunSQL(
+            sql='CREATE UNIQUE INDEX alerts_alertcount_key_uniq '
+                'ON alerts_alertcount (hour, COALESCE(distillery_id, 0), '
+                'COALESCE(alarm_type_id, 0), COALESCE(alarm_id, 0), '
+                'level, status);',
+            reverse_sql='DROP INDEX IF EXISTS alerts_alertcount_key_uniq;',
+        ),
+    ]
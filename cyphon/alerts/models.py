@@ -19,6 +19,8 @@ Defines Alert class.
 """
 
 # standard library
+from collections import Counter
+import datetime
 import hashlib
 import json
 import logging
@@ -35,11 +37,14 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.gis.db.models import PointField
 from django.contrib.postgres.fields import JSONField
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models.functions import Trunc
+from django.db.models.signals import post_save
 from django.forms import fields
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 from django.utils import timezone
+import pytz
 
 # local
 from cyphon.choices import (
@@ -59,6 +64,18 @@ from utils.parserutils.parserutils import (
 
 _ALERT_URL = '/app/alerts/'
 
+# Alert fields that determine which AlertCount includes an Alert
+_ROLLUP_FIELDS = ('created_date', 'distillery_id', 'alarm_type_id',
+                  'alarm_id', 'level', 'status')
+
+# Alert fields stored in an Alert's search text, other than its
+# analysis notes and comments
+_SEARCH_FIELDS = ('title', 'data')
+
+# AlertCount fields that correspond to an Alert's rollup key
+_ROLLUP_KEY_FIELDS = ('hour', 'distillery_id', 'alarm_type_id',
+                      'alarm_id', 'level', 'status')
+
 _PRIVATE_FIELD_SETTINGS = settings.PRIVATE_FIELDS
 
 _LOGGER = logging.getLogger(__name__)
@@ -69,6 +86,35 @@ fields.DateTimeField.strptime = lambda o, v, f: \
                                 dateutil.parser.parse(v)  # pragma: no cover
 
 
+def _get_visible_alarms(user):
+    """
+    Takes a user and returns Subqueries for the ids of the Monitors and
+    Watchdogs whose Alerts the user can see.
+    """
+    user_groups = user.groups.all()
+    Monitor = apps.get_model('monitors', 'Monitor')
+    Watchdog = apps.get_model('watchdogs', 'Watchdog')
+    monitors = models.Subquery(Monitor.objects
+        .annotate(models.Count('groups'))
+        .filter(models.Q(groups__count=0) |
+                models.Q(groups__in=user_groups))
+        .values('id'))
+    watchdogs = models.Subquery(Watchdog.objects
+        .annotate(models.Count('groups'))
+        .filter(models.Q(groups__count=0) |
+                models.Q(groups__in=user_groups))
+        .values('id'))
+    return monitors, watchdogs
+
+
+def get_hour(date_time):
+    """
+    Takes an aware datetime and returns the start of its hour in UTC.
+    """
+    return date_time.astimezone(pytz.utc).replace(
+        minute=0, second=0, microsecond=0)
+
+
 class AlertManager(models.Manager):
     """
     Adds methods to the default model manager.
@@ -88,19 +134,7 @@ class AlertManager(models.Manager):
         """
 
         """
-        user_groups = user.groups.all()
-        Monitor = apps.get_model('monitors', 'Monitor')
-        Watchdog = apps.get_model('watchdogs', 'Watchdog')
-        monitors = models.Subquery(Monitor.objects
-            .annotate(models.Count('groups'))
-            .filter(models.Q(groups__count=0) |
-                    models.Q(groups__in=user_groups))
-            .values('id'))
-        watchdogs = models.Subquery(Watchdog.objects
-            .annotate(models.Count('groups'))
-            .filter(models.Q(groups__count=0) |
-                    models.Q(groups__in=user_groups))
-            .values('id'))
+        monitors, watchdogs = _get_visible_alarms(user)
         return queryset.filter(
             models.Q(watchdog__isnull=True, monitor__isnull=True) |
             models.Q(watchdog__in=watchdogs) |
@@ -133,6 +167,125 @@ class AlertManager(models.Manager):
         else:
             return alert_qs.none()
 
+    def update_search_text(self, batch_size=1000):
+        """Fill in the search text of Alerts that don't have any.
+
+        Used to index Alerts created before the search_text field was
+        added.
+
+        Parameters
+        ----------
+        batch_size : int
+            The number of Alerts to update in each transaction.
+
+        Returns
+        -------
+        int
+            The number of Alerts updated.
+
+        """
+        updated = 0
+        unindexed = self.get_queryset().filter(search_text__isnull=True)\
+                        .select_related('distillery__container')\
+                        .order_by('pk')
+
+        while True:
+            alerts = list(unindexed[:batch_size])
+            if not alerts:
+                return updated
+
+            with transaction.atomic():
+                for alert in alerts:
+                    search_text = alert._get_search_text()
+                    self.filter(pk=alert.pk).update(search_text=search_text)
+
+            updated += len(alerts)
+
+    def _save_or_find_duplicate(self, alert):
+        """
+        Takes a new Alert and saves it. If another Alert with the same
+        muzzle_hash was saved first, returns that Alert instead, along
+        with a Boolean indicating whether the new Alert was saved.
+        """
+        try:
+            with transaction.atomic():
+                alert.save()
+            return alert, True
+        except IntegrityError:
+            return self.get(muzzle_hash=alert.muzzle_hash), False
+
+    def create_many(self, alerts):
+        """Save a batch of new Alerts.
+
+        Prepares each Alert as :meth:`~Alert.save` does, combines
+        Alerts that duplicate each other or a previously saved Alert,
+        and saves the remaining Alerts with a single bulk INSERT. A
+        |post_save| signal is then sent for each new Alert, so new
+        Alerts are tagged and announced as if they had been saved one
+        at a time.
+
+        Parameters
+        ----------
+        alerts : |list| of |Alert|
+            New, unsaved Alerts.
+
+        Returns
+        -------
+        |list| of |Alert|
+            For each of the `alerts`, the saved Alert, or the previous
+            Alert that it duplicates, whose incidents have been
+            incremented.
+
+        """
+        # share Distilleries so teasers use the same cached Tastes
+        distilleries = {}
+        for alert in alerts:
+            if alert.distillery_id is not None:
+                alert.distillery = distilleries.setdefault(
+                    alert.distillery_id, alert.distillery)
+            alert._prepare()
+
+        hashes = [alert.muzzle_hash for alert in alerts]
+        saved = {alert.muzzle_hash: alert for alert
+                 in self.filter(muzzle_hash__in=hashes)}
+        new_alerts = []
+        incidents = Counter()
+
+        for alert in alerts:
+            if alert.muzzle_hash in saved:
+                incidents[alert.muzzle_hash] += 1
+            else:
+                saved[alert.muzzle_hash] = alert
+                new_alerts.append(alert)
+
+        try:
+            with transaction.atomic():
+                self.bulk_create(new_alerts)
+        except IntegrityError:
+            # another process saved a duplicate during the batch
+            created = []
+            for alert in new_alerts:
+                original, is_new = self._save_or_find_duplicate(alert)
+                if is_new:
+                    created.append(alert)
+                else:
+                    saved[alert.muzzle_hash] = original
+                    incidents[alert.muzzle_hash] += 1
+            new_alerts = created
+        else:
+            for alert in new_alerts:
+                post_save.send(sender=self.model, instance=alert,
+                               created=True, update_fields=None,
+                               raw=False, using=self.db)
+
+        for muzzle_hash, count in incidents.items():
+            original = saved[muzzle_hash]
+            self.filter(pk=original.pk).update(
+                incidents=models.F('incidents') + count)
+            original.incidents += count
+
+        return [saved[muzzle_hash] for muzzle_hash in hashes]
+
 
 class Alert(models.Model):
     """
@@ -204,6 +357,11 @@ class Alert(models.Model):
         of the |Muzzle| and the Alert. Otherwise, consists of a UUID.
         Used to identify duplicate Alerts.
 
+    search_text : str
+        The Alert's title, the values of its data's text fields, and
+        its analysis notes and comments. Keyword searches match this
+        field through a trigram index.
+
     """
     _WATCHDOG = models.Q(app_label='watchdogs', model='watchdog')
     _MONITOR = models.Q(app_label='monitors', model='monitor')
@@ -276,6 +434,7 @@ class Alert(models.Model):
         db_index=True,
         unique=True
     )
+    search_text = models.TextField(blank=True, null=True, editable=False)
 
     objects = AlertManager()
 
@@ -287,6 +446,17 @@ class Alert(models.Model):
         )
         ordering = ['-id']
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Overrides the from_db() method to remember the Alert's
+        AlertCount key as it was loaded, so changes can be counted.
+        """
+        instance = super(Alert, cls).from_db(db, field_names, values)
+        if all(field in instance.__dict__ for field in _ROLLUP_FIELDS):
+            instance._rollup_key = instance.get_rollup_key()
+        return instance
+
     def __str__(self):
         if self.title:
             return 'PK %s: %s' % (self.pk, self.title)
@@ -300,6 +470,18 @@ class Alert(models.Model):
         Overrides the save() method to assign a title, content_date,
         location, and data to a new Alert.
         """
+        update_fields = kwargs.get('update_fields')
+        if self._prepare(update_fields) and update_fields is not None:
+            kwargs['update_fields'] = list(update_fields) + ['search_text']
+        return super(Alert, self).save(*args, **kwargs)
+
+    def _prepare(self, update_fields=None):
+        """
+        Assigns a title, content_date, location, data, created_date,
+        and muzzle_hash to the Alert before it is saved. Takes the
+        names of the fields being saved, if not all of them, and returns
+        a Boolean indicating whether the search text was updated.
+        """
         if not self.data:
             self._add_data()
 
@@ -318,7 +500,85 @@ class Alert(models.Model):
 
         self.muzzle_hash = self._get_muzzle_hash()
 
-        return super(Alert, self).save(*args, **kwargs)
+        if self._has_search_changes(update_fields):
+            self.search_text = self._get_search_text()
+            return True
+
+        return False
+
+    def _has_search_changes(self, update_fields=None):
+        """
+        Takes the names of the fields being saved, if not all of them,
+        and returns a Boolean indicating whether the Alert's search text
+        should be rebuilt. Analysis notes and comments update it through
+        signals, so only the Alert's own search fields are checked.
+        When all fields are saved, they are compared with the saved
+        values, so loading Alerts doesn't cost a copy of their data.
+        """
+        if self.pk is None or self.search_text is None:
+            return True
+
+        if update_fields is not None:
+            return not set(update_fields).isdisjoint(_SEARCH_FIELDS)
+
+        saved_values = Alert.objects.filter(pk=self.pk)\
+                                    .values_list(*_SEARCH_FIELDS).first()
+        return saved_values != (self.title, self.data)
+
+    def _get_search_text(self):
+        """
+        Returns a string of the Alert's title, the values of its data's
+        text fields, and its analysis notes and comments, for use in
+        keyword searches.
+        """
+        values = [self.title]
+
+        if self.data and self.distillery:
+            for field in self.distillery.get_text_fields():
+                value = get_dict_value(field.field_name, self.data)
+                if value is not None:
+                    values.append(str(value))
+
+        if self.pk:
+            values.extend(Analysis.objects.filter(alert=self)
+                          .values_list('notes', flat=True))
+            values.extend(self.comments.values_list('content', flat=True))
+
+        return '\n'.join(value for value in values if value)
+
+    def update_search_text(self):
+        """Update the Alert's search text.
+
+        Saves only the search_text field, without sending signals. Used
+        when the Alert's analysis notes or comments change.
+
+        Returns
+        -------
+        None
+
+        """
+        self.search_text = self._get_search_text()
+        Alert.objects.filter(pk=self.pk).update(search_text=self.search_text)
+
+    def get_rollup_key(self):
+        """Get the key of the AlertCount that includes the Alert.
+
+        Returns
+        -------
+        tuple
+            The hour in which the Alert was created (in UTC), and the
+            ids of its Distillery, alarm type, and alarm, and its level
+            and status.
+
+        """
+        return (
+            get_hour(self.created_date),
+            self.distillery_id,
+            self.alarm_type_id,
+            self.alarm_id,
+            self.level,
+            self.status,
+        )
 
     @property
     def link(self):
@@ -735,3 +995,243 @@ class Comment(models.Model):
         date = self.created_date
         content = self.content
         return '%s commented at %s:\n%s' % (user, date, content)
+
+
+class AlertCountManager(models.Manager):
+    """
+    Adds methods to the default model manager.
+    """
+
+    def add(self, key, count):
+        """Add to the number of Alerts with a rollup key.
+
+        Parameters
+        ----------
+        key : tuple
+            A key returned by :meth:`Alert.get_rollup_key`.
+
+        count : int
+            The number of Alerts to add, which may be negative.
+
+        Returns
+        -------
+        None
+
+        """
+        fields = dict(zip(_ROLLUP_KEY_FIELDS, key))
+        queryset = self.filter(**fields)
+
+        if queryset.update(count=models.F('count') + count):
+            return
+
+        try:
+            with transaction.atomic():
+                self.create(count=count, **fields)
+        except IntegrityError:
+            # another process created the AlertCount first
+            queryset.update(count=models.F('count') + count)
+
+    def _lock(self):
+        """
+        Locks the AlertCount table against changes until the end of the
+        current transaction. Reads aren't blocked.
+        """
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute('LOCK TABLE %s IN SHARE ROW EXCLUSIVE MODE'
+                           % table)
+
+    def rebuild(self, start=None, end=None):
+        """Recount Alerts created in a range of hours.
+
+        Replaces the AlertCounts for the range with counts taken
+        directly from the |Alert| table. Used to reconcile counts with
+        changes that didn't send signals, such as bulk updates.
+
+        Parameters
+        ----------
+        start : datetime or None
+            The earliest Alert creation date to recount. If |None|,
+            all Alerts before `end` are recounted.
+
+        end : datetime or None
+            The latest Alert creation date to recount. If |None|, all
+            Alerts after `start` are recounted.
+
+        Returns
+        -------
+        int
+            The number of Alerts counted.
+
+        """
+        counts = self.all()
+        alerts = Alert.objects.all()
+
+        if start is not None:
+            start = get_hour(start)
+            counts = counts.filter(hour__gte=start)
+            alerts = alerts.filter(created_date__gte=start)
+
+        if end is not None:
+            end = get_hour(end) + datetime.timedelta(hours=1)
+            counts = counts.filter(hour__lt=end)
+            alerts = alerts.filter(created_date__lt=end)
+
+        rows = alerts.annotate(
+            hour=Trunc('created_date', 'hour', tzinfo=pytz.utc)
+        ).values(*_ROLLUP_KEY_FIELDS).annotate(
+            count=models.Count('id')
+        ).order_by()
+
+        with transaction.atomic():
+            # Alerts are counted while add() is blocked, so a change
+            # made by a signal can't land between the count and the
+            # replacement of the AlertCounts. Locking only existing rows
+            # with select_for_update() wouldn't block new ones.
+            self._lock()
+            new_counts = [self.model(**row) for row in rows]
+            counts.delete()
+            self.bulk_create(new_counts)
+
+        return sum(alert_count.count for alert_count in new_counts)
+
+    def filter_by_user(self, user, queryset=None):
+        """Filter AlertCounts to those for Alerts a user can see.
+
+        Applies the same restrictions as
+        :meth:`AlertManager.filter_by_user`.
+
+        Parameters
+        ----------
+        user : |AppUser| or |None|
+
+        queryset : |QuerySet| of AlertCounts or |None|
+
+        Returns
+        -------
+        |QuerySet| of AlertCounts
+
+        """
+        if queryset is None:
+            queryset = self.get_queryset()
+
+        if not user:
+            return queryset.none()
+
+        if not user.is_staff:
+            queryset = queryset.filter(
+                models.Q(distillery__company=user.company) |
+                models.Q(distillery__company__isnull=True))
+
+        monitors, watchdogs = _get_visible_alarms(user)
+        monitor_type = ContentType.objects.get_by_natural_key(
+            'monitors', 'monitor')
+        watchdog_type = ContentType.objects.get_by_natural_key(
+            'watchdogs', 'watchdog')
+        return queryset.filter(
+            models.Q(alarm_type__isnull=True) |
+            models.Q(alarm_type=watchdog_type, alarm_id__in=watchdogs) |
+            models.Q(alarm_type=monitor_type, alarm_id__in=monitors))
+
+    def count_by_field(self, user, field_name, choices, start_date=None):
+        """Count the Alerts a user can see for each choice of a field.
+
+        Parameters
+        ----------
+        user : |AppUser|
+
+        field_name : str
+            Either 'level' or 'status'.
+
+        choices : tuple of 2-tuples
+            Choices for the field.
+
+        start_date : datetime or None
+            If provided, only Alerts created in or after the hour of
+            this date are counted.
+
+        Returns
+        -------
+        dict
+            The number of Alerts for each choice.
+
+        """
+        queryset = self.filter_by_user(user)
+
+        if start_date is not None:
+            queryset = queryset.filter(hour__gte=start_date)
+
+        counts = {key: 0 for key, dummy_text in choices}
+        totals = queryset.values(field_name).annotate(
+            total=models.Sum('count')).order_by()
+
+        for result in totals:
+            counts[result[field_name]] += result['total']
+
+        return counts
+
+
+class AlertCount(models.Model):
+    """
+    The number of |Alerts| created in an hour, by |Distillery|, alarm,
+    level, and status.
+
+    AlertCounts are updated as Alerts are saved and deleted, so
+    dashboards can count Alerts without scanning the Alert table.
+
+    Attributes
+    ----------
+    hour : datetime
+        The start of the hour in which the Alerts were created.
+
+    distillery : Distillery
+        The |Distillery| associated with the Alerts.
+
+    alarm_type : ContentType
+        The type of |Alarm| that triggered the Alerts.
+
+    alarm_id : int
+        The id of the |Alarm| that triggered the Alerts.
+
+    level : str
+        The level of the Alerts.
+
+    status : str
+        The status of the Alerts.
+
+    count : int
+        The number of Alerts.
+
+    """
+    hour = models.DateTimeField(db_index=True)
+    distillery = models.ForeignKey(
+        Distillery,
+        blank=True,
+        null=True,
+        related_name='+',
+        on_delete=models.CASCADE
+    )
+    alarm_type = models.ForeignKey(
+        ContentType,
+        blank=True,
+        null=True,
+        related_name='+',
+        on_delete=models.CASCADE
+    )
+    alarm_id = models.PositiveIntegerField(blank=True, null=True)
+    level = models.CharField(max_length=20, choices=ALERT_LEVEL_CHOICES)
+    status = models.CharField(max_length=20, choices=ALERT_STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+
+    objects = AlertCountManager()
+
+    class Meta(object):
+        """Metadata options."""
+
+        ordering = ['hour']
+        unique_together = ('hour', 'distillery', 'alarm_type', 'alarm_id',
+                           'level', 'status')
+
+    def __str__(self):
+        return '%s %s %s: %s' % (self.hour, self.level, self.status,
+                                 self.count)
@@ -21,18 +21,32 @@
 # standard library
 import logging
 import smtplib
+import threading
 
 # third party
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 # local
 from utils.emailutils.emailutils import emails_enabled
-from .models import Comment
+from .models import Alert, AlertCount, Analysis, Comment
 from .services import compose_comment_email
 
 _LOGGER = logging.getLogger(__name__)
 
+# Alerts being deleted by this thread, whose analysis notes and comments
+# are deleted along with them
+_DELETING = threading.local()
+
+
+def _get_deleting_alert_ids():
+    """
+    Returns the set of ids of Alerts being deleted by this thread.
+    """
+    if not hasattr(_DELETING, 'alert_ids'):
+        _DELETING.alert_ids = set()
+    return _DELETING.alert_ids
+
 
 @receiver(post_save, sender=Comment)
 def send_comment_notification(sender, instance, created, **kwargs):
@@ -47,3 +61,56 @@ def send_comment_notification(sender, instance, created, **kwargs):
             except smtplib.SMTPAuthenticationError as error:
                 _LOGGER.error('An error occurred when sending an '
                               'email notification: %s', error)
+
+
+@receiver(post_save, sender=Alert)
+def count_saved_alert(sender, instance, created, **kwargs):
+    """Update |AlertCounts| when an |Alert| is created or changed."""
+    new_key = instance.get_rollup_key()
+    old_key = getattr(instance, '_rollup_key', None)
+
+    if created:
+        AlertCount.objects.add(new_key, 1)
+    elif old_key is not None and old_key != new_key:
+        AlertCount.objects.add(old_key, -1)
+        AlertCount.objects.add(new_key, 1)
+
+    instance._rollup_key = new_key
+
+
+@receiver(pre_delete, sender=Alert)
+def mark_deleting_alert(sender, instance, **kwargs):
+    """
+    Record that an |Alert| is being deleted, so its search text isn't
+    rebuilt as its analysis notes and comments are deleted with it.
+    """
+    _get_deleting_alert_ids().add(instance.pk)
+
+
+@receiver(post_delete, sender=Alert)
+def count_deleted_alert(sender, instance, **kwargs):
+    """Update |AlertCounts| when an |Alert| is deleted."""
+    _get_deleting_alert_ids().discard(instance.pk)
+    key = getattr(instance, '_rollup_key', None) or instance.get_rollup_key()
+    AlertCount.objects.add(key, -1)
+
+
+@receiver(post_save, sender=Alert)
+def index_loaded_alert(sender, instance, raw, **kwargs):
+    """
+    Index the search text of an |Alert| loaded from a fixture, since
+    loading bypasses the Alert's save() method.
+    """
+    if raw:
+        instance.update_search_text()
+
+
+@receiver([post_save, post_delete], sender=Analysis)
+@receiver([post_save, post_delete], sender=Comment)
+def index_alert_notes(sender, instance, **kwargs):
+    """
+    Update the search text of an |Alert| when its analysis notes or
+    comments change, unless the Alert itself is being deleted.
+    """
+    if instance.alert_id not in _get_deleting_alert_ids():
+        instance.alert.update_search_text()
@@ -34,6 +34,7 @@ from alerts.models import Alert
 from alerts.views import AlertFilter
 from tags.models import Tag
 from tests.fixture_manager import get_fixtures
+from utils.parserutils.parserutils import get_dict_value
 
 
 class AlertFilterTestCase(TestCase):
@@ -77,6 +78,54 @@ class AlertFilterTestCase(TestCase):
         filtered_alerts = self.alert_filter.filter_by_content(self.alerts, '', val)
         self.assertEqual(filtered_alerts.count(), 3)
 
+    def _get_field_matches(self, value):
+        """
+        Returns the pks of Alerts matched by the per-field lookups the
+        content filter used before it searched Alerts' search text:
+        the title contains the value, ignoring case, or a text field in
+        the Alert's data equals the value.
+        """
+        pks = set(self.alerts.filter(title__icontains=value)
+                  .values_list('pk', flat=True))
+        for alert in self.alerts:
+            if not alert.data or not alert.distillery:
+                continue
+            for field in alert.distillery.get_text_fields():
+                if get_dict_value(field.field_name, alert.data) == value:
+                    pks.add(alert.pk)
+        return pks
+
+    def test_filter_by_content_field_matches(self):
+        """
+        Tests that the filter_by_content method still matches every
+        Alert that the former per-field lookups matched.
+        """
+        for val in ['acme', 'ACME', 'Threat', 'user@example.com',
+                    'Pied Piper', 'This is some text about wild dogs.']:
+            expected = self._get_field_matches(val)
+            self.assertTrue(expected, val)
+            filtered_alerts = self.alert_filter.filter_by_content(
+                self.alerts, '', val)
+            actual = set(filtered_alerts.values_list('pk', flat=True))
+            self.assertTrue(expected.issubset(actual), val)
+
+    def test_filter_by_content_substrings(self):
+        """
+        Tests that the filter_by_content method matches part of a data
+        field and, unlike the former per-field lookups, text in
+        comments.
+        """
+        filtered_alerts = self.alert_filter.filter_by_content(
+            self.alerts, '', 'WILD DOGS')
+        self.assertEqual(list(filtered_alerts.values_list('pk', flat=True)),
+                         [2])
+        self.assertEqual(self._get_field_matches('WILD DOGS'), set())
+
+        filtered_alerts = self.alert_filter.filter_by_content(
+            self.alerts, '', 'something to say')
+        self.assertEqual(list(filtered_alerts.values_list('pk', flat=True)),
+                         [3])
+
     @patch('alerts.filters.AlertFilter._filter_by_value', side_effect=ValueError())
     def test_filter_content_exception(self, mock_filter):
         """
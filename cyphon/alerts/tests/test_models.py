@@ -22,19 +22,22 @@ Tests Alert model methods.
 import datetime
 import logging
 try:
-    from unittest.mock import patch
+    from unittest.mock import Mock, patch
 except ImportError:
-    from mock import patch
+    from mock import Mock, patch
 
 # third party
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
+from django.db.models.query import QuerySet
+from django.db.models.signals import post_save
 from django.test import TestCase
 from django.utils import timezone
 
 # local
-from alerts.models import Alert, Comment
+from alerts.models import Alert, AlertCount, Analysis, Comment, get_hour
 from companies.models import Company
+from cyphon.choices import ALERT_LEVEL_CHOICES
 from distilleries.models import Distillery
 from tests.fixture_manager import get_fixtures
 from tests.mock import patch_find_by_id
@@ -490,6 +493,377 @@ class AddIncidentTestCase(AlertModelTestCase):
         self.assertEqual(alert_updated.incidents, old_incidents + 1)
 
 
+class CreateManyTestCase(AlertModelTestCase):
+    """
+    Tests the create_many method of the AlertManager.
+    """
+
+    def setUp(self):
+        super(CreateManyTestCase, self).setUp()
+        self.receiver = Mock()
+        post_save.connect(self.receiver, sender=Alert)
+
+    def tearDown(self):
+        post_save.disconnect(self.receiver, sender=Alert)
+        super(CreateManyTestCase, self).tearDown()
+
+    def _create_alert(self, subject):
+        """
+        Takes a subject and returns a new Alert for the muzzled
+        Watchdog.
+        """
+        return Alert(
+            level='HIGH',
+            distillery=self.distillery,
+            doc_id=1,
+            alarm=self.watchdog,
+            created_date=NOW_DATE,
+            data={'content': {'subject': subject}, 'to': 'me@example.com'}
+        )
+
+    def test_create_many(self):
+        """
+        Tests that new Alerts are saved and announced.
+        """
+        alert_count = Alert.objects.count()
+        alerts = [self._create_alert('foo'), self._create_alert('bar')]
+        saved_alerts = Alert.objects.create_many(alerts)
+        self.assertEqual(saved_alerts, alerts)
+        self.assertTrue(all(alert.pk for alert in saved_alerts))
+        self.assertEqual(Alert.objects.count(), alert_count + 2)
+        self.assertEqual(self.receiver.call_count, 2)
+        kwargs = self.receiver.call_args[1]
+        self.assertTrue(kwargs['created'])
+        self.assertIn(kwargs['instance'], alerts)
+
+    def test_create_many_matches_save(self):
+        """
+        Tests that Alerts are prepared as they are by the save method.
+        """
+        alert = self._create_alert('foo')
+        alert.save()
+        saved_alert = Alert.objects.get(pk=alert.pk)
+        saved_alert.delete()
+
+        batch_alert = Alert.objects.create_many([self._create_alert('foo')])[0]
+        batch_alert = Alert.objects.get(pk=batch_alert.pk)
+        self.assertEqual(batch_alert.title, saved_alert.title)
+        self.assertEqual(batch_alert.muzzle_hash, saved_alert.muzzle_hash)
+        self.assertEqual(batch_alert.content_date, saved_alert.content_date)
+        self.assertEqual(batch_alert.location, saved_alert.location)
+
+    def test_create_many_duplicates(self):
+        """
+        Tests that duplicate Alerts in a batch are combined.
+        """
+        alert_count = Alert.objects.count()
+        alerts = [self._create_alert('foo') for dummy_index in range(3)]
+        saved_alerts = Alert.objects.create_many(alerts)
+        self.assertEqual(Alert.objects.count(), alert_count + 1)
+        self.assertEqual(len(set(alert.pk for alert in saved_alerts)), 1)
+        saved_alert = Alert.objects.get(pk=saved_alerts[0].pk)
+        self.assertEqual(saved_alert.incidents, 3)
+        self.assertEqual(self.receiver.call_count, 1)
+
+    def test_create_many_existing(self):
+        """
+        Tests that duplicates of a previously saved Alert increment its
+        incidents.
+        """
+        alert = self._create_alert('foo')
+        alert.save()
+        self.receiver.reset_mock()
+        alert_count = Alert.objects.count()
+        saved_alerts = Alert.objects.create_many([self._create_alert('foo')])
+        self.assertEqual(saved_alerts[0].pk, alert.pk)
+        self.assertEqual(Alert.objects.count(), alert_count)
+        self.assertEqual(Alert.objects.get(pk=alert.pk).incidents, 2)
+        self.assertFalse(self.receiver.called)
+
+    def test_create_many_race(self):
+        """
+        Tests that Alerts are saved one at a time if a duplicate is
+        saved while the batch is being prepared.
+        """
+        alert = self._create_alert('foo')
+        alert.save()
+        alerts = [self._create_alert('foo'), self._create_alert('bar')]
+        with patch('alerts.models.AlertManager.filter',
+                   return_value=Alert.objects.none()):
+            saved_alerts = Alert.objects.create_many(alerts)
+        self.assertEqual(saved_alerts[0].pk, alert.pk)
+        self.assertEqual(saved_alerts[1], alerts[1])
+        self.assertTrue(alerts[1].pk)
+
+
+class AlertCountTestCase(AlertModelTestCase):
+    """
+    Tests the AlertCount class and the signals that maintain it.
+    """
+
+    @staticmethod
+    def _get_count(key):
+        """
+        Takes a rollup key and returns the number of Alerts counted
+        for it.
+        """
+        return sum(AlertCount.objects.filter(
+            hour=key[0],
+            distillery_id=key[1],
+            alarm_type_id=key[2],
+            alarm_id=key[3],
+            level=key[4],
+            status=key[5],
+        ).values_list('count', flat=True))
+
+    @staticmethod
+    def _count_alerts(alerts):
+        """
+        Takes a QuerySet of Alerts and returns a dictionary of the
+        number of Alerts at each level.
+        """
+        counts = {key: 0 for key, dummy_text in ALERT_LEVEL_CHOICES}
+        for alert in alerts:
+            counts[alert.level] += 1
+        return counts
+
+    def test_add_created_concurrently(self):
+        """
+        Tests that the add method adds to an AlertCount created by
+        another process after its update found no AlertCount.
+        """
+        key = (get_hour(NOW_DATE), None, None, None, 'HIGH', 'NEW')
+        AlertCount.objects.add(key, 1)
+        real_update = QuerySet.update
+        calls = []
+
+        def update_after_create(queryset, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                return 0
+            return real_update(queryset, **kwargs)
+
+        with patch.object(QuerySet, 'update', autospec=True,
+                          side_effect=update_after_create):
+            AlertCount.objects.add(key, 2)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(self._get_count(key), 3)
+        self.assertEqual(AlertCount.objects.filter(
+            hour=key[0], distillery__isnull=True).count(), 1)
+
+    def test_rebuild(self):
+        """
+        Tests that the rebuild method counts all Alerts.
+        """
+        AlertCount.objects.all().delete()
+        total = AlertCount.objects.rebuild()
+        self.assertEqual(total, Alert.objects.count())
+        for alert in Alert.objects.all():
+            self.assertTrue(self._get_count(alert.get_rollup_key()) >= 1)
+
+    def test_rebuild_range(self):
+        """
+        Tests that the rebuild method only replaces counts for the
+        given range of hours.
+        """
+        AlertCount.objects.all().delete()
+        alert = Alert.objects.first()
+        total = AlertCount.objects.rebuild(start=alert.created_date,
+                                           end=alert.created_date)
+        self.assertTrue(total >= 1)
+        self.assertTrue(total < Alert.objects.count())
+        self.assertEqual(AlertCount.objects.exclude(
+            hour=alert.get_rollup_key()[0]).count(), 0)
+
+    def test_count_new_alert(self):
+        """
+        Tests that saving a new Alert adds it to the AlertCounts.
+        """
+        self.alert.created_date = NOW_DATE
+        key = self.alert.get_rollup_key()
+        self.assertEqual(self._get_count(key), 0)
+        self.alert.save()
+        self.assertEqual(self._get_count(key), 1)
+        self.alert.save()
+        self.assertEqual(self._get_count(key), 1)
+
+    def test_count_changed_alert(self):
+        """
+        Tests that changing an Alert's status moves it to a new
+        AlertCount.
+        """
+        alert = Alert.objects.get(pk=1)
+        old_key = alert.get_rollup_key()
+        old_count = self._get_count(old_key)
+        alert.status = 'DONE' if alert.status != 'DONE' else 'NEW'
+        alert.save()
+        new_key = alert.get_rollup_key()
+        self.assertEqual(self._get_count(old_key), old_count - 1)
+        self.assertEqual(self._get_count(new_key), 1)
+
+    def test_count_deleted_alert(self):
+        """
+        Tests that deleting an Alert removes it from the AlertCounts.
+        """
+        alert = Alert.objects.get(pk=1)
+        key = alert.get_rollup_key()
+        old_count = self._get_count(key)
+        alert.delete()
+        self.assertEqual(self._get_count(key), old_count - 1)
+
+    def test_count_by_field_staff(self):
+        """
+        Tests that the count_by_field method matches the visible Alerts
+        for a staff user.
+        """
+        user = get_user_model().objects.get(pk=1)
+        counts = AlertCount.objects.count_by_field(
+            user, 'level', ALERT_LEVEL_CHOICES)
+        alerts = Alert.objects.filter_by_user(user)
+        self.assertEqual(counts, self._count_alerts(alerts))
+
+    def test_count_by_field_company(self):
+        """
+        Tests that the count_by_field method matches the visible Alerts
+        for a user with a Company.
+        """
+        user = get_user_model().objects.get(pk=3)
+        counts = AlertCount.objects.count_by_field(
+            user, 'level', ALERT_LEVEL_CHOICES)
+        alerts = Alert.objects.filter_by_user(user)
+        self.assertEqual(counts, self._count_alerts(alerts))
+
+    def test_count_by_field_no_user(self):
+        """
+        Tests that the count_by_field method counts no Alerts without
+        a user.
+        """
+        counts = AlertCount.objects.count_by_field(
+            None, 'level', ALERT_LEVEL_CHOICES)
+        self.assertEqual(sum(counts.values()), 0)
+
+
+class AlertSearchTextTestCase(AlertModelTestCase):
+    """
+    Tests the search_text field of Alerts.
+    """
+
+    def test_loaded_alert(self):
+        """
+        Tests that Alerts loaded from fixtures have search text.
+        """
+        alert = Alert.objects.get(pk=2)
+        self.assertIn(alert.title, alert.search_text)
+        self.assertIn('user@example.com', alert.search_text)
+
+    def test_new_alert(self):
+        """
+        Tests that a new Alert's search text includes its title and data.
+        """
+        self.alert.data = {'subject': 'Urgent request'}
+        self.alert.title = 'Test Alert'
+        self.alert.save()
+        alert = Alert.objects.get(pk=self.alert.pk)
+        self.assertTrue(alert.search_text.startswith('Test Alert'))
+
+    def test_comments(self):
+        """
+        Tests that adding or removing a Comment updates the search text.
+        """
+        user = get_user_model().objects.get(pk=1)
+        comment = Comment.objects.create(alert_id=1, user=user,
+                                         content='zebra sighting')
+        self.assertIn('zebra', Alert.objects.get(pk=1).search_text)
+        comment.delete()
+        self.assertNotIn('zebra', Alert.objects.get(pk=1).search_text)
+
+    def test_notes(self):
+        """
+        Tests that saving analysis notes updates the search text.
+        """
+        alert = Alert.objects.get(pk=1)
+        Analysis.objects.save_notes(alert=alert, notes='giraffe tracks')
+        self.assertIn('giraffe', Alert.objects.get(pk=1).search_text)
+
+    @staticmethod
+    def _get_alert_with_data():
+        """
+        Returns an Alert that has data, so saving it doesn't fetch the
+        data from its Distillery.
+        """
+        Alert.objects.filter(pk=1).update(data={'subject': 'Urgent request'})
+        return Alert.objects.get(pk=1)
+
+    def test_save_unchanged(self):
+        """
+        Tests that the search text isn't rebuilt when an Alert is saved
+        without changes to its title or data.
+        """
+        alert = self._get_alert_with_data()
+        alert.status = 'BUSY'
+        with patch.object(Alert, '_get_search_text') as mock_get:
+            alert.save()
+        self.assertFalse(mock_get.called)
+
+    def test_load_without_serializing(self):
+        """
+        Tests that loading Alerts doesn't serialize their data.
+        """
+        with patch('alerts.models.json.dumps') as mock_dumps:
+            list(Alert.objects.all())
+        self.assertFalse(mock_dumps.called)
+
+    def test_save_changed_title(self):
+        """
+        Tests that the search text is rebuilt and saved when an Alert's
+        title is changed and only the title is saved.
+        """
+        alert = self._get_alert_with_data()
+        alert.title = 'Elephant sighting'
+        alert.save(update_fields=['title'])
+        self.assertIn('Elephant', Alert.objects.get(pk=1).search_text)
+
+    def test_save_changed_data(self):
+        """
+        Tests that the search text is rebuilt when an Alert's data is
+        changed in place.
+        """
+        alert = self._get_alert_with_data()
+        alert.data['subject'] = 'Hippo sighting'
+        with patch.object(Alert, '_get_search_text',
+                          return_value='Hippo sighting') as mock_get:
+            alert.save()
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(Alert.objects.get(pk=1).search_text,
+                         'Hippo sighting')
+
+    def test_delete_alert(self):
+        """
+        Tests that the search text isn't rebuilt when an Alert's
+        comments are deleted along with it.
+        """
+        user = get_user_model().objects.get(pk=1)
+        Comment.objects.create(alert_id=1, user=user, content='zebra')
+        with patch.object(Alert, 'update_search_text') as mock_update:
+            Alert.objects.get(pk=1).delete()
+        self.assertFalse(mock_update.called)
+        self.assertFalse(Comment.objects.filter(alert_id=1).exists())
+
+    def test_update_search_text(self):
+        """
+        Tests that the AlertManager indexes Alerts without search text.
+        """
+        expected = {alert.pk: alert.search_text
+                    for alert in Alert.objects.all()}
+        Alert.objects.update(search_text=None)
+        updated = Alert.objects.update_search_text(batch_size=3)
+        self.assertEqual(updated, len(expected))
+        actual = {alert.pk: alert.search_text
+                  for alert in Alert.objects.all()}
+        self.assertEqual(actual, expected)
+
+
 class AlertTeaserTestCase(AlertModelTestCase):
     """
     Tests the teaser property of an Alert.
@@ -475,6 +475,72 @@ class AlertLocationAPITests(AlertBaseAPITests):
         response = self.get_api_response('?days=31', is_staff=False)
         self.assertEqual(response.json(), self.max_msg)
 
+    def test_get_clustered_locations(self):
+        """
+        Tests the REST API endpoint for Alert locations when a zoom
+        parameter is provided.
+        """
+        test_url = '?days=7&zoom=3'
+        with patch('alerts.views.timezone.now', return_value=self.date):
+            response = self.get_api_response(test_url, is_staff=False)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            actual = response.json()
+            self.assertEqual(actual['type'], 'FeatureCollection')
+            self.assertEqual(len(actual['features']), 1)
+            feature = actual['features'][0]
+            self.assertEqual(feature['geometry'], {
+                'type': 'Point',
+                'coordinates': [-78.2, 36.4]
+            })
+            self.assertEqual(feature['properties'], {
+                'count': 2,
+                'levels': {
+                    'CRITICAL': 0,
+                    'HIGH': 2,
+                    'MEDIUM': 0,
+                    'LOW': 0,
+                    'INFO': 0
+                }
+            })
+
+    def test_get_clustered_locations_bbox(self):
+        """
+        Tests the REST API endpoint for clustered Alert locations when a
+        bbox parameter is provided.
+        """
+        with patch('alerts.views.timezone.now', return_value=self.date):
+            response = self.get_api_response(
+                '?days=7&zoom=3&bbox=-80,35,-77,37', is_staff=False)
+            self.assertEqual(len(response.json()['features']), 1)
+            response = self.get_api_response(
+                '?days=7&zoom=3&bbox=0,0,10,10', is_staff=False)
+            self.assertEqual(response.json()['features'], [])
+
+    def test_get_clustered_locations_bad_zoom(self):
+        """
+        Tests the REST API endpoint for clustered Alert locations when
+        the zoom parameter is invalid.
+        """
+        msg = {'error': 'The zoom parameter must be an integer from 0 to 20'}
+        response = self.get_api_response('?days=7&zoom=hello', is_staff=False)
+        self.assertEqual(response.json(), msg)
+        response = self.get_api_response('?days=7&zoom=21', is_staff=False)
+        self.assertEqual(response.json(), msg)
+
+    def test_get_clustered_locations_bad_bbox(self):
+        """
+        Tests the REST API endpoint for clustered Alert locations when
+        the bbox parameter is invalid.
+        """
+        msg = {'error': 'The bbox parameter must be in the form '
+                        'west,south,east,north'}
+        response = self.get_api_response('?days=7&zoom=3&bbox=1,2,3',
+                                         is_staff=False)
+        self.assertEqual(response.json(), msg)
+        response = self.get_api_response('?days=7&zoom=3&bbox=10,0,0,10',
+                                         is_staff=False)
+        self.assertEqual(response.json(), msg)
+
 
 class AlertTimeseriesAPITests(AlertBaseAPITests):
     """
@@ -553,6 +619,120 @@ class AlertTimeseriesAPITests(AlertBaseAPITests):
         self.assertEqual(response.json(), self.max_msg)
 
 
+    def test_level_timeseries_hour(self):
+        """
+        Tests the REST API endpoint for Alert levels by hour.
+        """
+        date = self.date + timedelta(days=1)
+        with patch('alerts.views.timezone.localtime', return_value=date):
+            response = self.get_api_response('?days=1&bucket=hour',
+                                             is_staff=False)
+            actual = response.json()
+            self.assertEqual(len(actual['date']), 24)
+            self.assertTrue(actual['date'][2].startswith('2015-03-01T02:00'))
+            self.assertEqual(actual['HIGH'][2], 2)
+            self.assertEqual(actual['MEDIUM'][2], 2)
+            self.assertEqual(actual['LOW'][2], 1)
+            self.assertEqual(sum(actual['HIGH']), 2)
+
+    def test_level_timeseries_week(self):
+        """
+        Tests the REST API endpoint for Alert levels by week.
+        """
+        date = self.date + timedelta(days=7)
+        with patch('alerts.views.timezone.localtime', return_value=date):
+            response = self.get_api_response('?days=7&bucket=week',
+                                             is_staff=False)
+            expected = {
+                'CRITICAL': [0, 0],
+                'HIGH': [2, 0],
+                'MEDIUM': [2, 0],
+                'LOW': [1, 0],
+                'INFO': [0, 0],
+                'date': ['2015-02-23', '2015-03-02']
+            }
+            self.assertEqual(response.json(), expected)
+
+    def test_level_timeseries_tz(self):
+        """
+        Tests the REST API endpoint for Alert levels in a different
+        timezone.
+        """
+        date = self.date + timedelta(days=3)
+        with patch('alerts.views.timezone.now', return_value=date):
+            response = self.get_api_response('?days=7&tz=America/New_York',
+                                             is_staff=False)
+            expected = {
+                'CRITICAL': [0, 0, 0, 0, 0, 0, 0],
+                'HIGH': [0, 0, 0, 0, 2, 0, 0],
+                'MEDIUM': [0, 0, 0, 0, 2, 0, 0],
+                'LOW': [0, 0, 0, 0, 1, 0, 0],
+                'INFO': [0, 0, 0, 0, 0, 0, 0],
+                'date': [
+                    '2015-02-24',
+                    '2015-02-25',
+                    '2015-02-26',
+                    '2015-02-27',
+                    '2015-02-28',
+                    '2015-03-01',
+                    '2015-03-02'
+                ]}
+            self.assertEqual(response.json(), expected)
+
+    def test_level_timeseries_bad_bucket(self):
+        """
+        Tests the REST API endpoint for Alert level timeseries when the
+        bucket parameter is not a valid option.
+        """
+        response = self.get_api_response('?days=7&bucket=month',
+                                         is_staff=False)
+        expected = {
+            'error': 'The bucket parameter must be one of: hour, day, week'
+        }
+        self.assertEqual(response.json(), expected)
+
+    def test_level_timeseries_bad_tz(self):
+        """
+        Tests the REST API endpoint for Alert level timeseries when the
+        tz parameter is not a known timezone.
+        """
+        response = self.get_api_response('?days=7&tz=Mars/Olympus',
+                                         is_staff=False)
+        expected = {'error': 'Unknown timezone: Mars/Olympus'}
+        self.assertEqual(response.json(), expected)
+
+
+class AlertStatusTimeseriesAPITests(AlertBaseAPITests):
+    """
+    Tests the REST API endpoint for Alert status timeseries.
+    """
+    model_url = 'alerts/status-timeseries/'
+
+    def test_status_timeseries(self):
+        """
+        Tests the REST API endpoint for Alert statuses for the past week.
+        """
+        date = self.date + timedelta(days=7)
+        with patch('alerts.views.timezone.localtime', return_value=date):
+            response = self.get_api_response('?days=7', is_staff=False)
+            actual = response.json()
+            self.assertEqual(sorted(actual.keys()),
+                             ['BUSY', 'DONE', 'NEW', 'date'])
+            self.assertEqual(len(actual['date']), 7)
+            totals = [sum(actual[status][index]
+                          for status in ('NEW', 'BUSY', 'DONE'))
+                      for index in range(7)]
+            self.assertEqual(totals, [5, 0, 0, 0, 0, 0, 0])
+
+    def test_status_timeseries_no_days(self):
+        """
+        Tests the REST API endpoint for Alert status timeseries when no
+        days parameter is provided.
+        """
+        response = self.get_api_response(is_staff=False)
+        self.assertEqual(response.json(), self.error)
+
+
 class AlertDistilleryAPITests(AlertBaseAPITests):
     """
     Tests REST API endpoints for Alert-related data.
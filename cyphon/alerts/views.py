@@ -23,11 +23,13 @@ import datetime
 import json
 
 # third party
-from django.db.models import OuterRef
+from django.contrib.gis.geos import Polygon
+from django.db.models import OuterRef, Sum
 from django.shortcuts import get_object_or_404
 from django.core.exceptions import PermissionDenied
 from django.core.serializers import serialize
 from django.utils import timezone
+import pytz
 from rest_framework.decorators import list_route
 from rest_framework import status
 from rest_framework.response import Response
@@ -41,9 +43,14 @@ from cyphon.choices import ALERT_LEVEL_CHOICES, ALERT_STATUS_CHOICES
 from cyphon.views import CustomModelViewSet
 from distilleries.models import Distillery
 from distilleries.serializers import DistilleryListSerializer
-from utils.dbutils.dbutils import count_by_group, SQCount
+from utils.dbutils.dbutils import (
+    count_by_grid,
+    count_by_group,
+    count_by_interval,
+    SQCount,
+)
 from .filters import AlertFilter
-from .models import Alert, Analysis, Comment
+from .models import Alert, AlertCount, Analysis, Comment
 from .serializers import (
     AlertDetailSerializer,
     AlertListSerializer,
@@ -76,6 +83,20 @@ class AlertViewSet(CustomModelViewSet):
 
     MAX_DAYS = 30
 
+    #: Lengths of the intervals that a timeseries can be divided into.
+    TIMESERIES_BUCKETS = ('hour', 'day', 'week')
+
+    #: Query parameters that don't prevent answering a request from
+    #: |AlertCounts|.
+    ROLLUP_PARAMS = frozenset(['days', 'limit', 'offset', 'page'])
+
+    #: Highest map zoom level for which locations can be clustered.
+    MAX_ZOOM = 20
+
+    #: Number of clusters across a 256-pixel map tile, so each cluster
+    #: covers a 64-pixel cell.
+    CLUSTER_CELLS_PER_TILE = 4
+
     def get_queryset(self):
         """
         Overrides the default method for returning the ViewSet's
@@ -136,20 +157,36 @@ class AlertViewSet(CustomModelViewSet):
                 return self.serializer_class
 
     @staticmethod
-    def _get_date(days_ago):
+    def _get_date(days_ago, tzinfo=None):
         """
         Takes an integer representing a number of days in the past, and
-        returns a datetime for midnight localtime of that day.
+        an optional timezone, and returns a datetime for midnight of that
+        day in the timezone (localtime by default).
         """
         try:
             days = int(days_ago)
-            localtime = timezone.localtime(timezone.now())
+            localtime = timezone.localtime(timezone.now(), tzinfo)
             date_time = localtime - datetime.timedelta(days=days)
             return date_time.replace(hour=0, minute=0,
                                      second=0, microsecond=0)
         except (ValueError, TypeError):
             return None
 
+    def _use_alert_counts(self, start_date=None):
+        """
+        Returns a Boolean indicating whether the current request can be
+        answered from hourly |AlertCounts| rather than from Alerts. This
+        is only the case if the request has no Alert filter parameters
+        and any start date falls on the hour in UTC.
+        """
+        if set(self.request.query_params) - self.ROLLUP_PARAMS:
+            return False
+
+        if start_date is not None:
+            return timezone.localtime(start_date, pytz.utc).minute == 0
+
+        return True
+
     def _get_filtered_alerts(self):
         """
 
@@ -189,27 +226,69 @@ class AlertViewSet(CustomModelViewSet):
         )
         return counts[field_name]
 
-    def _timeseries(self, days, field_name, choices):
+    @staticmethod
+    def _get_buckets(start_date, end_date, bucket, tzinfo):
         """
+        Takes start and end datetimes, a bucket size, and a timezone,
+        and returns a list of the starts of the buckets between them.
+        Hourly buckets are datetimes; daily and weekly buckets are dates.
+        """
+        buckets = []
 
+        if bucket == 'hour':
+            step = datetime.timedelta(hours=1)
+            current = start_date.astimezone(pytz.utc)
+            while current < end_date:
+                buckets.append(current.astimezone(tzinfo))
+                current += step
+        else:
+            step = datetime.timedelta(days=7 if bucket == 'week' else 1)
+            current = start_date.date()
+            while current < end_date.date():
+                buckets.append(current)
+                current += step
+
+        return buckets
+
+    def _timeseries(self, days, field_name, choices, bucket='day',
+                    tzinfo=None):
         """
+        Takes a number of days, a field name and its choices, a bucket
+        size, and a timezone. Returns a dictionary of Alert counts for
+        each choice in each bucket, ending at midnight today. Counts are
+        computed with a single query.
+        """
+        tzinfo = tzinfo or timezone.get_current_timezone()
+        start_date = self._get_date(days, tzinfo)
+        end_date = self._get_date(0, tzinfo)
+
+        if bucket == 'week':
+            start_date -= datetime.timedelta(days=start_date.weekday())
+
+        queryset = self._filter_by_timeframe(start_date, end_date)
+        interval_counts = count_by_interval(
+            queryset=queryset,
+            date_column='created_date',
+            interval=bucket,
+            column=field_name,
+            options=choices,
+            tzinfo=tzinfo
+        )
+        if bucket != 'hour':
+            interval_counts = {interval.date(): interval_cnt for
+                               (interval, interval_cnt)
+                               in interval_counts.items()}
+
         counts = {'date': []}
 
         for (value, dummy_text) in choices:
             counts[value] = []
 
-        for day in reversed(range(1, days + 1)):
-            start_date = self._get_date(day)
-            end_date = self._get_date(day - 1)
-            queryset = self._filter_by_timeframe(start_date, end_date)
-            date_cnt = self._counts_by_field(
-                queryset=queryset,
-                field_name=field_name,
-                choices=choices
-            )
-            counts['date'].append(start_date.date())
+        for start in self._get_buckets(start_date, end_date, bucket, tzinfo):
+            bucket_cnt = interval_counts.get(start, {})
+            counts['date'].append(start)
             for (value, dummy_text) in choices:
-                counts[value].append(date_cnt[value])
+                counts[value].append(bucket_cnt.get(value, 0))
 
         return counts
 
@@ -252,7 +331,18 @@ class AlertViewSet(CustomModelViewSet):
         if error:
             return error
         else:
-            queryset = self._filter_by_start_date(int(days))
+            start_date = self._get_date(int(days))
+
+            if self._use_alert_counts(start_date):
+                counts = AlertCount.objects.count_by_field(
+                    user=request.user,
+                    field_name=field_name,
+                    choices=choices,
+                    start_date=start_date
+                )
+                return Response(counts)
+
+            queryset = self._filter_by_timeframe(start_date=start_date)
             counts = self._counts_by_field(
                 queryset=queryset,
                 field_name=field_name,
@@ -288,6 +378,19 @@ class AlertViewSet(CustomModelViewSet):
 
         if error:
             return error
+        elif self._use_alert_counts(date):
+            alert_counts = AlertCount.objects.filter_by_user(
+                request.user,
+                AlertCount.objects.filter(hour__gte=date,
+                                          distillery__isnull=False))
+            totals = alert_counts.values('distillery__name').annotate(
+                total=Sum('count')).order_by()
+            counts = {
+                result['distillery__name']: result['total']
+                for result in totals
+                if result['total']
+            }
+            return Response(counts)
         else:
             alerts = Alert.objects.filter(
                 created_date__gte=date,
@@ -301,23 +404,104 @@ class AlertViewSet(CustomModelViewSet):
             }
             return Response(counts)
 
+    @staticmethod
+    def _get_bbox(bbox):
+        """
+        Takes a string of comma-separated west, south, east, and north
+        coordinates and returns a Polygon for the bounding box, or
+        |None| if the string is not a valid bounding box.
+        """
+        try:
+            west, south, east, north = [float(val) for val in bbox.split(',')]
+        except (AttributeError, ValueError):
+            return None
+
+        if west >= east or south >= north:
+            return None
+
+        return Polygon.from_bbox((west, south, east, north))
+
+    def _cluster_locations(self, queryset, zoom, bbox=None):
+        """
+        Takes a QuerySet of Alerts, a map zoom level, and an optional
+        bounding box string. Returns a Response containing GeoJSON for
+        clusters of Alert locations, with the number of Alerts at each
+        level in each cluster.
+        """
+        try:
+            zoom = int(zoom)
+            if zoom < 0 or zoom > self.MAX_ZOOM:
+                raise ValueError
+        except (TypeError, ValueError):
+            msg = 'The zoom parameter must be an integer from 0 to %s' \
+                  % self.MAX_ZOOM
+            return Response({'error': msg})
+
+        if bbox is not None:
+            polygon = self._get_bbox(bbox)
+            if polygon is None:
+                msg = 'The bbox parameter must be in the form ' \
+                      'west,south,east,north'
+                return Response({'error': msg})
+            queryset = queryset.filter(location__within=polygon)
+
+        grid_size = 360.0 / (2 ** zoom) / self.CLUSTER_CELLS_PER_TILE
+        clusters = count_by_grid(
+            queryset=queryset,
+            point_column='location',
+            grid_size=grid_size,
+            column='level',
+            options=ALERT_LEVEL_CHOICES
+        )
+        features = [{
+            'type': 'Feature',
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [cluster['longitude'], cluster['latitude']]
+            },
+            'properties': {
+                'count': cluster['count'],
+                'levels': cluster['level'],
+            }
+        } for cluster in clusters]
+        geojson = {
+            'type': 'FeatureCollection',
+            'crs': {
+                'type': 'name',
+                'properties': {
+                    'name': 'EPSG:4326'
+                }
+            },
+            'features': features
+        }
+        return Response(geojson)
+
     @list_route(methods=['get'], url_path='locations')
     def locations(self, request):
         """
         Provides a REST API endpoint for GET requests for alert
         locations.
 
+        If a `zoom` parameter is provided, returns clusters of alert
+        locations sized for a map at that zoom level, optionally limited
+        by a `bbox` parameter ('west,south,east,north').
+
         WARNING
         -------
         Alerts titles will not be redacted.
 
         """
         days = request.query_params.get('days')
+        zoom = request.query_params.get('zoom')
 
         error = self._catch_days_param_error(days)
 
         if error:
             return error
+        elif zoom is not None:
+            queryset = self._filter_by_start_date(int(days))
+            bbox = request.query_params.get('bbox')
+            return self._cluster_locations(queryset, zoom, bbox)
         else:
             queryset = self._filter_by_start_date(int(days))
             location_qs = queryset.filter(location__isnull=False)
@@ -331,25 +515,57 @@ class AlertViewSet(CustomModelViewSet):
             geojson = serialize('geojson', location_qs, fields=fields)
             return Response(json.loads(geojson))
 
-    @list_route(methods=['get'], url_path='level-timeseries')
-    def level_timeseries(self, request):
+    def _get_timeseries(self, request, field_name, choices):
         """
-        Provides a REST API endpoint for GET requests for a timeseries
-        of alert counts by level.
+        Takes a request, a field name, and the field's choices. Returns
+        a Response containing a timeseries of Alert counts for the
+        `days`, `bucket`, and `tz` parameters of the request.
         """
         days = request.query_params.get('days')
+        bucket = request.query_params.get('bucket', 'day')
+        tz_name = request.query_params.get('tz')
 
         error = self._catch_days_param_error(days)
 
         if error:
             return error
-        else:
-            counts = self._timeseries(
-                days=int(days),
-                field_name='level',
-                choices=ALERT_LEVEL_CHOICES
-            )
-            return Response(counts)
+
+        if bucket not in self.TIMESERIES_BUCKETS:
+            msg = 'The bucket parameter must be one of: %s' \
+                  % ', '.join(self.TIMESERIES_BUCKETS)
+            return Response({'error': msg})
+
+        try:
+            tzinfo = pytz.timezone(tz_name) if tz_name else None
+        except pytz.UnknownTimeZoneError:
+            return Response({'error': 'Unknown timezone: %s' % tz_name})
+
+        counts = self._timeseries(
+            days=int(days),
+            field_name=field_name,
+            choices=choices,
+            bucket=bucket,
+            tzinfo=tzinfo
+        )
+        return Response(counts)
+
+    @list_route(methods=['get'], url_path='level-timeseries')
+    def level_timeseries(self, request):
+        """
+        Provides a REST API endpoint for GET requests for a timeseries
+        of alert counts by level. Accepts `bucket` ('hour', 'day', or
+        'week') and `tz` (e.g., 'America/New_York') parameters.
+        """
+        return self._get_timeseries(request, 'level', ALERT_LEVEL_CHOICES)
+
+    @list_route(methods=['get'], url_path='status-timeseries')
+    def status_timeseries(self, request):
+        """
+        Provides a REST API endpoint for GET requests for a timeseries
+        of alert counts by status. Accepts `bucket` ('hour', 'day', or
+        'week') and `tz` (e.g., 'America/New_York') parameters.
+        """
+        return self._get_timeseries(request, 'status', ALERT_STATUS_CHOICES)
 
     @list_route(methods=['get'], url_path='distilleries')
     def distilleries(self, request):
@@ -357,8 +573,17 @@ class AlertViewSet(CustomModelViewSet):
         Provides a REST API endpoint for GET requests for Distilleries
         associated with Alerts.
         """
-        alerts = self._get_filtered_alerts()
-        distilleries = Distillery.objects.filter(alerts__in=alerts).distinct()
+        if self._use_alert_counts():
+            alert_counts = AlertCount.objects.filter_by_user(request.user)
+            distillery_ids = alert_counts.values('distillery_id').annotate(
+                total=Sum('count')).filter(total__gt=0).order_by()
+            distilleries = Distillery.objects.filter(
+                pk__in=distillery_ids.values('distillery_id'))
+        else:
+            alerts = self._get_filtered_alerts()
+            distilleries = Distillery.objects.filter(
+                alerts__in=alerts).distinct()
+
         page = self.paginate_queryset(distilleries)
 
         if page is not None:
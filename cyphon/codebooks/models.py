@@ -265,3 +265,18 @@ class CodeBook(models.Model):
         for realname in self.realnames:
             text = realname.redact(text)
         return text
+
+    def redact_data(self, data):
+        """
+        Takes a dictionary, list, or text string and returns a copy in
+        which every text string has been redacted using the CodeBook's
+        CodeNames. Other values are returned unchanged.
+        """
+        if isinstance(data, dict):
+            return {key: self.redact_data(val) for (key, val) in data.items()}
+        elif isinstance(data, list):
+            return [self.redact_data(val) for val in data]
+        elif isinstance(data, str):
+            return self.redact(data)
+        else:
+            return data
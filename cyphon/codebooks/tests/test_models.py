@@ -195,3 +195,21 @@ class CodeBookTestCase(CodeBookBaseTestCase):
             actual = self.codebook.redact(text)
             expected = '**FORGE** is president of **PEAK**.'
             self.assertEqual(actual, expected)
+
+    def test_redact_data(self):
+        """
+        Tests the redact_data method.
+        """
+        with patch.dict('codebooks.models.settings.CODEBOOKS',
+                        self.mock_settings):
+            data = {
+                'user': {'name': 'John Smith', 'age': 42},
+                'tags': ['Acme Supply Co', 'supplies'],
+            }
+            actual = self.codebook.redact_data(data)
+            expected = {
+                'user': {'name': '**FORGE**', 'age': 42},
+                'tags': ['**PEAK**', 'supplies'],
+            }
+            self.assertEqual(actual, expected)
+            self.assertEqual(data['user']['name'], 'John Smith')
@@ -121,6 +121,13 @@ OPERATOR_CHOICES = (
     ('within', 'within')
 )
 
+#: Refresh policies for documents inserted into a |Warehouse|.
+REFRESH_POLICY_CHOICES = (
+    ('true', 'Refresh immediately'),
+    ('wait_for', 'Wait for the next refresh'),
+    ('false', 'Don\'t wait for a refresh'),
+)
+
 RANGE_CHOICES = (
     ('FloatField:>', 'greater than'),
     ('FloatField:>=', 'greater than or equal to'),
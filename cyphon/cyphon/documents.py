@@ -61,6 +61,31 @@ class DocumentObj(object):
     def __str__(self):
         return "%s:%s" % (self.collection, self.doc_id)
 
+    def with_data(self, data):
+        """Create a copy of the DocumentObj with different data.
+
+        The new DocumentObj shares the original's attributes, so the
+        original data is not copied.
+
+        Parameters
+        ----------
+        data : `str`, `dict`, or `email.message.Message`
+            The data for the new DocumentObj.
+
+        Returns
+        -------
+        |DocumentObj|
+            A new DocumentObj with the same `doc_id`, `collection`,
+            and `platform`, and the given `data`.
+
+        """
+        return DocumentObj(
+            data=data,
+            doc_id=self.doc_id,
+            collection=self.collection,
+            platform=self.platform
+        )
+
     def _get_distillery_natural_key(self):
         """Get the natural key for the document's Distillery.
 
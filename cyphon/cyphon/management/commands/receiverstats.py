@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines a command for showing the message counts of receivers.
+"""
+
+# third party
+from django.core.management.base import BaseCommand
+
+# local
+from cyphon.receiverstats import OUTCOMES, get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    """
+    Prints the number of messages that receiver processes have
+    processed, retried, and dead-lettered.
+    """
+
+    help = 'Show the number of messages handled by receivers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear the counts after showing them.'
+        )
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        for outcome in OUTCOMES:
+            self.stdout.write('%s: %s' % (outcome.replace('_', '-'),
+                                          stats[outcome]))
+        if options['reset']:
+            reset_stats()
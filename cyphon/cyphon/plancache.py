@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines a |PlanCache| for keeping compiled, read-only representations
+of database configuration in memory.
+
+=========================  ===================================================
+Class                      Description
+=========================  ===================================================
+:class:`~PlanCache`        Per-process cache of a compiled plan.
+=========================  ===================================================
+
+A "plan" is any object built from model instances (e.g., the enabled
+|Chutes| and their compiled |Sieves|) that can be reused to process
+many documents without further database queries. A |PlanCache| is
+invalidated when a model in one of its watched apps is saved or
+deleted. Other processes learn of the change through a version key
+stored in Django's cache, which they check at most once per
+``CHECK_INTERVAL`` seconds. If Django's cache isn't shared between
+processes (e.g., the default local-memory cache), plans are instead
+rebuilt once they are ``MAX_AGE`` seconds old.
+
+"""
+
+# standard library
+import time
+import uuid
+
+# third party
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+_PLAN_CACHE_SETTINGS = getattr(settings, 'PLAN_CACHE', {})
+
+CHECK_INTERVAL = _PLAN_CACHE_SETTINGS.get('CHECK_INTERVAL', 5)
+MAX_AGE = _PLAN_CACHE_SETTINGS.get('MAX_AGE', 300)
+
+_KEY_PREFIX = 'cyphon.plancache.'
+
+_SIGNALS = (post_save, post_delete, m2m_changed)
+
+
+class PlanCache(object):
+    """A per-process cache of a compiled plan.
+
+    Parameters
+    ----------
+    name : str
+        A unique name for the plan.
+
+    builder : function
+        A function that takes no arguments and returns a new plan.
+
+    app_labels : |list| of |str|
+        Labels of apps whose models the plan is built from. Saving or
+        deleting an instance of one of these models invalidates the
+        plan.
+
+    """
+
+    def __init__(self, name, builder, app_labels):
+        self.name = name
+        self.app_labels = frozenset(app_labels)
+        self._builder = builder
+        self._plan = None
+        self._version = None
+        self._built = 0
+        self._checked = 0
+
+        for signal in _SIGNALS:
+            signal.connect(self._handle_change, weak=False,
+                           dispatch_uid=self._key)
+
+    @property
+    def _key(self):
+        """
+        Returns the key for the plan's version in Django's cache.
+        """
+        return _KEY_PREFIX + self.name
+
+    def _handle_change(self, sender, **kwargs):
+        """
+        Receiver for model signals. Invalidates the plan if the sender
+        belongs to one of the watched apps.
+        """
+        if sender._meta.app_label in self.app_labels:
+            self.invalidate()
+
+    def _is_stale(self, version, now):
+        """
+        Takes the current version of the plan and the current time, and
+        returns a Boolean indicating whether the plan should be rebuilt.
+        """
+        return (self._plan is None
+                or version != self._version
+                or now - self._built >= MAX_AGE)
+
+    def get(self):
+        """Get the current plan, rebuilding it if necessary.
+
+        Returns
+        -------
+        object
+            The plan returned by the builder function.
+
+        """
+        now = time.time()
+
+        if self._plan is not None and now - self._checked < CHECK_INTERVAL:
+            return self._plan
+
+        self._checked = now
+        version = cache.get(self._key)
+
+        if self._is_stale(version, now):
+            # record the version before building, so a change made
+            # during the build is caught by the next check
+            self._version = version
+            self._built = now
+            self._plan = self._builder()
+
+        return self._plan
+
+    def invalidate(self):
+        """Discard the plan in this and other processes.
+
+        Returns
+        -------
+        None
+
+        """
+        self._plan = None
+        cache.set(self._key, uuid.uuid4().hex, None)
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines counts of the messages handled by receiver consumer processes.
+
+=========================  ===================================================
+Class                      Description
+=========================  ===================================================
+:class:`~MessageStats`     Per-process counts of messages by outcome.
+=========================  ===================================================
+
+=========================  ===================================================
+Function                   Description
+=========================  ===================================================
+:func:`~get_stats`         Get the counts published by all processes.
+:func:`~reset_stats`       Clear the published counts.
+=========================  ===================================================
+
+Each receiver process adds its counts to totals in Django's cache at
+most once per ``STATS_INTERVAL`` seconds, and when it stops. The totals
+can be read with the ``receiverstats`` management command. If Django's
+cache isn't shared between processes (e.g., the default local-memory
+cache), each process only publishes to its own cache.
+
+"""
+
+# standard library
+from collections import Counter
+import time
+
+# third party
+from django.conf import settings
+from django.core.cache import cache
+
+_RECEIVER_SETTINGS = getattr(settings, 'RECEIVER', {})
+
+#: Minimum number of seconds between publishing a process's counts.
+STATS_INTERVAL = _RECEIVER_SETTINGS.get('STATS_INTERVAL', 60)
+
+#: Outcomes for which messages are counted.
+OUTCOMES = ('processed', 'retried', 'dead_lettered')
+
+_KEY_PREFIX = 'cyphon.receiver.stats.'
+
+
+def _get_key(outcome):
+    """
+    Returns the key for an outcome's total in Django's cache.
+    """
+    return _KEY_PREFIX + outcome
+
+
+def _add_to_total(outcome, num):
+    """
+    Adds a number to an outcome's total in Django's cache.
+    """
+    key = _get_key(outcome)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key, num)
+    except ValueError:
+        # the key was evicted after it was added
+        cache.set(key, num, None)
+
+
+def get_stats():
+    """Get the message counts published by receiver processes.
+
+    Returns
+    -------
+    |dict|
+        A dictionary that maps each outcome in :const:`OUTCOMES` to
+        the number of messages with that outcome.
+
+    """
+    totals = cache.get_many([_get_key(outcome) for outcome in OUTCOMES])
+    return {outcome: totals.get(_get_key(outcome), 0)
+            for outcome in OUTCOMES}
+
+
+def reset_stats():
+    """Clear the message counts published by receiver processes.
+
+    Returns
+    -------
+    None
+
+    """
+    cache.delete_many([_get_key(outcome) for outcome in OUTCOMES])
+
+
+class MessageStats(Counter):
+    """Counts of messages handled by this process, keyed by outcome.
+
+    Parameters
+    ----------
+    interval : int or float
+        The minimum number of seconds between publishing counts to
+        Django's cache.
+
+    """
+
+    def __init__(self, interval=STATS_INTERVAL):
+        super(MessageStats, self).__init__()
+        self.interval = interval
+        self._published = Counter()
+        self._last_published = time.monotonic()
+
+    def count(self, outcome, num=1):
+        """Count messages with an outcome.
+
+        The counts are published if :attr:`interval` seconds have
+        passed since they were last published.
+
+        Parameters
+        ----------
+        outcome : str
+            One of :const:`OUTCOMES`.
+
+        num : int
+            The number of messages.
+
+        Returns
+        -------
+        None
+
+        """
+        self[outcome] += num
+        if time.monotonic() - self._last_published >= self.interval:
+            self.publish()
+
+    def publish(self):
+        """Add the messages counted since the last publish to the totals.
+
+        Returns
+        -------
+        None
+
+        """
+        self._last_published = time.monotonic()
+        for outcome in OUTCOMES:
+            unpublished = self[outcome] - self._published[outcome]
+            if unpublished > 0:
+                _add_to_total(outcome, unpublished)
+                self._published[outcome] = self[outcome]
+
+    def clear(self):
+        """Clear the counts without publishing them.
+
+        Returns
+        -------
+        None
+
+        """
+        super(MessageStats, self).clear()
+        self._published.clear()
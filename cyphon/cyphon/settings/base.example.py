@@ -341,6 +341,10 @@ CELERYBEAT_SCHEDULE = {
         'task': 'tasks.run_bkgd_search',
         'schedule': timedelta(seconds=60)
     },
+    'reconcile-alert-counts': {
+        'task': 'tasks.reconcile_alert_counts',
+        'schedule': timedelta(minutes=15)
+    },
 }
 
 #: A white-list of content-types/serializers to allow.
@@ -129,6 +129,7 @@ ELASTICSEARCH = {
         'index.mapping.ignore_malformed': True,
         'number_of_shards': 1,
     },
+    'HEALTH_CHECK_INTERVAL': 10,  # seconds to reuse a healthy cluster status
 }
 
 EMAIL = {
@@ -211,6 +212,11 @@ NOTIFICATIONS = {
     'IGNORED_ALERT_LEVELS': ['INFO'],
 }
 
+PLAN_CACHE = {
+    'CHECK_INTERVAL': 5,    # seconds between checks for config changes
+    'MAX_AGE': 300,         # seconds before a compiled plan is rebuilt
+}
+
 POSTGRES = {
     'NAME': os.getenv('POSTGRES_DB', 'postgres'),
     'USER': os.getenv('POSTGRES_USER', 'postgres'),
@@ -234,11 +240,40 @@ RABBITMQ = {
     'DURABLE': True,
 }
 
+RECEIVER = {
+    'PREFETCH_COUNT': 1,    # unacknowledged messages delivered to a consumer
+    'BATCH_SIZE': 1,        # messages processed together (1 disables batching)
+    'BATCH_INTERVAL': 5,    # max seconds to wait before processing a batch
+    'ACK_AFTER_PERSIST': False,  # ack only after a message is processed
+    'MAX_RETRIES': 5,       # retries before a message is dead-lettered
+    'RETRY_DELAY': 1,       # seconds before first retry (doubles each time)
+    'MAX_RETRY_DELAY': 300,  # max seconds between retries
+    'DEAD_LETTER_EXCHANGE': 'cyphon.dead',  # exchange for failed messages
+    'STATS_INTERVAL': 60,   # max seconds before message counts are published
+}
+
 SAUCELABS = {
     'USERNAME': os.getenv('SAUCE_USERNAME', ''),
     'ACCESS_KEY': os.getenv('SAUCE_ACCESS_KEY', ''),
 }
 
+SEARCH = {
+    'MAX_WORKERS': 8,       # threads for searching Distilleries concurrently
+    'TIMEOUT': 30,          # seconds to wait for each Distillery's results
+    # search cache class, e.g. 'query.search.cache.DjangoSearchCache', or None
+    'CACHE_BACKEND': 'query.search.cache.LocalSearchCache',
+    'CACHE_TTL': 60,        # seconds that search results are cached
+    'CACHE_SIZE': 1000,     # max searches cached by a LocalSearchCache
+    'CACHE_ALIAS': 'default',  # Django cache used by a DjangoSearchCache
+    'CACHED_HITS': 100,     # hits per search whose ids are cached
+}
+
+SIEVES = {
+    'ADAPTIVE_ORDERING': False,  # reorder sieve nodes by observed cost and hit rate
+    'REORDER_INTERVAL': 1000,    # evaluations between reorderings
+    'STATS_INTERVAL': 60,        # min seconds between saved node statistics
+}
+
 TEASERS = {
     'CHAR_LIMIT': 1000  # Character limit for teaser fields
 }
@@ -254,3 +289,13 @@ TWITTER = {
 WAREHOUSES = {
     'DEFAULT_STORAGE_ENGINE': 'elasticsearch'
 }
+
+WATCHDOGS = {
+    'ASYNC_INSPECTION': False,  # inspect in a background thread (at-most-once)
+    'DURABLE_INSPECTION': False,  # publish saved documents to the watchdogs queue
+    'QUEUE_SIZE': 10000,        # max documents awaiting inspection
+    'BATCH_SIZE': 100,          # documents inspected together
+    'BATCH_INTERVAL': 1,        # max seconds to wait before inspecting a batch
+    'MUZZLE_WINDOW_SIZE': 10000,  # muzzled alerts remembered per process (0 disables)
+    'MUZZLE_FLUSH_INTERVAL': 5,  # max seconds before duplicate incidents are saved
+}
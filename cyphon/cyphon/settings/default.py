@@ -142,6 +142,7 @@ ELASTICSEARCH = {
         'index.mapping.ignore_malformed': True,
         'number_of_shards': 1,
     },
+    'HEALTH_CHECK_INTERVAL': 10,  # seconds to reuse a healthy cluster status
 }
 
 EMAIL = {
@@ -214,6 +215,11 @@ NOTIFICATIONS = {
     'IGNORED_ALERT_LEVELS': ['INFO'],
 }
 
+PLAN_CACHE = {
+    'CHECK_INTERVAL': 0,    # rebuild compiled plans on every use in tests
+    'MAX_AGE': 0,
+}
+
 POSTGRES = {
     'NAME': os.getenv('POSTGRES_DB', 'postgres'),
     'USER': os.getenv('POSTGRES_USER', 'postgres'),
@@ -237,11 +243,39 @@ RABBITMQ = {
     'DURABLE': True,
 }
 
+RECEIVER = {
+    'PREFETCH_COUNT': 1,    # unacknowledged messages delivered to a consumer
+    'BATCH_SIZE': 1,        # messages processed together (1 disables batching)
+    'BATCH_INTERVAL': 5,    # max seconds to wait before processing a batch
+    'ACK_AFTER_PERSIST': False,  # ack only after a message is processed
+    'MAX_RETRIES': 5,       # retries before a message is dead-lettered
+    'RETRY_DELAY': 1,       # seconds before first retry (doubles each time)
+    'MAX_RETRY_DELAY': 300,  # max seconds between retries
+    'DEAD_LETTER_EXCHANGE': 'cyphon.dead',  # exchange for failed messages
+    'STATS_INTERVAL': 60,   # max seconds before message counts are published
+}
+
 SAUCELABS = {
     'USERNAME': os.getenv('SAUCE_USERNAME', ''),
     'ACCESS_KEY': os.getenv('SAUCE_ACCESS_KEY', ''),
 }
 
+SEARCH = {
+    'MAX_WORKERS': 1,       # threads for searching Distilleries concurrently
+    'TIMEOUT': 30,          # seconds to wait for each Distillery's results
+    'CACHE_BACKEND': None,  # search cache class (None disables caching)
+    'CACHE_TTL': 60,        # seconds that search results are cached
+    'CACHE_SIZE': 1000,     # max searches cached by a LocalSearchCache
+    'CACHE_ALIAS': 'default',  # Django cache used by a DjangoSearchCache
+    'CACHED_HITS': 100,     # hits per search whose ids are cached
+}
+
+SIEVES = {
+    'ADAPTIVE_ORDERING': False,  # reorder sieve nodes by observed cost and hit rate
+    'REORDER_INTERVAL': 100,     # evaluations between reorderings
+    'STATS_INTERVAL': 60,        # min seconds between saved node statistics
+}
+
 TEASERS = {
     'CHAR_LIMIT': 1000  # Character limit for teaser fields
 }
@@ -258,6 +292,16 @@ WAREHOUSES = {
     'DEFAULT_STORAGE_ENGINE': 'elasticsearch'
 }
 
+WATCHDOGS = {
+    'ASYNC_INSPECTION': False,  # inspect in a background thread (at-most-once)
+    'DURABLE_INSPECTION': False,  # publish saved documents to the watchdogs queue
+    'QUEUE_SIZE': 10000,        # max documents awaiting inspection
+    'BATCH_SIZE': 100,          # documents inspected together
+    'BATCH_INTERVAL': 1,        # max seconds to wait before inspecting a batch
+    'MUZZLE_WINDOW_SIZE': 0,    # muzzled alerts remembered per process (0 disables)
+    'MUZZLE_FLUSH_INTERVAL': 5,  # max seconds before duplicate incidents are saved
+}
+
 
 #########################
 # Settings from base.py #
@@ -563,6 +607,10 @@ CELERYBEAT_SCHEDULE = {
         'task': 'tasks.run_bkgd_search',
         'schedule': timedelta(seconds=60)
     },
+    'reconcile-alert-counts': {
+        'task': 'tasks.reconcile_alert_counts',
+        'schedule': timedelta(minutes=15)
+    },
 }
 
 #: A white-list of content-types/serializers to allow.
@@ -23,9 +23,13 @@ Cyphon Celery tasks.
 
 """
 
+# standard library
+import datetime
+
 # third party
 from django.apps import apps
 from django.db import close_old_connections
+from django.utils import timezone
 
 # local
 from cyphon.celeryapp import app
@@ -68,3 +72,16 @@ def run_bkgd_search():
     """
     execute_filter_queries()
     close_old_connections()
+
+
+@app.task(name='tasks.reconcile_alert_counts')
+def reconcile_alert_counts(hours=48):
+    """
+    Rebuilds AlertCounts for recent hours, to correct any drift from
+    Alert changes that didn't send signals.
+    """
+    alert_count_model = apps.get_model(app_label='alerts',
+                                       model_name='alertcount')
+    start = timezone.now() - datetime.timedelta(hours=hours)
+    alert_count_model.objects.rebuild(start=start)
+    close_old_connections()
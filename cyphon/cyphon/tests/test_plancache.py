@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Tests the PlanCache class.
+"""
+
+# standard library
+from unittest import TestCase
+try:
+    from unittest.mock import Mock, patch
+except ImportError:
+    from mock import Mock, patch
+
+# third party
+from django.core.cache import cache
+from django.db.models.signals import post_save
+
+# local
+from cyphon.plancache import PlanCache, _SIGNALS
+from categories.models import Category
+from companies.models import Company
+
+
+class PlanCacheTestCase(TestCase):
+    """
+    Tests the PlanCache class.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.builder = Mock(side_effect=lambda: object())
+        self.plan_cache = PlanCache(
+            name='test_plan',
+            builder=self.builder,
+            app_labels=['companies']
+        )
+
+    def tearDown(self):
+        for signal in _SIGNALS:
+            signal.disconnect(dispatch_uid=self.plan_cache._key)
+
+    @patch('cyphon.plancache.CHECK_INTERVAL', 60)
+    @patch('cyphon.plancache.MAX_AGE', 300)
+    def test_get_reuses_plan(self):
+        """
+        Tests that the get method builds a plan once and then reuses it.
+        """
+        plan = self.plan_cache.get()
+        self.assertIs(self.plan_cache.get(), plan)
+        self.assertEqual(self.builder.call_count, 1)
+
+    @patch('cyphon.plancache.CHECK_INTERVAL', 0)
+    @patch('cyphon.plancache.MAX_AGE', 300)
+    def test_get_after_version_change(self):
+        """
+        Tests that the get method rebuilds a plan when another process
+        has changed its version.
+        """
+        plan = self.plan_cache.get()
+        cache.set(self.plan_cache._key, 'new_version')
+        self.assertIsNot(self.plan_cache.get(), plan)
+        self.assertEqual(self.builder.call_count, 2)
+
+    @patch('cyphon.plancache.CHECK_INTERVAL', 0)
+    @patch('cyphon.plancache.MAX_AGE', 0)
+    def test_get_after_max_age(self):
+        """
+        Tests that the get method rebuilds a plan that has expired.
+        """
+        self.plan_cache.get()
+        self.plan_cache.get()
+        self.assertEqual(self.builder.call_count, 2)
+
+    @patch('cyphon.plancache.CHECK_INTERVAL', 60)
+    @patch('cyphon.plancache.MAX_AGE', 300)
+    def test_watched_signal(self):
+        """
+        Tests that a signal from a watched app invalidates the plan.
+        """
+        plan = self.plan_cache.get()
+        post_save.send(sender=Company, instance=Mock(), created=False)
+        self.assertIsNot(self.plan_cache.get(), plan)
+
+    @patch('cyphon.plancache.CHECK_INTERVAL', 60)
+    @patch('cyphon.plancache.MAX_AGE', 300)
+    def test_unwatched_signal(self):
+        """
+        Tests that a signal from another app doesn't invalidate the plan.
+        """
+        plan = self.plan_cache.get()
+        with patch.object(self.plan_cache, 'invalidate') as mock_invalidate:
+            post_save.send(sender=Category, instance=Mock(), created=False)
+            self.assertFalse(mock_invalidate.called)
+        self.assertIs(self.plan_cache.get(), plan)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Tests the MessageStats class and the receiverstats command.
+"""
+
+# standard library
+from io import StringIO
+from unittest import TestCase
+
+# third party
+from django.core.cache import cache
+from django.core.management import call_command
+
+# local
+from cyphon.receiverstats import MessageStats, get_stats
+
+
+class MessageStatsTestCase(TestCase):
+    """
+    Tests the MessageStats class.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_count_waits_for_interval(self):
+        """
+        Tests that counts aren't published until the interval passes.
+        """
+        stats = MessageStats(interval=60)
+        stats.count('processed', 3)
+        self.assertEqual(stats['processed'], 3)
+        self.assertEqual(get_stats()['processed'], 0)
+
+    def test_count_publishes(self):
+        """
+        Tests that counts are published once the interval has passed.
+        """
+        stats = MessageStats(interval=0)
+        stats.count('processed', 3)
+        stats.count('retried')
+        self.assertEqual(get_stats(), {
+            'processed': 3,
+            'retried': 1,
+            'dead_lettered': 0,
+        })
+
+    def test_publish_adds_to_totals(self):
+        """
+        Tests that each process adds only its unpublished counts to the
+        totals.
+        """
+        stats_1 = MessageStats(interval=60)
+        stats_2 = MessageStats(interval=60)
+        stats_1.count('processed', 2)
+        stats_1.publish()
+        stats_1.count('processed')
+        stats_1.publish()
+        stats_2.count('processed', 4)
+        stats_2.publish()
+        self.assertEqual(get_stats()['processed'], 7)
+
+    def test_command(self):
+        """
+        Tests that the receiverstats command shows the published counts
+        and clears them when asked.
+        """
+        stats = MessageStats(interval=60)
+        stats.count('dead_lettered', 2)
+        stats.publish()
+        out = StringIO()
+        call_command('receiverstats', '--reset', stdout=out)
+        self.assertIn('dead-lettered: 2', out.getvalue())
+        self.assertEqual(get_stats()['dead_lettered'], 0)
@@ -26,10 +26,15 @@ except ImportError:
 
 # third party
 from django.test import TestCase
+from django.utils import timezone
 from django_mailbox.models import Mailbox
 
 # local
-from cyphon.tasks import get_new_mail, run_health_check
+from cyphon.tasks import (
+    get_new_mail,
+    reconcile_alert_counts,
+    run_health_check,
+)
 from monitors.models import Monitor
 from tests.fixture_manager import get_fixtures
 
@@ -69,3 +74,20 @@ class RunHealthCheckTestCase(TestCase):
             run_health_check()
             self.assertEqual(mock_update.call_count, enabled_monitors_count)
 
+
+
+class ReconcileAlertCountsTestCase(TestCase):
+    """
+    Tests the reconcile_alert_counts task.
+    """
+
+    def test_reconcile_alert_counts(self):
+        """
+        Tests that the reconcile_alert_counts task rebuilds recent
+        AlertCounts.
+        """
+        with patch('alerts.models.AlertCountManager.rebuild') as mock_rebuild:
+            reconcile_alert_counts(hours=2)
+            self.assertEqual(mock_rebuild.call_count, 1)
+            start = mock_rebuild.call_args[1]['start']
+            self.assertTrue(start < timezone.now())
@@ -253,6 +253,22 @@ class Distillery(models.Model):
         """
         return DocumentObj(data=doc, doc_id=doc_id, collection=str(self))
 
+    def _prepare_doc(self, doc_obj):
+        """Prepare a document for saving.
+
+        Takes a DocumentObj, adds the date, the Distillery's pk, a
+        reference to the raw data, platform info, and a label to its
+        data, and returns the updated document.
+        """
+        doc = self._add_date(doc_obj.data)
+        doc = self._add_distillery_info(doc)
+        if doc_obj.doc_id and doc_obj.collection:
+            doc = self._add_raw_data_info(doc, doc_obj)
+        if doc_obj.platform:
+            doc = self._add_platform_info(doc, doc_obj.platform)
+        doc = self._add_label(doc)
+        return doc
+
     def _save_and_send_signal(self, doc):
         """Save a doc and send a |document_saved| signal.
 
@@ -262,9 +278,18 @@ class Distillery(models.Model):
         and |Monitors|.
         """
         doc_id = self.collection.insert(doc)
+        self._send_signal(doc, doc_id)
+        return doc_id
+
+    def _send_signal(self, doc, doc_id):
+        """Send a |document_saved| signal for a saved doc.
+
+        Takes a dictionary of data and the id under which it was saved
+        in the Distillery's |Collection|, and sends a signal that the
+        document has been saved.
+        """
         doc_obj = self._create_doc_obj(doc, doc_id)
         signals.document_saved.send(sender=type(self), doc_obj=doc_obj)
-        return doc_id
 
     def _get_date_saved_field(self):
         """Get the field containing the date when a document was saved.
@@ -380,7 +405,8 @@ class Distillery(models.Model):
         """
         return self.container.get_field_list()
 
-    def find(self, query, sorter=None, page=1, page_size=_PAGE_SIZE):
+    def find(self, query, sorter=None, page=1, page_size=_PAGE_SIZE,
+             cursor=None, fields=None, timeout=None):
         """Find documents matching a query.
 
         Parameters
@@ -393,11 +419,24 @@ class Distillery(models.Model):
             A |Sorter| defining how results should be ordered.
 
         page : int
-            The page of results to return.
+            The page of results to return. Ignored if a valid `cursor`
+            is given.
 
         page_size : int
             The number of documents per page of results.
 
+        cursor : |str| or |None|
+            A cursor token returned by a previous search with the same
+            query and sorter, for the page of results that follows it.
+
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents. If
+            |None|, all fields in the schema are returned.
+
+        timeout : |int|, |float|, or |None|
+            The maximum number of seconds the search may take before the
+            engine abandons it. If |None|, the engine's default applies.
+
         Returns
         -------
         |dict|
@@ -405,11 +444,36 @@ class Distillery(models.Model):
             value is the total number of documents matching the search
             criteria. The 'results' value is a list of documents from
             the search result, with the doc ids added to each document.
+            If a `sorter` or `cursor` is given, the dictionary also has
+            a 'cursor' key with a token for the next page of results.
 
         """
-        return self.collection.find(query, sorter, page, page_size)
+        return self.collection.find(query, sorter, page, page_size, cursor,
+                                    fields, timeout)
+
+    def scan(self, query, sorter=None):
+        """Iterate over all documents matching a query.
 
-    def find_by_id(self, doc_ids):
+        Parameters
+        ----------
+        query : |EngineQuery|
+            An |EngineQuery| defining critieria for matching documents
+            in the Distillery's |Collection|.
+
+        sorter : |Sorter| or |None|
+            A |Sorter| defining how documents should be ordered.
+
+        Returns
+        -------
+        generator of |dict|
+            Documents matching the query, with their doc ids added.
+            Documents are fetched in batches as the generator is
+            consumed.
+
+        """
+        return self.collection.scan(query, sorter)
+
+    def find_by_id(self, doc_ids, fields=None):
         """Find one or more documents by id.
 
         Parameters
@@ -417,6 +481,10 @@ class Distillery(models.Model):
         doc_ids : |str| or |list| of |str|
             A document id or a list of document ids.
 
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents. If
+            |None|, whole documents are returned.
+
         Returns
         -------
         |dict|, |list| of |dict|, or |None|
@@ -426,7 +494,7 @@ class Distillery(models.Model):
             are found, returns |None|.
 
         """
-        return self.collection.find_by_id(doc_ids)
+        return self.collection.find_by_id(doc_ids, fields)
 
     def filter_ids_by_content(self, doc_ids, value):
         """Find the ids of documents with text that matches a value.
@@ -570,6 +638,43 @@ class Distillery(models.Model):
             date = doc.get(self._DATE_KEY)
             return parse_date(date)
 
+    def _add_searchable_date_field(self, field_names):
+        """Add the searchable date field to a list of field names."""
+        date_field = self.get_searchable_date_field()
+        if date_field and date_field not in field_names:
+            return field_names + [date_field]
+        return field_names
+
+    def get_date_fields(self):
+        """Get the names of fields needed to date a document.
+
+        Returns
+        -------
+        |list| of |str|
+            Names of the document fields used by :meth:`get_date` and
+            :meth:`get_searchable_date_field`.
+
+        """
+        field_names = list(self.taste.date_fields) if self.taste else []
+        return self._add_searchable_date_field(field_names)
+
+    def get_sample_fields(self):
+        """Get the names of fields needed to create a teaser for a document.
+
+        Returns
+        -------
+        |list| of |str| or |None|
+            Names of the document fields used by :meth:`get_sample`
+            and :meth:`get_date`, or |None| if the Distillery has no
+            |Taste|, in which case whole documents are needed.
+
+        """
+        if not self.taste:
+            return None
+
+        field_names = list(self.taste.sample_fields)
+        return self._add_searchable_date_field(field_names)
+
     def get_sample(self, doc):
         """Get a teaser for a document.
 
@@ -620,12 +725,41 @@ class Distillery(models.Model):
             The id of the saved document.
 
         """
-        doc = self._add_date(doc_obj.data)
-        doc = self._add_distillery_info(doc)
-        if doc_obj.doc_id and doc_obj.collection:
-            doc = self._add_raw_data_info(doc, doc_obj)
-        if doc_obj.platform:
-            doc = self._add_platform_info(doc, doc_obj.platform)
-        doc = self._add_label(doc)
+        doc = self._prepare_doc(doc_obj)
         doc_id = self._save_and_send_signal(doc)
         return doc_id
+
+    def save_many(self, doc_objs):
+        """Save multiple documents to the Distillery's |Collection|.
+
+        Prepares each document as :meth:`~Distillery.save_data` does,
+        saves them with a single bulk insert, and sends a
+        |document_saved| signal for each document that was saved.
+
+        Parameters
+        ----------
+        doc_objs : |list| of |DocumentObj|
+            Documents to be saved.
+
+        Returns
+        -------
+        |list| of |str|
+            The id of each saved document, in the same order as
+            `doc_objs`. The id is |None| for a document that could not
+            be saved.
+
+        """
+        docs = [self._prepare_doc(doc_obj) for doc_obj in doc_objs]
+        results = self.collection.insert_many(docs)
+        doc_ids = []
+
+        for doc, result in zip(docs, results):
+            doc_id = result['doc_id']
+            if result['error']:
+                _LOGGER.error('Document could not be saved to %s: %s',
+                              self, result['error'])
+            else:
+                self._send_signal(doc, doc_id)
+            doc_ids.append(doc_id)
+
+        return doc_ids
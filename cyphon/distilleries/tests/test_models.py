@@ -247,7 +247,8 @@ class DistilleryTestCase(TestCase, DistilleryTestCaseMixin):
 
         self.distillery.collection.find.assert_called_once_with(mock_fieldsets,
                                                                 'AND', 1,
-                                                                _PAGE_SIZE)
+                                                                _PAGE_SIZE,
+                                                                None, None)
         self.assertEqual(docs, mock_docs)
 
     def test_filter_ids(self):
@@ -296,6 +297,20 @@ class DistilleryTestCase(TestCase, DistilleryTestCaseMixin):
 
         self.assertEqual(doc_ids, mock_doc_ids)
 
+    def test_get_sample_fields(self):
+        """
+        Tests the get_sample_fields method.
+        """
+        actual = self.distillery.get_sample_fields()
+        expected = ['from', 'subject', 'body', 'date', '_raw_data']
+        self.assertEqual(actual, expected)
+
+    def test_get_date_fields(self):
+        """
+        Tests the get_date_fields method.
+        """
+        self.assertEqual(self.distillery.get_date_fields(), ['date'])
+
     def test_get_sample(self):
         """
         Tests the get_sample method.
@@ -390,4 +405,35 @@ class SaveDataTestCase(TransactionTestCase, DistilleryTestCaseMixin):
         self.distillery.collection.insert.assert_called_once_with(bottled_with_meta)
         self.assertEqual(doc_id, mock_doc_id)
 
+    def test_save_many(self):
+        """
+        Tests the save_many method.
+        """
+        self.distillery.collection.insert_many = Mock(return_value=[
+            {'doc_id': '1', 'error': None},
+            {'doc_id': None, 'error': 'mapper_parsing_exception'},
+        ])
+        self.distillery._send_signal = Mock()
+
+        doc_objs = [
+            DocumentObj(data=copy.deepcopy(self.bottled_data),
+                        doc_id='551d54e6f861c95f3123e5f6',
+                        collection='mongodb.test_database.twitter',
+                        platform='twitter'),
+            DocumentObj(data={'foo': 'bar'}),
+        ]
+
+        with patch('distilleries.models.timezone.now',
+                   return_value=self.time):
+            with LogCapture() as log_capture:
+                doc_ids = self.distillery.save_many(doc_objs)
+                self.assertEqual(len(log_capture.records), 1)
+
+        bottled_with_meta = copy.deepcopy(self.bottled_data)
+        bottled_with_meta.update(self.meta)
+        docs = self.distillery.collection.insert_many.call_args[0][0]
+        self.assertEqual(docs[0], bottled_with_meta)
+        self.assertEqual(doc_ids, ['1', None])
+        self.distillery._send_signal.assert_called_once_with(docs[0], '1')
+
 # TODO(LH): test labeled doc
@@ -35,7 +35,13 @@ Constant                                Description
 Decorator                               Description
 ======================================  ======================================
 :func:`~catch_connection_error`         Catch and log ConnectionErrors.
-:func:`~wait_for_status`                Wait for a certain cluster state.
+:func:`~wait_for_status`                Ensure a certain cluster state.
+======================================  ======================================
+
+======================================  ======================================
+Function                                Description
+======================================  ======================================
+:func:`~clear_index_cache`              Forget which indexes exist.
 ======================================  ======================================
 
 """
@@ -48,6 +54,7 @@ import logging
 # third party
 from django.utils import timezone
 import elasticsearch
+from elasticsearch.helpers import scan, streaming_bulk
 
 # local
 from engines.elasticsearch import queries as es_queries
@@ -55,12 +62,17 @@ from engines.elasticsearch import results as es_results
 from engines.elasticsearch import sorter as es_sorter
 from engines.engine import Engine, MAX_RESULTS, PAGE_SIZE
 from .client import ELASTICSEARCH, ES_KWARGS
+from .health import CLUSTER_HEALTH
 from .mapper import create_mapping
 
 _LOGGER = logging.getLogger(__name__)
 
 TIMEOUT = ES_KWARGS.get('timeout', 30)
 
+# names of indexes known to exist, so they are only checked for (and
+# created) once per process
+_KNOWN_INDEXES = set()
+
 ENGINE_CLASS = 'ElasticsearchEngine'
 """|str|
 
@@ -85,6 +97,22 @@ for easily archiving or deleting old data.
 """
 
 
+def clear_index_cache():
+    """Forget which indexes are known to exist.
+
+    Engines check for, and if necessary create, an index the first time
+    they insert into it in a process. Call this function if indexes are
+    deleted while the process is running, so they are created again
+    with the proper mapping.
+
+    Returns
+    -------
+    None
+
+    """
+    _KNOWN_INDEXES.clear()
+
+
 def catch_connection_error(func):
     """Catch and log :exc:`~elasticsearch.exceptions.ConnectionError`.
 
@@ -113,11 +141,13 @@ def catch_connection_error(func):
 
 def wait_for_status(status, timeout=TIMEOUT):
     """
-    Wait for a particular Elasticsearch cluster status.
+    Wait for a particular Elasticsearch cluster status, if necessary.
 
     Decorator for functions that require a particular cluster state.
-    Waits for the cluster to attain the given status before executing
-    the function.
+    Uses the process's shared |ClusterHealth| to check the cluster
+    state at most once per ``HEALTH_CHECK_INTERVAL``. Waits for the
+    cluster to attain the given status before executing the function
+    only if the last known status is not acceptable.
 
     Parameters
     ----------
@@ -136,8 +166,7 @@ def wait_for_status(status, timeout=TIMEOUT):
     def _decorator(func):
         @wraps(func)  # preserve name and docstring of wrapped function
         def _call(*args, **kwargs):
-            ELASTICSEARCH.cluster.health(wait_for_status=status,
-                                         request_timeout=timeout)
+            CLUSTER_HEALTH.wait_for(status, timeout)
             return func(*args, **kwargs)
         return _call
     return _decorator
@@ -186,9 +215,12 @@ class ElasticsearchEngine(Engine):
         self._index_name = self.warehouse_collection.get_warehouse_name()
         self._doc_type = self.warehouse_collection.name
         self._in_time_series = self.warehouse_collection.in_time_series()
+        self._refresh = self.warehouse_collection.get_refresh_policy()
+        self._refresh_interval = \
+            self.warehouse_collection.get_refresh_interval()
 
-        if not self._in_time_series and not self._index_exists():
-            self._create_index()
+        if not self._in_time_series:
+            self._ensure_index()
 
     def __str__(self):
         """Get a string representation of the Engine instance.
@@ -277,7 +309,12 @@ class ElasticsearchEngine(Engine):
         Returns a dict of properties for mapping the data fields in
         Elasticsearch.
         """
-        return create_mapping(self._doc_type, self.schema)
+        mapping = create_mapping(self._doc_type, self.schema)
+        if self._refresh_interval:
+            index_settings = dict(mapping['settings'])
+            index_settings['refresh_interval'] = self._refresh_interval
+            mapping['settings'] = index_settings
+        return mapping
 
     def _create_index(self):
         """Create an index for inserting docs.
@@ -290,6 +327,19 @@ class ElasticsearchEngine(Engine):
         params = {'index': index, 'ignore': 400, 'body': mappings}
         ELASTICSEARCH.indices.create(**params)
 
+    def _ensure_index(self):
+        """Make sure the index for inserting docs exists.
+
+        Checks whether the index exists, and creates it if necessary,
+        the first time it's needed in the process. For a time series,
+        this happens once per day.
+        """
+        index = self._index_for_insert
+        if index not in _KNOWN_INDEXES:
+            if not self._index_exists():
+                self._create_index()
+            _KNOWN_INDEXES.add(index)
+
     def create_template(self):
         """Create a template for the index.
 
@@ -302,7 +352,7 @@ class ElasticsearchEngine(Engine):
             ELASTICSEARCH.indices.delete_template(name)
         ELASTICSEARCH.indices.put_template(name=name, body=body)
 
-    def _filter_by_id(self, doc_ids):
+    def _filter_by_id(self, doc_ids, source=True):
         """Get docs matching one or more ids from multiple indexes.
 
         Takes a document id or a list of document ids, and returns
@@ -317,7 +367,8 @@ class ElasticsearchEngine(Engine):
         params = self._params_for_search
         query = es_queries.ids_query(doc_ids)
         params.update({
-            'body': query, '_source': True,
+            'body': query, '_source': source,
+            'size': len(doc_ids),
             'ignore_unavailable': True
         })
         results = ELASTICSEARCH.search(**params)
@@ -327,18 +378,19 @@ class ElasticsearchEngine(Engine):
         elif len(formatted_results) > 0:
             return formatted_results[0]
 
-    def _find_multiple_ids(self, doc_ids):
+    def _find_multiple_ids(self, doc_ids, source=True):
         """Get docs matching a list of ids from an index.
 
         Takes a list of document ids and returns a list of matching
         documents from the index associated with the Engine.
         """
         params = self._params_for_search
-        params.update({'body': {'ids': doc_ids}, 'refresh': True})
+        params.update({'body': {'ids': doc_ids}, 'refresh': True,
+                       '_source': source})
         results = ELASTICSEARCH.mget(**params)
         return es_results.get_found_docs(results)
 
-    def _find_single_id(self, doc_id):
+    def _find_single_id(self, doc_id, source=True):
         """Get a doc matching an id from an index.
 
         Takes a document id and returns the matching document from the
@@ -347,11 +399,13 @@ class ElasticsearchEngine(Engine):
         params = self._params_for_search
         query = es_queries.id_query(doc_id)
         params.update(query)
+        params['_source'] = source
         result = ELASTICSEARCH.get(**params)
         if result['found']:
             return es_results.get_source_with_id(result)
 
-    def _get_search_results(self, query, source, size=MAX_RESULTS, offset=0):
+    def _get_search_results(self, query, source, size=MAX_RESULTS, offset=0,
+                            search_after=None, timeout=None):
         """Return the raw search result from the Elasticsearch API.
 
         Parameters
@@ -369,6 +423,14 @@ class ElasticsearchEngine(Engine):
         offset : int
             The number of results to skip when returning the result set.
 
+        search_after : |list| or |None|
+            Sort values of the document after which results should
+            start. If given, `offset` is ignored.
+
+        timeout : |int|, |float|, or |None|
+            The number of seconds to wait for a response. If |None|,
+            the client's default timeout applies.
+
         Returns
         -------
         dict
@@ -385,11 +447,18 @@ class ElasticsearchEngine(Engine):
             'ignore_unavailable': True,
         })
 
+        if search_after:
+            params['body'] = dict(query, search_after=search_after)
+            params['from_'] = 0
+
+        if timeout:
+            params['request_timeout'] = timeout
+
         return ELASTICSEARCH.search(**params)
 
     @catch_connection_error
     @wait_for_status('yellow')
-    def find_by_id(self, doc_ids):
+    def find_by_id(self, doc_ids, fields=None):
         """Find one or more documents by id.
 
         Parameters
@@ -397,6 +466,11 @@ class ElasticsearchEngine(Engine):
         doc_ids : |str| or |list| of |str|
             A document id or a list of document ids.
 
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents, using
+            dot notation for nested fields. If |None|, whole documents
+            are returned.
+
         Returns
         -------
         |dict|, |list| of |dict|, or |None|
@@ -405,16 +479,19 @@ class ElasticsearchEngine(Engine):
             single document. If no matches are found, returns `None`.
 
         """
+        source = True if fields is None else list(fields)
+
         if self._in_time_series:
-            return self._filter_by_id(doc_ids)
+            return self._filter_by_id(doc_ids, source)
         elif isinstance(doc_ids, list):
-            return self._find_multiple_ids(doc_ids) or None
+            return self._find_multiple_ids(doc_ids, source) or None
         else:
-            return self._find_single_id(doc_ids)
+            return self._find_single_id(doc_ids, source)
 
     @catch_connection_error
     @wait_for_status('yellow')
-    def find(self, query, sorter=None, page=1, page_size=PAGE_SIZE):
+    def find(self, query, sorter=None, page=1, page_size=PAGE_SIZE,
+             cursor=None, fields=None, timeout=None):
         """Find documents matching a query.
 
         Parameters
@@ -427,11 +504,28 @@ class ElasticsearchEngine(Engine):
             A |Sorter| defining how results should be ordered.
 
         page : int
-            The page of results to return.
+            The page of results to return. Ignored if a valid `cursor`
+            is given.
 
         page_size : int
             The number of documents per page of results.
 
+        cursor : |str| or |None|
+            A cursor token returned by a previous search with the same
+            query and sorter. Results start after the document it
+            refers to, using Elasticsearch's `search_after` rather
+            than `from`, so deep pages aren't limited by the index's
+            `max_result_window`.
+
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents, using
+            dot notation for nested fields. If |None|, all fields in the
+            Engine's schema are returned.
+
+        timeout : |int|, |float|, or |None|
+            The maximum number of seconds the search may take before the
+            engine abandons it. If |None|, the engine's default applies.
+
         Returns
         -------
         |dict|
@@ -439,24 +533,113 @@ class ElasticsearchEngine(Engine):
             value is the total number of documents matching the search
             criteria. The 'results' value is a list of documents from
             the search result, with the doc ids added to each document.
+            If a `sorter` or `cursor` is given, the dictionary also has
+            a 'cursor' key with a token for the next page of results.
 
         """
         offset = self.get_offset(page, page_size)
         es_query = es_queries.ElasticsearchQuery(query.subqueries,
                                                  query.joiner)
         params = es_query.params
+        paginate = sorter is not None or cursor is not None
+
+        if paginate:
+            sort_list = sorter.sort_list if sorter else []
+            elastic_sorter = es_sorter.ElasticsearchSorter(sort_list)
+            params.update(elastic_sorter.params)
+
+            # break ties by doc id so search_after is deterministic
+            params['sort'].append({'_uid': {'order': 'asc'}})
+
+        search_after = self.decode_cursor(cursor) if cursor else None
+
+        if search_after and len(search_after) != len(params['sort']):
+            search_after = None
+
+        source = self.get_projection(fields)
+
+        try:
+            results = self._get_search_results(
+                params,
+                source=source,
+                size=page_size,
+                offset=offset,
+                search_after=search_after,
+                timeout=timeout
+            )
+        except elasticsearch.exceptions.RequestError as error:
+            if not search_after:
+                raise
+
+            # the cursor's values don't match the types of the sort
+            # fields, so treat it as invalid and use the page number
+            _LOGGER.warning('Ignoring invalid cursor %s: %s', cursor, error)
+            results = self._get_search_results(
+                params,
+                source=source,
+                size=page_size,
+                offset=offset,
+                timeout=timeout
+            )
+
+        results_and_count = es_results.get_results_and_count(results)
+
+        if paginate:
+            sort_values = es_results.get_last_sort_values(results, page_size)
+            results_and_count['cursor'] = self.encode_cursor(sort_values) \
+                                          if sort_values else None
+
+        return results_and_count
+
+    @wait_for_status('yellow')
+    def scan(self, query, sorter=None, batch_size=MAX_RESULTS):
+        """Iterate over all documents matching a query.
+
+        Uses the scroll API, so documents are fetched in batches and
+        aren't limited by the index's `max_result_window`. Errors that
+        occur while documents are fetched, including failed shards, are
+        raised from the generator rather than logged, so an incomplete
+        scan can't be mistaken for a complete one.
+
+        Parameters
+        ----------
+        query : |EngineQuery|
+            An |EngineQuery| defining critieria for matching documents
+            in the index or time series.
+
+        sorter : |Sorter| or |None|
+            A |Sorter| defining how documents should be ordered. If
+            |None|, documents are returned in index order, which is the
+            most efficient way to scroll.
+
+        batch_size : int
+            The number of documents to fetch from each shard at a time.
+
+        Returns
+        -------
+        generator of |dict|
+            Documents matching the query, with their doc ids added.
+
+        """
+        es_query = es_queries.ElasticsearchQuery(query.subqueries,
+                                                 query.joiner)
+        params = es_query.params
 
         if sorter:
             elastic_sorter = es_sorter.ElasticsearchSorter(sorter.sort_list)
             params.update(elastic_sorter.params)
 
-        results = self._get_search_results(
-            params,
-            source=self.field_names,
-            size=page_size,
-            offset=offset
+        hits = scan(
+            ELASTICSEARCH,
+            query=params,
+            preserve_order=bool(sorter),
+            size=batch_size,
+            _source=self.field_names,
+            ignore_unavailable=True,
+            **self._params_for_search
         )
-        return es_results.get_results_and_count(results)
+        for hit in hits:
+            yield es_results.get_source_with_id(hit)
 
     @catch_connection_error
     @wait_for_status('yellow')
@@ -500,12 +683,76 @@ class ElasticsearchEngine(Engine):
 
         """
         params = self._params_for_insert
-        params.update({'body': doc, 'refresh': True})
-        if not self._index_exists():
-            self._create_index()
+        params.update({'body': doc, 'refresh': self._refresh})
+        self._ensure_index()
         doc = ELASTICSEARCH.index(**params)
         return doc['_id']
 
+    def _get_bulk_actions(self, docs):
+        """Create actions for inserting docs with the bulk API.
+
+        Takes a list of documents and yields a bulk index action for
+        each document.
+        """
+        params = self._params_for_insert
+        for doc in docs:
+            yield {
+                '_op_type': 'index',
+                '_index': params['index'],
+                '_type': params['doc_type'],
+                '_source': doc
+            }
+
+    def insert_many(self, docs):
+        """Insert multiple documents into the index.
+
+        Uses the bulk API, so documents are sent in chunks rather than
+        one request per document. The Collection's refresh policy is
+        applied once per chunk.
+
+        Parameters
+        ----------
+        docs : |list| of |dict|
+            Documents to insert into the Elasticsearch index.
+
+        Returns
+        -------
+        |list| of |dict|
+            A dictionary for each document, in the same order as `docs`,
+            with the keys 'doc_id' and 'error'. If a document could not
+            be indexed, 'doc_id' is |None| and 'error' describes the
+            problem.
+
+        Notes
+        -----
+        Elasticsearch assigns a new id to each document, so documents
+        are never rejected as duplicates.
+
+        """
+        if not docs:
+            return []
+
+        self._ensure_index()
+
+        results = []
+        bulk_results = streaming_bulk(
+            ELASTICSEARCH,
+            self._get_bulk_actions(docs),
+            refresh=self._refresh,
+            raise_on_error=False,
+            raise_on_exception=False
+        )
+
+        for success, item in bulk_results:
+            info = item['index']
+            if success:
+                results.append({'doc_id': info['_id'], 'error': None})
+            else:
+                results.append({'doc_id': None,
+                                'error': str(info.get('error'))})
+
+        return results
+
     def _remove_by_id_wildcard(self, doc_ids):
         """Remove one or more docs from multiple indexes.
 
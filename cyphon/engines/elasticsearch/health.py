@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines a per-process watcher for the Elasticsearch cluster state.
+
+======================================  ======================================
+Class                                   Description
+======================================  ======================================
+:class:`~ClusterHealth`                 Cached Elasticsearch cluster state.
+======================================  ======================================
+
+======================================  ======================================
+Constant                                Description
+======================================  ======================================
+:const:`~CLUSTER_HEALTH`                Shared ClusterHealth instance.
+:const:`~HEALTH_CHECK_INTERVAL`         Seconds between cluster checks.
+======================================  ======================================
+
+"""
+
+# standard library
+import logging
+import threading
+import time
+
+# local
+from .client import ELASTICSEARCH, ES_HEALTH_CHECK_INTERVAL
+
+_LOGGER = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL = ES_HEALTH_CHECK_INTERVAL
+"""|int|
+
+The minimum number of seconds between cluster health requests, unless
+the last known status was not acceptable.
+"""
+
+_STATUS_RANKS = {
+    'red': 0,
+    'yellow': 1,
+    'green': 2,
+}
+
+
+class ClusterHealth(object):
+    """A cached view of an Elasticsearch cluster's health.
+
+    Requests the cluster health at most once per `interval` while the
+    cluster is in an acceptable state, so that requests to the cluster
+    don't each require an extra health request. If the last known
+    status is not acceptable, or is unknown, callers wait for the
+    cluster to attain the required status.
+
+    Parameters
+    ----------
+    client : |Elasticsearch|
+        The Elasticsearch client used to check the cluster health.
+
+    interval : |int| or |float|
+        The number of seconds for which a cluster status is reused.
+
+    Attributes
+    ----------
+    status : |str| or |None|
+        The last known cluster status ('green', 'yellow', or 'red'),
+        or |None| if it is unknown.
+
+    checked : |float|
+        The time of the last health check, in seconds since the epoch.
+
+    latency : |float| or |None|
+        The number of seconds the last health check took, including any
+        time spent waiting for the cluster's status.
+
+    """
+
+    def __init__(self, client, interval=HEALTH_CHECK_INTERVAL):
+        self.client = client
+        self.interval = interval
+        self.status = None
+        self.checked = 0.0
+        self.latency = None
+        self._lock = threading.Lock()
+
+    def _is_acceptable(self, status):
+        """
+        Takes a cluster status and returns a Boolean indicating whether
+        the last known status is at least as healthy.
+        """
+        if self.status is None:
+            return False
+        return _STATUS_RANKS[self.status] >= _STATUS_RANKS[status]
+
+    def _is_current(self):
+        """
+        Returns a Boolean indicating whether the last known status was
+        checked within the interval.
+        """
+        return time.time() - self.checked < self.interval
+
+    def _check(self, status, timeout):
+        """
+        Takes a cluster status and a timeout in seconds. Waits for the
+        cluster to attain the status and records the result.
+        """
+        start = time.time()
+        try:
+            health = self.client.cluster.health(wait_for_status=status,
+                                                request_timeout=timeout)
+        except Exception:
+            # force a new check on the next request
+            self.status = None
+            raise
+        finally:
+            self.latency = time.time() - start
+
+        self.status = health.get('status')
+        self.checked = time.time()
+
+        if not self._is_acceptable(status):
+            _LOGGER.warning('Elasticsearch cluster status is %s',
+                            self.status)
+
+    def wait_for(self, status, timeout):
+        """Wait for the cluster to attain a status, if necessary.
+
+        Returns immediately if the last known status is acceptable and
+        was checked within the interval. Otherwise, requests the
+        cluster health, waiting up to `timeout` seconds for the cluster
+        to attain the `status`.
+
+        Parameters
+        ----------
+        status : str
+            The desired cluster state. Options are: 'green', 'yellow',
+            'red'.
+
+        timeout : |int| or |float|
+            The number of seconds to wait for the desired state.
+
+        Returns
+        -------
+        None
+
+        """
+        if self._is_current() and self._is_acceptable(status):
+            return
+
+        with self._lock:
+            # another thread may have checked while we waited
+            if not (self._is_current() and self._is_acceptable(status)):
+                self._check(status, timeout)
+
+    def get_state(self):
+        """Get the cached cluster state for monitoring.
+
+        Returns
+        -------
+        dict
+            A dictionary with the last known 'status', the time it was
+            'checked', the 'latency' of the check in seconds, and the
+            check 'interval'.
+
+        """
+        return {
+            'status': self.status,
+            'checked': self.checked,
+            'latency': self.latency,
+            'interval': self.interval,
+        }
+
+
+CLUSTER_HEALTH = ClusterHealth(ELASTICSEARCH)
+""":class:`~ClusterHealth`
+
+Cluster health watcher shared by Elasticsearch Engines in the process.
+"""
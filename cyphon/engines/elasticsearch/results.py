@@ -25,6 +25,7 @@ Function                        Description
 :func:`~get_doc_info`           Get the index, doc_type, and id of a doc.
 :func:`~get_found_docs`         Get docs from a multi-get request.
 :func:`~get_hits`               Get docs from a search result.
+:func:`~get_last_sort_values`   Get the sort values of the last doc.
 :func:`~get_results_and_count`  Get docs and doc count from a search result.
 :func:`~get_source`             Get `_source` fields with added `_id` fields.
 :func:`~get_source_with_id`     Get a doc's `_source` field with its `_id`.
@@ -107,6 +108,30 @@ def get_doc_ids(results):
     return [hit['_id'] for hit in get_hits(results)]
 
 
+def get_last_sort_values(results, size):
+    """Get the sort values of the last document in a full page of results.
+
+    Parameters
+    ----------
+    results : dict
+        An Elasticsearch search result for a sorted search.
+
+    size : int
+        The number of documents requested for the page.
+
+    Returns
+    -------
+    |list| or |None|
+        The sort values of the last document, which can be used as
+        `search_after` to get the next page of results. Returns |None|
+        if the page isn't full, since there are no more results.
+
+    """
+    hits = get_hits(results)
+    if hits and len(hits) >= int(size):
+        return hits[-1].get('sort')
+
+
 def get_source_with_id(result):
     """Return a document's `_source` field with its `_id` added.
 
@@ -40,9 +40,14 @@ LOGGER = logging.getLogger(__name__)
 
 try:
     # local
-    from engines.elasticsearch.client import ELASTICSEARCH, VERSION
+    from engines.elasticsearch.client import (
+        ELASTICSEARCH,
+        ES_INDEX_SETTINGS,
+        VERSION,
+    )
     from engines.elasticsearch.engine import (
         catch_connection_error,
+        clear_index_cache,
         ElasticsearchEngine,
     )
     NOT_CONNECTED = False
@@ -76,6 +81,7 @@ class ElasticsearchBaseTestCase(EngineBaseTestCase):
 
     def tearDown(self):
         self.elasticsearch.indices.delete(index=self.index)
+        clear_index_cache()
         logging.disable(logging.NOTSET)
 
     @staticmethod
@@ -403,13 +409,56 @@ class ElasticsearchHelperTestCase(ElasticsearchBaseTestCase):
             call(name=str(self.engine), body=body),
         ])
 
+    @patch('engines.elasticsearch.engine.ELASTICSEARCH.search')
+    def test_get_search_results_timeout(self, mock_search):
+        """
+        Tests that the _get_search_results method passes a timeout to
+        Elasticsearch.
+        """
+        self.engine._get_search_results({'query': {}}, source=[],
+                                        timeout=5)
+        self.assertEqual(mock_search.call_args[1]['request_timeout'], 5)
+
 
 class ElasticsearchCRUDTestCase(ElasticsearchBaseTestCase, CRUDTestCaseMixin):
     """
     Class for testing simple CRUD operations for the Elasticsearch class.
     Inherits its test methods from CRUDTestCaseMixin.
     """
-    pass
+
+    def test_ensure_index_cached(self):
+        """
+        Tests that the index is only checked for once per process.
+        """
+        with patch.object(self.engine, '_index_exists',
+                          return_value=True) as mock_exists:
+            self.engine._ensure_index()
+            self.assertFalse(mock_exists.called)
+
+            clear_index_cache()
+            self.engine._ensure_index()
+            self.engine._ensure_index()
+            self.assertEqual(mock_exists.call_count, 1)
+
+    @patch('engines.elasticsearch.engine.ELASTICSEARCH.index',
+           return_value={'_id': '1'})
+    def test_insert_refresh_policy(self, mock_index):
+        """
+        Tests that the insert method uses the Collection's refresh
+        policy.
+        """
+        self.engine._refresh = 'wait_for'
+        self.engine.insert({'text': 'test'})
+        self.assertEqual(mock_index.call_args[1]['refresh'], 'wait_for')
+
+    def test_refresh_interval(self):
+        """
+        Tests that the refresh interval is added to the index settings.
+        """
+        self.engine._refresh_interval = '30s'
+        mapping = self.engine._create_mapping()
+        self.assertEqual(mapping['settings']['refresh_interval'], '30s')
+        self.assertNotIn('refresh_interval', ES_INDEX_SETTINGS)
 
 
 class ElasticsearchWildcardTestCase(ElasticsearchBaseTestCase):
@@ -431,6 +480,7 @@ class ElasticsearchWildcardTestCase(ElasticsearchBaseTestCase):
 
     def tearDown(self):
         self.elasticsearch.indices.delete(index=self.engine._index_for_insert)
+        clear_index_cache()
         logging.disable(logging.NOTSET)
 
     def test_find_by_id(self):
@@ -532,3 +582,13 @@ class ElasticsearchFilterTestCase(ElasticsearchBaseTestCase, FilterTestCaseMixin
 
         for doc in self.test_docs:
             self.engine.insert(doc)
+
+    def test_find_cursor_wrong_type(self):
+        """
+        Tests that a cursor whose values don't match the types of the
+        sort fields is ignored.
+        """
+        cursor = self.engine.encode_cursor(['not a number', 'doc#1'])
+        results = self._find_by_age(cursor)
+        self.assertEqual(results['count'], 3)
+        self.assertEqual(len(results['results']), 2)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""Tests the :mod:`engines.elasticsearch.health` module.
+
+"""
+
+# standard library
+import logging
+from unittest import skipIf, TestCase
+try:
+    from unittest.mock import Mock, patch
+except ImportError:
+    from mock import Mock, patch
+
+# third party
+from elasticsearch.exceptions import ConnectionError
+
+LOGGER = logging.getLogger(__name__)
+
+try:
+    # local
+    from engines.elasticsearch.health import ClusterHealth
+    NOT_CONNECTED = False
+
+except ConnectionError:
+    NOT_CONNECTED = True
+    LOGGER.warning('Cannot connect to Elasticsearch. '
+                   'Elasticsearch tests will be skipped.')
+
+
+@skipIf(NOT_CONNECTED, 'Cannot connect to Elasticsearch')
+class ClusterHealthTestCase(TestCase):
+    """
+    Tests the ClusterHealth class.
+    """
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.cluster.health.return_value = {'status': 'green'}
+        self.health = ClusterHealth(self.client, interval=10)
+
+    def test_reuses_status(self):
+        """
+        Tests that an acceptable status is reused within the interval.
+        """
+        self.health.wait_for('yellow', 30)
+        self.health.wait_for('yellow', 30)
+        self.client.cluster.health.assert_called_once_with(
+            wait_for_status='yellow', request_timeout=30)
+
+    def test_rechecks_after_interval(self):
+        """
+        Tests that the status is checked again after the interval.
+        """
+        self.health.wait_for('yellow', 30)
+        self.health.checked -= 5
+        self.health.wait_for('yellow', 30)
+        self.assertEqual(self.client.cluster.health.call_count, 1)
+        self.health.checked -= 10
+        self.health.wait_for('yellow', 30)
+        self.assertEqual(self.client.cluster.health.call_count, 2)
+
+    def test_rechecks_unacceptable_status(self):
+        """
+        Tests that callers wait for the cluster if the last known status
+        is not acceptable.
+        """
+        self.client.cluster.health.return_value = {'status': 'red'}
+        with patch('engines.elasticsearch.health._LOGGER') as mock_logger:
+            self.health.wait_for('yellow', 30)
+            self.health.wait_for('yellow', 30)
+            self.assertEqual(mock_logger.warning.call_count, 2)
+        self.assertEqual(self.client.cluster.health.call_count, 2)
+
+    def test_error_clears_status(self):
+        """
+        Tests that the status is checked again after a failed check.
+        """
+        self.health.wait_for('yellow', 30)
+        self.client.cluster.health.side_effect = ConnectionError()
+        self.health.checked = 0
+        with self.assertRaises(ConnectionError):
+            self.health.wait_for('yellow', 30)
+        self.assertIsNone(self.health.status)
+
+    def test_get_state(self):
+        """
+        Tests the get_state method.
+        """
+        self.health.wait_for('yellow', 30)
+        state = self.health.get_state()
+        self.assertEqual(state['status'], 'green')
+        self.assertEqual(state['interval'], 10)
+        self.assertIsNotNone(state['latency'])
+        self.assertGreater(state['checked'], 0)
@@ -35,6 +35,11 @@ Constant               Description
 
 """
 
+# standard library
+import base64
+import binascii
+import json
+
 # third party
 from django.conf import settings
 
@@ -104,6 +109,25 @@ class Engine(BaseClass):
         """
         return [field.field_name for field in self.schema]
 
+    def get_projection(self, fields=None):
+        """Get the names of fields to return from matching documents.
+
+        Parameters
+        ----------
+        fields : |list| of |str| or |None|
+            Names of the fields requested, or |None| for all fields in
+            the Engine's schema.
+
+        Returns
+        -------
+        |list| of |str|
+            The names of the fields to return.
+
+        """
+        if fields is None:
+            return self.field_names
+        return list(fields)
+
     @staticmethod
     def get_offset(page, page_size):
         """Get the number of documents to skip when returning results.
@@ -124,7 +148,60 @@ class Engine(BaseClass):
         """
         return (int(page) - 1) * int(page_size)
 
-    def find_by_id(self, doc_ids):
+    @staticmethod
+    def _dump_cursor_values(values):
+        """Serialize the sort values of a cursor as a JSON string."""
+        return json.dumps(values)
+
+    @staticmethod
+    def _load_cursor_values(data):
+        """Deserialize sort values dumped by :meth:`_dump_cursor_values`."""
+        return json.loads(data)
+
+    def encode_cursor(self, values):
+        """Encode the sort values of a document as a cursor token.
+
+        Parameters
+        ----------
+        values : list
+            The values of the sort fields of the last document in a
+            page of results, followed by the document's id.
+
+        Returns
+        -------
+        str
+            An opaque, URL-safe token that can be passed to :meth:`find`
+            to return the documents that follow.
+
+        """
+        data = self._dump_cursor_values(values).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii')
+
+    def decode_cursor(self, token):
+        """Decode a cursor token created by :meth:`encode_cursor`.
+
+        Parameters
+        ----------
+        token : str
+            A cursor token.
+
+        Returns
+        -------
+        |list| or |None|
+            The sort values encoded in the token, or |None| if the token
+            is not valid.
+
+        """
+        try:
+            data = base64.urlsafe_b64decode(token.encode('ascii'))
+            values = self._load_cursor_values(data.decode('utf-8'))
+        except (AttributeError, KeyError, TypeError, ValueError,
+                binascii.Error):
+            return None
+
+        return values if isinstance(values, list) else None
+
+    def find_by_id(self, doc_ids, fields=None):
         """Find one or more documents by id.
 
         Parameters
@@ -132,6 +209,11 @@ class Engine(BaseClass):
         doc_ids : |str| or |list| of |str|
             A document id or a list of document ids.
 
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents, using
+            dot notation for nested fields. If |None|, whole documents
+            are returned.
+
         Returns
         -------
         |dict|, |list| of |dict|, or |None|
@@ -146,7 +228,8 @@ class Engine(BaseClass):
         """
         return self.raise_method_not_implemented()
 
-    def find(self, query, sorter=None, page=1, page_size=PAGE_SIZE):
+    def find(self, query, sorter=None, page=1, page_size=PAGE_SIZE,
+             cursor=None, fields=None, timeout=None):
         """Find documents matching a query.
 
         Parameters
@@ -159,11 +242,26 @@ class Engine(BaseClass):
             A |Sorter| defining how results should be ordered.
 
         page : int
-            The page of results to return.
+            The page of results to return. Ignored if a valid `cursor`
+            is given.
 
         page_size : int
             The number of documents per page of results.
 
+        cursor : |str| or |None|
+            A cursor token returned by a previous search with the same
+            query and sorter. If given, the documents that follow the
+            last document of that search are returned.
+
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents, using
+            dot notation for nested fields. If |None|, all fields in the
+            Engine's schema are returned.
+
+        timeout : |int|, |float|, or |None|
+            The maximum number of seconds the search may take before the
+            engine abandons it. If |None|, the engine's default applies.
+
         Returns
         -------
         |list| of |dict|
@@ -171,6 +269,42 @@ class Engine(BaseClass):
             value is the total number of documents matching the search
             criteria. The 'results' value is a list of documents from
             the search result, with the doc ids added to each document.
+            If a `sorter` or `cursor` is given, documents are also
+            ordered by id, and the dictionary includes a 'cursor' key
+            with a token for the next page of results, or |None| if
+            this is the last page.
+
+        Notes
+        -----
+        This method needs to be implemented in derived classes.
+
+        """
+        return self.raise_method_not_implemented()
+
+    def scan(self, query, sorter=None, batch_size=MAX_RESULTS):
+        """Iterate over all documents matching a query.
+
+        Documents are fetched from the data store in batches, so memory
+        use is bounded by the `batch_size` rather than the number of
+        matching documents.
+
+        Parameters
+        ----------
+        query : |EngineQuery|
+            An |EngineQuery| defining critieria for matching documents
+            in the index or time series.
+
+        sorter : |Sorter| or |None|
+            A |Sorter| defining how documents should be ordered.
+
+        batch_size : int
+            The number of documents to fetch from the data store at a
+            time.
+
+        Returns
+        -------
+        generator of |dict|
+            Documents matching the query, with their doc ids added.
 
         Notes
         -----
@@ -226,6 +360,32 @@ class Engine(BaseClass):
         """
         return self.raise_method_not_implemented()
 
+    def insert_many(self, docs):
+        """Insert multiple documents into the data store.
+
+        Parameters
+        ----------
+        docs : |list| of |dict|
+            Documents to insert in the data store.
+
+        Returns
+        -------
+        |list| of |dict|
+            A dictionary for each document, in the same order as `docs`,
+            with the keys 'doc_id' and 'error'. For a document that was
+            saved, 'doc_id' is its id and 'error' is |None|. For a
+            document that could not be saved, 'error' describes the
+            problem.
+
+        Notes
+        -----
+        The base implementation inserts the documents one at a time.
+        Derived classes should override it to use the data store's bulk
+        API.
+
+        """
+        return [{'doc_id': self.insert(doc), 'error': None} for doc in docs]
+
     def remove_by_id(self, doc_ids):
         """Remove the documents with the given ids.
 
@@ -44,7 +44,8 @@ from functools import wraps
 import logging
 
 # third party
-from bson import ObjectId
+from bson import json_util, ObjectId
+from bson.errors import BSONError
 from django.conf import settings
 import pymongo
 
@@ -53,6 +54,7 @@ from engines.engine import Engine, MAX_RESULTS, PAGE_SIZE
 from engines.mongodb import queries as mongodb_queries
 from engines.mongodb import sorter as mongodb_sorter
 from engines.mongodb import results as mongodb_results
+from engines.sorter import SortParam
 from utils.parserutils import parserutils
 from .client import MONGODB_CLIENT
 
@@ -60,6 +62,8 @@ _DISTILLERY_SETTINGS = settings.DISTILLERIES
 
 _LOGGER = logging.getLogger(__name__)
 
+_DUPLICATE_KEY_ERROR = 11000
+
 
 ENGINE_CLASS = 'MongoDbEngine'
 """|str|
@@ -238,7 +242,7 @@ class MongoDbEngine(Engine):
             return self._restore_object_id(doc_ids)
 
     def _get_search_results(self, query, projection=None, sorter=None,
-                            page=1, page_size=MAX_RESULTS):
+                            page=1, page_size=MAX_RESULTS, timeout=None):
         """Find matching documents.
 
         Parameters
@@ -258,6 +262,10 @@ class MongoDbEngine(Engine):
         page_size : int
             The number of documents per page.
 
+        timeout : |int|, |float|, or |None|
+            The maximum number of seconds the server may spend on the
+            query. If |None|, the query isn't limited.
+
         Returns
         -------
         |list| of |dict|
@@ -276,30 +284,33 @@ class MongoDbEngine(Engine):
             m_sorter = mongodb_sorter.MongoDbSorter(sorter.sort_list)
             cursor = cursor.sort(m_sorter.params)
 
+        if timeout:
+            cursor = cursor.max_time_ms(int(timeout * 1000))
+
         return cursor.skip(offset).limit(int(page_size))
 
-    def _find_multiple_ids(self, doc_ids):
+    def _find_multiple_ids(self, doc_ids, projection=None):
         """Find documents by their ids.
 
         Takes a list of hexadecimal document id strings and returns
         the corresponding documents.
         """
         id_filter = mongodb_queries.ids_filter(doc_ids)
-        docs = self._get_search_results(id_filter)
+        docs = self._get_search_results(id_filter, projection)
         return mongodb_results.get_results(docs)
 
-    def _find_single_id(self, doc_id):
+    def _find_single_id(self, doc_id, projection=None):
         """Find a document by its id.
 
         Takes a hexadecimal document id string and returns the
         corresponding document.
         """
         id_filter = mongodb_queries.id_query(doc_id)
-        doc = self._collection.find_one(id_filter)
+        doc = self._collection.find_one(id_filter, projection)
         return mongodb_results.get_results(doc)
 
     @catch_timeout_error
-    def find_by_id(self, doc_ids):
+    def find_by_id(self, doc_ids, fields=None):
         """Find one or more documents by id.
 
         Parameters
@@ -307,6 +318,11 @@ class MongoDbEngine(Engine):
         doc_ids : |str| or |list| of |str|
             A hexadecimanl document id or a list of ids.
 
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents, using
+            dot notation for nested fields. If |None|, whole documents
+            are returned.
+
         Returns
         -------
         |dict|, |list| of |dict|, or |None|
@@ -316,16 +332,43 @@ class MongoDbEngine(Engine):
 
         """
         obj_ids = self._restore_object_ids(doc_ids)
+        projection = None if fields is None else list(fields)
 
         if isinstance(obj_ids, list):
-            data = self._find_multiple_ids(obj_ids)
+            data = self._find_multiple_ids(obj_ids, projection)
         else:
-            data = self._find_single_id(obj_ids)
+            data = self._find_single_id(obj_ids, projection)
 
         return data or None
 
+    @staticmethod
+    def _dump_cursor_values(values):
+        """Serialize the sort values of a cursor as extended JSON.
+
+        Preserves BSON types such as ObjectIds and datetimes, so they
+        can be compared with the values stored in the collection.
+        """
+        return json_util.dumps(values)
+
+    @staticmethod
+    def _load_cursor_values(data):
+        """Deserialize sort values dumped by :meth:`_dump_cursor_values`."""
+        try:
+            return json_util.loads(data)
+        except (BSONError, KeyError) as error:
+            # e.g., an invalid ObjectId
+            raise ValueError(error)
+
+    def _get_cursor_values(self, doc, sort_params):
+        """Get the values of a document's sort fields for a cursor."""
+        values = [parserutils.get_dict_value(field_name, doc)
+                  for field_name, _ in sort_params[:-1]]
+        values.append(self._restore_object_id(doc['_id']))
+        return values
+
     @catch_timeout_error
-    def find(self, query, sorter=None, page=1, page_size=PAGE_SIZE):
+    def find(self, query, sorter=None, page=1, page_size=PAGE_SIZE,
+             cursor=None, fields=None, timeout=None):
         """Find documents matching a query.
 
         Parameters
@@ -337,11 +380,29 @@ class MongoDbEngine(Engine):
             A |Sorter| defining how results should be ordered.
 
         page : int
-            The page of results to return.
+            The page of results to return. Ignored if a valid `cursor`
+            is given.
 
         page_size : int
             The number of documents per page of results.
 
+        cursor : |str| or |None|
+            A cursor token returned by a previous search with the same
+            query and sorter. Results start after the document it
+            refers to, using a range query on the sort fields rather
+            than skipping over the preceding documents. The token also
+            carries the total count from the first page, so later
+            pages aren't counted again.
+
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents, using
+            dot notation for nested fields. If |None|, all fields in the
+            Engine's schema are returned.
+
+        timeout : |int|, |float|, or |None|
+            The maximum number of seconds the search may take before the
+            engine abandons it. If |None|, the engine's default applies.
+
         Returns
         -------
         |list| of |dict|
@@ -349,14 +410,112 @@ class MongoDbEngine(Engine):
             value is the total number of documents matching the search
             criteria. The 'results' value is a list of documents from
             the search result, with the doc ids added to each document.
+            If a `sorter` or `cursor` is given, the dictionary also has
+            a 'cursor' key with a token for the next page of results.
 
         """
         query = mongodb_queries.MongoDbQuery(query.subqueries, query.joiner)
-        projection = self.field_names
+        projection = self.get_projection(fields)
         mongodb_params = query.params
+
+        if sorter is None and cursor is None:
+            docs = self._get_search_results(mongodb_params, projection,
+                                            sorter, page, page_size, timeout)
+            return mongodb_results.get_results_and_count(docs)
+
+        # break ties by doc id so the range query is unambiguous
+        sort_list = list(sorter.sort_list) if sorter else []
+        sort_list.append(SortParam('_id', None, 'ASC'))
+        sorter = mongodb_sorter.MongoDbSorter(sort_list)
+        sort_params = sorter.params
+
+        # the sort values of the last doc are needed for its cursor
+        projection += [field_name for field_name, _ in sort_params[:-1]
+                       if field_name not in projection]
+
+        after_values = self.decode_cursor(cursor) if cursor else None
+        count = None
+
+        # the total count follows the sort values of the last doc
+        if after_values and len(after_values) == len(sort_params) + 1 \
+                and isinstance(after_values[-1], int):
+            count = after_values.pop()
+
+        if after_values and len(after_values) == len(sort_params):
+            if count is None:
+                count_options = {'maxTimeMS': int(timeout * 1000)} \
+                                if timeout else {}
+                count = self._collection.count(mongodb_params,
+                                               **count_options)
+            after_params = mongodb_queries.after_query(sort_params,
+                                                       after_values)
+            mongodb_params = {'$and': [mongodb_params, after_params]}
+            page = 1
+
         docs = self._get_search_results(mongodb_params, projection, sorter,
-                                        page, page_size)
-        return mongodb_results.get_results_and_count(docs)
+                                        page, page_size, timeout)
+
+        if count is None:
+            results_and_count = mongodb_results.get_results_and_count(docs)
+        else:
+            results_and_count = {
+                'count': count,
+                'results': mongodb_results.get_results(docs),
+            }
+
+        results = results_and_count['results']
+
+        if results and len(results) >= int(page_size):
+            cursor_values = self._get_cursor_values(results[-1], sort_params)
+            cursor_values.append(results_and_count['count'])
+            results_and_count['cursor'] = self.encode_cursor(cursor_values)
+        else:
+            results_and_count['cursor'] = None
+
+        return results_and_count
+
+    def scan(self, query, sorter=None, batch_size=MAX_RESULTS):
+        """Iterate over all documents matching a query.
+
+        The server-side cursor doesn't time out while a slow consumer
+        holds it, and is closed when the generator finishes or is
+        discarded. Errors that occur while documents are fetched are
+        raised from the generator rather than logged, so an incomplete
+        scan can't be mistaken for a complete one.
+
+        Parameters
+        ----------
+        query : |EngineQuery|
+            An |EngineQuery| defining critieria for matching documents.
+
+        sorter : |Sorter| or |None|
+            A |Sorter| defining how documents should be ordered.
+
+        batch_size : int
+            The number of documents to fetch from the server at a time.
+
+        Returns
+        -------
+        generator of |dict|
+            Documents matching the query, with their ObjectIds
+            converted to hexadecimal strings.
+
+        """
+        query = mongodb_queries.MongoDbQuery(query.subqueries, query.joiner)
+        cursor = self._collection.find(query.params, self.field_names,
+                                       no_cursor_timeout=True)
+
+        if sorter:
+            m_sorter = mongodb_sorter.MongoDbSorter(sorter.sort_list)
+            cursor = cursor.sort(m_sorter.params)
+
+        cursor = cursor.batch_size(int(batch_size))
+
+        try:
+            for doc in cursor:
+                yield mongodb_results.get_results(doc)
+        finally:
+            cursor.close()
 
     @catch_timeout_error
     def filter_ids(self, doc_ids, fields, value):
@@ -411,13 +570,73 @@ class MongoDbEngine(Engine):
             obj_id = inserted_result.inserted_id
 
         except pymongo.errors.DuplicateKeyError as error:
-            errmsg = error.details['errmsg']
-            key_val = parserutils.get_dup_key_val(errmsg)
-            dup = self._collection.find_one(key_val)
-            obj_id = dup['_id']
+            obj_id = self._get_duplicate_id(error.details['errmsg'])
 
         return str(obj_id)
 
+    def _get_duplicate_id(self, errmsg):
+        """Get the id of an existing document with a duplicate key.
+
+        Takes the error message for a duplicate key error and returns
+        the ObjectId of the original document.
+        """
+        key_val = parserutils.get_dup_key_val(errmsg)
+        dup = self._collection.find_one(key_val)
+        return dup['_id']
+
+    def insert_many(self, docs):
+        """Insert multiple documents into the collection.
+
+        Documents are inserted with a single unordered request, so a
+        document that can't be inserted doesn't prevent the others from
+        being saved.
+
+        Parameters
+        ----------
+        docs : |list| of |dict|
+            Documents to insert into the MongoDB collection.
+
+        Returns
+        -------
+        |list| of |dict|
+            A dictionary for each document, in the same order as `docs`,
+            with the keys 'doc_id' and 'error'. If a document could not
+            be inserted, 'doc_id' is |None| and 'error' describes the
+            problem.
+
+        Notes
+        ------
+        As with :meth:`~MongoDbEngine.insert`, a document rejected
+        because a document with the same key already exists is not
+        treated as an error. Its 'doc_id' is the hexadecimal id of the
+        original document.
+
+        """
+        docs = list(docs)
+        if not docs:
+            return []
+
+        try:
+            self._collection.insert_many(docs, ordered=False)
+            write_errors = {}
+        except pymongo.errors.BulkWriteError as error:
+            write_errors = {write_error['index']: write_error
+                            for write_error in error.details['writeErrors']}
+
+        results = []
+        for index, doc in enumerate(docs):
+            write_error = write_errors.get(index)
+            if write_error is None:
+                results.append({'doc_id': str(doc['_id']), 'error': None})
+            elif write_error['code'] == _DUPLICATE_KEY_ERROR:
+                obj_id = self._get_duplicate_id(write_error['errmsg'])
+                results.append({'doc_id': str(obj_id), 'error': None})
+            else:
+                results.append({'doc_id': None,
+                                'error': write_error['errmsg']})
+
+        return results
+
     def remove_by_id(self, doc_ids):
         """Remove the documents with the given ids.
 
@@ -27,6 +27,7 @@ Class                                 Description
 ====================================  =========================================
 Function                              Description
 ====================================  =========================================
+:func:`~after_query`                  Create a query for docs after a doc.
 :func:`~id_query`                     Create a query to find a doc by id.
 :func:`~ids_and_value_filter`         Create a query for docs matching a value.
 :func:`~ids_filter`                   Create a filter for docs using ids.
@@ -39,6 +40,9 @@ Function                              Description
 import json
 import re
 
+# third party
+import pymongo
+
 # local
 from engines.queries import EngineQueryFieldset, EngineQuery
 from utils.parserutils.parserutils import restore_type
@@ -74,6 +78,57 @@ def regex_query(field_name, value):
     return {field_name: {'$regex': value, '$options': 'i'}}
 
 
+def after_query(sort_params, values):
+    """Create a query for documents that sort after a given document.
+
+    Constructs a range query on the sort fields, so a page of results
+    can start after the last document of the previous page without
+    skipping over the documents that precede it.
+
+    Parameters
+    ----------
+    sort_params : |list| of |tuple|
+        (field name, direction) pairs defining the order of documents,
+        as returned by :attr:`MongoDbSorter.params`. The last field
+        should be unique (e.g., '_id') so the order is unambiguous.
+
+    values : list
+        The values of the sort fields for the document after which
+        results should start.
+
+    Returns
+    -------
+    dict
+        A query for documents that follow the given document.
+
+    """
+    clauses = []
+
+    for index, (field_name, direction) in enumerate(sort_params):
+        clause = {name: values[position] for position, (name, _)
+                  in enumerate(sort_params[:index])}
+        value = values[index]
+
+        if value is None:
+            # nulls sort first, so nothing precedes them when descending
+            if direction == pymongo.DESCENDING:
+                continue
+            clause[field_name] = {'$ne': None}
+        elif direction == pymongo.ASCENDING:
+            clause[field_name] = {'$gt': value}
+        else:
+            # null and missing values sort last when descending, and
+            # aren't matched by $lt
+            clause[_MONGODB_QUERY_JOINERS['OR']] = [
+                {field_name: {'$lt': value}},
+                {field_name: None},
+            ]
+
+        clauses.append(clause)
+
+    return {_MONGODB_QUERY_JOINERS['OR']: clauses}
+
+
 def ids_filter(doc_ids):
     """Create a filter for documents with the given ids.
 
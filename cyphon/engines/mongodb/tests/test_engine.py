@@ -19,6 +19,7 @@ Tests the MongoDbEngine class.
 """
 
 # standard library
+import base64
 import logging
 import time
 from unittest import skipIf
@@ -33,6 +34,7 @@ import pymongo
 # local
 from engines.mongodb.client import MONGODB_CLIENT
 from engines.mongodb.engine import MongoDbEngine
+from engines.mongodb.queries import after_query
 from engines.tests.test_engine import EngineBaseTestCase
 from engines.tests.mixins import CRUDTestCaseMixin, FilterTestCaseMixin
 from warehouses.models import Collection
@@ -115,6 +117,14 @@ class MongoDbHelperTestCase(MongoDbBaseTestCase):
         expected = 'TextIndex'
         self.assertEqual(actual, expected)
 
+    def test_get_search_results_timeout(self):
+        """
+        Tests that the _get_search_results() method limits the time
+        MongoDB may spend on the query.
+        """
+        cursor = self.engine._get_search_results({}, timeout=5)
+        self.assertEqual(cursor._Cursor__max_time_ms, 5000)
+
 
 class MongoDbTestCase(MongoDbBaseTestCase):
     """
@@ -129,13 +139,54 @@ class MongoDbTestCase(MongoDbBaseTestCase):
         self.assertTrue(name.startswith('test_database_'))
         self.assertTrue(name.endswith('.test_docs'))
 
+    def test_after_query_desc(self):
+        """
+        Tests that documents with null values follow a document with a
+        value in descending order.
+        """
+        sort_params = [('age', pymongo.DESCENDING), ('_id', pymongo.ASCENDING)]
+        self.assertEqual(after_query(sort_params, [30, 'x']), {
+            '$or': [
+                {'$or': [{'age': {'$lt': 30}}, {'age': None}]},
+                {'age': 30, '_id': {'$gt': 'x'}},
+            ]
+        })
+
+    def test_decode_invalid_object_id(self):
+        """
+        Tests that a cursor token with an invalid ObjectId is decoded
+        as None.
+        """
+        token = base64.urlsafe_b64encode(b'[30, {"$oid": "xyz"}]')
+        self.assertIsNone(self.engine.decode_cursor(token.decode('ascii')))
+
 
 class MongoDbCRUDTestCase(MongoDbBaseTestCase, CRUDTestCaseMixin):
     """
     Class for testing simple CRUD operations for the MongoDbEngine class. Inherits its
     test methods from CRUDTestCaseMixin.
     """
-    pass
+
+    def test_insert_many_duplicates(self):
+        """
+        Tests that the insert_many method returns the id of the original
+        document for a duplicate document.
+        """
+        self.engine._create_unique_index()
+        raw_data = {
+            'backend': 'example_backend',
+            'database': 'example_database',
+            'collection': 'raw_data',
+            'doc_id': 1
+        }
+        doc_id = self.engine.insert({'_raw_data': dict(raw_data)})
+        results = self.engine.insert_many([
+            {'_raw_data': dict(raw_data), 'text': 'duplicate'},
+            {'text': 'new'},
+        ])
+        self.assertEqual(results[0], {'doc_id': doc_id, 'error': None})
+        self.assertIsNone(results[1]['error'])
+        self.assertNotEqual(results[1]['doc_id'], doc_id)
 
 
 class MongoDbFilterTestCase(MongoDbBaseTestCase, FilterTestCaseMixin):
@@ -153,3 +204,31 @@ class MongoDbFilterTestCase(MongoDbBaseTestCase, FilterTestCaseMixin):
 
         for doc in self.test_docs:
             self.engine.insert(doc)
+
+    def test_find_cursor_missing_value(self):
+        """
+        Tests that a document without a sort field value follows the
+        documents with values in descending order.
+        """
+        self.engine.insert({
+            'user': {'screen_name': 'anonymous'},
+            'content': {'text': 'I like cats.'}
+        })
+        results = self._find_by_age()
+        results = self._find_by_age(results['cursor'])
+        names = [doc['user']['screen_name'] for doc in results['results']]
+        self.assertIn('anonymous', names)
+
+    def test_find_cursor_count(self):
+        """
+        Tests that the total count is carried in the cursor, so later
+        pages aren't counted again.
+        """
+        results = self._find_by_age()
+        with patch('engines.mongodb.results.get_count') as mock_count, \
+                patch.object(self.engine._collection, 'count') \
+                as mock_collection_count:
+            results = self._find_by_age(results['cursor'])
+        self.assertEqual(results['count'], 3)
+        mock_count.assert_not_called()
+        mock_collection_count.assert_not_called()
@@ -49,6 +49,27 @@ class CRUDTestCaseMixin(object):
         self.assertEqual(self._get_id([result], 0), doc_id)
         self.assertEqual(self._get_doc([result], 0)['text'], test_text)
 
+    def test_insert_many(self):
+        """
+        Tests the insert_many method.
+        """
+        test_texts = ['this is a bulk insert test post',
+                      'this is another bulk insert test post']
+        results = self.engine.insert_many([{'text': text}
+                                           for text in test_texts])
+
+        self.assertEqual(len(results), 2)
+        for result, test_text in zip(results, test_texts):
+            self.assertIsNone(result['error'])
+            doc = self.engine.find_by_id(result['doc_id'])
+            self.assertEqual(self._get_doc([doc], 0)['text'], test_text)
+
+    def test_insert_many_empty(self):
+        """
+        Tests the insert_many method for an empty list of documents.
+        """
+        self.assertEqual(self.engine.insert_many([]), [])
+
     def test_find_by_id_single(self):
         """
         Tests the find_by_id method for a single document.
@@ -957,6 +978,86 @@ class FilterTestCaseMixin(object):
         self.assertEqual(len(docs), 1)
         self.assertEqual(docs[0]['user']['screen_name'], 'john')
 
+    def _find_by_age(self, cursor=None):
+        """
+        Returns the first page of 2 matching documents in descending
+        order of age, or the page after the given cursor.
+        """
+        sorter = Sorter([
+            SortParam(
+                field_name='user.age',
+                field_type='IntegerField',
+                order='DESC'
+            )
+        ])
+        field_query = EngineQuery(self.fieldsets, 'OR')
+        return self.engine.find(
+            query=field_query,
+            sorter=sorter,
+            page_size=2,
+            cursor=cursor
+        )
+
+    def test_find_cursor(self):
+        """
+        Tests paging through sorted find results with a cursor.
+        """
+        results = self._find_by_age()
+        first_names = [doc['user']['screen_name']
+                       for doc in results['results']]
+        self.assertEqual(results['count'], 3)
+        self.assertEqual(len(first_names), 2)
+        self.assertTrue(results['cursor'])
+
+        results = self._find_by_age(results['cursor'])
+        docs = results['results']
+        self.assertEqual(results['count'], 3)
+        self.assertEqual(len(docs), 1)
+        self.assertEqual(docs[0]['user']['screen_name'], 'john')
+        self.assertNotIn(docs[0]['user']['screen_name'], first_names)
+        self.assertIsNone(results['cursor'])
+
+    def test_scan(self):
+        """
+        Tests that scan returns all matching documents in batches.
+        """
+        sorter = Sorter([
+            SortParam(
+                field_name='user.age',
+                field_type='IntegerField',
+                order='ASC'
+            )
+        ])
+        field_query = EngineQuery(self.fieldsets, 'OR')
+        docs = list(self.engine.scan(field_query, sorter, batch_size=1))
+
+        self.assertEqual(len(docs), 3)
+        self.assertEqual(docs[0]['user']['screen_name'], 'john')
+        self.assertTrue(all('_id' in doc for doc in docs))
+
+    def test_find_requested_fields(self):
+        """
+        Tests that find and find_by_id return only the requested fields.
+        """
+        field_query = EngineQuery(self.fieldsets, 'OR')
+        results = self.engine.find(
+            query=field_query,
+            fields=['user.screen_name']
+        )
+        docs = results['results']
+        self.assertEqual(results['count'], 3)
+        for doc in docs:
+            self.assertIn('_id', doc)
+            self.assertIn('screen_name', doc['user'])
+            self.assertNotIn('age', doc['user'])
+            self.assertNotIn('content', doc)
+
+        doc = self.engine.find_by_id(docs[0]['_id'],
+                                     fields=['user.screen_name'])
+        self.assertEqual(doc['_id'], docs[0]['_id'])
+        self.assertEqual(doc['user'], docs[0]['user'])
+        self.assertNotIn('content', doc)
+
     def test_filter_ids_analyzed(self):
         """
         Tests the filter_ids method.
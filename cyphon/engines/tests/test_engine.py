@@ -137,6 +137,29 @@ class EngineTestCase(EngineBaseTestCase):
         with self.assertRaises(NotImplementedError):
             self.engine.find({'_id': 'xyz'})
 
+    def test_encode_cursor(self):
+        """
+        Tests that cursor tokens can be decoded.
+        """
+        token = self.engine.encode_cursor([1509000000000, 'doc#1'])
+        self.assertEqual(self.engine.decode_cursor(token),
+                         [1509000000000, 'doc#1'])
+
+    def test_decode_invalid_cursor(self):
+        """
+        Tests that an invalid cursor token is decoded as None.
+        """
+        self.assertIsNone(self.engine.decode_cursor('not a cursor'))
+        self.assertIsNone(self.engine.decode_cursor(
+            self.engine.encode_cursor({'foo': 'bar'})))
+
+    def test_scan(self):
+        """
+        Tests the scan method.
+        """
+        with self.assertRaises(NotImplementedError):
+            self.engine.scan({'_id': 'xyz'})
+
     def test_filter_ids(self):
         """
         Tests the find_by_id method.
@@ -151,6 +174,13 @@ class EngineTestCase(EngineBaseTestCase):
         with self.assertRaises(NotImplementedError):
             self.engine.insert({'_id': 'xyz'})
 
+    def test_insert_many(self):
+        """
+        Tests the insert_many method.
+        """
+        with self.assertRaises(NotImplementedError):
+            self.engine.insert_many([{'_id': 'xyz'}])
+
     def test_remove_by_id(self):
         """
         Tests the remove_by_id method.
@@ -279,7 +279,8 @@ class Monitor(Alarm):
         if date_field:
             query = self._get_query(date_field)
             sorter = self._get_sorter(date_field)
-            results = distillery.find(query, sorter, page=1, page_size=1)
+            results = distillery.find(query, sorter, page=1, page_size=1,
+                                      fields=distillery.get_date_fields())
             if results['results']:
                 return results['results'][0]
 
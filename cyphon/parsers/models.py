@@ -103,9 +103,29 @@ class Parser(models.Model):
         abstract = True
         ordering = ['name']
 
+    _REGEX_FLAGS = re.DOTALL | re.IGNORECASE
+
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        """
+        Overrides the save() method to discard compiled regexes for
+        the Parser's previous settings.
+        """
+        super(Parser, self).save(*args, **kwargs)
+        parserutils.clear_compiled_regexes(self._regex_owner)
+
+    def delete(self, *args, **kwargs):
+        """
+        Overrides the delete() method to discard compiled regexes for
+        the Parser.
+        """
+        owner = self._regex_owner
+        result = super(Parser, self).delete(*args, **kwargs)
+        parserutils.clear_compiled_regexes(owner)
+        return result
+
     def clean(self):
         super(Parser, self).clean()
 
@@ -114,12 +134,28 @@ class Parser(models.Model):
             raise ValidationError(_('A regex must be provided to use the '
                                     '%s method.' % method_name))
 
+    @property
+    def _regex_owner(self):
+        """
+        Returns a key identifying the Parser in the compiled regex cache.
+        """
+        return (self._meta.label_lower, self.pk)
+
+    def _get_regex(self):
+        """
+        Returns the Parser's compiled regex, or None if the regex can't
+        be compiled.
+        """
+        return parserutils.get_compiled_regex(self._regex_owner, self.regex,
+                                              self._REGEX_FLAGS)
+
     def _search(self, string):
         """
         Takes a string and returns a re.MatchObject for the Parser's regex.
         """
-        # TODO(LH): catch exceptions for malformed regex
-        return re.search(self.regex, string, re.DOTALL | re.IGNORECASE)
+        regex = self._get_regex()
+        if regex is not None:
+            return regex.search(string)
 
     def _is_present(self, string):
         """
@@ -159,7 +195,10 @@ class Parser(models.Model):
         """
         Takes a string and returns a list of strings matching the Parser's regex.
         """
-        return re.findall(self.regex, string, re.DOTALL | re.IGNORECASE)
+        regex = self._get_regex()
+        if regex is None:
+            return []
+        return regex.findall(string)
 
     def _get_count(self, string):
         """
@@ -203,6 +242,22 @@ class Parser(models.Model):
         else:
             return self._format(results)
 
+    def compile(self):
+        """Prepare the Parser for processing many documents.
+
+        Compiles the Parser's regex, so it is validated and cached
+        before the first document is parsed.
+
+        Returns
+        -------
+        |Parser|
+            The Parser itself.
+
+        """
+        if self.regex:
+            self._get_regex()
+        return self
+
     def process(self, value):
         """
         Takes a value and returns a parsed result.
@@ -261,6 +316,8 @@ class FieldParser(Parser):
         abstract = True
         ordering = ['name']
 
+    _source_paths = None
+
     def clean(self):
         """
         Adds custom validations to the model's clean() method.
@@ -284,15 +341,36 @@ class FieldParser(Parser):
         Takes a dictionary and returns values for the keys specified by the
         source_fields.
         """
-        fields = self.source_fields.split(',')
-        values = []
+        return [path.get_value(doc) for path in self._get_source_paths()]
 
-        for field in fields:
-            key = field.strip() # in case there were spaces after commas
-            value = parserutils.get_dict_value(key, doc)
-            values.append(value)
+    def _get_source_paths(self):
+        """
+        Returns a tuple of FieldPaths for the source_fields, parsed once
+        and reused until the source_fields change.
+        """
+        if self._source_paths is None \
+                or self._source_paths[0] != self.source_fields:
+            paths = tuple(
+                # strip in case there were spaces after commas
+                parserutils.compile_field_path(field.strip())
+                for field in self.source_fields.split(',')
+            )
+            self._source_paths = (self.source_fields, paths)
+        return self._source_paths[1]
+
+    def compile(self):
+        """Prepare the FieldParser for processing many documents.
 
-        return values
+        Compiles the FieldParser's regex and parses its source fields.
+
+        Returns
+        -------
+        |FieldParser|
+            The FieldParser itself.
+
+        """
+        self._get_source_paths()
+        return super(FieldParser, self).compile()
 
     def _parse_all(self, values):
         """
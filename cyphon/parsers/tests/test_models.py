@@ -19,6 +19,7 @@ Tests the Parser class.
 """
 
 # standard library
+import logging
 from unittest import TestCase
 
 # third party
@@ -148,6 +149,20 @@ class ParseTestCase(TestCase):
         result = parser._parse('this is an example post')
         self.assertEqual(result, 'this is an example post')
 
+    def test_malformed_regex(self):
+        """
+        Tests the _parse method when the Parser's regex can't be
+        compiled.
+        """
+        logging.disable(logging.ERROR)
+        try:
+            parser = Parser(method='COUNT', regex='(Bad Bots')
+            self.assertEqual(parser._parse(self.string), 0)
+            parser = Parser(method='SUBSTRING', regex='(Bad Bots')
+            self.assertEqual(parser._parse(self.string), None)
+        finally:
+            logging.disable(logging.NOTSET)
+
 
 class StringParserTestCase(TestCase):
     """
@@ -381,3 +396,13 @@ class FieldParserProcessTestCase(TestCase):
         expected = 'this is an example post'
         self.assertEqual(actual, expected)
 
+
+    def test_source_fields_changed(self):
+        """
+        Tests that parsed source fields are updated when the source_fields
+        change.
+        """
+        parser = FieldParser(source_fields='text').compile()
+        self.assertEqual(parser.process(self.doc), 'this is an example post')
+        parser.source_fields = 'id_str'
+        self.assertEqual(parser.process(self.doc), '0123456')
@@ -27,6 +27,7 @@ from alerts.models import Alert
 from alerts.serializers import AlertDetailSerializer
 from distilleries.models import Distillery
 from utils.dbutils.dbutils import join_query
+from .cache import CACHED_HITS, get_page_ids, order_by_ids, SEARCH_CACHE
 from .search_results import DEFAULT_PAGE_SIZE, SearchResults
 
 ALERT_SEARCH_VIEW_NAME = 'search_alerts'
@@ -45,13 +46,18 @@ class AlertSearchResults(SearchResults):
     NEGATIVE_QUERY_FLAGS = ['not:eq']
 
     def __init__(self, query, page=1, page_size=DEFAULT_PAGE_SIZE,
-                 after=None, before=None):
+                 after=None, before=None, cache_key=None):
         """Find alerts that match a SearchQuery.
 
         Parameters
         ----------
         query : query.search.search_query.SearchQuery
 
+        cache_key : str or None
+            A key returned by :func:`~query.search.cache.get_search_key`.
+            If provided, and a search cache is configured, the ids of
+            matching Alerts are cached and later pages are fetched by id.
+
         """
         super(AlertSearchResults, self).__init__(
             self.VIEW_NAME, query, page, page_size,
@@ -61,11 +67,70 @@ class AlertSearchResults(SearchResults):
         queryset = self._get_alert_search_queryset(
             query, after=after, before=before)
 
-        if queryset:
+        if cache_key and SEARCH_CACHE is not None:
+            cache_key = '%s:alerts' % cache_key
+            entry = self._get_cache_entry(queryset, cache_key)
+            page_ids = get_page_ids(entry, page, page_size)
+
+            if page_ids is not None:
+                self.results = self._get_alerts_by_id(page_ids)
+            else:
+                self.results = self._get_results_page(
+                    queryset, page, page_size)
+
+            self.count = entry['count']
+
+        elif queryset:
             self.results = self._get_results_page(
                 queryset, page, page_size)
             self.count = queryset.count()
 
+    @staticmethod
+    def _get_cache_entry(queryset, cache_key):
+        """Return the cached count and first ids of matching Alerts.
+
+        If the search isn't cached, gets the count and ids from the
+        queryset and caches them.
+
+        Parameters
+        ----------
+        queryset : django.db.models.query.QuerySet
+
+        cache_key : str
+
+        Returns
+        -------
+        dict
+            A dictionary with the total 'count' of matching Alerts and
+            the 'ids' of up to :const:`CACHED_HITS` of them.
+
+        """
+        entry = SEARCH_CACHE.get(cache_key)
+
+        if entry is None:
+            ids = list(queryset.values_list('pk', flat=True)[:CACHED_HITS])
+            count = queryset.count() if len(ids) == CACHED_HITS else len(ids)
+            entry = {'count': count, 'ids': ids}
+            SEARCH_CACHE.set(cache_key, entry)
+
+        return entry
+
+    @staticmethod
+    def _get_alerts_by_id(alert_ids):
+        """Return Alerts in the order of a list of ids.
+
+        Parameters
+        ----------
+        alert_ids : list of int
+
+        Returns
+        -------
+        list of Alert
+
+        """
+        alerts = Alert.objects.filter(pk__in=alert_ids)
+        return order_by_ids(alerts, alert_ids, lambda alert: alert.pk)
+
     @staticmethod
     def _serialize_alert_object(alert, request):
         """Return a JSON serializable representation of an Alert.
@@ -86,32 +151,24 @@ class AlertSearchResults(SearchResults):
         return AlertDetailSerializer(alert, context={'request': request}).data
 
     @staticmethod
-    def _get_keyword_search_query(keyword, text_fields):
+    def _get_keyword_search_query(keyword):
         """ Create a search query for searching by keyword.
 
+        Matches the Alert's search text, which combines its title, data
+        text fields, analysis notes, and comments.
+
         Parameters
         ----------
         keyword : string
-        text_fields : list of DataField
 
         Returns
         -------
         Q
         """
-        queries = [
-            Q(title__icontains=keyword),
-            Q(analysis__notes__icontains=keyword),
-            Q(comments__content__icontains=keyword)]
-
-        for field in text_fields:
-            underscored_field = field.replace('.', '__')
-            query_field = 'data__{}__icontains'.format(underscored_field)
-            queries.append(Q(**{query_field: keyword}))
-
-        return join_query(queries, 'OR')
+        return Q(search_text__icontains=keyword)
 
     @staticmethod
-    def _get_keyword_list_search_query(keywords, distilleries):
+    def _get_keyword_list_search_query(keywords):
         """Create a search query that searches alerts for keywords.
 
         Parameters
@@ -119,8 +176,6 @@ class AlertSearchResults(SearchResults):
         keywords : list of str
             Keywords to search for.
 
-        distilleries: list of distilleries.models.Distillery
-
         Returns
         -------
         Q
@@ -129,9 +184,8 @@ class AlertSearchResults(SearchResults):
         if not keywords:
             return Q()
 
-        text_fields = AlertSearchResults._get_shared_text_fields(distilleries)
         queries = [
-            AlertSearchResults._get_keyword_search_query(keyword, text_fields)
+            AlertSearchResults._get_keyword_search_query(keyword)
             for keyword in keywords]
 
         if len(queries) == 1:
@@ -207,27 +261,6 @@ class AlertSearchResults(SearchResults):
 
         return join_query(queries, 'AND') if queries else Q()
 
-    @staticmethod
-    def _get_shared_text_fields(distilleries):
-        """Gets the shared text fields from a list of distilleries.
-
-        Parameters
-        ----------
-        distilleries : list of Distillery
-
-        Returns
-        -------
-        list of DataFields
-        """
-        grouped_text_fields = [
-            distillery.get_text_fields() for distillery in distilleries]
-        text_fields = [
-            text_field for grouped_text_field in grouped_text_fields
-            for text_field in grouped_text_field]
-        field_names = [field.field_name for field in text_fields]
-
-        return list(set(field_names))
-
     @staticmethod
     def _get_alert_search_queryset(query, after=None, before=None):
         """Return the queryset of alerts matching particular keywords.
@@ -258,8 +291,6 @@ class AlertSearchResults(SearchResults):
 
         if distillery_qs:
             alert_qs = alert_qs.filter(distillery__in=distillery_qs)
-        else:
-            distillery_qs = Distillery.objects.all()
 
         if after:
             alert_qs = alert_qs.filter(created_date__gte=after)
@@ -267,7 +298,7 @@ class AlertSearchResults(SearchResults):
             alert_qs = alert_qs.filter(created_date__lte=before)
 
         keyword_query = AlertSearchResults._get_keyword_list_search_query(
-            query.keywords, distillery_qs)
+            query.keywords)
         field_query = AlertSearchResults._get_field_search_query(
             query.field_parameters)
         alert_qs = alert_qs.filter(
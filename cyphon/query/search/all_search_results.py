@@ -37,18 +37,24 @@ class AllSearchResults(object):
 
     """
     def __init__(self, query, page=1, page_size=DEFAULT_PAGE_SIZE,
-                 before=None, after=None):
+                 before=None, after=None, cache_key=None):
         """Initialize an AllSearchResults object.
 
         Parameters
         ----------
         query : query.search.search_query.SearchQuery
 
+        cache_key : str or None
+            A key returned by :func:`~query.search.cache.get_search_key`
+            for caching results.
+
         """
         self.distillery_results = DistillerySearchResultsList(
-            query, page=page, page_size=page_size, before=before, after=after)
+            query, page=page, page_size=page_size, before=before, after=after,
+            cache_key=cache_key)
         self.alert_results = AlertSearchResults(
-            query, page=page, page_size=page_size, before=before, after=after)
+            query, page=page, page_size=page_size, before=before, after=after,
+            cache_key=cache_key)
         self.count = self.distillery_results.count + self.alert_results.count
 
     def as_dict(self, request):
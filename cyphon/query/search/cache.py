@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines caches for search results.
+
+======================================  ======================================
+Class                                   Description
+======================================  ======================================
+:class:`~SearchCache`                   Base class for search caches.
+:class:`~LocalSearchCache`              Per-process LRU cache with a TTL.
+:class:`~DjangoSearchCache`             Cache using a Django cache backend.
+======================================  ======================================
+
+======================================  ======================================
+Function                                Description
+======================================  ======================================
+:func:`~get_search_key`                 Key for a search and user.
+:func:`~get_page_ids`                   Cached ids for a page of results.
+:func:`~order_by_ids`                   Order documents by cached ids.
+======================================  ======================================
+
+======================================  ======================================
+Constant                                Description
+======================================  ======================================
+:const:`~SEARCH_CACHE`                  Configured SearchCache, or |None|.
+======================================  ======================================
+
+Searches cache the total number of hits and the ids of the first
+:const:`CACHED_HITS` hits for each Distillery and for Alerts. Later
+pages within those hits are fetched by id instead of repeating the
+search.
+
+"""
+
+# standard library
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+import time
+
+# third party
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+_SEARCH_SETTINGS = getattr(settings, 'SEARCH', {})
+
+CACHE_BACKEND = _SEARCH_SETTINGS.get('CACHE_BACKEND')
+"""|str| or |None|
+
+The dotted path of the :class:`SearchCache` subclass used to cache
+search results. If |None|, search results aren't cached.
+"""
+
+CACHE_TTL = _SEARCH_SETTINGS.get('CACHE_TTL', 60)
+"""|int|
+
+The number of seconds that search results are cached.
+"""
+
+CACHE_SIZE = _SEARCH_SETTINGS.get('CACHE_SIZE', 1000)
+"""|int|
+
+The maximum number of entries in a :class:`LocalSearchCache`.
+"""
+
+CACHE_ALIAS = _SEARCH_SETTINGS.get('CACHE_ALIAS', 'default')
+"""|str|
+
+The Django cache used by a :class:`DjangoSearchCache`.
+"""
+
+CACHED_HITS = _SEARCH_SETTINGS.get('CACHED_HITS', 100)
+"""|int|
+
+The number of hits whose ids are cached for each search.
+"""
+
+
+class SearchCache(object):
+    """Base class for caches of search results.
+
+    Parameters
+    ----------
+    ttl : int
+        The number of seconds to cache an entry.
+
+    """
+
+    def __init__(self, ttl=CACHE_TTL):
+        self.ttl = ttl
+
+    def get(self, key):
+        """Get a cached entry.
+
+        Parameters
+        ----------
+        key : str
+
+        Returns
+        -------
+        |dict| or |None|
+            The entry for the key, or |None| if it isn't cached or
+            has expired.
+
+        """
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """Cache an entry.
+
+        Parameters
+        ----------
+        key : str
+
+        value : dict
+
+        Returns
+        -------
+        None
+
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove all cached entries.
+
+        Returns
+        -------
+        None
+
+        """
+        raise NotImplementedError
+
+
+class LocalSearchCache(SearchCache):
+    """A per-process, least-recently-used cache of search results.
+
+    Parameters
+    ----------
+    ttl : int
+        The number of seconds to cache an entry.
+
+    max_size : int
+        The maximum number of entries to cache.
+
+    """
+
+    def __init__(self, ttl=CACHE_TTL, max_size=CACHE_SIZE):
+        super(LocalSearchCache, self).__init__(ttl)
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get a cached entry, and mark it as recently used."""
+        with self._lock:
+            try:
+                value, expiration = self._entries[key]
+            except KeyError:
+                return None
+
+            if expiration <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """Cache an entry, removing the least recently used if full."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoSearchCache(SearchCache):
+    """A cache of search results that uses a Django cache backend.
+
+    Allows cached results to be shared between processes, e.g., through
+    Memcached or Redis.
+
+    Parameters
+    ----------
+    ttl : int
+        The number of seconds to cache an entry.
+
+    alias : str
+        The name of the cache in the CACHES setting.
+
+    """
+
+    KEY_PREFIX = 'search:'
+
+    def __init__(self, ttl=CACHE_TTL, alias=CACHE_ALIAS):
+        super(DjangoSearchCache, self).__init__(ttl)
+        self.alias = alias
+
+    @property
+    def _cache(self):
+        return caches[self.alias]
+
+    def get(self, key):
+        """Get a cached entry."""
+        return self._cache.get(self.KEY_PREFIX + key)
+
+    def set(self, key, value):
+        """Cache an entry."""
+        self._cache.set(self.KEY_PREFIX + key, value, self.ttl)
+
+    def clear(self):
+        """Remove all entries from the Django cache."""
+        self._cache.clear()
+
+
+def _normalize_parameters(parameters):
+    """
+    Takes a list of dictionaries describing SearchParameters and returns
+    them without their positions in the query string, in a consistent
+    order.
+    """
+    normalized = [
+        {key: value for key, value in parameter.items()
+         if key not in ('index', 'parameter')}
+        for parameter in parameters
+    ]
+    return sorted(normalized, key=lambda item: json.dumps(item,
+                                                          sort_keys=True))
+
+
+def _get_user_scope(user):
+    """
+    Takes an |AppUser| and returns a dictionary of the attributes that
+    determine which Alerts and Distilleries the user can see.
+    """
+    return {
+        'is_staff': user.is_staff,
+        'company': user.company_id,
+        'groups': sorted(user.groups.values_list('pk', flat=True)),
+    }
+
+
+def get_search_key(search_query, before=None, after=None):
+    """Get a cache key for a search.
+
+    Searches have the same key if they have the same parameters in any
+    order, the same date range, and users who can see the same data.
+
+    Parameters
+    ----------
+    search_query : query.search.search_query.SearchQuery
+
+    before : datetime or None
+
+    after : datetime or None
+
+    Returns
+    -------
+    str
+
+    """
+    query_dict = search_query.as_dict()
+    distilleries = query_dict['distilleries']
+    key_data = {
+        'keywords': _normalize_parameters(query_dict['keywords']),
+        'fields': _normalize_parameters(query_dict['fields']),
+        'distilleries': sorted(distilleries['distilleries'])
+                        if distilleries else None,
+        'user': _get_user_scope(search_query.user),
+        'before': before.isoformat() if before else None,
+        'after': after.isoformat() if after else None,
+    }
+    serialized = json.dumps(key_data, sort_keys=True)
+    return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+
+def get_page_ids(entry, page, page_size):
+    """Get the cached ids for a page of search results.
+
+    Parameters
+    ----------
+    entry : dict
+        A cache entry with the total 'count' of hits and the 'ids' of
+        the first hits.
+
+    page : int
+
+    page_size : int
+
+    Returns
+    -------
+    |list| or |None|
+        The ids of the hits on the page, or |None| if the page isn't
+        covered by the cached ids.
+
+    """
+    start = (page - 1) * page_size
+    end = start + page_size
+    ids = entry['ids']
+
+    if end <= len(ids) or len(ids) >= entry['count']:
+        return ids[start:end]
+
+    return None
+
+
+def order_by_ids(items, ids, get_id):
+    """Order items to match a list of ids.
+
+    Parameters
+    ----------
+    items : list
+        Items fetched by id, in any order.
+
+    ids : list
+        The ids in the order the items should appear.
+
+    get_id : function
+        A function that returns the id of an item.
+
+    Returns
+    -------
+    list
+        The items in the order of `ids`. Ids with no matching item
+        are skipped.
+
+    """
+    items_by_id = {get_id(item): item for item in items}
+    return [items_by_id[item_id] for item_id in ids if item_id in items_by_id]
+
+
+def _get_cache():
+    """
+    Returns an instance of the configured SearchCache, or |None| if
+    caching is disabled.
+    """
+    if CACHE_BACKEND:
+        return import_string(CACHE_BACKEND)()
+    return None
+
+
+SEARCH_CACHE = _get_cache()
+"""|SearchCache| or |None|
+
+The cache used for search results.
+"""
@@ -16,9 +16,15 @@
 # along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
 
 # standard library
+from concurrent import futures
 from functools import reduce
+import logging
+import threading
+import time
 
 # third party
+from django.conf import settings
+from django.db import connection
 from django.urls import reverse
 
 # local
@@ -26,8 +32,55 @@ from cyphon.fieldsets import QueryFieldset
 from distilleries.models import Distillery
 from distilleries.serializers import DistilleryListSerializer
 from engines.queries import EngineQuery
+from engines.sorter import Sorter, SortParam
+from .cache import (
+    CACHED_HITS,
+    get_page_ids,
+    order_by_ids,
+    SEARCH_CACHE,
+)
 from .search_results import SearchResults, DEFAULT_PAGE_SIZE
 
+_LOGGER = logging.getLogger(__name__)
+
+_SEARCH_SETTINGS = getattr(settings, 'SEARCH', {})
+
+MAX_WORKERS = _SEARCH_SETTINGS.get('MAX_WORKERS', 1)
+"""int
+
+The maximum number of Distilleries searched at the same time.
+"""
+
+TIMEOUT = _SEARCH_SETTINGS.get('TIMEOUT', 30)
+"""int
+
+The number of seconds to wait for search results from Distilleries.
+"""
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor():
+    """Return the thread pool shared by all searches.
+
+    The pool is created on first use, and recreated if
+    :const:`MAX_WORKERS` has changed, so concurrent requests share at
+    most :const:`MAX_WORKERS` search threads.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None or _EXECUTOR._max_workers != MAX_WORKERS:
+            if _EXECUTOR is not None:
+                _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        return _EXECUTOR
+
 
 class DistillerySearchResults(SearchResults):
     """
@@ -37,7 +90,8 @@ class DistillerySearchResults(SearchResults):
     VIEW_NAME = 'search_distillery'
 
     def __init__(self, query, distillery, page=1, page_size=DEFAULT_PAGE_SIZE,
-                 before=None, after=None):
+                 before=None, after=None, fetch=True, cache_key=None,
+                 cursor=None):
         """Create a DistillerySearchResults instance.
 
         Parameters
@@ -46,28 +100,216 @@ class DistillerySearchResults(SearchResults):
 
         distillery : Distillery
 
+        fetch : bool
+            Whether to search the Distillery right away. If |False|,
+            results are not available until :meth:`fetch` is called.
+
+        cache_key : str or None
+            A key returned by :func:`~query.search.cache.get_search_key`.
+            If provided, and a search cache is configured, the ids of
+            the first hits are cached and later pages are fetched by id.
+
+        cursor : str or None
+            A cursor token from the results of a previous search of the
+            Distillery. If provided, the page of results that follows
+            that search is returned instead of the `page`.
+
         """
         super(DistillerySearchResults, self).__init__(
-            self.VIEW_NAME, query, page, page_size,
+            self.VIEW_NAME, query, page, page_size, before, after,
         )
         self.results = []
         self.count = 0
+        self.error = None
         self.distillery = distillery
+        self.cache_key = None
+        self.cursor = cursor
+        self.next_cursor = None
+        self.sorter = self._get_sorter(distillery)
+        # only the fields needed for teasers are fetched
+        self.fields = distillery.get_sample_fields()
+
+        if cache_key and SEARCH_CACHE is not None:
+            self.cache_key = '%s:%s' % (cache_key, distillery.pk)
+
         self.engine_query = self._get_engine_query(
             distillery, query, before=before, after=after)
 
+        if fetch:
+            self.fetch()
+
+    def find(self):
+        """Search the Distillery.
+
+        Returns
+        -------
+        dict or None
+            A dictionary with keys 'count' and 'results', as returned
+            by :meth:`Distillery.find`, or |None| if the Distillery
+            can't be searched for the query.
+
+        """
+        if not self._is_searchable():
+            return None
+
+        if self.cursor:
+            return self.distillery.find(
+                self.engine_query, sorter=self.sorter,
+                page_size=self.page_size, cursor=self.cursor,
+                fields=self.fields, timeout=TIMEOUT)
+
+        if self.cache_key:
+            return self._find_cached()
+
+        return self.distillery.find(
+            self.engine_query, sorter=self.sorter,
+            page=self.page, page_size=self.page_size, fields=self.fields,
+            timeout=TIMEOUT)
+
+    def _is_searchable(self):
+        """Return whether the Distillery can be searched for the query.
+
+        Returns
+        -------
+        bool
+
+        """
         if not self.engine_query:
-            return
+            return False
+
+        if (self.before or self.after) and \
+                not self.distillery.get_searchable_date_field():
+            return False
 
-        if (before or after) and not distillery.get_searchable_date_field():
-            results = None
-        else:
+        return True
+
+    def scan(self):
+        """Iterate over all documents in the Distillery matching the query.
+
+        Unlike :meth:`find`, this isn't limited to a page of results.
+        Documents are fetched in batches as the generator is consumed,
+        so they can be streamed without holding them all in memory.
+
+        Returns
+        -------
+        iterator of dict
+
+        """
+        if not self._is_searchable():
+            return iter([])
+
+        return self.distillery.scan(self.engine_query, self.sorter) \
+               or iter([])
+
+    @staticmethod
+    def _get_sorter(distillery):
+        """Return a Sorter for ordering a Distillery's search results.
+
+        Results are ordered by the Distillery's searchable date field,
+        most recent first, if it has one. The engine breaks ties by doc
+        id, so the order is stable enough to page through with cursors.
+
+        Parameters
+        ----------
+        distillery : Distillery
+
+        Returns
+        -------
+        Sorter
+
+        """
+        date_field = distillery.get_searchable_date_field()
+
+        if not date_field:
+            return Sorter([])
+
+        return Sorter([SortParam(date_field, 'DateTimeField', 'DESC')])
+
+    @staticmethod
+    def _get_doc_id(doc):
+        """Return the id of a document as a string."""
+        return str(doc.get('_id'))
+
+    def _find_cached(self):
+        """Search the Distillery using cached hit ids.
+
+        If ids for the page are cached, the documents are fetched by id.
+        Otherwise, if the page is among the first :const:`CACHED_HITS`
+        hits, those hits are fetched, their ids are cached, and the page
+        is taken from them. Later pages are searched as usual, and
+        return a cursor so deeper pages can be fetched without an offset.
+
+        Returns
+        -------
+        dict or None
+
+        """
+        entry = SEARCH_CACHE.get(self.cache_key)
+
+        if entry is not None:
+            page_ids = get_page_ids(entry, self.page, self.page_size)
+
+            if page_ids is not None:
+                docs = self.distillery.find_by_id(
+                    page_ids, fields=self.fields) if page_ids else None
+                return {
+                    'count': entry['count'],
+                    'results': order_by_ids(docs or [], page_ids,
+                                            self._get_doc_id),
+                }
+
+        elif self.page * self.page_size <= CACHED_HITS:
             results = self.distillery.find(
-                self.engine_query, page=page, page_size=page_size)
+                self.engine_query, sorter=self.sorter,
+                page=1, page_size=CACHED_HITS, fields=self.fields,
+                timeout=TIMEOUT)
+
+            if not results:
+                return results
+
+            docs = results['results']
+            SEARCH_CACHE.set(self.cache_key, {
+                'count': results['count'],
+                'ids': [self._get_doc_id(doc) for doc in docs],
+            })
+            start = (self.page - 1) * self.page_size
+            return {
+                'count': results['count'],
+                'results': docs[start:start + self.page_size],
+            }
+
+        return self.distillery.find(
+            self.engine_query, sorter=self.sorter,
+            page=self.page, page_size=self.page_size, fields=self.fields,
+            timeout=TIMEOUT)
+
+    def set_results(self, results):
+        """Store the results of a search of the Distillery.
+
+        Parameters
+        ----------
+        results : dict or None
+            Results returned by :meth:`find`.
+
+        Returns
+        -------
+        None
 
+        """
         if results and results['count']:
             self.count = results['count']
             self.results = results['results']
+            self.next_cursor = results.get('cursor')
+
+    def fetch(self):
+        """Search the Distillery and store the results.
+
+        Returns
+        -------
+        None
+
+        """
+        self.set_results(self.find())
 
     @staticmethod
     def _serialize_distillery_object(distillery, request):
@@ -241,6 +483,55 @@ class DistillerySearchResults(SearchResults):
     def _get_path(self):
         return reverse(self.view_name, args=[self.distillery.pk])
 
+    def _get_next_uri(self, request):
+        """Return the absolute URI of the next page of results.
+
+        Uses the cursor for the next page if the search returned one,
+        and falls back to a page number otherwise.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+
+        Returns
+        -------
+        str or None
+
+        """
+        if self.next_cursor:
+            query_params = request.GET.copy()
+            query_params.pop('page', None)
+            query_params['cursor'] = self.next_cursor
+
+            return self._create_abs_uri_with_params(
+                self._get_path(), request, query_params,
+            )
+
+        if self.cursor:
+            return None
+
+        return super(DistillerySearchResults, self)._get_next_uri(request)
+
+    def _get_previous_uri(self, request):
+        """Return the absolute URI of the previous page of results.
+
+        Cursors only lead forward, so there is no previous page for a
+        search that used a cursor.
+
+        Parameters
+        ----------
+        request : django.http.HttpRequest
+
+        Returns
+        -------
+        str or None
+
+        """
+        if self.cursor:
+            return None
+
+        return super(DistillerySearchResults, self)._get_previous_uri(request)
+
     def as_dict(self, request):
         """Return a JSON serializable representation of this instance.
 
@@ -256,6 +547,7 @@ class DistillerySearchResults(SearchResults):
         parent_dict = super(DistillerySearchResults, self).as_dict(request)
 
         parent_dict['results'] = self.results
+        parent_dict['cursor'] = self.next_cursor
         parent_dict['distillery'] = self._serialize_distillery_object(
             self.distillery, request,
         )
@@ -270,13 +562,17 @@ class DistillerySearchResultsList(object):
 
     def __init__(
             self, query, page=1, page_size=DEFAULT_PAGE_SIZE,
-            before=None, after=None):
+            before=None, after=None, cache_key=None):
         """Create a DistillerySearchResultsList instance.
 
         Parameters
         ----------
         query: query.search.search_query.SearchQuery
 
+        cache_key : str or None
+            A key returned by :func:`~query.search.cache.get_search_key`
+            for caching results.
+
         """
         self.count = 0
         self.distilleries = (
@@ -284,7 +580,8 @@ class DistillerySearchResultsList(object):
         )
         self.results = self._get_distillery_search_results(
             self.distilleries, query,
-            page=page, page_size=page_size, before=before, after=after
+            page=page, page_size=page_size, before=before, after=after,
+            cache_key=cache_key
         )
         self.count = self._get_result_count(self.results)
 
@@ -303,10 +600,108 @@ class DistillerySearchResultsList(object):
         """
         return reduce((lambda count, result: count + result.count), results, 0)
 
+    @staticmethod
+    def _record_error(distillery_results, error):
+        """Log and record an error from searching a Distillery.
+
+        Errors are recorded on the DistillerySearchResults rather than
+        raised, so one failing Distillery doesn't prevent results from
+        being returned for the others.
+
+        Parameters
+        ----------
+        distillery_results : DistillerySearchResults
+
+        error : Exception
+
+        Returns
+        -------
+        None
+
+        """
+        _LOGGER.error('An error occurred while searching %s: %s',
+                      distillery_results.distillery, error)
+        distillery_results.error = str(error)
+
+    @staticmethod
+    def _find_in_thread(distillery_results):
+        """Search the Distillery of a DistillerySearchResults in a worker thread.
+
+        Closes the thread's database connection when done, since worker
+        threads aren't managed by Django's request handling.
+
+        Parameters
+        ----------
+        distillery_results : DistillerySearchResults
+
+        Returns
+        -------
+        dict or None
+
+        """
+        try:
+            return distillery_results.find()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _fetch_all(distillery_results_list):
+        """Fetch the results of DistillerySearchResults concurrently.
+
+        Searches run on a thread pool shared by all requests, so no
+        more than :const:`MAX_WORKERS` Distilleries are searched at a
+        time. Waits up to :const:`TIMEOUT` seconds for all results.
+        Searches that haven't finished by then are recorded as timed
+        out, and their results are discarded. The same timeout is
+        passed to the search engine, which stops searches still running
+        on the server.
+
+        Parameters
+        ----------
+        distillery_results_list : list of DistillerySearchResults
+
+        Returns
+        -------
+        None
+
+        """
+        if MAX_WORKERS <= 1 or len(distillery_results_list) <= 1:
+            for distillery_results in distillery_results_list:
+                try:
+                    distillery_results.fetch()
+                except Exception as error:
+                    DistillerySearchResultsList._record_error(
+                        distillery_results, error)
+            return
+
+        executor = _get_executor()
+        deadline = time.time() + TIMEOUT
+        pending = [
+            (distillery_results, executor.submit(
+                DistillerySearchResultsList._find_in_thread,
+                distillery_results))
+            for distillery_results in distillery_results_list
+        ]
+        for distillery_results, future in pending:
+            try:
+                results = future.result(
+                    timeout=max(deadline - time.time(), 0))
+                distillery_results.set_results(results)
+            except futures.TimeoutError:
+                # only stops a search that hasn't started; one that's
+                # already running is ended by the engine's own timeout
+                future.cancel()
+                _LOGGER.warning('Search of %s timed out after %s seconds',
+                                distillery_results.distillery, TIMEOUT)
+                distillery_results.error = 'Search timed out'
+            except Exception as error:
+                DistillerySearchResultsList._record_error(
+                    distillery_results, error)
+
     @staticmethod
     def _get_distillery_search_results(
             distilleries, query, page, page_size,
-            before=None, after=None):
+            before=None, after=None, cache_key=None):
         """Return a list of DistillerySearchResults for a query.
 
         Parameters
@@ -315,21 +710,39 @@ class DistillerySearchResultsList(object):
 
         query : query.search.search_query.SearchQuery
 
+        cache_key : str or None
+
         Returns
         -------
         list of DistillerySearchResults or None
 
         """
         if query.keywords or query.field_parameters:
-            return [
+            distillery_results_list = [
                 DistillerySearchResults(
                     query, distillery,
-                    page=page, page_size=page_size, before=before, after=after)
+                    page=page, page_size=page_size, before=before, after=after,
+                    fetch=False, cache_key=cache_key)
                 for distillery in distilleries
             ]
+            DistillerySearchResultsList._fetch_all(distillery_results_list)
+            return distillery_results_list
 
         return []
 
+    def _get_errors_as_dict(self):
+        """Return a JSON serializable representation of search errors.
+
+        Returns
+        -------
+        list of dict
+
+        """
+        return [
+            {'distillery': str(result.distillery), 'error': result.error}
+            for result in self.results if result.error
+        ]
+
     def _get_results_as_dict(self, request):
         """Return a JSON serializable representation of earch results.
 
@@ -360,7 +773,13 @@ class DistillerySearchResultsList(object):
         dict
 
         """
-        return {
+        results_dict = {
             'count': self.count,
             'results': self._get_results_as_dict(request)
         }
+        errors = self._get_errors_as_dict()
+
+        if errors:
+            results_dict['errors'] = errors
+
+        return results_dict
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines functions for streaming search results as export files.
+
+Each writer takes an iterable of documents and yields lines of the
+export file, so documents can be written to a response as they are
+fetched instead of being held in memory.
+
+Since the response has already started when documents are fetched, an
+error can't change its status. Instead, the writer ends the file with
+a line marking the export as incomplete: a JSON object with an
+:const:`ERROR_KEY` key, or a CSV row whose first cell is
+:const:`ERROR_KEY`.
+
+=========================  ===========================================
+Function                   Description
+=========================  ===========================================
+:func:`~write_csv`         Write documents as CSV rows.
+:func:`~write_ndjson`      Write documents as newline-delimited JSON.
+=========================  ===========================================
+
+=========================  ===========================================
+Constant                   Description
+=========================  ===========================================
+:const:`~ERROR_KEY`        Key marking an incomplete export.
+:const:`~EXPORT_FORMATS`   Content types of supported export formats.
+=========================  ===========================================
+
+"""
+
+# standard library
+import csv
+import json
+import logging
+
+# third party
+from django.core.serializers.json import DjangoJSONEncoder
+
+# local
+from utils.parserutils.parserutils import get_dict_value
+
+_LOGGER = logging.getLogger(__name__)
+
+_ERROR_MESSAGE = 'Export incomplete: an error occurred fetching documents'
+
+ERROR_KEY = '_error'
+"""str
+
+Key of the last line of an export that ended because of an error.
+"""
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+"""dict
+
+Maps the names of supported export formats to their content types.
+"""
+
+
+class _Echo(object):
+    """A file-like object that returns what is written to it.
+
+    Lets a :func:`csv.writer` format rows one at a time without
+    buffering them.
+    """
+
+    @staticmethod
+    def write(value):
+        """Return the value instead of writing it."""
+        return value
+
+
+def _dump_json(data):
+    """Return a JSON string for data, including dates and times."""
+    return json.dumps(data, cls=DjangoJSONEncoder)
+
+
+def _format_csv_value(value):
+    """Format a document value for a CSV cell.
+
+    Nested dictionaries and lists are written as JSON, and missing
+    values as empty strings.
+    """
+    if value is None:
+        return ''
+    elif isinstance(value, (dict, list)):
+        return _dump_json(value)
+    else:
+        return value
+
+
+def write_ndjson(docs):
+    """Write documents as newline-delimited JSON.
+
+    Parameters
+    ----------
+    docs : iterable of dict
+        Documents to write.
+
+    Returns
+    -------
+    generator of str
+        A line of JSON for each document. If an error occurs, the last
+        line is an object with an :const:`ERROR_KEY` key.
+
+    """
+    try:
+        for doc in docs:
+            yield _dump_json(doc) + '\n'
+    except Exception as error:
+        _LOGGER.exception('An error occurred during an export: %s', error)
+        yield _dump_json({ERROR_KEY: _ERROR_MESSAGE}) + '\n'
+
+
+def write_csv(docs, field_names):
+    """Write documents as CSV rows.
+
+    Parameters
+    ----------
+    docs : iterable of dict
+        Documents to write.
+
+    field_names : list of str
+        Names of the fields to write as columns. Nested fields are
+        denoted using dot notation (e.g., "user.screen_name").
+
+    Returns
+    -------
+    generator of str
+        A header row, followed by a row for each document. If an error
+        occurs, the last row starts with :const:`ERROR_KEY`.
+
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(field_names)
+
+    try:
+        for doc in docs:
+            yield writer.writerow([
+                _format_csv_value(get_dict_value(field_name, doc))
+                for field_name in field_names
+            ])
+    except Exception as error:
+        _LOGGER.exception('An error occurred during an export: %s', error)
+        yield writer.writerow([ERROR_KEY, _ERROR_MESSAGE])
@@ -20,6 +20,7 @@ Tests for the AlertSearchResults class.
 
 #standard
 from dateutil import parser
+from unittest.mock import patch
 
 # third party
 from django.test import TestCase
@@ -28,6 +29,7 @@ from django.contrib.auth import get_user_model
 
 # local
 from query.search.alert_search_results import AlertSearchResults
+from query.search.cache import LocalSearchCache
 from query.search.search_query import SearchQuery
 from tests.fixture_manager import get_fixtures
 from alerts.models import Alert
@@ -168,6 +170,30 @@ class AlertSearchResultsTestCase(TestCase):
         self.assertIsNone(alert_results_as_dict['next'])
         self.assertEqual(len(alert_results_as_dict['results']), 1)
 
+    def test_cached_pages(self):
+        """
+        Tests that pages of cached results match uncached results.
+        """
+        search_query = SearchQuery('example', self.user)
+        expected = [
+            [alert.pk for alert in self._get_search_results(
+                search_query, page=page, page_size=1).results]
+            for page in range(1, 4)
+        ]
+        cache = LocalSearchCache()
+
+        with patch('query.search.alert_search_results.SEARCH_CACHE', cache):
+            for page in range(1, 4):
+                alert_results = AlertSearchResults(
+                    search_query, page, 1, cache_key='key')
+                self.assertEqual(alert_results.count, 3)
+                self.assertEqual(
+                    [alert.pk for alert in alert_results.results],
+                    expected[page - 1])
+
+        self.assertEqual(cache.get('key:alerts')['count'], 3)
+        self.assertEqual(len(cache.get('key:alerts')['ids']), 3)
+
     def test_filtered_alert_searching(self):
         """
         Tests that only distilleries specified are searched.
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Tests the search cache.
+"""
+
+# standard library
+import datetime
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+# third party
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+# local
+from query.search.cache import (
+    get_page_ids,
+    get_search_key,
+    LocalSearchCache,
+    order_by_ids,
+)
+from query.search.search_query import SearchQuery
+from tests.fixture_manager import get_fixtures
+
+
+class LocalSearchCacheTestCase(unittest.TestCase):
+    """
+    Tests the LocalSearchCache class.
+    """
+
+    def test_get_and_set(self):
+        """
+        Tests that entries can be cached and retrieved.
+        """
+        cache = LocalSearchCache(ttl=60, max_size=10)
+        self.assertIsNone(cache.get('foo'))
+        cache.set('foo', {'count': 1, 'ids': [1]})
+        self.assertEqual(cache.get('foo'), {'count': 1, 'ids': [1]})
+
+    def test_expired(self):
+        """
+        Tests that expired entries aren't returned.
+        """
+        cache = LocalSearchCache(ttl=60, max_size=10)
+        with patch('query.search.cache.time.monotonic', return_value=100):
+            cache.set('foo', {'count': 1, 'ids': [1]})
+        with patch('query.search.cache.time.monotonic', return_value=161):
+            self.assertIsNone(cache.get('foo'))
+        self.assertEqual(len(cache), 0)
+
+    def test_max_size(self):
+        """
+        Tests that the least recently used entry is removed when the
+        cache is full.
+        """
+        cache = LocalSearchCache(ttl=60, max_size=2)
+        cache.set('foo', {})
+        cache.set('bar', {})
+        cache.get('foo')
+        cache.set('baz', {})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('bar'))
+        self.assertEqual(cache.get('foo'), {})
+
+    def test_clear(self):
+        """
+        Tests the clear method.
+        """
+        cache = LocalSearchCache(ttl=60, max_size=2)
+        cache.set('foo', {})
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+class GetPageIdsTestCase(unittest.TestCase):
+    """
+    Tests the get_page_ids function.
+    """
+
+    def test_cached_page(self):
+        """
+        Tests that ids are returned for a page within the cached ids.
+        """
+        entry = {'count': 10, 'ids': [1, 2, 3, 4]}
+        self.assertEqual(get_page_ids(entry, page=2, page_size=2), [3, 4])
+
+    def test_uncached_page(self):
+        """
+        Tests that None is returned for a page beyond the cached ids.
+        """
+        entry = {'count': 10, 'ids': [1, 2, 3, 4]}
+        self.assertIsNone(get_page_ids(entry, page=2, page_size=3))
+
+    def test_all_ids_cached(self):
+        """
+        Tests that pages are covered when all ids are cached.
+        """
+        entry = {'count': 3, 'ids': [1, 2, 3]}
+        self.assertEqual(get_page_ids(entry, page=2, page_size=2), [3])
+        self.assertEqual(get_page_ids(entry, page=3, page_size=2), [])
+
+
+class OrderByIdsTestCase(unittest.TestCase):
+    """
+    Tests the order_by_ids function.
+    """
+
+    def test_order_by_ids(self):
+        """
+        Tests that items are ordered by id and missing ids are skipped.
+        """
+        items = [{'_id': 'b'}, {'_id': 'a'}]
+        actual = order_by_ids(items, ['a', 'c', 'b'], lambda doc: doc['_id'])
+        self.assertEqual(actual, [{'_id': 'a'}, {'_id': 'b'}])
+
+
+class GetSearchKeyTestCase(TestCase):
+    """
+    Tests the get_search_key function.
+    """
+    fixtures = get_fixtures(['users', 'distilleries'])
+
+    def setUp(self):
+        user_model = get_user_model()
+        self.user = user_model.objects.get(pk=1)
+        self.other_user = user_model.objects.get(pk=3)
+
+    def test_parameter_order(self):
+        """
+        Tests that the order of search parameters doesn't change the key.
+        """
+        key1 = get_search_key(SearchQuery('foo bar', self.user))
+        key2 = get_search_key(SearchQuery('bar foo', self.user))
+        key3 = get_search_key(SearchQuery('foo baz', self.user))
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+    def test_user_scope(self):
+        """
+        Tests that users who can see different data get different keys.
+        """
+        key1 = get_search_key(SearchQuery('foo', self.user))
+        key2 = get_search_key(SearchQuery('foo', self.other_user))
+        self.assertNotEqual(key1, key2)
+
+    def test_dates(self):
+        """
+        Tests that the date range is part of the key.
+        """
+        search_query = SearchQuery('foo', self.user)
+        after = datetime.datetime(2017, 1, 1)
+        self.assertNotEqual(get_search_key(search_query),
+                            get_search_key(search_query, after=after))
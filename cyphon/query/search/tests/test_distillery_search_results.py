@@ -19,6 +19,7 @@ Tests for the DistillerySearchResults Class.
 """
 
 # standard library
+import threading
 from unittest.mock import patch
 from dateutil import parser
 
@@ -31,9 +32,12 @@ from django.test.client import RequestFactory
 from cyphon.fieldsets import QueryFieldset
 from distilleries.models import Distillery
 from engines.queries import EngineQuery
+from query.search.cache import CACHED_HITS, LocalSearchCache
 from query.search.distillery_search_results import (
     DistillerySearchResults,
     DistillerySearchResultsList,
+    TIMEOUT,
+    _get_executor,
 )
 from tests.test_fixture_manager import get_fixtures
 from query.search.search_query import SearchQuery
@@ -220,6 +224,7 @@ class DistillerySearchResultsTestCase(TestCase):
             'results': MOCK_RESULTS_LIST,
             'next': None,
             'previous': None,
+            'cursor': None,
             'distillery': {
                 'id': 1,
                 'name': 'mongodb.test_database.test_posts',
@@ -227,6 +232,85 @@ class DistillerySearchResultsTestCase(TestCase):
             }
         })
 
+    def test_cached_pages(self):
+        """
+        Tests that the first hits of a search are cached and later
+        pages are fetched by id.
+        """
+        distillery = Distillery.objects.get(pk=1)
+        search_query = SearchQuery('test', self.user)
+        docs = [{'_id': str(index), 'content': index} for index in range(5)]
+        cache = LocalSearchCache()
+
+        with patch('query.search.distillery_search_results.SEARCH_CACHE',
+                   cache), \
+                patch('distilleries.models.Distillery.find',
+                      return_value={'count': 5, 'results': docs}) \
+                as mock_find, \
+                patch('distilleries.models.Distillery.find_by_id',
+                      return_value=[docs[3], docs[2]]) as mock_find_by_id:
+            first = DistillerySearchResults(
+                search_query, distillery, page=1, page_size=2,
+                cache_key='key')
+            second = DistillerySearchResults(
+                search_query, distillery, page=2, page_size=2,
+                cache_key='key')
+
+        self.assertEqual(first.results, docs[:2])
+        self.assertEqual(second.results, [docs[2], docs[3]])
+        self.assertEqual(second.count, 5)
+        mock_find.assert_called_once_with(
+            first.engine_query, sorter=first.sorter,
+            page=1, page_size=CACHED_HITS, fields=first.fields,
+            timeout=TIMEOUT)
+        mock_find_by_id.assert_called_once_with(['2', '3'],
+                                                fields=second.fields)
+
+    def test_cursor(self):
+        """
+        Tests that a search with a cursor returns the cursor for the
+        next page of results in place of a page number.
+        """
+        distillery = Distillery.objects.get(pk=1)
+        search_query = SearchQuery('test', self.user)
+        results = {'count': 5, 'results': MOCK_RESULTS_LIST, 'cursor': 'def'}
+
+        with patch('distilleries.models.Distillery.find',
+                   return_value=results) as mock_find:
+            distillery_results = DistillerySearchResults(
+                search_query, distillery, page=3, page_size=2,
+                cursor='abc')
+
+        mock_find.assert_called_once_with(
+            distillery_results.engine_query,
+            sorter=distillery_results.sorter, page_size=2, cursor='abc',
+            fields=distillery_results.fields, timeout=TIMEOUT)
+
+        factory = RequestFactory()
+        request = factory.get('/api/v1/search/distilleries/1/',
+                              {'query': 'test', 'page': 3, 'cursor': 'abc'})
+        results_dict = distillery_results.as_dict(request)
+
+        self.assertEqual(results_dict['cursor'], 'def')
+        self.assertIn('cursor=def', results_dict['next'])
+        self.assertNotIn('page=', results_dict['next'])
+        self.assertIsNone(results_dict['previous'])
+
+    def test_sorter(self):
+        """
+        Tests that results are sorted by the Distillery's searchable
+        date field, most recent first.
+        """
+        distillery = Distillery.objects.get(pk=1)
+        search_query = SearchQuery('test', self.user)
+        distillery_results = self._get_instance(search_query, distillery)
+        sort_list = distillery_results.sorter.sort_list
+
+        self.assertEqual(len(sort_list), 1)
+        self.assertEqual(sort_list[0].field_name,
+                         distillery.get_searchable_date_field())
+        self.assertEqual(sort_list[0].order, 'DESC')
+
 
 class DistillerySearchResultsListTestCase(TestCase):
     fixtures = get_fixtures(['distilleries', 'users'])
@@ -299,6 +383,7 @@ class DistillerySearchResultsListTestCase(TestCase):
                 'next': None,
                 'previous': None,
                 'results': MOCK_RESULTS_LIST,
+                'cursor': None,
                 'distillery': {
                     'id': 1,
                     'name': 'mongodb.test_database.test_posts',
@@ -306,3 +391,87 @@ class DistillerySearchResultsListTestCase(TestCase):
                 }
             }]
         })
+
+    def test_search_error(self):
+        """
+        Tests that an error searching a Distillery is reported rather
+        than raised.
+        """
+        search_query = SearchQuery('@source="test_posts" test', self.user)
+        with patch('distilleries.models.Distillery.find',
+                   side_effect=ConnectionError('no connection')):
+            distillery_results_list = DistillerySearchResultsList(search_query)
+
+        factory = RequestFactory()
+        request = factory.get('/api/v1/search/')
+
+        self.assertEqual(distillery_results_list.as_dict(request), {
+            'count': 0,
+            'results': [],
+            'errors': [{
+                'distillery': 'mongodb.test_database.test_posts',
+                'error': 'no connection',
+            }]
+        })
+
+    def test_concurrent_search(self):
+        """
+        Tests that Distilleries are searched concurrently.
+        """
+        # each search waits until all 6 searches are running, so the
+        # barrier is broken if they run one at a time
+        barrier = threading.Barrier(6, timeout=10)
+
+        def concurrent_find(*args, **kwargs):
+            barrier.wait()
+            return MOCK_RESULTS
+
+        search_query = SearchQuery('test', self.user)
+        with patch('query.search.distillery_search_results.MAX_WORKERS', 6), \
+                patch('distilleries.models.Distillery.find',
+                      side_effect=concurrent_find):
+            distillery_results_list = DistillerySearchResultsList(search_query)
+
+        self.assertEqual(distillery_results_list._get_errors_as_dict(), [])
+        self.assertEqual(distillery_results_list.count, 6)
+
+    def test_search_timeout(self):
+        """
+        Tests that Distilleries that aren't searched within the timeout
+        are reported and don't contribute results.
+        """
+        release = threading.Event()
+
+        def blocked_find(*args, **kwargs):
+            release.wait(10)
+            return MOCK_RESULTS
+
+        search_query = SearchQuery('test', self.user)
+        try:
+            with patch('query.search.distillery_search_results.MAX_WORKERS',
+                       6), \
+                    patch('query.search.distillery_search_results.TIMEOUT',
+                          0), \
+                    patch('distilleries.models.Distillery.find',
+                          side_effect=blocked_find):
+                distillery_results_list = \
+                    DistillerySearchResultsList(search_query)
+        finally:
+            release.set()
+
+        self.assertEqual(distillery_results_list.count, 0)
+        errors = distillery_results_list._get_errors_as_dict()
+        self.assertEqual(len(errors), 6)
+        self.assertEqual(errors[0]['error'], 'Search timed out')
+
+    def test_shared_executor(self):
+        """
+        Tests that searches share one thread pool sized by MAX_WORKERS.
+        """
+        with patch('query.search.distillery_search_results.MAX_WORKERS', 3):
+            executor = _get_executor()
+            self.assertIs(_get_executor(), executor)
+            self.assertEqual(executor._max_workers, 3)
+
+        with patch('query.search.distillery_search_results.MAX_WORKERS', 4):
+            self.assertIsNot(_get_executor(), executor)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Tests for functions that write search result exports.
+"""
+
+# standard library
+import datetime
+import json
+import logging
+from unittest import TestCase
+
+# local
+from query.search.export import ERROR_KEY, write_csv, write_ndjson
+
+DOCS = [
+    {
+        '_id': '1',
+        'user': {'name': 'john', 'age': 20},
+        'tags': ['cats', 'pets'],
+        'date': datetime.datetime(2017, 1, 1, 12, 0),
+    },
+    {
+        '_id': '2',
+        'user': {'name': 'jane, esq.'},
+    },
+]
+
+
+def _get_failing_docs():
+    """
+    Yields a document and then raises an error, like a search that
+    fails partway through.
+    """
+    yield DOCS[1]
+    raise RuntimeError('shard failure')
+
+
+class WriteNdjsonTestCase(TestCase):
+    """
+    Tests the write_ndjson function.
+    """
+
+    def test_write_ndjson(self):
+        """
+        Tests that each document is written as a line of JSON.
+        """
+        lines = list(write_ndjson(iter(DOCS)))
+
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(all(line.endswith('\n') for line in lines))
+        self.assertEqual(json.loads(lines[0])['date'], '2017-01-01T12:00:00')
+        self.assertEqual(json.loads(lines[1]), DOCS[1])
+
+    def test_write_ndjson_error(self):
+        """
+        Tests that an export interrupted by an error ends with an error
+        line.
+        """
+        logging.disable(logging.ERROR)
+        try:
+            lines = list(write_ndjson(_get_failing_docs()))
+        finally:
+            logging.disable(logging.NOTSET)
+
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0]), DOCS[1])
+        self.assertIn(ERROR_KEY, json.loads(lines[1]))
+
+
+class WriteCsvTestCase(TestCase):
+    """
+    Tests the write_csv function.
+    """
+
+    def test_write_csv(self):
+        """
+        Tests that a header and a row for each document are written.
+        """
+        field_names = ['_id', 'user.name', 'user.age', 'tags']
+        lines = list(write_csv(iter(DOCS), field_names))
+
+        self.assertEqual(lines, [
+            '_id,user.name,user.age,tags\r\n',
+            '1,john,20,"[""cats"", ""pets""]"\r\n',
+            '2,"jane, esq.",,\r\n',
+        ])
+
+    def test_write_csv_error(self):
+        """
+        Tests that an export interrupted by an error ends with an error
+        row.
+        """
+        logging.disable(logging.ERROR)
+        try:
+            lines = list(write_csv(_get_failing_docs(), ['_id']))
+        finally:
+            logging.disable(logging.NOTSET)
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[1], '2\r\n')
+        self.assertTrue(lines[2].startswith(ERROR_KEY + ','))
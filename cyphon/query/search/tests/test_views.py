@@ -19,6 +19,7 @@ Tests for the search endpoints.
 """
 
 # standard library
+import json
 from unittest.mock import patch
 from unittest import TestCase
 from datetime import datetime
@@ -27,6 +28,7 @@ from datetime import datetime
 from appusers.models import AppUser
 from tests.api_tests import CyphonAPITestCase
 from tests.fixture_manager import get_fixtures
+from ..export import ERROR_KEY
 from ..views import QueryParams
 from ..search_results import DEFAULT_PAGE_SIZE
 
@@ -319,6 +321,7 @@ class SearchDistilleriesViewTestCase(SearchViewBaseTestCase):
             'count': 1,
             'next': None,
             'previous': None,
+            'cursor': None,
             'distillery': {
                 'id': 6,
                 'name': 'elasticsearch.test_index.test_mail',
@@ -390,3 +393,102 @@ class SearchDistilleryViewTestCase(SearchViewBaseTestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['query']['errors'][0],
                          'Search query is empty.')
+
+
+class ExportDistilleryViewTestCase(SearchViewBaseTestCase):
+    """
+    Tests the export_distillery view.
+    """
+
+    model_url = 'search/distilleries/'
+
+    MOCK_DOCS = [
+        {'_id': '1', 'subject': 'hello', 'body': 'something'},
+        {'_id': '2', 'subject': 'goodbye'},
+    ]
+
+    def _get_export_response(self, url):
+        """Returns a response with a mocked version of distillery.scan.
+
+        Parameters
+        ----------
+        url : str
+            URL to navigate to.
+
+        Returns
+        -------
+        django.http.StreamingHttpResponse
+        """
+        with patch('distilleries.models.Distillery.scan',
+                   return_value=iter(self.MOCK_DOCS)) as mock_scan:
+            response = self.get_api_response(url)
+            content = b''.join(response.streaming_content).decode('utf-8') \
+                      if response.streaming else None
+        return response, content, mock_scan
+
+    def test_ndjson(self):
+        """
+        Tests that documents are streamed as newline-delimited JSON.
+        """
+        response, content, mock_scan = self._get_export_response(
+            '6/export/?query=something')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertIn('test_mail.ndjson', response['Content-Disposition'])
+        self.assertEqual([json.loads(line) for line in content.splitlines()],
+                         self.MOCK_DOCS)
+        self.assertEqual(mock_scan.call_count, 1)
+
+    def test_ndjson_error(self):
+        """
+        Tests that an export interrupted by a search error ends with a
+        line marking it as incomplete.
+        """
+        def failing_scan(*args, **kwargs):
+            yield self.MOCK_DOCS[0]
+            raise RuntimeError('shard failure')
+
+        with patch('distilleries.models.Distillery.scan',
+                   side_effect=failing_scan), \
+                patch('query.search.export._LOGGER'):
+            response = self.get_api_response('6/export/?query=something')
+            content = b''.join(response.streaming_content).decode('utf-8')
+
+        lines = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(lines[0], self.MOCK_DOCS[0])
+        self.assertIn(ERROR_KEY, lines[-1])
+
+    def test_csv(self):
+        """
+        Tests that documents are streamed as CSV rows.
+        """
+        response, content, _ = self._get_export_response(
+            '6/export/?query=something&output=csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = content.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].startswith('_id,'))
+
+    def test_invalid_output(self):
+        """
+        Tests that a 400 response is returned for an unknown output format.
+        """
+        response, _, mock_scan = self._get_export_response(
+            '6/export/?query=something&output=xml')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'],
+                         'The output parameter must be one of: csv, ndjson')
+        self.assertFalse(mock_scan.called)
+
+    def test_distillery_not_found(self):
+        """
+        Tests that a 404 response is returned for an unknown distillery.
+        """
+        response, _, _ = self._get_export_response('12/export/?query=woo')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['detail'], 'Distillery 12 not found.')
@@ -26,4 +26,6 @@ urlpatterns = [
         name=views.DISTILLERIES_SEARCH_VIEW_NAME),
     url(r'^distilleries/(?P<pk>[0-9]+)/$', views.search_distillery,
         name=views.DISTILLERY_SEARCH_VIEW_NAME),
+    url(r'^distilleries/(?P<pk>[0-9]+)/export/$', views.export_distillery,
+        name=views.DISTILLERY_EXPORT_VIEW_NAME),
 ]
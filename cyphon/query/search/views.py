@@ -22,6 +22,7 @@
 from dateutil import parser
 
 # third party
+from django.http import StreamingHttpResponse
 from rest_framework.decorators import api_view
 from rest_framework import status
 from rest_framework.response import Response
@@ -30,6 +31,8 @@ from rest_framework.response import Response
 from distilleries.models import Distillery
 from .search_query import SearchQuery
 from .all_search_results import AllSearchResults
+from .cache import get_search_key, SEARCH_CACHE
+from .export import EXPORT_FORMATS, write_csv, write_ndjson
 from .alert_search_results import AlertSearchResults
 from .distillery_search_results import (
     DistillerySearchResultsList, DistillerySearchResults
@@ -41,6 +44,7 @@ SEARCH_VIEW_NAME = 'search'
 ALERT_SEARCH_VIEW_NAME = AlertSearchResults.VIEW_NAME
 DISTILLERY_SEARCH_VIEW_NAME = DistillerySearchResults.VIEW_NAME
 DISTILLERIES_SEARCH_VIEW_NAME = 'search_distilleries'
+DISTILLERY_EXPORT_VIEW_NAME = 'export_distillery'
 
 
 class QueryParams(object):
@@ -51,6 +55,7 @@ class QueryParams(object):
         self.before = self._parse_date(params.get('before'))
         self.after = self._parse_date(params.get('after'))
         self.page = self._parse_int(params.get('page'), 1)
+        self.cursor = params.get('cursor') or None
         self.page_size = self._parse_int(
             params.get('page_size'), DEFAULT_PAGE_SIZE)
 
@@ -88,7 +93,8 @@ def search(request):
     if search_query.is_valid():
         search_results = AllSearchResults(
             search_query, page=params.page, page_size=params.page_size,
-            after=params.after, before=params.before)
+            after=params.after, before=params.before,
+            cache_key=_get_cache_key(search_query, params))
         response['results'] = search_results.as_dict(request)
 
         return Response(response)
@@ -118,7 +124,8 @@ def search_alerts(request):
     if search_query.is_valid():
         search_results = AlertSearchResults(
             search_query, page=params.page, page_size=params.page_size,
-            after=params.after, before=params.before)
+            after=params.after, before=params.before,
+            cache_key=_get_cache_key(search_query, params))
         response['results'] = search_results.as_dict(request)
 
         return Response(response)
@@ -145,7 +152,8 @@ def search_distilleries(request):
     if search_query.is_valid():
         search_results = DistillerySearchResultsList(
             search_query, page=params.page, page_size=params.page_size,
-            after=params.after, before=params.before)
+            after=params.after, before=params.before,
+            cache_key=_get_cache_key(search_query, params))
         response['results'] = search_results.as_dict(request)
 
         return Response(response)
@@ -188,12 +196,120 @@ def search_distillery(request, pk):
         search_query, page=params.page,
         page_size=params.page_size,
         distillery=distillery,
-        after=params.after, before=params.before)
+        after=params.after, before=params.before,
+        cache_key=_get_cache_key(search_query, params),
+        cursor=params.cursor)
     response['results'] = search_results.as_dict(request)
 
     return Response(response)
 
 
+@api_view(['GET'])
+def export_distillery(request, pk):
+    """View that streams all results of a search of a single distillery.
+
+    Results are written as newline-delimited JSON, or as CSV with a
+    column for each field of the distillery, depending on the `output`
+    parameter. Documents are redacted with the distillery's codebook
+    if the user requires redaction or the `redact` parameter is set.
+    If an error interrupts the export, the file ends with a line
+    marking it as incomplete (see :mod:`query.search.export`).
+
+    Parameters
+    ----------
+    request : rest_framework.request.Request
+    pk: str
+        Primary key of the distillery to search through.
+
+    Returns
+    -------
+    StreamingHttpResponse or Response
+    """
+    params = QueryParams(request.query_params)
+    output = request.query_params.get('output', 'ndjson')
+
+    if output not in EXPORT_FORMATS:
+        return Response(
+            data={'detail': 'The output parameter must be one of: {}'.format(
+                ', '.join(sorted(EXPORT_FORMATS)))},
+            status=status.HTTP_400_BAD_REQUEST)
+
+    search_query = SearchQuery(
+        params.query, request.user,
+        ignored_parameter_types=[SearchParameterType.DISTILLERY],
+    )
+
+    if not search_query.is_valid():
+        return Response(data=_create_empty_response(search_query),
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        distillery = Distillery.objects.get(pk=int(pk))
+    except Distillery.DoesNotExist:
+        return Response(
+            data={'detail': 'Distillery {} not found.'.format(pk)},
+            status=status.HTTP_404_NOT_FOUND)
+
+    search_results = DistillerySearchResults(
+        search_query, distillery,
+        after=params.after, before=params.before, fetch=False)
+    docs = search_results.scan()
+    codebook = distillery.codebook
+
+    if codebook and (request.user.use_redaction or
+                     _parse_bool(request.query_params.get('redact'))):
+        docs = (codebook.redact_data(doc) for doc in docs)
+
+    if output == 'csv':
+        field_names = ['_id'] + distillery.get_field_list()
+        lines = write_csv(docs, field_names)
+    else:
+        lines = write_ndjson(docs)
+
+    response = StreamingHttpResponse(lines,
+                                     content_type=EXPORT_FORMATS[output])
+    response['Content-Disposition'] = 'attachment; filename="{}.{}"'.format(
+        distillery.collection.name, output)
+
+    return response
+
+
+def _parse_bool(value):
+    """Return whether a query parameter value is true.
+
+    Parameters
+    ----------
+    value : str or None
+
+    Returns
+    -------
+    bool
+
+    """
+    return str(value).lower() in ('1', 'true', 'yes')
+
+
+def _get_cache_key(search_query, params):
+    """Return a cache key for a search, if search results are cached.
+
+    Parameters
+    ----------
+    search_query : SearchQuery
+
+    params : QueryParams
+
+    Returns
+    -------
+    str or None
+
+    """
+    if SEARCH_CACHE is None:
+        return None
+
+    return get_search_key(
+        search_query, before=params.before, after=params.after)
+
+
 def _create_empty_response(search_query):
     """Creates a search response without any results.
 
@@ -23,7 +23,9 @@ Provides a queue consumer for RabbitMQ.
 import json
 import logging
 import os
+import signal
 import sys
+import time
 from multiprocessing import Process
 
 # add path to the Cyphon project folder so Cyphon packages can be found
@@ -48,26 +50,110 @@ import six
 
 # local
 from cyphon.documents import DocumentObj
+from cyphon.receiverstats import MessageStats
 from cyphon.transaction import close_connection, close_old_connections
 from sifter.datasifter.datachutes.models import DataChute
 from sifter.logsifter.logchutes.models import LogChute
+from watchdogs.dedup import MUZZLE_WINDOW
+from watchdogs.dispatch import (
+    COLLECTION_HEADER,
+    DOC_ID_HEADER,
+    INSPECTION_QUEUE,
+)
 from watchdogs.models import Watchdog
 
 LOGGER = logging.getLogger('receiver')
 
 BROKER = settings.RABBITMQ
 
+_RECEIVER_SETTINGS = getattr(settings, 'RECEIVER', {})
 
-def create_doc_obj(body):
+#: Maximum number of unacknowledged messages delivered to a consumer.
+PREFETCH_COUNT = _RECEIVER_SETTINGS.get('PREFETCH_COUNT', 1)
+
+#: Number of messages processed together. A value of 1 disables batching.
+BATCH_SIZE = _RECEIVER_SETTINGS.get('BATCH_SIZE', 1)
+
+#: Maximum number of seconds to wait before processing a partial batch.
+BATCH_INTERVAL = _RECEIVER_SETTINGS.get('BATCH_INTERVAL', 5)
+
+#: Whether to acknowledge messages only after they have been processed.
+#: Failed messages are then retried or dead-lettered instead of dropped.
+ACK_AFTER_PERSIST = _RECEIVER_SETTINGS.get('ACK_AFTER_PERSIST', False)
+
+#: Number of times a failed message is retried before it is dead-lettered.
+MAX_RETRIES = _RECEIVER_SETTINGS.get('MAX_RETRIES', 5)
+
+#: Number of seconds before the first retry. Doubles with each retry.
+RETRY_DELAY = _RECEIVER_SETTINGS.get('RETRY_DELAY', 1)
+
+#: Maximum number of seconds between retries.
+MAX_RETRY_DELAY = _RECEIVER_SETTINGS.get('MAX_RETRY_DELAY', 300)
+
+#: Exchange that receives messages which can't be processed.
+DEAD_LETTER_EXCHANGE = _RECEIVER_SETTINGS.get('DEAD_LETTER_EXCHANGE',
+                                              'cyphon.dead')
+
+#: Counts of messages handled by this process, keyed by outcome
+#: ('processed', 'retried', 'dead_lettered'). The counts are published
+#: to Django's cache for the ``receiverstats`` management command.
+STATS = MessageStats()
+
+_RETRY_COUNT_HEADER = 'x-retry-count'
+_ERROR_HEADER = 'x-error'
+
+
+def _get_consumers():
+    """Get functions for processing a single |DocumentObj|.
+
+    Returns a dictionary that maps routing keys to consumer functions.
+    """
+    return {
+        'datachutes': DataChute.objects.process,
+        'logchutes': LogChute.objects.process,
+        'watchdogs': Watchdog.objects.process,
+    }
+
+
+def _inspect_many(doc_objs):
+    """
+    Inspects a batch of DocumentObjs with Watchdogs. The batch's Alerts
+    are saved in a single transaction, so either every document is
+    inspected or an exception is raised. Returns an empty list of
+    failures.
+    """
+    Watchdog.objects.process_many(doc_objs)
+    return []
+
+
+def _get_batch_consumers():
+    """Get functions for processing a batch of |DocumentObjs|.
+
+    Returns a dictionary that maps routing keys to consumer functions.
+    Each function returns a list of (|DocumentObj|, |Exception|) tuples
+    for the documents that could not be processed.
+    """
+    return {
+        'datachutes': DataChute.objects.process_many,
+        'logchutes': LogChute.objects.process_many,
+        'watchdogs': _inspect_many,
+    }
+
+
+def create_doc_obj(body, properties=None):
     """Turn a message str into a |DocumentObj|.
 
     Parses a message body, adds an ``_id`` field based on the document's
-    ``@uuid`` field, and creates a |DocumentObj| from the result.
+    ``@uuid`` field, and creates a |DocumentObj| from the result. For a
+    saved document published for inspection, the document's id and
+    |Collection| are taken from the message headers instead.
 
     Parameters
     ----------
     body : str
 
+    properties : pika.spec.BasicProperties
+
     Returns
     -------
     |DocumentObj|
@@ -76,62 +162,485 @@ def create_doc_obj(body):
     if isinstance(body, six.binary_type):
         body = body.decode('utf-8')
     data = json.loads(body)
-    doc_id = data.get('@uuid')
+    headers = _get_headers(properties)
+    doc_id = headers.get(DOC_ID_HEADER, data.get('@uuid'))
     data['_id'] = doc_id
-    collection = data.get('collection')
+    collection = headers.get(COLLECTION_HEADER, data.get('collection'))
     return DocumentObj(data=data, doc_id=doc_id, collection=collection)
 
 
-@close_connection
-def process_msg(channel, method, properties, body):
-    """Process a message.
+def get_retry_delay(retry_count):
+    """Get the number of seconds to wait before retrying a message.
+
+    Parameters
+    ----------
+    retry_count : int
+        The number of times the message has already been retried.
+
+    Returns
+    -------
+    int
 
-    Callback function for a queue consumer.
+    """
+    return min(RETRY_DELAY * 2 ** retry_count, MAX_RETRY_DELAY)
+
+
+def _get_headers(properties):
+    """
+    Takes the properties of a message and returns a copy of its
+    headers.
+    """
+    headers = getattr(properties, 'headers', None) or {}
+    return dict(headers)
+
+
+def _log_stats():
+    """
+    Logs the number of messages retried and dead-lettered by this
+    process.
+    """
+    LOGGER.info('Receiver stats: %s processed, %s retried, %s dead-lettered',
+                STATS['processed'], STATS['retried'], STATS['dead_lettered'])
+
+
+def dead_letter_msg(channel, routing_key, properties, body, error):
+    """Send a message that can't be processed to the dead-letter exchange.
+
+    The error is attached to the message in an ``x-error`` header.
+    The caller is responsible for acknowledging the original message.
 
     Parameters
     ----------
     channel : pika.Channel
 
-    method : pika.spec.Basic.Return
+    routing_key : str
+        The routing key of the original message.
 
     properties : pika.spec.BasicProperties
 
     body : str, unicode, or bytes (python 3.x)
 
+    error : Exception
+        The error that prevented the message from being processed.
+
+    """
+    headers = _get_headers(properties)
+    headers[_ERROR_HEADER] = repr(error)
+    channel.basic_publish(
+        exchange=DEAD_LETTER_EXCHANGE,
+        routing_key=routing_key,
+        body=body,
+        properties=pika.BasicProperties(headers=headers, delivery_mode=2)
+    )
+    STATS.count('dead_lettered')
+    LOGGER.error('Message dead-lettered after error: %s', error)
+    _log_stats()
+
+
+def retry_msg(channel, routing_key, properties, body, error):
+    """Schedule a failed message to be processed again.
+
+    Publishes the message to a retry queue whose messages expire
+    after an exponentially increasing delay, at which point they are
+    routed back to the original queue. Once a message has been retried
+    :const:`MAX_RETRIES` times, it is dead-lettered instead. The caller
+    is responsible for acknowledging the original message.
+
+    Parameters
+    ----------
+    channel : pika.Channel
+
     routing_key : str
-        Indicates the type of consumer to use. Options are 'datachutes',
-        'logchutes', 'watchdogs'.
+        The routing key of the original message.
+
+    properties : pika.spec.BasicProperties
+
+    body : str, unicode, or bytes (python 3.x)
+
+    error : Exception
+        The error that prevented the message from being processed.
+
+    """
+    headers = _get_headers(properties)
+    retry_count = headers.get(_RETRY_COUNT_HEADER, 0)
+
+    if retry_count >= MAX_RETRIES:
+        dead_letter_msg(channel, routing_key, properties, body, error)
+        return
+
+    delay = get_retry_delay(retry_count)
+    retry_queue = declare_retry_queue(channel, routing_key, delay)
+    headers[_RETRY_COUNT_HEADER] = retry_count + 1
+    headers[_ERROR_HEADER] = repr(error)
+    channel.basic_publish(
+        exchange='',
+        routing_key=retry_queue,
+        body=body,
+        properties=pika.BasicProperties(headers=headers, delivery_mode=2)
+    )
+    STATS.count('retried')
+    LOGGER.warning('Message scheduled for retry %s of %s in %s seconds '
+                   'after error: %s', retry_count + 1, MAX_RETRIES, delay,
+                   error)
+    _log_stats()
+
+
+def declare_retry_queue(channel, routing_key, delay):
+    """Declare a queue that holds messages awaiting a retry.
+
+    Each delay has its own queue, since RabbitMQ only expires messages
+    at the head of a queue. Expired messages are routed back to the
+    queue for the original routing key.
+
+    Parameters
+    ----------
+    channel : pika.Channel
+
+    routing_key : str
+        The routing key of the messages to be retried.
+
+    delay : int
+        The number of seconds messages wait in the queue.
+
+    Returns
+    -------
+    str
+        The name of the retry queue.
 
+    """
+    queue_name = '%s.retry.%s' % (routing_key, delay)
+    channel.queue_declare(
+        queue=queue_name,
+        durable=BROKER['DURABLE'],
+        arguments={
+            'x-message-ttl': int(delay * 1000),
+            'x-dead-letter-exchange': BROKER['EXCHANGE'],
+            'x-dead-letter-routing-key': routing_key,
+        }
+    )
+    return queue_name
+
+
+def declare_dead_letter_queue(channel, routing_key):
+    """Declare a queue that collects messages that can't be processed.
+
+    Parameters
+    ----------
+    channel : pika.Channel
+
+    routing_key : str
+        The routing key of the messages to be collected.
+
+    Returns
+    -------
+    str
+        The name of the dead-letter queue.
+
+    """
+    durable = BROKER['DURABLE']
+    queue_name = '%s.dead' % routing_key
+    channel.exchange_declare(exchange=DEAD_LETTER_EXCHANGE, durable=durable)
+    channel.queue_declare(queue=queue_name, durable=durable)
+    channel.queue_bind(exchange=DEAD_LETTER_EXCHANGE,
+                       queue=queue_name,
+                       routing_key=routing_key)
+    return queue_name
+
+
+def _process_msg_after_ack(channel, method, properties, body):
+    """
+    Acknowledges a message and then processes it. Errors are logged
+    and the message is dropped.
     """
     channel.basic_ack(delivery_tag=method.delivery_tag)
-    consumers = {
-        'datachutes': DataChute.objects.process,
-        'logchutes': LogChute.objects.process,
-        'watchdogs': Watchdog.objects.process,
-    }
 
     try:
         if not isinstance(body, str):
             body = body.decode('utf-8')
 
-        doc_obj = create_doc_obj(body)
-        consumer_func = consumers[method.routing_key]
+        doc_obj = create_doc_obj(body, properties)
+        consumer_func = _get_consumers()[method.routing_key]
         consumer_func(doc_obj)
+        STATS.count('processed')
 
     except Exception as error:
         LOGGER.exception('An error occurred while processing the message '
                          '\'%s\':\n  %s', body, error)
 
 
+def _process_msg_before_ack(channel, method, properties, body):
+    """
+    Processes a message and then acknowledges it. Messages that can't
+    be decoded are dead-lettered, and messages that fail during
+    processing are retried.
+    """
+    routing_key = method.routing_key
+
+    try:
+        doc_obj = create_doc_obj(body, properties)
+    except Exception as error:
+        # invalid JSON, or JSON that isn't an object, can never succeed
+        dead_letter_msg(channel, routing_key, properties, body, error)
+    else:
+        try:
+            _get_consumers()[routing_key](doc_obj)
+            STATS.count('processed')
+        except Exception as error:
+            LOGGER.exception('An error occurred while processing the '
+                             'message \'%s\':\n  %s', body, error)
+            retry_msg(channel, routing_key, properties, body, error)
+
+    channel.basic_ack(delivery_tag=method.delivery_tag)
+
+
+@close_connection
+def process_msg(channel, method, properties, body):
+    """Process a message.
+
+    Callback function for a queue consumer. If the receiver's
+    ``ACK_AFTER_PERSIST`` setting is enabled, the message is only
+    acknowledged after it has been processed, or after it has been
+    handed off to a retry or dead-letter queue. Otherwise, the message
+    is acknowledged before it is processed.
+
+    Parameters
+    ----------
+    channel : pika.Channel
+
+    method : pika.spec.Basic.Return
+
+    properties : pika.spec.BasicProperties
+
+    body : str, unicode, or bytes (python 3.x)
+
+    routing_key : str
+        Indicates the type of consumer to use. Options are 'datachutes',
+        'logchutes', 'watchdogs'.
+
+    """
+    if ACK_AFTER_PERSIST:
+        _process_msg_before_ack(channel, method, properties, body)
+    else:
+        _process_msg_after_ack(channel, method, properties, body)
+
+
+class MessageBatch(object):
+    """A batch of messages awaiting processing.
+
+    Attributes
+    ----------
+    routing_key : str
+        Indicates the type of consumer to use. Options are 'datachutes',
+        'logchutes', 'watchdogs'.
+
+    size : int
+        The number of messages at which the batch is full.
+
+    interval : float
+        The number of seconds after the first message is added at
+        which the batch should be flushed, even if it is not full.
+
+    """
+
+    def __init__(self, routing_key, size=BATCH_SIZE, interval=BATCH_INTERVAL):
+        self.routing_key = routing_key
+        self.size = size
+        self.interval = interval
+        self.messages = []
+        self.started = None
+
+    def __len__(self):
+        return len(self.messages)
+
+    def add(self, method, properties, body):
+        """Add a message to the batch.
+
+        Parameters
+        ----------
+        method : pika.spec.Basic.Deliver
+
+        properties : pika.spec.BasicProperties
+
+        body : str, unicode, or bytes (python 3.x)
+
+        """
+        if not self.messages:
+            self.started = time.time()
+        self.messages.append((method, properties, body))
+
+    def is_ready(self):
+        """Whether the batch is full or has waited long enough.
+
+        Returns
+        -------
+        bool
+
+        """
+        if not self.messages:
+            return False
+        elapsed = time.time() - self.started
+        return len(self.messages) >= self.size or elapsed >= self.interval
+
+    def _create_doc_objs(self, channel):
+        """
+        Returns a list of (message, DocumentObj) tuples for the messages
+        in the batch. Messages that can't be decoded are dead-lettered
+        if ACK_AFTER_PERSIST is enabled; otherwise they are logged and
+        skipped.
+        """
+        decoded = []
+        for message in self.messages:
+            dummy_method, properties, body = message
+            try:
+                decoded.append((message, create_doc_obj(body, properties)))
+            except Exception as error:
+                if ACK_AFTER_PERSIST:
+                    dead_letter_msg(channel, self.routing_key, properties,
+                                    body, error)
+                else:
+                    LOGGER.exception('An error occurred while decoding the '
+                                     'message \'%s\':\n  %s', body, error)
+        return decoded
+
+    def _retry(self, channel, decoded, failures):
+        """
+        Schedules the message for each document that could not be
+        processed for a retry.
+        """
+        messages = {id(doc_obj): message for message, doc_obj in decoded}
+        for doc_obj, error in failures:
+            dummy_method, properties, body = messages[id(doc_obj)]
+            retry_msg(channel, self.routing_key, properties, body, error)
+
+    def _process_individually(self, doc_objs):
+        """
+        Processes each DocumentObj in a failed batch on its own, so one
+        bad document can't cost the rest of the batch. Returns a list of
+        (DocumentObj, Exception) tuples for the documents that fail.
+        """
+        consumer_func = _get_consumers()[self.routing_key]
+        failures = []
+        for doc_obj in doc_objs:
+            try:
+                consumer_func(doc_obj)
+            except Exception as error:
+                LOGGER.exception('An error occurred while processing %s:'
+                                 '\n  %s', doc_obj, error)
+                failures.append((doc_obj, error))
+        return failures
+
+    @close_connection
+    def flush(self, channel):
+        """Process the messages in the batch and acknowledge them.
+
+        Messages are decoded and processed together, then acknowledged
+        with a single ``basic_ack`` once processing is complete. If the
+        receiver's ``ACK_AFTER_PERSIST`` setting is enabled, the
+        messages for documents that could not be processed are retried
+        before the batch is acknowledged. If the whole batch fails, each
+        message is processed on its own before the batch is
+        acknowledged, so only the messages that fail again are retried
+        or, without ``ACK_AFTER_PERSIST``, dropped.
+
+        Parameters
+        ----------
+        channel : pika.Channel
+
+        """
+        if not self.messages:
+            return
+
+        last_tag = self.messages[-1][0].delivery_tag
+        decoded = self._create_doc_objs(channel)
+        doc_objs = [doc_obj for dummy_msg, doc_obj in decoded]
+
+        try:
+            consumer_func = _get_batch_consumers()[self.routing_key]
+            failures = consumer_func(doc_objs)
+
+        except Exception as error:
+            LOGGER.exception('An error occurred while processing a batch '
+                             'of %s messages; processing them one at a '
+                             'time:\n  %s', len(self), error)
+            failures = self._process_individually(doc_objs)
+
+        STATS.count('processed', len(doc_objs) - len(failures))
+
+        if ACK_AFTER_PERSIST:
+            self._retry(channel, decoded, failures)
+
+        # if a retry can't be scheduled, the exception propagates and
+        # the unacknowledged messages are redelivered by the broker
+        channel.basic_ack(delivery_tag=last_tag, multiple=True)
+        self.messages = []
+        self.started = None
+
+
+def consume_batches(channel, queue_name, routing_key):
+    """Consume messages from a queue in batches.
+
+    Parameters
+    ----------
+    channel : pika.adapters.blocking_connection.BlockingChannel
+
+    queue_name : str
+
+    routing_key : str
+        Options are 'datachutes', 'logchutes', 'watchdogs'.
+
+    """
+    batch = MessageBatch(routing_key)
+    events = channel.consume(queue_name, inactivity_timeout=BATCH_INTERVAL)
+
+    for event in events:
+        # an inactivity timeout yields an empty event
+        if event and event[0] is not None:
+            batch.add(*event)
+
+        if batch.is_ready():
+            batch.flush(channel)
+
+
+def _exit_on_sigterm(signum, frame):
+    """
+    Raises SystemExit when a consumer process is terminated, so its
+    teardown runs instead of the process being killed outright.
+    """
+    raise SystemExit(0)
+
+
+def _shutdown():
+    """
+    Finishes work deferred by a consumer process before it exits.
+    Processes started by :func:`create_consumers` exit without running
+    :mod:`atexit` handlers, so this is called explicitly when a
+    consumer stops.
+    """
+    pending = INSPECTION_QUEUE.qsize()
+    if pending:
+        LOGGER.info('Inspecting %s queued documents before exiting', pending)
+    INSPECTION_QUEUE.stop()
+    MUZZLE_WINDOW.stop()
+    STATS.publish()
+
+
 def consume_queue(routing_key='watchdogs'):
     """Create a queue consumer for RabbitMQ.
 
+    If the receiver's ``BATCH_SIZE`` setting is greater than 1,
+    messages are processed in batches. Otherwise, they are processed
+    one at a time. When the consumer stops, including when its process
+    is terminated, documents awaiting inspection are inspected and
+    pending Alert incidents are saved before it returns.
+
     Parameters
     ----------
     routing_key : str
         Options are 'datachutes', 'logchutes', 'watchdogs'.
 
     """
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
     try:
         credentials = pika.PlainCredentials(username=BROKER['USERNAME'],
                                             password=BROKER['PASSWORD'])
@@ -158,17 +667,28 @@ def consume_queue(routing_key='watchdogs'):
                            queue=queue_name,
                            routing_key=routing_key)
 
+        if ACK_AFTER_PERSIST:
+            declare_dead_letter_queue(channel, routing_key)
+
         LOGGER.info('Waiting for messages')
         # print(' [*] Waiting for messages. To exit press CTRL+C')
-        channel.basic_qos(prefetch_count=1)
-        channel.basic_consume(process_msg, queue=queue_name)
-
-        channel.start_consuming()
+        if BATCH_SIZE > 1:
+            # the broker must be able to deliver a full batch before
+            # any of its messages are acknowledged
+            channel.basic_qos(prefetch_count=max(PREFETCH_COUNT, BATCH_SIZE))
+            consume_batches(channel, queue_name, routing_key)
+        else:
+            channel.basic_qos(prefetch_count=PREFETCH_COUNT)
+            channel.basic_consume(process_msg, queue=queue_name)
+            channel.start_consuming()
 
     except Exception as error:
         LOGGER.exception('An error occurred while consuming messages:\n  %s',
                          error)
 
+    finally:
+        _shutdown()
+
 
 @close_old_connections
 def create_consumers(routing_key, num):
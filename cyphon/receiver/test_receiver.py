@@ -34,7 +34,16 @@ from testfixtures import LogCapture
 
 # local
 from cyphon.documents import DocumentObj
-from receiver.receiver import create_doc_obj, process_msg, LOGGER
+from receiver.receiver import (
+    consume_queue,
+    create_doc_obj,
+    process_msg,
+    get_retry_delay,
+    LOGGER,
+    MessageBatch,
+    retry_msg,
+    STATS,
+)
 from tests.fixture_manager import get_fixtures
 
 LOGGER.removeHandler('console')
@@ -87,6 +96,23 @@ class ProcessMsgTestCase(TransactionTestCase):
         self.assertEqual(doc_obj.collection, self.doc['collection'])
         self.assertEqual(doc_obj.data, expected_doc)
 
+    def test_create_doc_obj_headers(self):
+        """
+        Tests that the create_doc_obj function takes the doc id and
+        collection of a document published for inspection from the
+        message headers.
+        """
+        properties = Mock()
+        properties.headers = {
+            'x-doc-id': 'abc',
+            'x-collection': 'mongodb.test_database.test_docs'
+        }
+        doc_obj = create_doc_obj(self.msg, properties)
+        self.assertEqual(doc_obj.doc_id, 'abc')
+        self.assertEqual(doc_obj.data['_id'], 'abc')
+        self.assertEqual(doc_obj.collection, 'mongodb.test_database.test_docs')
+        self.assertEqual(doc_obj.data['@uuid'], self.doc['@uuid'])
+
     @patch('receiver.receiver.LogChute.objects.process')
     def test_process_msg_logchutes(self, mock_process):
         """
@@ -96,7 +122,7 @@ class ProcessMsgTestCase(TransactionTestCase):
         with patch('receiver.receiver.create_doc_obj',
                    return_value=self.mock_doc_obj) as mock_create:
             process_msg(**self.kwargs)
-            mock_create.assert_called_once_with(self.decoded_msg)
+            mock_create.assert_called_once_with(self.decoded_msg, None)
             mock_process.assert_called_once_with(self.mock_doc_obj)
 
     @patch('receiver.receiver.DataChute.objects.process')
@@ -108,7 +134,7 @@ class ProcessMsgTestCase(TransactionTestCase):
         with patch('receiver.receiver.create_doc_obj',
                    return_value=self.mock_doc_obj) as mock_create:
             process_msg(**self.kwargs)
-            mock_create.assert_called_once_with(self.decoded_msg)
+            mock_create.assert_called_once_with(self.decoded_msg, None)
             mock_process.assert_called_once_with(self.mock_doc_obj)
 
     @patch('receiver.receiver.Watchdog.objects.process')
@@ -120,7 +146,7 @@ class ProcessMsgTestCase(TransactionTestCase):
         with patch('receiver.receiver.create_doc_obj',
                    return_value=self.mock_doc_obj) as mock_create:
             process_msg(**self.kwargs)
-            mock_create.assert_called_once_with(self.decoded_msg)
+            mock_create.assert_called_once_with(self.decoded_msg, None)
             mock_process.assert_called_once_with(self.mock_doc_obj)
 
     def test_process_msg_exception(self):
@@ -140,3 +166,347 @@ class ProcessMsgTestCase(TransactionTestCase):
                          '"foobar"}\':\n'
                          '  foo'),
                     )
+
+
+class MessageBatchTestCase(TransactionTestCase):
+    """
+    Tests the MessageBatch class.
+    """
+
+    fixtures = get_fixtures(['logchutes'])
+
+    doc = {
+        'message': 'foobar',
+        '@uuid': '12345',
+        'collection': 'elasticsearch.test_index.test_logs'
+    }
+    msg = bytes(json.dumps(doc), 'utf-8')
+
+    def setUp(self):
+        logging.disable(logging.ERROR)
+        self.mock_channel = Mock()
+        self.batch = MessageBatch('logchutes', size=2, interval=60)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _add_msg(self, delivery_tag, body=None):
+        """
+        Adds a message with the given delivery tag to the batch.
+        """
+        method = Mock()
+        method.delivery_tag = delivery_tag
+        self.batch.add(method, None, body or self.msg)
+
+    def test_is_ready_empty(self):
+        """
+        Tests the is_ready method when the batch is empty.
+        """
+        self.assertFalse(self.batch.is_ready())
+
+    def test_is_ready_full(self):
+        """
+        Tests the is_ready method when the batch is full.
+        """
+        self._add_msg(1)
+        self.assertFalse(self.batch.is_ready())
+        self._add_msg(2)
+        self.assertTrue(self.batch.is_ready())
+
+    def test_is_ready_expired(self):
+        """
+        Tests the is_ready method when the batch interval has elapsed.
+        """
+        self._add_msg(1)
+        self.batch.started -= 61
+        self.assertTrue(self.batch.is_ready())
+
+    @patch('receiver.receiver.LogChute.objects.process_many',
+           return_value=[])
+    def test_flush(self, mock_process):
+        """
+        Tests that the flush method processes the batch and acks all
+        messages at once.
+        """
+        self._add_msg(1)
+        self._add_msg(2)
+        self.batch.flush(self.mock_channel)
+        doc_objs = mock_process.call_args[0][0]
+        self.assertEqual(len(doc_objs), 2)
+        self.assertEqual(doc_objs[0].doc_id, '12345')
+        self.mock_channel.basic_ack.assert_called_once_with(
+            delivery_tag=2, multiple=True)
+        self.assertEqual(len(self.batch), 0)
+
+    @patch('receiver.receiver.LogChute.objects.process')
+    @patch('receiver.receiver.LogChute.objects.process_many',
+           side_effect=Exception('foo'))
+    def test_flush_exception(self, mock_process_many, mock_process):
+        """
+        Tests that the flush method processes each message on its own
+        and then acks the batch when an exception is raised for the
+        batch.
+        """
+        self._add_msg(1)
+        self._add_msg(2, body=b'not json')
+        self._add_msg(3)
+        self.batch.flush(self.mock_channel)
+        self.assertEqual(len(mock_process_many.call_args[0][0]), 2)
+        self.assertEqual(mock_process.call_count, 2)
+        self.mock_channel.basic_ack.assert_called_once_with(
+            delivery_tag=3, multiple=True)
+
+    @patch('receiver.receiver.LogChute.objects.process',
+           side_effect=[Exception('bar'), None])
+    @patch('receiver.receiver.LogChute.objects.process_many',
+           side_effect=Exception('foo'))
+    def test_flush_exception_partial(self, mock_process_many, mock_process):
+        """
+        Tests that a message that fails on its own doesn't prevent the
+        rest of a failed batch from being processed.
+        """
+        self._add_msg(1)
+        self._add_msg(2)
+        self.batch.flush(self.mock_channel)
+        self.assertEqual(mock_process.call_count, 2)
+        self.mock_channel.basic_ack.assert_called_once_with(
+            delivery_tag=2, multiple=True)
+
+
+class AckAfterPersistTestCase(TransactionTestCase):
+    """
+    Tests message handling when ACK_AFTER_PERSIST is enabled.
+    """
+
+    fixtures = get_fixtures(['logchutes'])
+
+    doc = {
+        'message': 'foobar',
+        '@uuid': '12345',
+        'collection': 'elasticsearch.test_index.test_logs'
+    }
+    msg = bytes(json.dumps(doc), 'utf-8')
+
+    def setUp(self):
+        logging.disable(logging.ERROR)
+        STATS.clear()
+        self.mock_channel = Mock()
+        self.mock_method = Mock()
+        self.mock_method.routing_key = 'logchutes'
+        self.mock_method.delivery_tag = 1
+        self.mock_properties = Mock()
+        self.mock_properties.headers = None
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _get_published_headers(self):
+        """
+        Returns the headers of the last message published.
+        """
+        kwargs = self.mock_channel.basic_publish.call_args[1]
+        return kwargs['properties'].headers
+
+    def test_get_retry_delay(self):
+        """
+        Tests that the get_retry_delay function backs off exponentially
+        up to the maximum delay.
+        """
+        with patch('receiver.receiver.RETRY_DELAY', 2):
+            with patch('receiver.receiver.MAX_RETRY_DELAY', 10):
+                self.assertEqual(get_retry_delay(0), 2)
+                self.assertEqual(get_retry_delay(1), 4)
+                self.assertEqual(get_retry_delay(2), 8)
+                self.assertEqual(get_retry_delay(3), 10)
+
+    def test_retry_msg(self):
+        """
+        Tests that the retry_msg function publishes the message to a
+        retry queue with an incremented retry count.
+        """
+        self.mock_properties.headers = {'x-retry-count': 1}
+        with patch('receiver.receiver.RETRY_DELAY', 1):
+            retry_msg(self.mock_channel, 'logchutes', self.mock_properties,
+                      self.msg, Exception('foo'))
+        kwargs = self.mock_channel.basic_publish.call_args[1]
+        self.assertEqual(kwargs['routing_key'], 'logchutes.retry.2')
+        self.assertEqual(kwargs['body'], self.msg)
+        self.assertEqual(self._get_published_headers()['x-retry-count'], 2)
+        self.assertEqual(STATS['retried'], 1)
+
+    def test_retry_msg_max_retries(self):
+        """
+        Tests that the retry_msg function dead-letters a message that
+        has exceeded the maximum number of retries.
+        """
+        self.mock_properties.headers = {'x-retry-count': 5}
+        with patch('receiver.receiver.MAX_RETRIES', 5):
+            retry_msg(self.mock_channel, 'logchutes', self.mock_properties,
+                      self.msg, Exception('foo'))
+        kwargs = self.mock_channel.basic_publish.call_args[1]
+        self.assertEqual(kwargs['exchange'], 'cyphon.dead')
+        self.assertEqual(self._get_published_headers()['x-error'],
+                         repr(Exception('foo')))
+        self.assertEqual(STATS['retried'], 0)
+        self.assertEqual(STATS['dead_lettered'], 1)
+
+    @patch('receiver.receiver.ACK_AFTER_PERSIST', True)
+    @patch('receiver.receiver.LogChute.objects.process')
+    def test_process_msg_success(self, mock_process):
+        """
+        Tests that a message is acked after it is processed.
+        """
+        process_msg(self.mock_channel, self.mock_method,
+                    self.mock_properties, self.msg)
+        self.assertEqual(mock_process.call_count, 1)
+        self.mock_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+        self.assertFalse(self.mock_channel.basic_publish.called)
+        self.assertEqual(STATS['processed'], 1)
+
+    @patch('receiver.receiver.ACK_AFTER_PERSIST', True)
+    @patch('receiver.receiver.LogChute.objects.process',
+           side_effect=Exception('foo'))
+    def test_process_msg_failure(self, mock_process):
+        """
+        Tests that a message that fails during processing is retried
+        and then acked.
+        """
+        with patch('receiver.receiver.retry_msg') as mock_retry:
+            process_msg(self.mock_channel, self.mock_method,
+                        self.mock_properties, self.msg)
+            self.assertEqual(mock_retry.call_count, 1)
+        self.mock_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    @patch('receiver.receiver.ACK_AFTER_PERSIST', True)
+    def test_process_msg_poison(self):
+        """
+        Tests that a message that can't be decoded is dead-lettered.
+        """
+        with patch('receiver.receiver.dead_letter_msg') as mock_dead:
+            process_msg(self.mock_channel, self.mock_method,
+                        self.mock_properties, b'not json')
+            self.assertEqual(mock_dead.call_count, 1)
+        self.mock_channel.basic_ack.assert_called_once_with(delivery_tag=1)
+
+    @patch('receiver.receiver.ACK_AFTER_PERSIST', True)
+    def test_process_msg_not_object(self):
+        """
+        Tests that a message containing JSON that isn't an object is
+        dead-lettered rather than raising an error.
+        """
+        for body in (b'[1]', b'"x"', b'1'):
+            self.mock_channel.reset_mock()
+            with patch('receiver.receiver.dead_letter_msg') as mock_dead:
+                process_msg(self.mock_channel, self.mock_method,
+                            self.mock_properties, body)
+                self.assertEqual(mock_dead.call_count, 1)
+            self.mock_channel.basic_ack.assert_called_once_with(
+                delivery_tag=1)
+        self.assertEqual(STATS['processed'], 0)
+
+    @patch('receiver.receiver.ACK_AFTER_PERSIST', False)
+    @patch('receiver.receiver.LogChute.objects.process')
+    def test_process_msg_stats_after_ack(self, mock_process):
+        """
+        Tests that messages processed after they are acked are counted.
+        """
+        process_msg(self.mock_channel, self.mock_method,
+                    self.mock_properties, self.msg)
+        self.assertEqual(mock_process.call_count, 1)
+        self.assertEqual(STATS['processed'], 1)
+
+    @patch('receiver.receiver.ACK_AFTER_PERSIST', True)
+    @patch('receiver.receiver.LogChute.objects.process',
+           side_effect=Exception('bar'))
+    @patch('receiver.receiver.LogChute.objects.process_many',
+           side_effect=Exception('foo'))
+    def test_flush_failure(self, mock_process_many, mock_process):
+        """
+        Tests that each message in a failed batch that also fails on
+        its own is retried before the batch is acked.
+        """
+        batch = MessageBatch('logchutes', size=2, interval=60)
+        for tag in (1, 2):
+            method = Mock()
+            method.delivery_tag = tag
+            batch.add(method, self.mock_properties, self.msg)
+        with patch('receiver.receiver.retry_msg') as mock_retry:
+            batch.flush(self.mock_channel)
+            self.assertEqual(mock_retry.call_count, 2)
+        self.mock_channel.basic_ack.assert_called_once_with(
+            delivery_tag=2, multiple=True)
+
+    @patch('receiver.receiver.ACK_AFTER_PERSIST', True)
+    def test_flush_partial_failure(self):
+        """
+        Tests that only the messages for documents that could not be
+        processed are retried when the rest of the batch succeeds.
+        """
+        batch = MessageBatch('logchutes', size=2, interval=60)
+        bodies = []
+        for tag in (1, 2):
+            method = Mock()
+            method.delivery_tag = tag
+            body = bytes(json.dumps(dict(self.doc, **{'@uuid': str(tag)})),
+                         'utf-8')
+            bodies.append(body)
+            batch.add(method, self.mock_properties, body)
+        error = Exception('foo')
+
+        def fail_second(doc_objs):
+            return [(doc_objs[1], error)]
+
+        with patch('receiver.receiver.LogChute.objects.process_many',
+                   side_effect=fail_second), \
+                patch('receiver.receiver.retry_msg') as mock_retry:
+            batch.flush(self.mock_channel)
+            mock_retry.assert_called_once_with(
+                self.mock_channel, 'logchutes', self.mock_properties,
+                bodies[1], error)
+        self.assertEqual(STATS['processed'], 1)
+        self.mock_channel.basic_ack.assert_called_once_with(
+            delivery_tag=2, multiple=True)
+
+
+class ConsumeQueueTestCase(TransactionTestCase):
+    """
+    Tests the consume_queue function.
+    """
+
+    def setUp(self):
+        logging.disable(logging.ERROR)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    @patch('receiver.receiver.signal.signal')
+    @patch('receiver.receiver.pika.BlockingConnection',
+           side_effect=Exception('foo'))
+    def test_stops_inspection_queue(self, mock_connection, mock_signal):
+        """
+        Tests that the inspection queue is drained and pending Alert
+        incidents are flushed when the consumer stops, since atexit
+        handlers don't run in consumer processes.
+        """
+        with patch('receiver.receiver.INSPECTION_QUEUE') as mock_queue, \
+                patch('receiver.receiver.MUZZLE_WINDOW') as mock_window:
+            mock_queue.qsize.return_value = 0
+            consume_queue('logchutes')
+            mock_queue.stop.assert_called_once_with()
+            mock_window.stop.assert_called_once_with()
+        self.assertEqual(mock_signal.call_count, 1)
+
+    @patch('receiver.receiver.signal.signal')
+    @patch('receiver.receiver.pika.BlockingConnection',
+           side_effect=SystemExit(0))
+    def test_stops_inspection_queue_on_exit(self, mock_connection,
+                                            mock_signal):
+        """
+        Tests that the inspection queue is drained when the consumer
+        process is terminated.
+        """
+        with patch('receiver.receiver.INSPECTION_QUEUE') as mock_queue:
+            mock_queue.qsize.return_value = 0
+            with self.assertRaises(SystemExit):
+                consume_queue('logchutes')
+            mock_queue.stop.assert_called_once_with()
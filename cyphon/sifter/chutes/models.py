@@ -28,9 +28,44 @@ from django.utils.functional import cached_property
 
 # local
 from cyphon.models import SelectRelatedManager, FindEnabledMixin
+from cyphon.plancache import PlanCache
 
 _LOGGER = logging.getLogger(__name__)
 
+# apps whose models are referenced by Chutes and their Mungers, in
+# addition to the apps of the Chute, sieve, and munger models themselves
+_PLAN_APP_LABELS = [
+    'bottles',
+    'companies',
+    'containers',
+    'distilleries',
+    'labels',
+    'procedures',
+    'tastes',
+    'warehouses',
+]
+
+
+class ChutePlan(object):
+    """An immutable routing table for a Chute model.
+
+    Holds the enabled Chutes with their sieves compiled and their
+    mungers loaded, so documents can be routed without querying the
+    database.
+
+    Attributes
+    ----------
+    chutes : tuple
+        Compiled Chutes, in the Chute model's default order.
+
+    """
+
+    def __init__(self, chutes):
+        self.chutes = tuple(chute.compile() for chute in chutes)
+
+    def __len__(self):
+        return len(self.chutes)
+
 
 class ChuteManager(SelectRelatedManager, FindEnabledMixin):
     """
@@ -59,6 +94,55 @@ class ChuteManager(SelectRelatedManager, FindEnabledMixin):
         """
         return self.model._meta.get_field('munger').rel.to
 
+    @property
+    def _sieve_model(self):
+        """
+        Returns the Sieve model used by the Chute model.
+        """
+        return self.model._meta.get_field('sieve').rel.to
+
+    def _get_plan_app_labels(self):
+        """
+        Returns the labels of apps whose models are used to build the
+        ChutePlan.
+        """
+        munger_model = self._munger_model
+        condenser_model = munger_model._meta.get_field('condenser').rel.to
+        models_used = [self.model, self._sieve_model, munger_model,
+                       condenser_model]
+        app_labels = [model._meta.app_label for model in models_used]
+        return app_labels + _PLAN_APP_LABELS
+
+    def _build_plan(self):
+        """
+        Returns a new ChutePlan for the enabled Chutes.
+        """
+        return ChutePlan(self.find_enabled())
+
+    @cached_property
+    def _plan_cache(self):
+        """
+        Returns a PlanCache for the Chute model's ChutePlan.
+        """
+        return PlanCache(
+            name=self.model._meta.label_lower,
+            builder=self._build_plan,
+            app_labels=self._get_plan_app_labels()
+        )
+
+    def get_plan(self):
+        """Get the routing table for enabled Chutes.
+
+        The plan is built once per process and rebuilt when Chutes,
+        sieves, mungers, or related models change.
+
+        Returns
+        -------
+        |ChutePlan|
+
+        """
+        return self._plan_cache.get()
+
     @cached_property
     def _default_munger(self):
         """
@@ -87,14 +171,15 @@ class ChuteManager(SelectRelatedManager, FindEnabledMixin):
         """
         return self._default_munger.process(doc_obj)
 
-    def process(self, doc_obj):
+    def _process_with_chutes(self, doc_obj, chutes):
         """
-
+        Takes a DocumentObj and an iterable of Chutes, and processes the
+        document with each Chute. If none of the Chutes saves the
+        document, processes it with the default Munger, if enabled.
         """
-        enabled_chutes = self.find_enabled()
         saved = False
 
-        for chute in enabled_chutes:
+        for chute in chutes:
             result = chute.process(doc_obj)
             if result:
                 saved = True
@@ -102,6 +187,42 @@ class ChuteManager(SelectRelatedManager, FindEnabledMixin):
         if not saved and self._default_munger_enabled:
             self._process_with_default(doc_obj)
 
+    def process(self, doc_obj):
+        """
+
+        """
+        plan = self.get_plan()
+        self._process_with_chutes(doc_obj, plan.chutes)
+
+    def process_many(self, doc_objs):
+        """Process a batch of documents with the enabled Chutes.
+
+        Each document is processed on its own, so an error raised for
+        one document doesn't prevent the others from being saved.
+
+        Parameters
+        ----------
+        doc_objs : |list| of |DocumentObj|
+            The documents to be processed.
+
+        Returns
+        -------
+        |list| of |tuple|
+            A (|DocumentObj|, |Exception|) tuple for each document that
+            could not be processed.
+
+        """
+        plan = self.get_plan()
+        failures = []
+        for doc_obj in doc_objs:
+            try:
+                self._process_with_chutes(doc_obj, plan.chutes)
+            except Exception as error:
+                _LOGGER.exception('An error occurred while processing %s: %s',
+                                  doc_obj, error)
+                failures.append((doc_obj, error))
+        return failures
+
 
 class Chute(models.Model):
     """
@@ -109,6 +230,8 @@ class Chute(models.Model):
     """
     enabled = models.BooleanField(default=True)
 
+    _compiled_sieve = None
+
     class Meta:
         """
         Metadata options for a Django Model.
@@ -129,11 +252,31 @@ class Chute(models.Model):
         matches the rules defined by the Chute's sieve. Otherwise,
         returns False.
         """
-        if self.sieve:
+        if self._compiled_sieve is not None:
+            return self._compiled_sieve.is_match(data)
+        elif self.sieve:
             return self.sieve.is_match(data)
         else:
             return True
 
+    def compile(self):
+        """Prepare the Chute for processing many documents.
+
+        Compiles the Chute's sieve and munger, so that matching
+        documents can be routed and condensed without querying the
+        database for the Chute's configuration.
+
+        Returns
+        -------
+        |Chute|
+            The Chute itself.
+
+        """
+        if self.sieve:
+            self._compiled_sieve = self.sieve.compile()
+        self.munger.compile()
+        return self
+
     def _munge(self, doc_obj):
         """
         Takes a DocumentObj, processes the data with the Chute's munger,
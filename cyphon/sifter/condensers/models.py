@@ -38,6 +38,48 @@ from parsers.models import Parser
 LOGGER = logging.getLogger(__name__)
 
 
+class CompiledCondenser(object):
+    """An in-memory crosswalk for a |Condenser|.
+
+    Holds the Condenser's Fittings, including those of nested
+    Condensers, as a flat list, so data can be condensed without
+    querying the database.
+
+    Attributes
+    ----------
+    fittings : tuple
+        A (path, process) tuple for each Fitting, where `path` is a
+        tuple of target field names and `process` is the compiled
+        Parser's process method. For a nested Condenser, `process` is
+        |None|, and the path marks where its embedded document is
+        created. A nested Condenser's Fittings follow its own entry.
+
+    """
+
+    def __init__(self, fittings):
+        self.fittings = tuple(fittings)
+
+    def process(self, data, **kwargs):
+        """
+        Takes a dictionary of data (e.g., of a social media post) and
+        returns a dictionary that distills the data using the compiled
+        crosswalk.
+        """
+        custom_doc = {}
+
+        for path, process in self.fittings:
+            target = custom_doc
+            for field_name in path[:-1]:
+                target = target[field_name]
+
+            if process is None:
+                target[path[-1]] = {}
+            else:
+                target[path[-1]] = process(data, **kwargs)
+
+        return custom_doc
+
+
 class Condenser(models.Model):
     """
     Defines a crosswalk for transforming data into a user-defined format defined
@@ -107,6 +149,41 @@ class Condenser(models.Model):
 
         return custom_doc
 
+    def _flatten_fittings(self, prefix=()):
+        """
+        Takes a tuple of target field names for the Condenser's
+        embedded document, and returns a list of (path, process) tuples
+        for the Condenser's Fittings and those of nested Condensers.
+        """
+        fittings = []
+
+        for fitting in self.fittings.all():
+            path = prefix + (fitting.target_field_name, )
+            field_parser = fitting.field_parser
+
+            if fitting.is_parser():
+                fittings.append((path, field_parser.compile().process))
+
+            # if the field represents another Bottle, flatten its fittings
+            else:
+                fittings.append((path, None))
+                fittings.extend(field_parser._flatten_fittings(path))
+
+        return fittings
+
+    def compile(self):
+        """Build an in-memory crosswalk for the Condenser.
+
+        Returns
+        -------
+        |CompiledCondenser|
+            The Condenser's Fittings, with their Parsers loaded and
+            compiled, which can condense data without querying the
+            database.
+
+        """
+        return CompiledCondenser(self._flatten_fittings())
+
     def process(self, data, **kwargs):
         """
         Takes a dictionary of data (e.g., of a social media post) and a
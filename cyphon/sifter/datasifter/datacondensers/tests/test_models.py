@@ -87,6 +87,30 @@ class DataCondenserTestCase(DataCondenserBaseTestCase, CondenserTestCaseMixin):
             for item in actual:
                 self.assertEqual(actual[item], expected[item])
 
+    def test_compile(self):
+        """
+        Tests that a compiled DataCondenser gives the same result as the
+        DataCondenser without querying the database.
+        """
+        with patch('sifter.datasifter.datacondensers.models.DataParser.process',
+                   return_value='some text'):
+            compiled = self.condenser.compile()
+            expected = self.condenser.process({'text': 'example text'})
+            with self.assertNumQueries(0):
+                actual = compiled.process({'text': 'example text'})
+            self.assertEqual(actual, expected)
+
+    def test_compile_nested(self):
+        """
+        Tests that the Fittings of nested DataCondensers are flattened.
+        """
+        compiled = self.condenser.compile()
+        paths = [path for (path, _) in compiled.fittings]
+        self.assertIn(('user', ), paths)
+        self.assertIn(('user', 'screen_name'), paths)
+        self.assertLess(paths.index(('user', )),
+                        paths.index(('user', 'screen_name')))
+
 
 class DataFittingTestCase(DataCondenserBaseTestCase, FittingTestCaseMixin):
     """
@@ -88,6 +88,21 @@ class DataSieveTestCase(TestCase):
         data = {'subject': 'this is a critical alert'}
         self.assertFalse(self.datasieve.is_match(data))
 
+    def test_compile(self):
+        """
+        Tests that a compiled DataSieve gives the same results as the
+        DataSieve.
+        """
+        compiled = self.datasieve.compile()
+        docs = [
+            {'subject': 'this is a critical alert'},
+            {'subject': 'this is an urgent alert'},
+            {'subject': 'this is an urgent notice'},
+        ]
+        for doc in docs:
+            self.assertEqual(compiled.is_match(doc),
+                             self.datasieve.is_match(doc))
+
 
 class DataSieveNodeTestCase(TestCase):
     """
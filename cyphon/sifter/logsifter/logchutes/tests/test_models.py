@@ -20,9 +20,9 @@ Tests the LogChute class.
 
 # standard library
 try:
-    from unittest.mock import patch
+    from unittest.mock import Mock, patch
 except ImportError:
-    from mock import patch
+    from mock import Mock, patch
 
 # third party
 from django.test import TestCase
@@ -100,3 +100,33 @@ class LogChuteTestCase(TestCase):
                      'ERROR',
                      'Default LogMunger "dummy_munger" is not configured.'),
                 )
+
+    def test_process_many(self):
+        """
+        Tests that the process_many method fetches enabled chutes once
+        and processes each document with them.
+        """
+        doc_objs = [Mock(), Mock()]
+        enabled_chutes = list(LogChute.objects.find_enabled())
+        with patch.object(LogChute.objects, 'find_enabled',
+                          return_value=enabled_chutes) as mock_find:
+            with patch.object(LogChute.objects,
+                              '_process_with_chutes') as mock_process:
+                LogChute.objects.process_many(doc_objs)
+                mock_find.assert_called_once_with()
+                mock_process.assert_any_call(doc_objs[0], enabled_chutes)
+                mock_process.assert_any_call(doc_objs[1], enabled_chutes)
+
+    def test_process_many_failure(self):
+        """
+        Tests that the process_many method continues past a document
+        that raises an error and returns it with the error.
+        """
+        doc_objs = [Mock(), Mock()]
+        error = Exception('foo')
+        with patch.object(LogChute.objects, '_process_with_chutes',
+                          side_effect=[error, None]) as mock_process:
+            with LogCapture():
+                failures = LogChute.objects.process_many(doc_objs)
+        self.assertEqual(mock_process.call_count, 2)
+        self.assertEqual(failures, [(doc_objs[0], error)])
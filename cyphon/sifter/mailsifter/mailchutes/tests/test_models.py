@@ -90,6 +90,33 @@ class MailChuteTestCase(TestCase):
         mailchute.munger.process.assert_called_once_with(doc_obj)
         self.assertEqual(doc_id, mock_doc_id)
 
+    def test_process_compiled(self):
+        """
+        Tests that a compiled chute processes a matching email without
+        querying the database.
+        """
+        email = {'Message-ID': 'abc', 'Subject': 'This is a Critical Alert'}
+        doc_obj = DocumentObj(data=email)
+
+        mailchute = MailChute.objects.get(pk=1).compile()
+        mailchute.munger.process = Mock(return_value=1)
+
+        with self.assertNumQueries(0):
+            doc_id = mailchute.process(doc_obj)
+
+        mailchute.munger.process.assert_called_once_with(doc_obj)
+        self.assertEqual(doc_id, 1)
+
+    def test_get_plan(self):
+        """
+        Tests that the get_plan method returns a ChutePlan containing
+        the enabled chutes.
+        """
+        plan = MailChute.objects.get_plan()
+        expected = MailChute.objects.find_enabled()
+        self.assertEqual([chute.pk for chute in plan.chutes],
+                         [chute.pk for chute in expected])
+
 
 # NOTE: use TransactionTestCase to handle threading
 
@@ -56,4 +56,4 @@ class MailMunger(Munger):
         using the crosswalk defined by the Condenser.
         """
         company = self._get_company()
-        return self.condenser.process(data=data, company=company)
+        return self._get_condenser().process(data=data, company=company)
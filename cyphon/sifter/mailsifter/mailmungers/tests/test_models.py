@@ -19,10 +19,11 @@
 """
 
 # standard library
+import copy
 try:
-    from unittest.mock import Mock
+    from unittest.mock import Mock, patch
 except ImportError:
-    from mock import Mock
+    from mock import Mock, patch
 
 # third party
 from django.test import TestCase
@@ -62,3 +63,43 @@ class MailMungerTestCase(TestCase):
 
         assert mailmunger.distillery.save_data.call_count == 1
         self.assertEqual(doc_id, mock_doc_id)
+
+    def test_process_does_not_copy_data(self):
+        """
+        Tests that the process method saves a new DocumentObj without
+        copying the raw data.
+        """
+        email = {'Message-ID': 'abc', 'Subject': 'This is a Critical Alert'}
+        doc_obj = DocumentObj(data=email, doc_id='1', platform='email')
+        condensed = {'subject': 'This is a Critical Alert'}
+
+        mailmunger = MailMunger.objects.get_by_natural_key('mail')
+        mailmunger.condenser.process = Mock(return_value=condensed)
+        mailmunger.distillery.save_data = Mock(return_value='2')
+
+        mailmunger.process(doc_obj)
+
+        saved_doc_obj = mailmunger.distillery.save_data.call_args[0][0]
+        self.assertIsNot(saved_doc_obj, doc_obj)
+        self.assertIs(saved_doc_obj.data, condensed)
+        self.assertEqual(saved_doc_obj.doc_id, '1')
+        self.assertEqual(saved_doc_obj.platform, 'email')
+        self.assertIs(doc_obj.data, email)
+
+    def test_process_no_copy(self):
+        """
+        Tests that the process method doesn't copy the raw document.
+        """
+        email = {'Message-ID': 'abc', 'Subject': 'This is a Critical Alert'}
+        doc_obj = DocumentObj(data=email)
+
+        mailmunger = MailMunger.objects.get_by_natural_key('mail')
+        mailmunger.condenser.process = Mock(return_value={'subject': 'abc'})
+        mailmunger.distillery.save_data = Mock(return_value='1')
+
+        with patch('copy.deepcopy', wraps=copy.deepcopy) as mock_deepcopy:
+            mailmunger.process(doc_obj)
+        copied = [call[0][0] for call in mock_deepcopy.call_args_list]
+        self.assertFalse(any(obj is doc_obj or obj is email
+                             for obj in copied))
+        self.assertEqual(mailmunger.distillery.save_data.call_count, 1)
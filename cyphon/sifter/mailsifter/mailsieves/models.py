@@ -52,6 +52,12 @@ class MailRule(Rule):
         value = accessors.get_email_value(self.field_name, data)
         return str(value)
 
+    def _get_string_key(self):
+        """
+        Returns the name of the email component examined by the MailRule.
+        """
+        return self.field_name
+
 
 class MailSieve(Sieve):
     """
@@ -18,9 +18,6 @@
 
 """
 
-# standard library
-import copy
-
 # third party
 from django.db import models
 
@@ -51,9 +48,20 @@ class Munger(models.Model):
         unique_together = ('condenser', 'distillery')
         ordering = ['name']
 
+    _compiled_condenser = None
+
     def __str__(self):
         return self.name
 
+    def _get_condenser(self):
+        """
+        Returns the compiled Condenser if the Munger has been compiled.
+        Otherwise, returns the Condenser.
+        """
+        if self._compiled_condenser is not None:
+            return self._compiled_condenser
+        return self.condenser
+
     def _save_data(self, doc_obj):
         """
 
@@ -66,7 +74,25 @@ class Munger(models.Model):
         Condenser. Returns a dictionary that distills the data
         using the crosswalk defined by the Condenser.
         """
-        return self.condenser.process(data)
+        return self._get_condenser().process(data)
+
+    def compile(self):
+        """Prepare the Munger for processing many documents.
+
+        Compiles the Munger's Condenser and loads its Distillery's
+        Collection, so that data can be condensed without querying the
+        database for the Munger's configuration.
+
+        Returns
+        -------
+        |Munger|
+            The Munger itself.
+
+        """
+        self._compiled_condenser = self.condenser.compile()
+        # load related objects so they are cached on the Munger
+        dummy_related = self.distillery.collection
+        return self
 
     def process(self, doc_obj):
         """
@@ -82,7 +108,6 @@ class Munger(models.Model):
 
         """
         parsed_data = self._process_data(doc_obj.data)
-        new_doc_obj = copy.deepcopy(doc_obj)
-        new_doc_obj.data = parsed_data
+        new_doc_obj = doc_obj.with_data(parsed_data)
         doc_id = self._save_data(new_doc_obj)
         return doc_id
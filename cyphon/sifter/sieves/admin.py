@@ -18,6 +18,9 @@
 
 """
 
+# standard library
+import json
+
 # third party
 from django.contrib import admin
 from django.utils.translation import ugettext_lazy as _
@@ -133,4 +136,17 @@ class SieveAdmin(admin.ModelAdmin):
         'get_node_number',
     ]
     list_display_links = ['name', ]
+    readonly_fields = ['node_stats', ]
     save_as = True
+
+    def node_stats(self, instance):
+        """
+        Displays the most recent evaluation statistics for the Sieve's
+        nodes, if adaptive ordering is enabled.
+        """
+        stats = instance.get_node_stats()
+        if stats:
+            return json.dumps(stats, indent=4)
+        return _('No statistics have been recorded.')
+
+    node_stats.short_description = _('node statistics')
@@ -25,17 +25,23 @@ Class                   Description
 :class:`~FieldRule`     A Rule subclass for use with a dictionary.
 :class:`~Sieve`         An abstract base class for models that define rulesets.
 :class:`~SieveManager`  Model Manager for Sieves.
+:class:`~CompiledSieve` An in-memory evaluation tree for a Sieve.
+:class:`~RuleGroup`     Rules evaluated with a single combined regex.
+:class:`~NodeStats`     Evaluation counters for a node of a CompiledSieve.
 ======================  =======================================================
 
 """
 
 # standard library
+from collections import OrderedDict
 import logging
 import operator
 import re
-import sre_constants
+import time
 
 # third party
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -46,11 +52,27 @@ from django.utils.translation import ugettext_lazy as _
 from cyphon.models import GetByNameManager
 from cyphon.choices import LOGIC_CHOICES, RANGE_CHOICES, REGEX_CHOICES
 from lab.procedures.models import Protocol
-from utils.parserutils.parserutils import get_dict_value
+from utils.parserutils.parserutils import (
+    clear_compiled_regexes,
+    compile_field_path,
+    get_compiled_regex,
+)
 from utils.validators.validators import regex_validator
 
 LOGGER = logging.getLogger(__name__)
 
+_SIEVE_SETTINGS = getattr(settings, 'SIEVES', {})
+
+ADAPTIVE_ORDERING = _SIEVE_SETTINGS.get('ADAPTIVE_ORDERING', False)
+REORDER_INTERVAL = _SIEVE_SETTINGS.get('REORDER_INTERVAL', 1000)
+STATS_INTERVAL = _SIEVE_SETTINGS.get('STATS_INTERVAL', 60)
+
+_STATS_KEY_PREFIX = 'cyphon.sievestats.'
+
+# patterns that can't be safely combined with others in an alternation,
+# because they refer to groups by number or set global inline flags
+_UNCOMBINABLE_REGEX = re.compile(r'\\[1-9]|\(\?P=|\(\?\(|\(\?[aiLmsux]+\)')
+
 
 class Rule(models.Model):
     """An abstract base class for models that define rules.
@@ -118,6 +140,9 @@ class Rule(models.Model):
                     'if the data does NOT match the condition.')
     )
 
+    _regex = None
+    _regex_params = None
+
     class Meta(object):
         """Metadata options."""
 
@@ -150,6 +175,31 @@ class Rule(models.Model):
         if self.is_regex:
             regex_validator(self.value)
 
+    def save(self, *args, **kwargs):
+        """
+        Overrides the save() method to discard compiled regexes for
+        the Rule's previous settings.
+        """
+        super(Rule, self).save(*args, **kwargs)
+        clear_compiled_regexes(self._regex_owner)
+
+    def delete(self, *args, **kwargs):
+        """
+        Overrides the delete() method to discard compiled regexes for
+        the Rule.
+        """
+        owner = self._regex_owner
+        result = super(Rule, self).delete(*args, **kwargs)
+        clear_compiled_regexes(owner)
+        return result
+
+    @property
+    def _regex_owner(self):
+        """
+        Returns a key identifying the Rule in the compiled regex cache.
+        """
+        return (self._meta.label_lower, self.pk)
+
     def _preprocess(self, data):
         self.protocol.process(data)
 
@@ -183,6 +233,42 @@ class Rule(models.Model):
         """
         raise NotImplementedError()
 
+    def _get_string_key(self):
+        """
+        Returns a hashable key identifying the string examined by the
+        Rule, or None if Rules of this type shouldn't share a string.
+        Rules of the same type with the same key examine the same string.
+        """
+        return None
+
+    def get_group_key(self):
+        """Get a key for grouping the Rule with similar Rules.
+
+        Rules with the same key examine the same string with the same
+        case sensitivity, so their regexes can be combined into a
+        single pattern.
+
+        Returns
+        -------
+        |tuple| or |None|
+            A key for the Rule, or |None| if the Rule can't be combined
+            with other Rules (e.g., because it is negated, uses a
+            |Protocol|, or makes a numeric comparison).
+
+        """
+        if self.negate or self.protocol_id is not None \
+                or self._get_operator_type() != 'CharField':
+            return None
+
+        string_key = self._get_string_key()
+        regex = self._get_regex()
+
+        if string_key is None or regex is None \
+                or _UNCOMBINABLE_REGEX.search(regex.pattern):
+            return None
+
+        return (type(self), string_key, self.case_sensitive)
+
     def _get_operator_type(self):
         """
         Returns the type of field that is being examined by the rule.
@@ -195,26 +281,35 @@ class Rule(models.Model):
         """
         return self.operator.split(':')[1]
 
+    def _get_regex(self):
+        """
+        Returns a compiled regular expression for the Rule, or None if
+        the Rule's regex can't be compiled. Compiled patterns are cached
+        by the Rule's primary key, value, operator, and case sensitivity.
+        """
+        params = (self.value, self.operator, self.is_regex,
+                  self.case_sensitive)
+
+        if params != self._regex_params:
+            flags = 0 if self.case_sensitive else re.IGNORECASE
+            self._regex = get_compiled_regex(self._regex_owner,
+                                             self._create_regex(), flags)
+            self._regex_params = params
+
+        return self._regex
+
     def _matches_regex(self, data):
         """
         Takes a dictionary or a string of data and returns True if the data
         matches the Rule's regex. Otherwise, returns False.
         """
-        regex = self._create_regex()
-        string = self._get_string(data)
-        args = [regex, string]
+        regex = self._get_regex()
 
-        if not self.case_sensitive:
-            args.append(re.IGNORECASE)
-
-        try:
-            if re.search(*args):
-                return True
-        except sre_constants.error:
-            LOGGER.error('Cannot parse the regex "%s" for %s %s',
-                         regex, self.__class__.__name__, self.id)
+        if regex is None:
+            return False
 
-        return False
+        string = self._get_string(data)
+        return regex.search(string) is not None
 
     def _check_value(self, value):
         """
@@ -286,6 +381,13 @@ class StringRule(Rule):
         """
         return str(data)
 
+    def _get_string_key(self):
+        """
+        Returns a key indicating that the Rule examines the whole data
+        object.
+        """
+        return 'data'
+
 
 class FieldRule(Rule):
     """A Rule subclass for use with a dictionary.
@@ -347,7 +449,7 @@ class FieldRule(Rule):
         Takes a dictionary and returns the value for the key specified by the
         field_name.
         """
-        return get_dict_value(self.field_name, data)
+        return compile_field_path(self.field_name).get_value(data)
 
     def _get_string(self, data):
         """
@@ -357,6 +459,12 @@ class FieldRule(Rule):
         value = self._get_value(data)
         return str(value)
 
+    def _get_string_key(self):
+        """
+        Returns the name of the field examined by the Rule.
+        """
+        return self.field_name
+
     def _is_null(self, data):
         """
 
@@ -432,6 +540,380 @@ class SieveManager(GetByNameManager):
         return default_sieve
 
 
+class RuleGroup(object):
+    """Rules that examine the same string, combined with 'OR' logic.
+
+    The Rules' patterns are combined into a single alternation, so the
+    string is extracted once and scanned once, and the combined regex
+    gives the result directly. Rules combined with 'AND' logic aren't
+    grouped, since a hit on one alternative would still leave every
+    other Rule to be checked.
+
+    Attributes
+    ----------
+    rules : tuple
+        Rules that share the same :meth:`~Rule.get_group_key`.
+
+    """
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self._regex = self._combine(self.rules)
+
+    def __str__(self):
+        return ' | '.join(str(rule) for rule in self.rules)
+
+    @staticmethod
+    def _combine(rules):
+        """
+        Takes a list of Rules and returns a compiled regex combining
+        their patterns.
+        """
+        alternatives = ['(?:%s)' % rule._get_regex().pattern
+                        for rule in rules]
+        flags = rules[0]._get_regex().flags
+        return re.compile('|'.join(alternatives), flags)
+
+    def is_match(self, data):
+        """
+        Takes a data object and returns True if the data meet the
+        criteria of any of the Rules. Otherwise, returns False.
+        """
+        string = self.rules[0]._get_string(data)
+        return self._regex.search(string) is not None
+
+
+class NodeStats(object):
+    """Evaluation counters for a node of a |CompiledSieve|.
+
+    Attributes
+    ----------
+    evaluations : int
+        The number of times the node has been evaluated.
+
+    hits : int
+        The number of evaluations for which the node returned True.
+
+    elapsed : float
+        The total time spent evaluating the node, in seconds.
+
+    """
+
+    __slots__ = ('evaluations', 'hits', 'elapsed')
+
+    def __init__(self):
+        self.evaluations = 0
+        self.hits = 0
+        self.elapsed = 0.0
+
+    @property
+    def hit_rate(self):
+        """
+        Returns the proportion of evaluations that returned True,
+        smoothed so that unobserved nodes start at 0.5.
+        """
+        return (self.hits + 1) / (self.evaluations + 2)
+
+    @property
+    def cost(self):
+        """
+        Returns the average time spent evaluating the node, in seconds.
+        """
+        if self.evaluations:
+            return self.elapsed / self.evaluations
+        return 0.0
+
+    def record(self, hit, elapsed):
+        """
+        Takes the result of an evaluation and the time it took, and
+        adds them to the counters.
+        """
+        self.evaluations += 1
+        self.hits += hit
+        self.elapsed += elapsed
+
+    def decay(self):
+        """
+        Halves the counters, so that recent evaluations outweigh older
+        ones when the data stream changes.
+        """
+        self.evaluations //= 2
+        self.hits //= 2
+        self.elapsed /= 2
+
+    def get_rank(self, logic):
+        """
+        Takes the logic of the parent CompiledSieve and returns the
+        expected cost of evaluating the node per short-circuit. Nodes
+        with lower ranks should be evaluated first.
+        """
+        if logic == 'AND':
+            stop_rate = 1 - self.hit_rate
+        else:
+            stop_rate = self.hit_rate
+        return self.cost / stop_rate
+
+    def to_dict(self):
+        """
+        Returns a dictionary of the counters for display.
+        """
+        return {
+            'evaluations': self.evaluations,
+            'hits': self.hits,
+            'hit_rate': round(self.hit_rate, 4),
+            'avg_cost_us': round(self.cost * 1e6, 3),
+        }
+
+    @classmethod
+    def from_dict(cls, node_dict):
+        """
+        Takes a dictionary returned by :meth:`~NodeStats.to_dict` and
+        returns a NodeStats with the same counters.
+        """
+        stats = cls()
+        stats.evaluations = node_dict.get('evaluations', 0)
+        stats.hits = node_dict.get('hits', 0)
+        stats.elapsed = node_dict.get('avg_cost_us', 0) / 1e6 \
+            * stats.evaluations
+        return stats
+
+
+class CompiledSieve(object):
+    """An in-memory evaluation tree for a |Sieve|.
+
+    Holds the Sieve's nodes as loaded Rules and nested CompiledSieves,
+    so data can be examined without querying the database. Nested
+    Sieves that use the same logic as their parent and are not negated
+    are merged into the parent. For 'OR' logic, regex Rules that
+    examine the same string are combined into |RuleGroups|.
+
+    If adaptive ordering is enabled, the CompiledSieve records how
+    often each node returns True and how long it takes, and reorders
+    its nodes every ``REORDER_INTERVAL`` evaluations. For 'AND' logic,
+    cheap nodes that are likely to fail are moved forward; for 'OR'
+    logic, cheap nodes that are likely to succeed are. Results are
+    unchanged. A snapshot of the counters is saved to Django's cache
+    under `stats_key`, at most once every ``STATS_INTERVAL`` seconds.
+    A new CompiledSieve starts from the saved snapshot, so its nodes
+    don't have to be relearned when the Sieve is recompiled.
+
+    Attributes
+    ----------
+    logic : str
+        The logic used to combine nodes, which can be 'AND' or 'OR'.
+
+    negate : bool
+        Whether the result should be negated.
+
+    nodes : tuple
+        Rules, RuleGroups, and CompiledSieves to be evaluated.
+
+    name : str
+        The name of the Sieve.
+
+    adaptive : bool
+        Whether nodes should be reordered based on observed cost and
+        hit rate.
+
+    stats_key : str
+        The key under which a snapshot of the node statistics is saved
+        in Django's cache, or |None| if it shouldn't be saved.
+
+    """
+
+    def __init__(self, logic, negate, nodes, name=None, adaptive=False,
+                 stats_key=None):
+        self.logic = logic
+        self.negate = negate
+        self.nodes = tuple(self._group(self._flatten(nodes)))
+        self.name = name
+        self.adaptive = adaptive
+        self.stats_key = stats_key
+        self._entries = tuple((node, NodeStats()) for node in self.nodes)
+        self._evaluations = 0
+        self._published = 0.0
+
+        if adaptive and stats_key:
+            self._seed(cache.get(stats_key))
+
+    def __str__(self):
+        return self.name or '%s sieve' % self.logic
+
+    def _flatten(self, nodes):
+        """
+        Takes a list of nodes and yields them, replacing nested
+        CompiledSieves that can be merged with their own nodes.
+        """
+        for node in nodes:
+            if isinstance(node, CompiledSieve) \
+                    and node.logic == self.logic and not node.negate:
+                for child in node.nodes:
+                    yield child
+            else:
+                yield node
+
+    def _group(self, nodes):
+        """
+        Takes an iterable of nodes and returns a list in which Rules
+        that can be combined are replaced by RuleGroups. Each RuleGroup
+        takes the place of its first Rule. Rules are only grouped for
+        'OR' logic.
+        """
+        if self.logic != 'OR':
+            return list(nodes)
+
+        slots = []
+        groups = OrderedDict()
+
+        for node in nodes:
+            key = node.get_group_key() if isinstance(node, Rule) else None
+            if key is None:
+                slots.append(node)
+            else:
+                if key not in groups:
+                    groups[key] = []
+                    slots.append(key)
+                groups[key].append(node)
+
+        grouped = []
+        for slot in slots:
+            if isinstance(slot, tuple) and slot in groups:
+                rules = groups[slot]
+                try:
+                    if len(rules) > 1:
+                        grouped.append(RuleGroup(rules))
+                    else:
+                        grouped.extend(rules)
+                except re.error:
+                    # the combined pattern is invalid (e.g., too many
+                    # groups), so evaluate the Rules one at a time
+                    grouped.extend(rules)
+            else:
+                grouped.append(slot)
+        return grouped
+
+    def _evaluate_adaptive(self, data):
+        """
+        Takes a dictionary of data and returns the combined result of
+        the nodes, recording each node's result and evaluation time.
+        """
+        # 'AND' logic stops at the first False; 'OR' at the first True
+        stop_on = self.logic != 'AND'
+
+        for node, stats in self._entries:
+            start = time.perf_counter()
+            result = node.is_match(data)
+            stats.record(result, time.perf_counter() - start)
+            if result == stop_on:
+                return stop_on
+
+        return not stop_on
+
+    def _seed(self, snapshot):
+        """
+        Takes a snapshot saved by :meth:`~CompiledSieve.reorder`, or
+        |None|, and restores the counters of nodes it describes, then
+        orders the nodes by them.
+        """
+        if not snapshot or snapshot.get('logic') != self.logic:
+            return
+
+        saved = {}
+        for node_dict in snapshot.get('nodes', []):
+            saved.setdefault(node_dict['node'], node_dict)
+
+        self._entries = tuple(
+            (node, NodeStats.from_dict(saved[str(node)])
+             if str(node) in saved else NodeStats())
+            for node, _ in self._entries
+        )
+        self._sort()
+
+    def _sort(self):
+        """
+        Orders the nodes by their expected cost per short-circuit.
+        """
+        # sorted() is stable, so untested nodes keep their configured order
+        self._entries = tuple(sorted(
+            self._entries,
+            key=lambda entry: entry[1].get_rank(self.logic)
+        ))
+        self.nodes = tuple(node for node, _ in self._entries)
+
+    def _publish(self):
+        """
+        Saves a snapshot of the statistics to Django's cache, unless
+        one was saved less than ``STATS_INTERVAL`` seconds ago.
+        """
+        now = time.time()
+        if now - self._published < STATS_INTERVAL:
+            return
+
+        self._published = now
+        snapshot = {
+            'logic': self.logic,
+            'updated': now,
+            'nodes': self.get_stats(),
+        }
+        cache.set(self.stats_key, snapshot, None)
+
+    def get_stats(self):
+        """Get the evaluation statistics for the CompiledSieve's nodes.
+
+        Returns
+        -------
+        |list| of |dict|
+            Counters for each node, in current evaluation order.
+
+        """
+        stats = []
+        for node, node_stats in self._entries:
+            node_dict = node_stats.to_dict()
+            node_dict['node'] = str(node)
+            stats.append(node_dict)
+        return stats
+
+    def reorder(self):
+        """Reorder the nodes by their observed cost and hit rate.
+
+        Saves a snapshot of the statistics if one is due, then decays
+        the counters.
+
+        Returns
+        -------
+        None
+
+        """
+        self._sort()
+
+        if self.stats_key:
+            self._publish()
+
+        for _, stats in self._entries:
+            stats.decay()
+
+    def is_match(self, data):
+        """
+        Takes a dictionary of data and returns True if the data meet the
+        criteria of the compiled Sieve. Otherwise, returns False.
+        """
+        if self.adaptive:
+            match = self._evaluate_adaptive(data)
+            self._evaluations += 1
+            if self._evaluations >= REORDER_INTERVAL:
+                self._evaluations = 0
+                self.reorder()
+        elif self.logic == 'AND':
+            match = all(node.is_match(data) for node in self.nodes)
+        else:
+            match = any(node.is_match(data) for node in self.nodes)
+
+        if self.negate:
+            return not match
+        else:
+            return match
+
+
 class Sieve(models.Model):
     """An abstract base class for models that define rulesets.
 
@@ -498,6 +980,54 @@ class Sieve(models.Model):
 
     get_node_number.short_description = _('nodes')
 
+    def _get_stats_key(self):
+        """
+        Returns the key for the Sieve's node statistics in Django's
+        cache.
+        """
+        return '%s%s.%s' % (_STATS_KEY_PREFIX, self._meta.label_lower,
+                            self.pk)
+
+    def get_node_stats(self):
+        """Get the most recent node statistics for the Sieve.
+
+        Statistics are only recorded if adaptive ordering is enabled.
+
+        Returns
+        -------
+        |dict| or |None|
+            A snapshot of the evaluation statistics saved by the
+            Sieve's |CompiledSieve|, or |None| if none is available.
+
+        """
+        return cache.get(self._get_stats_key())
+
+    def compile(self):
+        """Build an in-memory evaluation tree for the Sieve.
+
+        Returns
+        -------
+        |CompiledSieve|
+            A tree of the Sieve's Rules and nested Sieves that can be
+            evaluated without querying the database.
+
+        """
+        nodes = []
+        for node in self.nodes.all():
+            node_object = node.node_object
+            if isinstance(node_object, Sieve):
+                nodes.append(node_object.compile())
+            else:
+                nodes.append(node_object)
+        return CompiledSieve(
+            logic=self.logic,
+            negate=self.negate,
+            nodes=nodes,
+            name=self.name,
+            adaptive=ADAPTIVE_ORDERING,
+            stats_key=self._get_stats_key()
+        )
+
     def is_match(self, data):
         """
         Takes a dictionary of data and returns True if the data meet the
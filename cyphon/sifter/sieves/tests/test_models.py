@@ -21,12 +21,22 @@ Tests the Rules and RuleSet classes.
 # standard library
 import logging
 from unittest import TestCase
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
 
 # third party
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 
 # local
-from sifter.sieves.models import FieldRule
+from sifter.sieves.models import (
+    CompiledSieve,
+    FieldRule,
+    NodeStats,
+    RuleGroup,
+)
 
 
 class FieldRuleTestCase(TestCase):
@@ -321,3 +331,347 @@ class FieldRuleTestCase(TestCase):
             self.fail('Rule raised ValidationError unexpectedly')
         with self.assertRaises(ValidationError):
             self.assertFalse(invalid_rule.clean())
+
+
+class RuleRegexTestCase(TestCase):
+    """
+    Tests regex compilation for the Rule class.
+    """
+
+    def setUp(self):
+        logging.disable(logging.ERROR)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_regex_compiled_once(self):
+        """
+        Tests that a Rule's regex is compiled once and reused.
+        """
+        rule = FieldRule(
+            field_name='subject',
+            operator='CharField:x',
+            value='critical'
+        )
+        regex = rule._get_regex()
+        self.assertIs(rule._get_regex(), regex)
+
+    def test_regex_recompiled_after_change(self):
+        """
+        Tests that a Rule's regex is recompiled when its value changes.
+        """
+        rule = FieldRule(
+            field_name='subject',
+            operator='CharField:x',
+            value='critical'
+        )
+        data = {'subject': 'this is an urgent alert'}
+        self.assertFalse(rule.is_match(data))
+        rule.value = 'urgent'
+        self.assertTrue(rule.is_match(data))
+
+    def test_invalid_regex(self):
+        """
+        Tests that a Rule with an invalid regex doesn't match.
+        """
+        rule = FieldRule(
+            field_name='subject',
+            operator='CharField:x',
+            value='(critical',
+            is_regex=True
+        )
+        data = {'subject': 'this is a (critical alert'}
+        self.assertIsNone(rule._get_regex())
+        self.assertFalse(rule.is_match(data))
+
+
+class CompiledSieveTestCase(TestCase):
+    """
+    Tests the CompiledSieve class.
+    """
+
+    def setUp(self):
+        self.critical_rule = FieldRule(
+            field_name='subject',
+            operator='CharField:x',
+            value='critical'
+        )
+        self.alert_rule = FieldRule(
+            field_name='subject',
+            operator='CharField:x',
+            value='alert'
+        )
+        self.urgent_rule = FieldRule(
+            field_name='subject',
+            operator='CharField:x',
+            value='urgent'
+        )
+
+    def test_and(self):
+        """
+        Tests the is_match method for 'AND' logic.
+        """
+        sieve = CompiledSieve('AND', False,
+                              [self.critical_rule, self.alert_rule])
+        self.assertTrue(sieve.is_match({'subject': 'critical alert'}))
+        self.assertFalse(sieve.is_match({'subject': 'critical notice'}))
+
+    def test_or(self):
+        """
+        Tests the is_match method for 'OR' logic.
+        """
+        sieve = CompiledSieve('OR', False,
+                              [self.critical_rule, self.urgent_rule])
+        self.assertTrue(sieve.is_match({'subject': 'urgent notice'}))
+        self.assertFalse(sieve.is_match({'subject': 'minor notice'}))
+
+    def test_negate(self):
+        """
+        Tests the is_match method for a negated CompiledSieve.
+        """
+        sieve = CompiledSieve('OR', True,
+                              [self.critical_rule, self.urgent_rule])
+        self.assertFalse(sieve.is_match({'subject': 'urgent notice'}))
+        self.assertTrue(sieve.is_match({'subject': 'minor notice'}))
+
+    def test_flatten_same_logic(self):
+        """
+        Tests that a nested CompiledSieve with the same logic is merged
+        into its parent.
+        """
+        body_rule = FieldRule(
+            field_name='body',
+            operator='CharField:x',
+            value='alert'
+        )
+        child = CompiledSieve('AND', False, [body_rule])
+        sieve = CompiledSieve('AND', False, [self.critical_rule, child])
+        self.assertEqual(sieve.nodes, (self.critical_rule, body_rule))
+
+    def test_no_flatten_negated(self):
+        """
+        Tests that a negated nested CompiledSieve is not merged into
+        its parent.
+        """
+        child = CompiledSieve('AND', True, [self.urgent_rule])
+        sieve = CompiledSieve('AND', False, [self.critical_rule, child])
+        self.assertEqual(sieve.nodes, (self.critical_rule, child))
+        self.assertTrue(sieve.is_match({'subject': 'critical alert'}))
+        self.assertFalse(sieve.is_match({'subject': 'urgent critical'}))
+
+
+class RuleGroupTestCase(TestCase):
+    """
+    Tests the RuleGroup class.
+    """
+
+    docs = [
+        {'subject': 'critical alert', 'body': 'urgent'},
+        {'subject': 'urgent notice', 'body': 'critical'},
+        {'subject': 'critical urgent alert'},
+        {'subject': 'Critical Alert'},
+        {'subject': 'nothing to see'},
+        {'body': 'critical alert'},
+    ]
+
+    def setUp(self):
+        self.rules = [
+            FieldRule(field_name='subject', operator='CharField:x',
+                      value='critical'),
+            FieldRule(field_name='subject', operator='CharField:^x',
+                      value='urgent'),
+            FieldRule(field_name='subject', operator='CharField:x$',
+                      value='al(e)rt', is_regex=True),
+        ]
+
+    def test_is_match(self):
+        """
+        Tests that a RuleGroup gives the same results as evaluating its
+        Rules one at a time with 'OR' logic.
+        """
+        group = RuleGroup(self.rules)
+        for doc in self.docs:
+            expected = any(rule.is_match(doc) for rule in self.rules)
+            self.assertEqual(group.is_match(doc), expected, doc)
+
+    def test_and_not_grouped(self):
+        """
+        Tests that a CompiledSieve with 'AND' logic evaluates its Rules
+        one at a time.
+        """
+        self.rules[1].operator = 'CharField:x'
+        sieve = CompiledSieve('AND', False, self.rules)
+        self.assertEqual(list(sieve.nodes), self.rules)
+        for doc in self.docs:
+            expected = all(rule.is_match(doc) for rule in self.rules)
+            self.assertEqual(sieve.is_match(doc), expected, doc)
+
+    def test_group_key(self):
+        """
+        Tests that Rules are grouped by field and case sensitivity.
+        """
+        key = self.rules[0].get_group_key()
+        self.assertEqual(self.rules[1].get_group_key(), key)
+        self.rules[1].case_sensitive = True
+        self.assertNotEqual(self.rules[1].get_group_key(), key)
+        self.rules[2].field_name = 'body'
+        self.assertNotEqual(self.rules[2].get_group_key(), key)
+
+    def test_no_group_key(self):
+        """
+        Tests that negated, numeric, and backreferencing Rules can't be
+        grouped.
+        """
+        negated = FieldRule(field_name='subject', operator='CharField:x',
+                            value='critical', negate=True)
+        numeric = FieldRule(field_name='count', operator='FloatField:>',
+                            value='1')
+        backref = FieldRule(field_name='subject', operator='CharField:x',
+                            value=r'(a)\1', is_regex=True)
+        for rule in (negated, numeric, backref):
+            self.assertIsNone(rule.get_group_key())
+
+    def test_compiled_sieve_groups(self):
+        """
+        Tests that a CompiledSieve combines Rules for the same field.
+        """
+        body_rule = FieldRule(field_name='body', operator='CharField:x',
+                              value='critical')
+        sieve = CompiledSieve('OR', False, self.rules + [body_rule])
+        self.assertEqual(len(sieve.nodes), 2)
+        self.assertIsInstance(sieve.nodes[0], RuleGroup)
+        self.assertIs(sieve.nodes[1], body_rule)
+        for doc in self.docs:
+            expected = any(rule.is_match(doc)
+                           for rule in self.rules + [body_rule])
+            self.assertEqual(sieve.is_match(doc), expected, doc)
+
+
+class NodeStatsTestCase(TestCase):
+    """
+    Tests the NodeStats class.
+    """
+
+    def test_get_rank(self):
+        """
+        Tests that cheap nodes that short-circuit often rank first.
+        """
+        rare = NodeStats()
+        common = NodeStats()
+        for _ in range(9):
+            rare.record(False, 0.001)
+            common.record(True, 0.001)
+        rare.record(True, 0.001)
+        common.record(False, 0.001)
+
+        self.assertLess(rare.get_rank('AND'), common.get_rank('AND'))
+        self.assertLess(common.get_rank('OR'), rare.get_rank('OR'))
+
+    def test_decay(self):
+        """
+        Tests that decaying the counters preserves the average cost.
+        """
+        stats = NodeStats()
+        for _ in range(4):
+            stats.record(True, 0.002)
+        stats.decay()
+        self.assertEqual(stats.evaluations, 2)
+        self.assertEqual(stats.hits, 2)
+        self.assertAlmostEqual(stats.cost, 0.002)
+
+
+@patch('sifter.sieves.models.REORDER_INTERVAL', 10)
+class AdaptiveOrderingTestCase(TestCase):
+    """
+    Tests adaptive ordering of CompiledSieve nodes.
+    """
+
+    def setUp(self):
+        self.subject_rule = FieldRule(
+            name='subject_alert',
+            field_name='subject',
+            operator='CharField:x',
+            value='alert'
+        )
+        self.body_rule = FieldRule(
+            name='body_critical',
+            field_name='body',
+            operator='CharField:x',
+            value='critical'
+        )
+        self.docs = [{'subject': 'alert', 'body': 'minor'}] * 9 \
+            + [{'subject': 'alert', 'body': 'critical'}]
+
+    def tearDown(self):
+        cache.delete('test.sieve')
+
+    def test_and(self):
+        """
+        Tests that a Rule that rarely matches is moved forward for
+        'AND' logic, without changing the results.
+        """
+        sieve = CompiledSieve('AND', False,
+                              [self.subject_rule, self.body_rule],
+                              adaptive=True, stats_key='test.sieve')
+        results = [sieve.is_match(doc) for doc in self.docs]
+        self.assertEqual(results, [False] * 9 + [True])
+        self.assertEqual(sieve.nodes, (self.body_rule, self.subject_rule))
+
+        snapshot = cache.get('test.sieve')
+        self.assertEqual(snapshot['logic'], 'AND')
+        self.assertEqual([node['node'] for node in snapshot['nodes']],
+                         ['body_critical', 'subject_alert'])
+
+    def test_or(self):
+        """
+        Tests that a Rule that often matches is moved forward for 'OR'
+        logic, without changing the results.
+        """
+        sieve = CompiledSieve('OR', False,
+                              [self.body_rule, self.subject_rule],
+                              adaptive=True)
+        results = [sieve.is_match(doc) for doc in self.docs]
+        self.assertEqual(results, [True] * 10)
+        self.assertEqual(sieve.nodes, (self.subject_rule, self.body_rule))
+
+    def test_seed(self):
+        """
+        Tests that a recompiled sieve starts from the saved statistics.
+        """
+        sieve = CompiledSieve('AND', False,
+                              [self.subject_rule, self.body_rule],
+                              adaptive=True, stats_key='test.sieve')
+        for doc in self.docs:
+            sieve.is_match(doc)
+
+        recompiled = CompiledSieve('AND', False,
+                                   [self.subject_rule, self.body_rule],
+                                   adaptive=True, stats_key='test.sieve')
+        self.assertEqual(recompiled.nodes,
+                         (self.body_rule, self.subject_rule))
+        self.assertEqual(recompiled.get_stats()[0]['evaluations'], 10)
+        self.assertEqual(recompiled.get_stats()[0]['hits'], 1)
+
+    @patch('sifter.sieves.models.STATS_INTERVAL', 60)
+    def test_stats_interval(self):
+        """
+        Tests that statistics are saved at most once per STATS_INTERVAL.
+        """
+        sieve = CompiledSieve('AND', False,
+                              [self.subject_rule, self.body_rule],
+                              adaptive=True, stats_key='test.sieve')
+        with patch('sifter.sieves.models.cache.set') as mock_set:
+            for doc in self.docs * 3:
+                sieve.is_match(doc)
+        self.assertEqual(mock_set.call_count, 1)
+
+    def test_not_adaptive(self):
+        """
+        Tests that nodes keep their order if adaptive ordering is
+        disabled.
+        """
+        sieve = CompiledSieve('AND', False,
+                              [self.subject_rule, self.body_rule])
+        for doc in self.docs:
+            sieve.is_match(doc)
+        self.assertEqual(sieve.nodes, (self.subject_rule, self.body_rule))
@@ -29,6 +29,7 @@ from django.conf import settings
 from django.core import serializers
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 # local
@@ -151,6 +152,20 @@ class Teaser(models.Model):
 
     """
 
+    DATE_FIELDS = ('datetime', 'date_string')
+    """`tuple`
+
+        Fields that may name the document field used for a teaser's date.
+
+    """
+
+    SAMPLE_FIELDS = TEXT_FIELDS + ('location', ) + DATE_FIELDS
+    """`tuple`
+
+        Fields that may name a document field used to create a teaser.
+
+    """
+
     class Meta:
         abstract = True
 
@@ -262,6 +277,39 @@ class Teaser(models.Model):
 
         return sample
 
+    @cached_property
+    def date_fields(self):
+        """The names of the document fields used for the date.
+
+        Returns
+        -------
+        |list| of |str|
+            Names of the document fields needed by :meth:`get_date`.
+
+        """
+        return [getattr(self, key) for key in self.DATE_FIELDS
+                if getattr(self, key)]
+
+    @cached_property
+    def sample_fields(self):
+        """The names of the document fields used to create a teaser.
+
+        Computed once per instance, so documents can be fetched with
+        only the fields needed by :meth:`get_sample`.
+
+        Returns
+        -------
+        |list| of |str|
+            Names of the document fields needed to create a teaser,
+            including the field that identifies the document's
+            |Collection|.
+
+        """
+        field_names = [getattr(self, key) for key in self.SAMPLE_FIELDS
+                       if getattr(self, key)]
+        field_names.append(_DISTILLERY_SETTINGS['RAW_DATA_KEY'])
+        return field_names
+
     def get_date_field(self):
         """Get the name of the date field.
 
@@ -161,6 +161,20 @@ class TeaserTestCase(TestCase):
                 self.assertEqual(actual, expected)
                 self.assertEqual(location.coords, (-148.000, 32.000))
 
+    def test_sample_fields(self):
+        """
+        Tests the sample_fields property.
+        """
+        expected = ['info.from', 'info.subject', 'info.body',
+                    'info.location', 'info.date', '_raw_data']
+        self.assertEqual(self.teaser.sample_fields, expected)
+
+    def test_date_fields(self):
+        """
+        Tests the date_fields property.
+        """
+        self.assertEqual(self.teaser.date_fields, ['info.date'])
+
     def test_get_text_fields(self):
         """
         Tests the get_text_fields method.
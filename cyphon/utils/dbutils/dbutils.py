@@ -21,8 +21,20 @@
 import json
 
 # third party
+from django.contrib.gis.db.models.functions import SnapToGrid
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db.models import Count, IntegerField, Subquery
+from django.db.models import (
+    Avg,
+    Case,
+    Count,
+    FloatField,
+    Func,
+    IntegerField,
+    Subquery,
+    Sum,
+    When,
+)
+from django.db.models.functions import Trunc
 
 
 class SQCount(Subquery):
@@ -32,20 +44,162 @@ class SQCount(Subquery):
     output_field = IntegerField()
 
 
+class PointX(Func):
+    """Selects the x coordinate (longitude) of a point."""
+
+    function = 'ST_X'
+    output_field = FloatField()
+
+
+class PointY(Func):
+    """Selects the y coordinate (latitude) of a point."""
+
+    function = 'ST_Y'
+    output_field = FloatField()
+
+
+def _get_countable(queryset):
+    """
+    Takes a QuerySet and returns a QuerySet of the same records that
+    can be grouped and aggregated. Filters are kept in the same query,
+    unless the QuerySet is distinct, in which case its primary keys are
+    selected in a subquery so rows duplicated by joins aren't counted
+    more than once.
+    """
+    if queryset.query.distinct:
+        return queryset.model.objects.filter(pk__in=queryset.values('pk'))
+    return queryset
+
+
 def count_by_group(queryset, column, options):
     """
     Takes a QuerySet, a column name, and an options list (tuple of 2-tuples).
     Returns a dictionary containing the number of records for each option.
     """
     counts = {key: 0 for key, _ in options}
-    grouped_qs = queryset.model.objects.filter(
-        id__in=queryset.values(queryset.model._meta.pk.name))
+    grouped_qs = _get_countable(queryset)
     grouped_qs = grouped_qs.values(column).annotate(Count(column)).order_by()
     for result in grouped_qs:
         counts[result[column]] = result[column + '__count']
     return {column: counts}
 
 
+def count_by_interval(queryset, date_column, interval, column, options,
+                      tzinfo=None):
+    """Count records by time interval and option with a single query.
+
+    Parameters
+    ----------
+    queryset : |QuerySet|
+        The records to count.
+
+    date_column : str
+        The name of the datetime column used to group records.
+
+    interval : str
+        The length of each time interval. Options are 'hour', 'day',
+        and 'week'.
+
+    column : str
+        The name of the column whose values are counted.
+
+    options : tuple of 2-tuples
+        Choices for the `column`.
+
+    tzinfo : tzinfo or None
+        The timezone in which intervals begin. If |None|, the current
+        timezone is used.
+
+    Returns
+    -------
+    dict
+        A dictionary that maps the start of each interval containing
+        records to a dictionary of the number of records for each
+        option.
+
+    """
+    aliases = {'count_%s' % index: key
+               for index, (key, dummy_text) in enumerate(options)}
+    aggregates = {
+        alias: Sum(Case(When(**{column: key}, then=1),
+                        default=0, output_field=IntegerField()))
+        for alias, key in aliases.items()
+    }
+    grouped_qs = _get_countable(queryset).annotate(
+        interval=Trunc(date_column, interval, tzinfo=tzinfo)
+    ).values('interval').annotate(**aggregates).order_by('interval')
+
+    counts = {}
+    for result in grouped_qs:
+        counts[result['interval']] = {
+            key: result[alias] or 0 for alias, key in aliases.items()
+        }
+    return counts
+
+
+def count_by_grid(queryset, point_column, grid_size, column, options):
+    """Cluster records by grid cell and count them with a single query.
+
+    Parameters
+    ----------
+    queryset : |QuerySet|
+        The records to count.
+
+    point_column : str
+        The name of the point column used to group records. Records
+        without a point are ignored.
+
+    grid_size : float
+        The width and height of each grid cell, in the units of the
+        point column's spatial reference system.
+
+    column : str
+        The name of the column whose values are counted.
+
+    options : tuple of 2-tuples
+        Choices for the `column`.
+
+    Returns
+    -------
+    |list| of |dict|
+        A dictionary for each grid cell that contains records, with
+        the 'longitude' and 'latitude' of the records' centroid, the
+        total 'count' of records, and a dictionary of the number of
+        records for each option.
+
+    """
+    aliases = {'count_%s' % index: key
+               for index, (key, dummy_text) in enumerate(options)}
+    aggregates = {
+        alias: Sum(Case(When(**{column: key}, then=1),
+                        default=0, output_field=IntegerField()))
+        for alias, key in aliases.items()
+    }
+    grouped_qs = _get_countable(queryset).filter(
+        **{point_column + '__isnull': False})
+    grouped_qs = grouped_qs.annotate(
+        cell_x=PointX(SnapToGrid(point_column, grid_size)),
+        cell_y=PointY(SnapToGrid(point_column, grid_size)),
+    ).values('cell_x', 'cell_y').annotate(
+        longitude=Avg(PointX(point_column)),
+        latitude=Avg(PointY(point_column)),
+        count=Count(queryset.model._meta.pk.name),
+        **aggregates
+    ).order_by('cell_x', 'cell_y')
+
+    clusters = []
+    for result in grouped_qs:
+        clusters.append({
+            'longitude': result['longitude'],
+            'latitude': result['latitude'],
+            'count': result['count'],
+            column: {
+                key: result[alias] or 0 for alias, key in aliases.items()
+            },
+        })
+    return clusters
+
+
 def json_encodeable(data):
     """
 
@@ -48,6 +48,7 @@ class CountByGroupTestCase(TestCase):
 
         mock_queryset.model = Mock()
         mock_queryset.model._meta = MagicMock()
+        mock_queryset.query = Mock(distinct=False)
         mock_queryset.model.objects = mock_queryset
         mock_queryset.annotate.return_value = mock_queryset
         mock_queryset.filter.return_value = mock_queryset
@@ -72,4 +73,114 @@ class CountByGroupTestCase(TestCase):
             expected['level'][value] = 0
         actual = dbutils.count_by_group(mock_queryset, 'level', options)
         self.assertEqual(actual, expected)
+        self.assertFalse(mock_queryset.filter.called)
 
+    @patch('django.db.models.query.QuerySet', autospec=True)
+    def test_count_by_group_distinct(self, mock_queryset):
+        """
+        Tests that the count_by_group function counts the records of a
+        distinct QuerySet through a subquery of their primary keys.
+        """
+        mock_queryset.model = Mock()
+        mock_queryset.model.objects = mock_queryset
+        mock_queryset.query = Mock(distinct=True)
+        mock_queryset.annotate.return_value = mock_queryset
+        mock_queryset.filter.return_value = mock_queryset
+        mock_queryset.values.return_value = mock_queryset
+        mock_queryset.order_by.return_value = [
+            {'level': 'high', 'level__count': 1}]
+
+        actual = dbutils.count_by_group(
+            mock_queryset, 'level', (('high', 'High'),))
+        self.assertEqual(actual, {'level': {'high': 1}})
+        mock_queryset.values.assert_any_call('pk')
+        mock_queryset.filter.assert_called_once_with(pk__in=mock_queryset)
+
+
+class CountByIntervalTestCase(TestCase):
+    """
+    Tests the count_by_interval function.
+    """
+
+    @patch('django.db.models.query.QuerySet', autospec=True)
+    def test_count_by_interval(self, mock_queryset):
+        """
+        Tests the count_by_interval function.
+        """
+        options = (
+            ('high', 'High'),
+            ('low', 'Low'),
+        )
+
+        mock_queryset.model = Mock()
+        mock_queryset.model._meta = MagicMock()
+        mock_queryset.query = Mock(distinct=False)
+        mock_queryset.model.objects = mock_queryset
+        mock_queryset.annotate.return_value = mock_queryset
+        mock_queryset.filter.return_value = mock_queryset
+        mock_queryset.values.return_value = mock_queryset
+        mock_queryset.order_by.return_value = [
+            {'interval': 'day1', 'count_0': 2, 'count_1': None},
+            {'interval': 'day2', 'count_0': 0, 'count_1': 1},
+        ]
+
+        actual = dbutils.count_by_interval(
+            queryset=mock_queryset,
+            date_column='created_date',
+            interval='day',
+            column='level',
+            options=options
+        )
+        expected = {
+            'day1': {'high': 2, 'low': 0},
+            'day2': {'high': 0, 'low': 1},
+        }
+        self.assertEqual(actual, expected)
+        mock_queryset.order_by.assert_called_once_with('interval')
+        self.assertFalse(mock_queryset.filter.called)
+
+
+class CountByGridTestCase(TestCase):
+    """
+    Tests the count_by_grid function.
+    """
+
+    @patch('django.db.models.query.QuerySet', autospec=True)
+    def test_count_by_grid(self, mock_queryset):
+        """
+        Tests the count_by_grid function.
+        """
+        options = (
+            ('high', 'High'),
+            ('low', 'Low'),
+        )
+
+        mock_queryset.model = Mock()
+        mock_queryset.model._meta = MagicMock()
+        mock_queryset.query = Mock(distinct=False)
+        mock_queryset.model.objects = mock_queryset
+        mock_queryset.annotate.return_value = mock_queryset
+        mock_queryset.filter.return_value = mock_queryset
+        mock_queryset.values.return_value = mock_queryset
+        mock_queryset.order_by.return_value = [
+            {'cell_x': 0, 'cell_y': 0, 'longitude': 0.5, 'latitude': 1.5,
+             'count': 2, 'count_0': 2, 'count_1': None},
+            {'cell_x': 10, 'cell_y': 0, 'longitude': 11.0, 'latitude': 2.0,
+             'count': 1, 'count_0': 0, 'count_1': 1},
+        ]
+
+        actual = dbutils.count_by_grid(
+            queryset=mock_queryset,
+            point_column='location',
+            grid_size=10,
+            column='level',
+            options=options
+        )
+        expected = [
+            {'longitude': 0.5, 'latitude': 1.5, 'count': 2,
+             'level': {'high': 2, 'low': 0}},
+            {'longitude': 11.0, 'latitude': 2.0, 'count': 1,
+             'level': {'high': 0, 'low': 1}},
+        ]
+        self.assertEqual(actual, expected)
+        mock_queryset.filter.assert_any_call(location__isnull=False)
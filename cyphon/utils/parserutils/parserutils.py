@@ -30,6 +30,14 @@ from bs4 import BeautifulSoup
 
 LOGGER = logging.getLogger(__name__)
 
+_COMPILED_REGEXES = {}
+
+_FIELD_PATHS = {}
+
+# field names are normally taken from configuration, but limit the
+# cache in case they are derived from data
+_MAX_FIELD_PATHS = 10000
+
 
 def html_to_text(html):
     """Strip HTML tags from a string.
@@ -65,107 +73,216 @@ def html_to_text(html):
     return os.linesep.join(lines)
 
 
-def get_dict_value(field_name, doc):
-    """Return the value of a dictionary item.
+def get_compiled_regex(owner, pattern, flags=0):
+    """Get a compiled regular expression from a per-process cache.
+
+    Patterns are compiled and validated once, the first time they are
+    requested for an owner. A pattern that can't be compiled is logged
+    once and cached as |None|.
 
     Parameters
     ----------
-    field_name : |str|
+    owner : |tuple|
+        A hashable key for the object that uses the pattern, such as
+        a model label and primary key (e.g., ``('logsieves.logrule', 1)``).
 
-    doc : |dict|
-        A data dictionary.
+    pattern : |str|
+        A regular expression.
+
+    flags : |int|
+        Flags for compiling the regular expression (e.g., `re.IGNORECASE`).
 
     Returns
     -------
-    any type
-        The value associated with the given `field_name` from the `doc`.
+    |RegexObject| or |None|
+        The compiled regular expression, or |None| if the pattern is
+        not valid.
 
-    Note
-    ----
-    For a nested dictionary, use dot notation in the `field_name`
-    (e.g., 'parentkey.childkey'). You may also reference an array value
-    by its index (e.g., 'tags[0]').
+    """
+    regexes = _COMPILED_REGEXES.setdefault(owner, {})
+    key = (pattern, flags)
 
-    Examples
-    --------
-    >>> get_value('a.b.c', {'a': {'b': {'c': 100}}})
-    100
+    if key not in regexes:
+        try:
+            regexes[key] = re.compile(pattern, flags)
+        except re.error:
+            LOGGER.error('Cannot parse the regex "%s" for %s', pattern, owner)
+            regexes[key] = None
 
-    >>> doc = {'a': {'b': [{'c': [100, [15, 20]]}, {'d': 40}], 'e': 10}}
-    >>> field = 'a.b[0].c[1][1]'
-    >>> get_dict_value(field, doc)
-    20
+    return regexes[key]
+
+
+def clear_compiled_regexes(owner):
+    """Remove an owner's compiled regular expressions from the cache.
+
+    Parameters
+    ----------
+    owner : |tuple|
+        The key used to cache the owner's patterns with
+        :func:`~get_compiled_regex`.
+
+    Returns
+    -------
+    None
 
     """
+    _COMPILED_REGEXES.pop(owner, None)
+
+
+class FieldPath(object):
+    """A compiled accessor for a field in a nested dictionary.
+
+    The field name is parsed once into a tuple of steps, so a value can
+    be read from many documents without parsing the name or copying the
+    documents.
+
+    Parameters
+    ----------
+    field_name : |str|
+        The name of the field, using dot notation for nested
+        dictionaries and brackets for array indexes (e.g.,
+        'a.b[0].c').
+
+    Attributes
+    ----------
+    field_name : |str|
+        The name of the field.
+
+    steps : |tuple| of |tuple|
+        A (key, indexes) tuple for each dot-separated part of the
+        `field_name`, where `indexes` is a tuple of array indexes.
+
+    """
+
+    __slots__ = ('field_name', 'steps')
 
-    def get_array_value(doc, key):
+    def __init__(self, field_name):
+        self.field_name = field_name
+        self.steps = tuple(self._parse_step(key)
+                           for key in field_name.split('.'))
+
+    @staticmethod
+    def _parse_step(key):
         """
-        Takes a dictionary (doc) and a string (key) representing a dictionary
-        key and one or more array indexes, e.g. "location[0][1]". Returns the
-        corresponding value from the dictionary.
+        Takes a part of a field name, such as 'loc[0][1]', and returns
+        a tuple of the dictionary key and a tuple of array indexes,
+        e.g. ('loc', (0, 1)).
         """
         # split key at the start of array values, e.g. 'loc[0]' -> ['loc', '0]']
         key_parts = key.split('[')
+        indexes = []
 
-        # get the name of the parent field, e.g. "loc"
-        key = key_parts.pop(0)
+        for index in key_parts[1:]:
+            index = index.replace(']', '')
+            try:
+                indexes.append(int(index))
+            except ValueError:
+                # keep the string, so the error is raised if the
+                # index is reached, as it would be by get_dict_value
+                indexes.append(index)
 
-        # get the dictionary value, which is the first array
-        array = doc[key]
+        return (key_parts[0], tuple(indexes))
 
-        while len(key_parts) > 0:
+    def get_value(self, doc):
+        """Return the value of the field from a dictionary.
 
-            index = key_parts.pop(0)
+        The `doc` is not copied, so the value returned may be part of
+        the `doc`.
 
-            # remove trailing bracket from index value
-            index = index.replace(']', '')
+        Parameters
+        ----------
+        doc : |dict|
+            A data dictionary.
 
-            # need to convert the string to an integer to use it as an index
-            index = int(index)
+        Returns
+        -------
+        any type
+            The value of the field, or |None| if a key is missing. If
+            an intermediate value is not a dictionary, that value is
+            returned.
 
-            value = array[index]
+        """
+        value = doc
+        try:
+            for key, indexes in self.steps:
+                if not isinstance(value, dict):
+                    return value
+                value = value[key]
+                for index in indexes:
+                    if isinstance(index, str):
+                        index = int(index)
+                    value = value[index]
+        except KeyError:
+            return None
+        return value
 
-            # step into the next array
-            array = value
 
-        return value
+def compile_field_path(field_name):
+    """Get a compiled accessor for a field from a per-process cache.
 
-    if isinstance(field_name, str):
+    Parameters
+    ----------
+    field_name : |str|
+        The name of the field, using dot notation for nested
+        dictionaries and brackets for array indexes (e.g.,
+        'a.b[0].c').
 
-        doc_copy = deepcopy(doc)
+    Returns
+    -------
+    |FieldPath|
+        An accessor for the field.
 
-        # parse the string into a list of keys
-        keys = field_name.split('.')
-        value = ''
+    Examples
+    --------
+    >>> path = compile_field_path('a.b[0].c')
+    >>> path.get_value({'a': {'b': [{'c': 100}]}})
+    100
+
+    """
+    try:
+        return _FIELD_PATHS[field_name]
+    except KeyError:
+        path = FieldPath(field_name)
+        if len(_FIELD_PATHS) < _MAX_FIELD_PATHS:
+            _FIELD_PATHS[field_name] = path
+        return path
 
-        try:
-            while len(keys) > 0:
 
-                if isinstance(doc_copy, dict):
+def get_dict_value(field_name, doc):
+    """Return the value of a dictionary item.
 
-                    key = keys.pop(0)
+    Parameters
+    ----------
+    field_name : |str|
 
-                    # remove any leading or trailing whitespaces
-                    key.strip()
+    doc : |dict|
+        A data dictionary.
 
-                    # check if the key includes an array index (e.g., 'location[0]')
-                    if '[' in key:
-                        value = get_array_value(doc_copy, key)
-                    else:
-                        value = doc_copy[key]
+    Returns
+    -------
+    any type
+        The value associated with the given `field_name` from the `doc`.
+        The `doc` is not copied, so the value may be part of the `doc`.
 
-                    doc_copy = value
+    Note
+    ----
+    For a nested dictionary, use dot notation in the `field_name`
+    (e.g., 'parentkey.childkey'). You may also reference an array value
+    by its index (e.g., 'tags[0]').
 
-                else:
-                    return doc_copy
+    Examples
+    --------
+    >>> get_value('a.b.c', {'a': {'b': {'c': 100}}})
+    100
 
-        except KeyError:
-            # log this error so user knows to correct field_name
-            # LOGGER.warning('The field_name "%s" cannot be found in the document %s.',
-            #                field_name, str(doc)[:160])
-            return None
+    >>> doc = {'a': {'b': [{'c': [100, [15, 20]]}, {'d': 40}], 'e': 10}}
+    >>> field = 'a.b[0].c[1][1]'
+    >>> get_dict_value(field, doc)
+    20
 
-        return value
+    """
+    if isinstance(field_name, str):
+        return compile_field_path(field_name).get_value(doc)
 
 
 def merge_dict(target, addition):
@@ -20,7 +20,12 @@ Tests the parserutils module.
 
 # standard library
 import logging
+import re
 from unittest import TestCase
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
 
 # third party
 from bson import ObjectId
@@ -52,6 +57,52 @@ class HtmlToTextTestCase(TestCase):
         self.assertEqual(actual, expected)
 
 
+class GetCompiledRegexTestCase(TestCase):
+    """
+    Tests the get_compiled_regex and clear_compiled_regexes functions.
+    """
+
+    owner = ('tests.owner', 1)
+
+    def setUp(self):
+        logging.disable(logging.ERROR)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+        parserutils.clear_compiled_regexes(self.owner)
+
+    def test_compiles_once(self):
+        """
+        Tests that a pattern is compiled once per owner.
+        """
+        regex = parserutils.get_compiled_regex(self.owner, 'foo',
+                                               re.IGNORECASE)
+        self.assertTrue(regex.search('FOO'))
+        self.assertIs(parserutils.get_compiled_regex(self.owner, 'foo',
+                                                     re.IGNORECASE), regex)
+
+    def test_invalid_pattern(self):
+        """
+        Tests that an invalid pattern is cached as None.
+        """
+        with patch('utils.parserutils.parserutils.re.compile',
+                   wraps=re.compile) as mock_compile:
+            self.assertIsNone(
+                parserutils.get_compiled_regex(self.owner, '(foo'))
+            self.assertIsNone(
+                parserutils.get_compiled_regex(self.owner, '(foo'))
+            self.assertEqual(mock_compile.call_count, 1)
+
+    def test_clear_compiled_regexes(self):
+        """
+        Tests that cleared patterns are compiled again.
+        """
+        regex = parserutils.get_compiled_regex(self.owner, 'foo')
+        parserutils.clear_compiled_regexes(self.owner)
+        self.assertIsNot(parserutils.get_compiled_regex(self.owner, 'foo'),
+                         regex)
+
+
 class GetDictValueTestCase(TestCase):
     """
     Tests the get_dict_value function.
@@ -111,6 +162,51 @@ class GetDictValueTestCase(TestCase):
         field = 'a.b[0].c[1][1]'
         self.assertEqual(parserutils.get_dict_value(field, doc), 20)
 
+    def test_non_dict_intermediate(self):
+        """
+        Tests that a non-dictionary intermediate value is returned.
+        """
+        doc = {'a': {'b': 10}}
+        self.assertEqual(parserutils.get_dict_value('a.b.c', doc), 10)
+
+    def test_no_copy(self):
+        """
+        Tests that the value is taken from the document without copying.
+        """
+        doc = {'a': {'b': [1, 2]}}
+        self.assertIs(parserutils.get_dict_value('a.b', doc), doc['a']['b'])
+
+
+class CompileFieldPathTestCase(TestCase):
+    """
+    Tests the compile_field_path function.
+    """
+
+    def test_steps(self):
+        """
+        Tests that the field name is parsed into keys and indexes.
+        """
+        path = parserutils.compile_field_path('a.b[0].c[1][-1]')
+        self.assertEqual(path.steps,
+                         (('a', ()), ('b', (0, )), ('c', (1, -1))))
+
+    def test_cached(self):
+        """
+        Tests that compiled paths are reused.
+        """
+        path = parserutils.compile_field_path('a.b')
+        self.assertIs(parserutils.compile_field_path('a.b'), path)
+
+    def test_invalid_index(self):
+        """
+        Tests that an invalid index raises a ValueError when reached,
+        but not when a preceding key is missing.
+        """
+        path = parserutils.compile_field_path('a[x]')
+        self.assertIsNone(path.get_value({'b': 1}))
+        with self.assertRaises(ValueError):
+            path.get_value({'a': [1]})
+
 
 class AbridgeDictTestCase(TestCase):
     """
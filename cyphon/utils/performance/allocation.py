@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Provides a helper for measuring memory allocated by a function, for use
+in benchmarks and regression tests.
+"""
+
+# standard library
+import tracemalloc
+
+
+def measure_allocation(func, *args, loops=1, **kwargs):
+    """Measure the memory allocated by a function.
+
+    Parameters
+    ----------
+    func : function
+        The function to measure.
+
+    *args
+        Positional arguments for the function.
+
+    loops : int
+        The number of times to call the function.
+
+    **kwargs
+        Keyword arguments for the function.
+
+    Returns
+    -------
+    dict
+        A dictionary with the average number of bytes allocated per
+        call that were still held at the end of the call ('retained'),
+        and the peak number of bytes allocated by any call ('peak').
+
+    Note
+    ----
+    The numbers depend on the Python version and platform, and include
+    allocations made by other threads, so compare measurements taken
+    in the same environment rather than asserting exact values.
+
+    Example
+    -------
+    >>> stats = measure_allocation(lambda: [0] * 1000, loops=3)
+    >>> sorted(stats)
+    ['peak', 'retained']
+
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+
+    retained = 0
+    peak = 0
+
+    try:
+        for _ in range(loops):
+            tracemalloc.clear_traces()
+            start_size = tracemalloc.get_traced_memory()[0]
+            result = func(*args, **kwargs)
+            current_size, peak_size = tracemalloc.get_traced_memory()
+            retained += current_size - start_size
+            peak = max(peak, peak_size - start_size)
+            del result
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    return {
+        'retained': retained // loops,
+        'peak': peak,
+    }
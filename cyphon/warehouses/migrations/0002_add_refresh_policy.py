@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('warehouses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='refresh_policy',
+            field=models.CharField(blank=True, choices=[('true', 'Refresh immediately'), ('wait_for', 'Wait for the next refresh'), ('false', "Don't wait for a refresh")], help_text="Overrides the refresh policy of the warehouse. Leave blank to use the warehouse's policy.", max_length=10),
+        ),
+        migrations.AddField(
+            model_name='warehouse',
+            name='refresh_interval',
+            field=models.CharField(blank=True, help_text='When used with Elasticsearch, how often new indexes are refreshed (e.g., "30s"). Leave blank to use the Elasticsearch default.', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='warehouse',
+            name='refresh_policy',
+            field=models.CharField(choices=[('true', 'Refresh immediately'), ('wait_for', 'Wait for the next refresh'), ('false', "Don't wait for a refresh")], default='true', help_text='When used with Elasticsearch, determines whether each insert waits for new documents to become searchable. Refreshing immediately makes documents searchable at once but slows indexing under load.', max_length=10),
+        ),
+    ]
@@ -43,6 +43,7 @@ from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 # local
+from cyphon.choices import REFRESH_POLICY_CHOICES
 from engines.registry import ENGINES_PACKAGE, ENGINE_MODULE, BACKEND_CHOICES
 from utils.validators.validators import db_name_validator, lowercase_validator
 
@@ -103,6 +104,15 @@ class Warehouse(models.Model):
         Whether data should be stored as a time series (e.g.,
         timestamped indexes).
 
+    refresh_policy : str
+        When inserted documents should become visible to searches.
+        Choices are constrained to |REFRESH_POLICY_CHOICES|. Used by
+        backends that support refresh policies, such as Elasticsearch.
+
+    refresh_interval : str
+        How often new indexes should be refreshed (e.g., '30s'), or an
+        empty string to use the backend's default.
+
     """
     _DEFAULT_STORAGE_ENGINE = _WAREHOUSE_SETTINGS['DEFAULT_STORAGE_ENGINE']
 
@@ -117,6 +127,20 @@ class Warehouse(models.Model):
         help_text=_('When used with Elasticsearch, stores each day\'s '
                     'data in a separate index. Allows easy deletion '
                     'of old data in Elasticsearch.'))
+    refresh_policy = models.CharField(
+        max_length=10,
+        choices=REFRESH_POLICY_CHOICES,
+        default='true',
+        help_text=_('When used with Elasticsearch, determines whether '
+                    'each insert waits for new documents to become '
+                    'searchable. Refreshing immediately makes documents '
+                    'searchable at once but slows indexing under load.'))
+    refresh_interval = models.CharField(
+        max_length=10,
+        blank=True,
+        help_text=_('When used with Elasticsearch, how often new indexes '
+                    'are refreshed (e.g., "30s"). Leave blank to use the '
+                    'Elasticsearch default.'))
 
     objects = WarehouseManager()
 
@@ -259,12 +283,23 @@ class Collection(models.Model):
         The name of a document collection, doc type, or database table,
         depending on the |Warehouse| backend.
 
+    refresh_policy : str
+        When inserted documents should become visible to searches,
+        overriding the |Warehouse|'s `refresh_policy`. If blank, the
+        |Warehouse|'s policy is used.
+
     """
 
     warehouse = models.ForeignKey(Warehouse, related_name='collections',
                                   related_query_name='collection')
     name = models.CharField(max_length=40, verbose_name='collection name',
                             validators=[db_name_validator])
+    refresh_policy = models.CharField(
+        max_length=10,
+        choices=REFRESH_POLICY_CHOICES,
+        blank=True,
+        help_text=_('Overrides the refresh policy of the warehouse. '
+                    'Leave blank to use the warehouse\'s policy.'))
 
     objects = CollectionManager()
 
@@ -380,6 +415,30 @@ class Collection(models.Model):
 
     get_warehouse_name.short_description = 'warehouse name'
 
+    def get_refresh_policy(self):
+        """Get the refresh policy for inserted documents.
+
+        Returns
+        -------
+        str
+            The Collection's `refresh_policy`, if one is set.
+            Otherwise, the `refresh_policy` of its |Warehouse|.
+
+        """
+        return self.refresh_policy or self.warehouse.refresh_policy
+
+    def get_refresh_interval(self):
+        """Get the refresh interval for new indexes.
+
+        Returns
+        -------
+        str
+            The `refresh_interval` of the Collection's |Warehouse|, or
+            an empty string if the backend's default should be used.
+
+        """
+        return self.warehouse.refresh_interval
+
     def get_schema(self):
         """Get the |DataFields| used by documents in the Collection.
 
@@ -443,7 +502,7 @@ class Collection(models.Model):
         """
         return self._get_engine()
 
-    def find_by_id(self, doc_ids):
+    def find_by_id(self, doc_ids, fields=None):
         """Find one or more documents by id.
 
         Parameters
@@ -451,6 +510,10 @@ class Collection(models.Model):
         doc_ids : |str| or |list| of |str|
             A document id or a list of document ids.
 
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents. If
+            |None|, whole documents are returned.
+
         Returns
         -------
         |dict|, |list| of |dict|, or |None|
@@ -459,9 +522,10 @@ class Collection(models.Model):
             single document. If no matches are found, returns |None|.
 
         """
-        return self.engine.find_by_id(doc_ids)
+        return self.engine.find_by_id(doc_ids, fields)
 
-    def find(self, query, sorter=None, page=1, page_size=_PAGE_SIZE):
+    def find(self, query, sorter=None, page=1, page_size=_PAGE_SIZE,
+             cursor=None, fields=None, timeout=None):
         """Find documents matching a query.
 
         Parameters
@@ -474,11 +538,24 @@ class Collection(models.Model):
             A |Sorter| defining how results should be ordered.
 
         page : int
-            The page of results to return.
+            The page of results to return. Ignored if a valid `cursor`
+            is given.
 
         page_size : int
             The number of documents per page of results.
 
+        cursor : |str| or |None|
+            A cursor token returned by a previous search with the same
+            query and sorter, for the page of results that follows it.
+
+        fields : |list| of |str| or |None|
+            Names of the fields to return from matching documents. If
+            |None|, all fields in the schema are returned.
+
+        timeout : |int|, |float|, or |None|
+            The maximum number of seconds the search may take before the
+            engine abandons it. If |None|, the engine's default applies.
+
         Returns
         -------
         |dict|
@@ -486,9 +563,34 @@ class Collection(models.Model):
             value is the total number of documents matching the search
             criteria. The 'results' value is a list of documents from
             the search result, with the doc ids added to each document.
+            If a `sorter` or `cursor` is given, the dictionary also has
+            a 'cursor' key with a token for the next page of results.
+
+        """
+        return self.engine.find(query, sorter, page, page_size, cursor,
+                                fields, timeout)
+
+    def scan(self, query, sorter=None):
+        """Iterate over all documents matching a query.
+
+        Parameters
+        ----------
+        query : |EngineQuery|
+            An |EngineQuery| defining critieria for matching documents
+            in the index or time series.
+
+        sorter : |Sorter| or |None|
+            A |Sorter| defining how documents should be ordered.
+
+        Returns
+        -------
+        generator of |dict|
+            Documents matching the query, with their doc ids added.
+            Documents are fetched in batches as the generator is
+            consumed.
 
         """
-        return self.engine.find(query, sorter, page, page_size)
+        return self.engine.scan(query, sorter)
 
     def filter_ids(self, doc_ids, fields, value):
         """Find the ids of documents that match a value.
@@ -535,6 +637,32 @@ class Collection(models.Model):
         except Exception as error:  # pylint: disable=W0703
             _LOGGER.exception('Insertion error: %s', error)
 
+    def insert_many(self, docs):
+        """Save multiple documents to the Collection.
+
+        Parameters
+        ----------
+        docs : |list| of |dict|
+            Documents to insert into the data store represented by the
+            Collection.
+
+        Returns
+        -------
+        |list| of |dict|
+            A dictionary for each document, in the same order as `docs`,
+            with the keys 'doc_id' and 'error'. See
+            :meth:`Engine.insert_many`.
+
+        """
+        docs = list(docs)
+        try:
+            return self.engine.insert_many(docs)
+
+        # different backends may throw different exceptions
+        except Exception as error:  # pylint: disable=W0703
+            _LOGGER.exception('Insertion error: %s', error)
+            return [{'doc_id': None, 'error': str(error)} for _ in docs]
+
     def remove_by_id(self, doc_ids):
         """Remove the documents with the given ids.
 
@@ -279,6 +279,23 @@ class CollectionTestCase(TestCase):
         expected = True
         self.assertIs(actual, expected)
 
+    def test_get_refresh_policy_default(self):
+        """
+        Tests the get_refresh_policy method when the Collection uses the
+        Warehouse's policy.
+        """
+        collection = Collection.objects.get(pk=3)
+        self.assertEqual(collection.get_refresh_policy(), 'true')
+
+    def test_get_refresh_policy_override(self):
+        """
+        Tests the get_refresh_policy method when the Collection
+        overrides the Warehouse's policy.
+        """
+        collection = Collection.objects.get(pk=3)
+        collection.refresh_policy = 'wait_for'
+        self.assertEqual(collection.get_refresh_policy(), 'wait_for')
+
     def test_get_warehouse_none(self):
         """
         Tests the get_warehouse_name method.
@@ -398,7 +415,8 @@ class CollectionTestCase(TestCase):
         query = EngineQuery([fieldset], joiner)
         collection.engine.find = Mock(return_value=[self.doc])
         docs = collection.find(query)
-        collection.engine.find.assert_called_once_with(query, None, 1, PAGE_SIZE)
+        collection.engine.find.assert_called_once_with(query, None, 1, PAGE_SIZE,
+                                                       None, None)
         self.assertEqual(docs, [self.doc])
 
     @patch('warehouses.models.Collection.engine')
@@ -409,7 +427,8 @@ class CollectionTestCase(TestCase):
         collection = Collection()
         collection.engine.find_by_id = Mock(return_value=[self.doc])
         docs = collection.find_by_id(self.mock_doc_id)
-        collection.engine.find_by_id.assert_called_once_with(self.mock_doc_id)
+        collection.engine.find_by_id.assert_called_once_with(self.mock_doc_id,
+                                                             None)
         self.assertEqual(docs, [self.doc])
 
     @patch('warehouses.models.Collection.engine')
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines a per-process window of recent muzzled |Alerts|.
+
+======================================  ======================================
+Class                                   Description
+======================================  ======================================
+:class:`~MuzzleWindow`                  Recent muzzled Alerts by hash.
+======================================  ======================================
+
+======================================  ======================================
+Constant                                Description
+======================================  ======================================
+:const:`~MUZZLE_WINDOW`                 Shared MuzzleWindow instance.
+======================================  ======================================
+
+When a muzzled |Watchdog| saves an |Alert|, the Alert is remembered by
+its muzzle hash until the end of the Muzzle's time bucket. Duplicate
+Alerts within that window are counted in memory instead of being saved,
+and the counts are added to the original Alerts' incidents in periodic
+flushes by a background thread. Counts that can't be saved are kept
+for the next flush. When the window is full, expired Alerts are
+forgotten first, then the oldest ones. The unique constraint on
+:attr:`Alert.muzzle_hash` still catches duplicates created by other
+processes.
+
+"""
+
+# standard library
+import atexit
+from collections import OrderedDict
+import logging
+import threading
+import time
+
+# third party
+from django import db
+from django.conf import settings
+from django.db import models
+
+# local
+from alerts.models import Alert
+from utils.dateutils.dateutils import convert_time_to_seconds
+
+_LOGGER = logging.getLogger(__name__)
+
+_WATCHDOG_SETTINGS = getattr(settings, 'WATCHDOGS', {})
+
+WINDOW_SIZE = _WATCHDOG_SETTINGS.get('MUZZLE_WINDOW_SIZE', 10000)
+"""|int|
+
+The maximum number of muzzled Alerts remembered by a process. A value
+of 0 disables the window.
+"""
+
+FLUSH_INTERVAL = _WATCHDOG_SETTINGS.get('MUZZLE_FLUSH_INTERVAL', 5)
+"""|int|
+
+The maximum number of seconds before counted duplicates are added to
+the incidents of the original Alerts.
+"""
+
+
+class MuzzleWindow(object):
+    """Recent muzzled Alerts and their pending duplicate incidents.
+
+    Pending incidents are flushed by a daemon thread, which is started
+    when the first duplicate is counted.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum number of Alerts to remember.
+
+    flush_interval : int or float
+        The maximum number of seconds to keep incidents in memory.
+
+    """
+
+    def __init__(self, max_size=WINDOW_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._alerts = OrderedDict()
+        self._pending = {}
+        self._flushed = time.monotonic()
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stopping = None
+
+    def __len__(self):
+        return len(self._alerts)
+
+    def _start(self):
+        """
+        Starts the flush thread if it isn't already running.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._stopping,),
+                    name='muzzle-flush',
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self, stopping):
+        """
+        Flushes pending incidents every flush interval until the
+        stopping Event is set.
+        """
+        while not stopping.wait(self.flush_interval):
+            try:
+                self.flush()
+            finally:
+                db.close_old_connections()
+
+    @staticmethod
+    def _get_expiration(alert, muzzle):
+        """
+        Takes an Alert and its Muzzle and returns the monotonic time at
+        which the Alert's time bucket ends.
+        """
+        interval = convert_time_to_seconds(muzzle.time_interval,
+                                           muzzle.time_unit)
+        created = time.mktime(alert.created_date.timetuple())
+        remaining = interval - created % interval
+        return time.monotonic() + remaining
+
+    def _prune(self, now):
+        """
+        Forgets Alerts whose time buckets have ended.
+        """
+        expired = [muzzle_hash for muzzle_hash, (dummy_alert, expiration)
+                   in self._alerts.items() if expiration <= now]
+        for muzzle_hash in expired:
+            del self._alerts[muzzle_hash]
+
+    def _make_room(self):
+        """
+        Forgets expired Alerts, and then the Alerts remembered longest
+        ago, until there is room for another Alert.
+        """
+        self._prune(time.monotonic())
+        while len(self._alerts) >= self.max_size:
+            self._alerts.popitem(last=False)
+
+    def add(self, alert, muzzle):
+        """Remember a saved Alert until its time bucket ends.
+
+        If the window is full, expired Alerts are forgotten, followed
+        by the oldest Alerts if that doesn't make room.
+
+        Parameters
+        ----------
+        alert : |Alert|
+            A saved Alert for a muzzled |Watchdog|.
+
+        muzzle : |Muzzle|
+            The Watchdog's Muzzle.
+
+        Returns
+        -------
+        None
+
+        """
+        if not self.max_size:
+            return
+
+        with self._lock:
+            self._alerts.pop(alert.muzzle_hash, None)
+            if len(self._alerts) >= self.max_size:
+                self._make_room()
+            expiration = self._get_expiration(alert, muzzle)
+            self._alerts[alert.muzzle_hash] = (alert, expiration)
+
+    def add_incident(self, muzzle_hash):
+        """Count a duplicate of a remembered Alert.
+
+        Parameters
+        ----------
+        muzzle_hash : str
+            The muzzle hash of the duplicate Alert.
+
+        Returns
+        -------
+        |Alert| or |None|
+            The remembered Alert that the duplicate matches, or |None|
+            if no such Alert is remembered.
+
+        """
+        if not self.max_size:
+            return None
+
+        with self._lock:
+            now = time.monotonic()
+            entry = self._alerts.get(muzzle_hash)
+            if entry is None or entry[1] <= now:
+                return None
+            alert = entry[0]
+            self._pending[alert.pk] = self._pending.get(alert.pk, 0) + 1
+            due = now - self._flushed >= self.flush_interval
+
+        if due:
+            self.flush()
+        else:
+            self._start()
+
+        return alert
+
+    def flush(self):
+        """Add pending duplicates to the incidents of their Alerts.
+
+        Runs one UPDATE query for each Alert with pending duplicates.
+        Duplicates that can't be added remain pending until the next
+        flush.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            self._flushed = time.monotonic()
+            self._prune(self._flushed)
+
+        failed = {}
+        for alert_id, incidents in pending.items():
+            try:
+                Alert.objects.filter(pk=alert_id).update(
+                    incidents=models.F('incidents') + incidents
+                )
+            except Exception as error:
+                _LOGGER.error('Could not add %s incidents to Alert %s: %s',
+                              incidents, alert_id, error)
+                failed[alert_id] = incidents
+
+        if failed:
+            with self._lock:
+                for alert_id, incidents in failed.items():
+                    self._pending[alert_id] = \
+                        self._pending.get(alert_id, 0) + incidents
+
+    def stop(self, timeout=None):
+        """Stop the flush thread and flush pending incidents.
+
+        Parameters
+        ----------
+        timeout : int or float or None
+            The maximum number of seconds to wait for the thread.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            thread = self._thread
+            stopping = self._stopping
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            stopping.set()
+            thread.join(timeout)
+        self.flush()
+
+    def clear(self):
+        """Forget all Alerts and discard pending duplicates.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            self._alerts.clear()
+            self._pending.clear()
+
+
+MUZZLE_WINDOW = MuzzleWindow()
+"""|MuzzleWindow|
+
+Window of recent muzzled Alerts for this process.
+"""
+
+# receiver consumers stop the window themselves, since processes started
+# with multiprocessing exit without running atexit handlers
+atexit.register(MUZZLE_WINDOW.stop)
@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Defines queues for inspecting saved documents outside of the request
+or message that saved them.
+
+======================================  ======================================
+Class                                   Description
+======================================  ======================================
+:class:`~InspectionQueue`               Bounded queue of documents to inspect.
+:class:`~InspectionPublisher`           Publishes documents to RabbitMQ.
+======================================  ======================================
+
+======================================  ======================================
+Constant                                Description
+======================================  ======================================
+:const:`~ASYNC_INSPECTION`              Whether documents are queued.
+:const:`~DURABLE_INSPECTION`            Whether documents are published.
+:const:`~INSPECTION_QUEUE`              Shared InspectionQueue instance.
+:const:`~INSPECTION_PUBLISHER`          Shared InspectionPublisher instance.
+======================================  ======================================
+
+An |InspectionQueue| holds documents in memory, so inspection is
+at-most-once: documents still queued when a process crashes are never
+inspected. An |InspectionPublisher| instead sends each document to
+RabbitMQ with the 'watchdogs' routing key, where it waits in a durable
+queue until a receiver inspects it.
+
+"""
+
+# standard library
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+# third party
+from django import db
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+import pika
+
+# local
+from watchdogs.models import Watchdog
+
+_LOGGER = logging.getLogger(__name__)
+
+_WATCHDOG_SETTINGS = getattr(settings, 'WATCHDOGS', {})
+
+ASYNC_INSPECTION = _WATCHDOG_SETTINGS.get('ASYNC_INSPECTION', False)
+"""|bool|
+
+Whether saved documents are handed to a background thread for
+inspection by |Watchdogs|, instead of being inspected before the
+|Distillery| returns. Documents queued when the process exits
+abnormally are not inspected.
+"""
+
+DURABLE_INSPECTION = _WATCHDOG_SETTINGS.get('DURABLE_INSPECTION', False)
+"""|bool|
+
+Whether saved documents are published to RabbitMQ for inspection by a
+'watchdogs' receiver, instead of being inspected in this process. Takes
+precedence over :const:`ASYNC_INSPECTION`.
+"""
+
+DOC_ID_HEADER = 'x-doc-id'
+"""|str|
+
+Message header holding the id of a document published for inspection.
+"""
+
+COLLECTION_HEADER = 'x-collection'
+"""|str|
+
+Message header holding the |Collection| of a document published for
+inspection.
+"""
+
+QUEUE_SIZE = _WATCHDOG_SETTINGS.get('QUEUE_SIZE', 10000)
+"""|int|
+
+The maximum number of documents awaiting inspection. When the queue is
+full, documents are inspected synchronously.
+"""
+
+BATCH_SIZE = _WATCHDOG_SETTINGS.get('BATCH_SIZE', 100)
+"""|int|
+
+The maximum number of documents inspected together.
+"""
+
+BATCH_INTERVAL = _WATCHDOG_SETTINGS.get('BATCH_INTERVAL', 1)
+"""|int|
+
+The maximum number of seconds to wait for a batch to fill before
+inspecting the documents already collected.
+"""
+
+_STOP = object()
+
+
+def _inspect(doc_objs):
+    """
+    Takes a list of DocumentObjs and inspects them with relevant
+    Watchdogs.
+    """
+    Watchdog.objects.process_many(doc_objs)
+
+
+class InspectionQueue(object):
+    """A bounded queue of documents awaiting inspection.
+
+    Documents are consumed in batches by a daemon thread, which is
+    started when the first document is added.
+
+    Parameters
+    ----------
+    consumer : function
+        A function that takes a |list| of |DocumentObjs|.
+
+    max_size : int
+        The maximum number of documents awaiting inspection.
+
+    batch_size : int
+        The maximum number of documents passed to the `consumer` at
+        once.
+
+    batch_interval : int or float
+        The maximum number of seconds to wait for a batch to fill.
+
+    """
+
+    def __init__(self, consumer, max_size=QUEUE_SIZE, batch_size=BATCH_SIZE,
+                 batch_interval=BATCH_INTERVAL):
+        self.consumer = consumer
+        self.batch_size = max(batch_size, 1)
+        self.batch_interval = batch_interval
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def _start(self):
+        """
+        Starts the worker thread if it isn't already running.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='watchdog-inspection',
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _get_batch(self):
+        """
+        Waits for a document, then collects more until the batch is
+        full or the batch interval has passed. Returns a list of
+        documents and a bool indicating whether the queue was stopped.
+        """
+        item = self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = time.monotonic() + self.batch_interval
+
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _process(self, batch):
+        """
+        Passes a batch of documents to the consumer. Errors are logged
+        so the worker can continue with the next batch.
+        """
+        try:
+            self.consumer(batch)
+        except Exception as error:
+            _LOGGER.exception('An error occurred while inspecting %s '
+                              'documents: %s', len(batch), error)
+        finally:
+            db.close_old_connections()
+
+    def _run(self):
+        """
+        Inspects batches of documents until the queue is stopped.
+        """
+        stopped = False
+        while not stopped:
+            batch, stopped = self._get_batch()
+            if batch:
+                self._process(batch)
+            for _ in range(len(batch) + int(stopped)):
+                self._queue.task_done()
+
+    def put(self, doc_obj):
+        """Add a document to the queue.
+
+        If the queue is full, the document is inspected immediately
+        instead, so documents aren't dropped when inspection falls
+        behind.
+
+        Parameters
+        ----------
+        doc_obj : |DocumentObj|
+            A saved document to be inspected.
+
+        Returns
+        -------
+        bool
+            Whether the document was queued.
+
+        """
+        self._start()
+        try:
+            self._queue.put_nowait(doc_obj)
+            return True
+        except queue.Full:
+            _LOGGER.warning('Inspection queue is full; inspecting %s '
+                            'synchronously', doc_obj)
+            self.consumer([doc_obj])
+            return False
+
+    def join(self):
+        """Block until every queued document has been inspected.
+
+        Returns
+        -------
+        None
+
+        """
+        if self._thread is not None:
+            self._queue.join()
+
+    def stop(self, timeout=None):
+        """Inspect the remaining documents and stop the worker thread.
+
+        Parameters
+        ----------
+        timeout : int or float or None
+            The maximum number of seconds to wait for the worker.
+
+        Returns
+        -------
+        None
+
+        """
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def qsize(self):
+        """Get the approximate number of documents awaiting inspection.
+
+        Returns
+        -------
+        int
+
+        """
+        return self._queue.qsize()
+
+
+class _DocumentEncoder(DjangoJSONEncoder):
+    """
+    Encodes dates like Django's JSON encoder, and other values that
+    JSON can't represent (e.g., MongoDB ObjectIds) as strings.
+    """
+
+    def default(self, o):
+        try:
+            return super(_DocumentEncoder, self).default(o)
+        except TypeError:
+            return str(o)
+
+
+class InspectionPublisher(object):
+    """Publishes saved documents to RabbitMQ for inspection.
+
+    Documents are sent to the RabbitMQ exchange with the 'watchdogs'
+    routing key as persistent messages, and are inspected by a receiver
+    consuming that queue. Each process and thread opens its own
+    connection, since pika connections can't be shared.
+
+    Parameters
+    ----------
+    consumer : function
+        A function that takes a |list| of |DocumentObjs|. Used to
+        inspect a document in this process if it can't be published.
+
+    routing_key : str
+        The routing key of the receiver's queue.
+
+    """
+
+    def __init__(self, consumer, routing_key='watchdogs'):
+        self.consumer = consumer
+        self.routing_key = routing_key
+        self._local = threading.local()
+
+    @staticmethod
+    def _connect():
+        """
+        Returns a new connection to RabbitMQ.
+        """
+        broker = settings.RABBITMQ
+        credentials = pika.PlainCredentials(username=broker['USERNAME'],
+                                            password=broker['PASSWORD'])
+        parameters = pika.ConnectionParameters(host=broker['HOST'],
+                                               virtual_host=broker['VHOST'],
+                                               credentials=credentials)
+        return pika.BlockingConnection(parameters)
+
+    def _get_channel(self):
+        """
+        Returns this thread's channel, opening a connection and
+        declaring the receiver's queue if necessary.
+        """
+        pid = os.getpid()
+        channel = getattr(self._local, 'channel', None)
+        if channel is not None and channel.is_open \
+                and self._local.pid == pid:
+            return channel
+
+        broker = settings.RABBITMQ
+        channel = self._connect().channel()
+        channel.exchange_declare(exchange=broker['EXCHANGE'],
+                                 durable=broker['DURABLE'])
+        # declared as the receiver declares it, so messages aren't
+        # dropped before a receiver has started
+        channel.queue_declare(queue=self.routing_key)
+        channel.queue_bind(exchange=broker['EXCHANGE'],
+                           queue=self.routing_key,
+                           routing_key=self.routing_key)
+        channel.confirm_delivery()
+        self._local.channel = channel
+        self._local.pid = pid
+        return channel
+
+    def _publish(self, doc_obj):
+        """
+        Publishes a DocumentObj and returns whether the broker
+        confirmed it.
+        """
+        body = json.dumps(doc_obj.data, cls=_DocumentEncoder)
+        headers = {
+            DOC_ID_HEADER: doc_obj.doc_id,
+            COLLECTION_HEADER: doc_obj.collection,
+        }
+        properties = pika.BasicProperties(headers=headers, delivery_mode=2)
+        return self._get_channel().basic_publish(
+            exchange=settings.RABBITMQ['EXCHANGE'],
+            routing_key=self.routing_key,
+            body=body,
+            properties=properties
+        )
+
+    def put(self, doc_obj):
+        """Publish a document for inspection.
+
+        If the document can't be published, it is inspected
+        immediately instead, so it isn't dropped.
+
+        Parameters
+        ----------
+        doc_obj : |DocumentObj|
+            A saved document to be inspected.
+
+        Returns
+        -------
+        bool
+            Whether the document was published.
+
+        """
+        try:
+            published = self._publish(doc_obj)
+        except Exception as error:
+            # an idle connection may have been closed by the broker,
+            # so reconnect and try once more
+            self._local.channel = None
+            _LOGGER.info('Reconnecting to publish %s for inspection '
+                         'after error: %s', doc_obj, error)
+            try:
+                published = self._publish(doc_obj)
+            except Exception as error:
+                self._local.channel = None
+                _LOGGER.warning('Could not publish %s for inspection; '
+                                'inspecting synchronously: %s',
+                                doc_obj, error)
+                published = False
+
+        if not published:
+            self.consumer([doc_obj])
+            return False
+        return True
+
+
+INSPECTION_QUEUE = InspectionQueue(
+    consumer=_inspect
+)
+"""|InspectionQueue|
+
+Queue of saved documents awaiting inspection by |Watchdogs| in this
+process.
+"""
+
+INSPECTION_PUBLISHER = InspectionPublisher(
+    consumer=_inspect
+)
+"""|InspectionPublisher|
+
+Publisher of saved documents to be inspected by a 'watchdogs' receiver.
+"""
+
+# receiver consumers stop the queue themselves, since processes started
+# with multiprocessing exit without running atexit handlers
+atexit.register(INSPECTION_QUEUE.stop, BATCH_INTERVAL + 5)
@@ -23,8 +23,11 @@ import contextlib
 import logging
 
 # third party
+from django.apps import apps
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 # local
@@ -32,11 +35,97 @@ from alarms.models import Alarm, AlarmManager
 from alerts.models import Alert
 from categories.models import Category
 from cyphon.choices import ALERT_LEVEL_CHOICES, TIME_UNIT_CHOICES
+from cyphon.plancache import PlanCache
+from cyphon.transaction import close_old_connections
 from utils.dbutils.dbutils import json_encodeable
+from watchdogs.dedup import MUZZLE_WINDOW
 from sifter.datasifter.datasieves.models import DataSieve
 
 _LOGGER = logging.getLogger(__name__)
 
+# apps whose models are used to build the WatchdogIndex
+_INDEX_APP_LABELS = [
+    'categories',
+    'datasieves',
+    'distilleries',
+    'procedures',
+    'warehouses',
+    'watchdogs',
+]
+
+
+class WatchdogIndex(object):
+    """An immutable index of enabled Watchdogs by Distillery.
+
+    Holds the enabled Watchdogs with their Triggers compiled and their
+    Muzzles loaded, and the Watchdogs relevant to each |Distillery|, so
+    documents can be inspected without querying the database.
+
+    Parameters
+    ----------
+    watchdogs : iterable of |Watchdog|
+        Enabled Watchdogs, in the order they should inspect documents.
+
+    distilleries : iterable of |Distillery|
+        The Distilleries whose documents may be inspected.
+
+    Attributes
+    ----------
+    watchdogs : tuple
+        Compiled Watchdogs.
+
+    """
+
+    def __init__(self, watchdogs, distilleries):
+        self.watchdogs = tuple(watchdog.compile() for watchdog in watchdogs)
+        self._by_collection = {}
+        for distillery in distilleries:
+            category_ids = [category.pk for category
+                            in distillery.categories.all()]
+            self._by_collection[str(distillery)] = \
+                self._filter_watchdogs(category_ids)
+
+    def __len__(self):
+        return len(self.watchdogs)
+
+    def _filter_watchdogs(self, category_ids):
+        """
+        Takes a list of Category ids and returns a tuple of Watchdogs
+        that have no Categories or share one of the Categories.
+        """
+        category_ids = frozenset(category_ids)
+        return tuple(
+            watchdog for watchdog in self.watchdogs
+            if not watchdog.category_ids
+            or watchdog.category_ids & category_ids
+        )
+
+    def get_watchdogs(self, doc_obj):
+        """Get the Watchdogs relevant to a document.
+
+        Parameters
+        ----------
+        doc_obj : |DocumentObj|
+            The document to be inspected.
+
+        Returns
+        -------
+        tuple
+            Compiled |Watchdogs| for inspecting the document. If the
+            document's |Distillery| was created after the index was
+            built, it is looked up in the database.
+
+        """
+        watchdogs = self._by_collection.get(doc_obj.collection)
+        if watchdogs is None:
+            distillery = doc_obj.distillery
+            category_ids = []
+            if distillery:
+                category_ids = distillery.categories.values_list('pk',
+                                                                 flat=True)
+            watchdogs = self._filter_watchdogs(category_ids)
+        return watchdogs
+
 
 class WatchdogManager(AlarmManager):
     """
@@ -82,6 +171,100 @@ class WatchdogManager(AlarmManager):
 
         return queryset.distinct()
 
+    def _build_index(self):
+        """
+        Returns a new WatchdogIndex for the enabled Watchdogs.
+        """
+        # use get_model to avoid circular dependency
+        distillery_model = apps.get_model('distilleries', 'Distillery')
+        watchdogs = self.find_enabled().select_related('muzzle')
+        distilleries = distillery_model.objects.prefetch_related('categories')
+        return WatchdogIndex(watchdogs, distilleries)
+
+    @cached_property
+    def _index_cache(self):
+        """
+        Returns a PlanCache for the WatchdogIndex.
+        """
+        return PlanCache(
+            name=self.model._meta.label_lower,
+            builder=self._build_index,
+            app_labels=_INDEX_APP_LABELS
+        )
+
+    def get_index(self):
+        """Get the index of enabled Watchdogs.
+
+        The index is built once per process and rebuilt when Watchdogs,
+        Triggers, Muzzles, sieves, Protocols, Categories, or
+        Distilleries change.
+
+        Returns
+        -------
+        |WatchdogIndex|
+
+        """
+        return self._index_cache.get()
+
+    @close_old_connections
+    def process(self, doc_obj):
+        """Inspect a document with relevant Watchdogs.
+
+        Parameters
+        ----------
+        doc_obj : |DocumentObj|
+            The document that Watchdogs should inspect.
+
+        Returns
+        -------
+        None
+
+        """
+        for watchdog in self.get_index().get_watchdogs(doc_obj):
+            watchdog.process(doc_obj)
+
+    @close_old_connections
+    def process_many(self, doc_objs):
+        """Inspect a batch of documents with relevant Watchdogs.
+
+        Alerts generated for the batch are saved together with
+        :meth:`AlertManager.create_many`. Duplicates of Alerts in the
+        muzzle window are counted without being saved.
+
+        Parameters
+        ----------
+        doc_objs : |list| of |DocumentObj|
+            The documents that Watchdogs should inspect.
+
+        Returns
+        -------
+        |list| of |Alert|
+            The Alerts saved or incremented for the batch.
+
+        """
+        index = self.get_index()
+        alerts = []
+        for doc_obj in doc_objs:
+            for watchdog in index.get_watchdogs(doc_obj):
+                alert = watchdog.get_alert(doc_obj)
+                if alert is None:
+                    continue
+                if (watchdog._is_muzzled() and
+                        watchdog._find_muzzled_duplicate(alert) is not None):
+                    continue
+                alerts.append(alert)
+
+        if not alerts:
+            return []
+
+        saved_alerts = Alert.objects.create_many(alerts)
+
+        for alert, saved_alert in zip(alerts, saved_alerts):
+            if alert.alarm._is_muzzled():
+                MUZZLE_WINDOW.add(saved_alert, alert.alarm.muzzle)
+
+        return saved_alerts
+
 
 class Watchdog(Alarm):
     """
@@ -113,9 +296,45 @@ class Watchdog(Alarm):
 
     objects = WatchdogManager()
 
+    _compiled_triggers = None
+    _category_ids = None
+
     def __str__(self):
         return self.name
 
+    @property
+    def category_ids(self):
+        """
+        Returns a frozenset of the ids of the Watchdog's Categories.
+        """
+        if self._category_ids is None:
+            return frozenset(self.categories.values_list('pk', flat=True))
+        return self._category_ids
+
+    def compile(self):
+        """Prepare the Watchdog for inspecting many documents.
+
+        Compiles the sieves of the Watchdog's Triggers and loads its
+        Categories and Muzzle, so documents can be inspected without
+        querying the database.
+
+        Returns
+        -------
+        |Watchdog|
+            The Watchdog itself.
+
+        """
+        triggers = self.triggers.select_related('sieve')
+        self._compiled_triggers = tuple(
+            (trigger.sieve.compile(), trigger.alert_level)
+            for trigger in triggers
+        )
+        self._category_ids = frozenset(
+            self.categories.values_list('pk', flat=True)
+        )
+        self._is_muzzled()  # cache the Muzzle, or its absence
+        return self
+
     def _create_alert(self, level, doc_obj):
         """
         Takes an alert level, a distillery, and a document id. Returns
@@ -147,6 +366,35 @@ class Watchdog(Alarm):
             alert.save()
         return alert
 
+    @staticmethod
+    def _find_muzzled_duplicate(alert):
+        """
+        Takes a new Alert for a muzzled Watchdog. If it duplicates an
+        Alert in the muzzle window, counts an incident for that Alert
+        and returns it. Otherwise, returns None.
+        """
+        alert.created_date = timezone.now()
+        return MUZZLE_WINDOW.add_incident(alert._get_muzzle_hash())
+
+    def _save_muzzled_alert(self, alert):
+        """
+        Takes a new Alert for a muzzled Watchdog. If it duplicates an
+        Alert in the muzzle window, counts an incident for that Alert
+        and returns it. Otherwise, saves the new Alert or increments a
+        previous Alert that it duplicates, and returns the saved Alert.
+        """
+        previous_alert = self._find_muzzled_duplicate(alert)
+        if previous_alert is not None:
+            return previous_alert
+
+        try:
+            alert = self._save_alert(alert)
+        except IntegrityError:
+            alert = self._increment_incidents(alert)
+
+        MUZZLE_WINDOW.add(alert, self.muzzle)
+        return alert
+
     @staticmethod
     @transaction.atomic
     def _increment_incidents(alert):
@@ -174,13 +422,19 @@ class Watchdog(Alarm):
             Otherwise, returns |None|.
 
         """
+        if self._compiled_triggers is not None:
+            for sieve, alert_level in self._compiled_triggers:
+                if sieve.is_match(data):
+                    return alert_level
+            return None
+
         triggers = self.triggers.all()
         for trigger in triggers:
             if trigger.is_match(data):
                 return trigger.alert_level
 
-    def process(self, doc_obj):
-        """Generate an |Alert| for a document if appropriate.
+    def get_alert(self, doc_obj):
+        """Create an unsaved |Alert| for a document if appropriate.
 
         Parameters
         ----------
@@ -191,7 +445,7 @@ class Watchdog(Alarm):
         Returns
         -------
         |Alert| or |None|
-            Returns an |Alert| if the Watchdog is enabled and the
+            Returns a new |Alert| if the Watchdog is enabled and the
             document matches one of the Watchdog's |Triggers|.
             Otherwise, returns |None|.
 
@@ -199,14 +453,39 @@ class Watchdog(Alarm):
         if self.enabled:
             alert_level = self.inspect(doc_obj.data)
             if alert_level is not None:
-                alert = self._create_alert(alert_level, doc_obj)
-
-                # save the alert or increment incidents on a previous
-                # alert it duplicates
-                try:
-                    return self._save_alert(alert)
-                except IntegrityError:
-                    return self._increment_incidents(alert)
+                return self._create_alert(alert_level, doc_obj)
+
+    def process(self, doc_obj):
+        """Generate an |Alert| for a document if appropriate.
+
+        Parameters
+        ----------
+        doc_obj: |DocumentObj|
+            Data and related information about the document to be
+            inspected.
+
+        Returns
+        -------
+        |Alert| or |None|
+            Returns an |Alert| if the Watchdog is enabled and the
+            document matches one of the Watchdog's |Triggers|.
+            Otherwise, returns |None|.
+
+        """
+        alert = self.get_alert(doc_obj)
+
+        if alert is None:
+            return None
+
+        if self._is_muzzled():
+            return self._save_muzzled_alert(alert)
+
+        # save the alert or increment incidents on a previous
+        # alert it duplicates
+        try:
+            return self._save_alert(alert)
+        except IntegrityError:
+            return self._increment_incidents(alert)
 
 
 class TriggerManager(models.Manager):
@@ -23,6 +23,12 @@ from django.dispatch import receiver
 
 # local
 from distilleries.signals import document_saved
+from watchdogs.dispatch import (
+    ASYNC_INSPECTION,
+    DURABLE_INSPECTION,
+    INSPECTION_PUBLISHER,
+    INSPECTION_QUEUE,
+)
 from watchdogs.models import Watchdog
 
 
@@ -31,5 +37,14 @@ def inspect_document(sender, doc_obj, **args):
     """
     Receiver for the Distillery app's document_saved signal. Gathers all
     Watchdogs to inspect the newly saved document and create Alerts if necessary.
+    If durable inspection is enabled, the document is published to
+    RabbitMQ for a 'watchdogs' receiver. If asynchronous inspection is
+    enabled, the document is queued and inspected in a batch by a
+    background thread.
     """
-    Watchdog.objects.process(doc_obj)
+    if DURABLE_INSPECTION:
+        INSPECTION_PUBLISHER.put(doc_obj)
+    elif ASYNC_INSPECTION:
+        INSPECTION_QUEUE.put(doc_obj)
+    else:
+        Watchdog.objects.process(doc_obj)
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Tests the MuzzleWindow class.
+"""
+
+# standard library
+import logging
+try:
+    from unittest.mock import Mock, patch
+except ImportError:
+    from mock import Mock, patch
+
+# third party
+from django.test import TestCase
+
+# local
+from alerts.models import Alert
+from tests.fixture_manager import get_fixtures
+from tests.mock import patch_find_by_id
+from watchdogs.dedup import MuzzleWindow
+from watchdogs.models import Watchdog
+from watchdogs.tests.test_models import WatchdogBaseTestCase
+
+
+class MuzzleWindowTestCase(TestCase):
+    """
+    Tests the MuzzleWindow class.
+    """
+    fixtures = get_fixtures(['alerts'])
+
+    def setUp(self):
+        self.window = MuzzleWindow(max_size=10, flush_interval=60)
+        self.alert = Alert.objects.get(pk=1)
+        self.alert.muzzle_hash = 'foo'
+        self.watchdog = Watchdog.objects.get_by_natural_key('inspect_emails')
+        self.muzzle = self.watchdog.muzzle
+
+    def tearDown(self):
+        self.window.stop()
+
+    def test_add_incident(self):
+        """
+        Tests that duplicates of a remembered Alert are counted until
+        the window is flushed.
+        """
+        incidents = self.alert.incidents
+        self.window.add(self.alert, self.muzzle)
+        with self.assertNumQueries(0):
+            for dummy_index in range(3):
+                result = self.window.add_incident(self.alert.muzzle_hash)
+        self.assertEqual(result, self.alert)
+        self.assertEqual(Alert.objects.get(pk=1).incidents, incidents)
+
+        with self.assertNumQueries(1):
+            self.window.flush()
+        self.assertEqual(Alert.objects.get(pk=1).incidents, incidents + 3)
+
+    def test_add_incident_unknown(self):
+        """
+        Tests that the add_incident method returns None for a hash that
+        isn't remembered.
+        """
+        self.assertIsNone(self.window.add_incident('bar'))
+
+    def test_add_incident_flush_interval(self):
+        """
+        Tests that pending duplicates are flushed once the flush
+        interval has passed.
+        """
+        incidents = self.alert.incidents
+        self.window.flush_interval = 0
+        self.window.add(self.alert, self.muzzle)
+        self.window.add_incident(self.alert.muzzle_hash)
+        self.assertEqual(Alert.objects.get(pk=1).incidents, incidents + 1)
+
+    def test_flush_thread(self):
+        """
+        Tests that counting a duplicate starts the flush thread, and
+        that stopping the window flushes pending duplicates.
+        """
+        incidents = self.alert.incidents
+        self.window.add(self.alert, self.muzzle)
+        self.window.add_incident(self.alert.muzzle_hash)
+        self.assertTrue(self.window._thread.is_alive())
+        thread = self.window._thread
+        self.window.stop()
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(Alert.objects.get(pk=1).incidents, incidents + 1)
+
+    def test_run(self):
+        """
+        Tests that the flush thread flushes the window each interval
+        until it is stopped.
+        """
+        mock_stopping = Mock()
+        mock_stopping.wait.side_effect = [False, False, True]
+        with patch.object(self.window, 'flush') as mock_flush:
+            self.window._run(mock_stopping)
+        self.assertEqual(mock_flush.call_count, 2)
+        mock_stopping.wait.assert_called_with(60)
+
+    def test_add_expired(self):
+        """
+        Tests that an Alert is forgotten once its time bucket ends.
+        """
+        with patch.object(MuzzleWindow, '_get_expiration', return_value=0):
+            self.window.add(self.alert, self.muzzle)
+        self.assertIsNone(self.window.add_incident(self.alert.muzzle_hash))
+        self.window.flush()
+        self.assertEqual(len(self.window), 0)
+
+    def _get_other_alert(self, pk, muzzle_hash):
+        """
+        Returns the Alert with the given pk and muzzle hash.
+        """
+        alert = Alert.objects.get(pk=pk)
+        alert.muzzle_hash = muzzle_hash
+        return alert
+
+    def test_add_max_size(self):
+        """
+        Tests that the oldest Alert is forgotten when the window is
+        full.
+        """
+        self.window.max_size = 2
+        self.window.add(self.alert, self.muzzle)
+        self.window.add(self._get_other_alert(2, 'bar'), self.muzzle)
+        self.window.add(self._get_other_alert(3, 'baz'), self.muzzle)
+        self.assertEqual(len(self.window), 2)
+        self.assertIsNone(self.window.add_incident(self.alert.muzzle_hash))
+        self.assertIsNotNone(self.window.add_incident('bar'))
+        self.assertIsNotNone(self.window.add_incident('baz'))
+
+    def test_add_max_size_expired(self):
+        """
+        Tests that expired Alerts are forgotten before older Alerts
+        when the window is full.
+        """
+        self.window.max_size = 2
+        self.window.add(self.alert, self.muzzle)
+        with patch.object(MuzzleWindow, '_get_expiration', return_value=0):
+            self.window.add(self._get_other_alert(2, 'bar'), self.muzzle)
+        self.window.add(self._get_other_alert(3, 'baz'), self.muzzle)
+        self.assertEqual(len(self.window), 2)
+        self.assertIsNotNone(
+            self.window.add_incident(self.alert.muzzle_hash))
+        self.assertIsNotNone(self.window.add_incident('baz'))
+
+    def test_flush_failure(self):
+        """
+        Tests that duplicates that can't be saved are kept for the next
+        flush.
+        """
+        incidents = self.alert.incidents
+        self.window.add(self.alert, self.muzzle)
+        self.window.add_incident(self.alert.muzzle_hash)
+        self.window.add_incident(self.alert.muzzle_hash)
+        with patch('watchdogs.dedup.Alert.objects.filter',
+                   side_effect=Exception('foo')):
+            with self.assertLogs('watchdogs.dedup', logging.ERROR):
+                self.window.flush()
+        self.window.add_incident(self.alert.muzzle_hash)
+        self.window.flush()
+        self.assertEqual(Alert.objects.get(pk=1).incidents, incidents + 3)
+
+    def test_disabled(self):
+        """
+        Tests that a window with a max_size of 0 remembers nothing.
+        """
+        self.window.max_size = 0
+        self.window.add(self.alert, self.muzzle)
+        self.assertEqual(len(self.window), 0)
+        self.assertIsNone(self.window.add_incident(self.alert.muzzle_hash))
+
+
+class WatchdogMuzzleWindowTestCase(WatchdogBaseTestCase):
+    """
+    Tests muzzling with a MuzzleWindow.
+    """
+
+    @patch_find_by_id
+    def test_process_muzzled(self):
+        """
+        Tests that duplicate Alerts are counted in the window and added
+        to the original Alert when the window is flushed.
+        """
+        window = MuzzleWindow(max_size=10, flush_interval=60)
+        with patch('watchdogs.models.MUZZLE_WINDOW', window):
+            alert_count = Alert.objects.count()
+            alert = self.email_wdog.process(self.doc_obj)
+            for dummy_index in range(3):
+                result = self.email_wdog.process(self.doc_obj)
+
+            self.assertEqual(result.pk, alert.pk)
+            self.assertEqual(Alert.objects.count(), alert_count + 1)
+            self.assertEqual(Alert.objects.get(pk=alert.pk).incidents, 1)
+
+            window.flush()
+            self.assertEqual(Alert.objects.get(pk=alert.pk).incidents, 4)
+
+    @patch_find_by_id
+    def test_process_muzzled_existing(self):
+        """
+        Tests that an Alert saved by another process is added to the
+        window after the unique constraint catches a duplicate.
+        """
+        alert = self.email_wdog.process(self.doc_obj)
+        window = MuzzleWindow(max_size=10, flush_interval=60)
+        with patch('watchdogs.models.MUZZLE_WINDOW', window):
+            result = self.email_wdog.process(self.doc_obj)
+            self.assertEqual(result.pk, alert.pk)
+            self.assertEqual(len(window), 1)
+            self.assertEqual(Alert.objects.get(pk=alert.pk).incidents, 2)
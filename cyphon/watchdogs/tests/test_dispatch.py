@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+# Copyright 2017-2018 Dunbar Security Solutions, Inc.
+#
+# This file is part of Cyphon Engine.
+#
+# Cyphon Engine is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# Cyphon Engine is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Cyphon Engine. If not, see <http://www.gnu.org/licenses/>.
+"""
+Tests the InspectionQueue and InspectionPublisher classes.
+"""
+
+# standard library
+from datetime import datetime
+import json
+import logging
+import threading
+from unittest import TestCase
+try:
+    from unittest.mock import Mock, patch
+except ImportError:
+    from mock import Mock, patch
+
+# local
+from cyphon.documents import DocumentObj
+from watchdogs.dispatch import InspectionPublisher, InspectionQueue
+
+
+class InspectionQueueTestCase(TestCase):
+    """
+    Tests the InspectionQueue class.
+    """
+
+    def setUp(self):
+        self.batches = []
+        self.inspection_queue = InspectionQueue(
+            consumer=self.batches.append,
+            max_size=10,
+            batch_size=3,
+            batch_interval=0.1
+        )
+
+    def tearDown(self):
+        self.inspection_queue.stop(timeout=1)
+
+    def test_put(self):
+        """
+        Tests that queued documents are inspected in batches.
+        """
+        for num in range(7):
+            self.assertTrue(self.inspection_queue.put(num))
+        self.inspection_queue.join()
+        self.assertEqual([num for batch in self.batches for num in batch],
+                         list(range(7)))
+        self.assertTrue(all(len(batch) <= 3 for batch in self.batches))
+        self.assertEqual(self.inspection_queue.qsize(), 0)
+
+    def test_partial_batch(self):
+        """
+        Tests that a partial batch is inspected after the batch
+        interval.
+        """
+        self.inspection_queue.put('doc')
+        self.inspection_queue.join()
+        self.assertEqual(self.batches, [['doc']])
+
+    def test_full_queue(self):
+        """
+        Tests that documents are inspected synchronously when the
+        queue is full.
+        """
+        release = threading.Event()
+        consumer = Mock(side_effect=lambda batch: release.wait(1))
+        inspection_queue = InspectionQueue(consumer, max_size=1,
+                                           batch_size=1, batch_interval=0)
+        inspection_queue.put('doc1')  # taken by the blocked worker
+        while inspection_queue.qsize():
+            pass
+        inspection_queue.put('doc2')  # fills the queue
+        release.set()
+        with self.assertLogs('watchdogs.dispatch', logging.WARNING):
+            queued = inspection_queue.put('doc3')
+        inspection_queue.stop(timeout=1)
+        self.assertFalse(queued)
+        consumer.assert_any_call(['doc3'])
+
+    def test_consumer_error(self):
+        """
+        Tests that the worker continues after the consumer raises an
+        error.
+        """
+        consumer = Mock(side_effect=[ValueError('foo'), None])
+        inspection_queue = InspectionQueue(consumer, batch_size=1,
+                                           batch_interval=0)
+        with self.assertLogs('watchdogs.dispatch', logging.ERROR):
+            inspection_queue.put('doc1')
+            inspection_queue.join()
+        inspection_queue.put('doc2')
+        inspection_queue.join()
+        inspection_queue.stop(timeout=1)
+        self.assertEqual(consumer.call_count, 2)
+
+    def test_stop(self):
+        """
+        Tests that stopping the queue inspects the remaining documents.
+        """
+        self.inspection_queue.put('doc')
+        self.inspection_queue.stop(timeout=1)
+        self.assertEqual(self.batches, [['doc']])
+
+
+class InspectionPublisherTestCase(TestCase):
+    """
+    Tests the InspectionPublisher class.
+    """
+
+    doc_obj = DocumentObj(
+        data={'message': 'foo', 'date': datetime(2018, 1, 1)},
+        doc_id='abc',
+        collection='elasticsearch.test_index.test_docs'
+    )
+
+    def setUp(self):
+        self.consumer = Mock()
+        self.publisher = InspectionPublisher(self.consumer)
+        self.mock_channel = Mock()
+        self.mock_channel.basic_publish.return_value = True
+        patcher = patch.object(InspectionPublisher, '_connect')
+        self.mock_connect = patcher.start()
+        self.mock_connect.return_value.channel.return_value = \
+            self.mock_channel
+        self.addCleanup(patcher.stop)
+
+    def test_put(self):
+        """
+        Tests that a document is published as a persistent message with
+        its id and collection in the headers.
+        """
+        self.assertTrue(self.publisher.put(self.doc_obj))
+        kwargs = self.mock_channel.basic_publish.call_args[1]
+        self.assertEqual(kwargs['routing_key'], 'watchdogs')
+        self.assertEqual(json.loads(kwargs['body']),
+                         {'message': 'foo', 'date': '2018-01-01T00:00:00'})
+        self.assertEqual(kwargs['properties'].delivery_mode, 2)
+        self.assertEqual(kwargs['properties'].headers, {
+            'x-doc-id': 'abc',
+            'x-collection': 'elasticsearch.test_index.test_docs'
+        })
+        self.mock_channel.confirm_delivery.assert_called_once_with()
+        self.assertFalse(self.consumer.called)
+
+    def test_put_reuses_channel(self):
+        """
+        Tests that a thread reuses its connection.
+        """
+        self.publisher.put(self.doc_obj)
+        self.publisher.put(self.doc_obj)
+        self.assertEqual(self.mock_connect.call_count, 1)
+
+    def test_put_reconnects(self):
+        """
+        Tests that a document is published over a new connection if
+        the old one has failed.
+        """
+        self.mock_channel.basic_publish.side_effect = [
+            Exception('closed'), True]
+        self.assertTrue(self.publisher.put(self.doc_obj))
+        self.assertEqual(self.mock_connect.call_count, 2)
+        self.assertFalse(self.consumer.called)
+
+    def test_put_failure(self):
+        """
+        Tests that a document is inspected synchronously if it can't
+        be published.
+        """
+        self.mock_channel.basic_publish.side_effect = Exception('closed')
+        with self.assertLogs('watchdogs.dispatch', logging.WARNING):
+            self.assertFalse(self.publisher.put(self.doc_obj))
+        self.consumer.assert_called_once_with([self.doc_obj])
+
+    def test_put_nacked(self):
+        """
+        Tests that a document is inspected synchronously if the broker
+        doesn't confirm it.
+        """
+        self.mock_channel.basic_publish.return_value = False
+        self.assertFalse(self.publisher.put(self.doc_obj))
+        self.consumer.assert_called_once_with([self.doc_obj])
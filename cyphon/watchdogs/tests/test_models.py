@@ -27,6 +27,7 @@ except ImportError:
 import threading
 
 # third party
+from django.core.cache import cache
 from django.test import TestCase, TransactionTestCase
 from testfixtures import LogCapture
 
@@ -34,9 +35,10 @@ from testfixtures import LogCapture
 from alerts.models import Alert
 from cyphon.documents import DocumentObj
 from distilleries.models import Distillery
+from lab.procedures.models import Protocol
 from tests.fixture_manager import get_fixtures
 from tests.mock import patch_find_by_id
-from watchdogs.models import Watchdog, Trigger, Muzzle
+from watchdogs.models import Watchdog, WatchdogIndex, Trigger, Muzzle
 
 
 DOC_ID = '666f6f2d6261722d71757578'
@@ -123,6 +125,129 @@ class WatchdogManagerTestCase(WatchdogBaseTestCase):
         self.assertEqual(relevant_watchdogs.count(), 2)
 
 
+    @patch_find_by_id
+    def test_process_many(self):
+        """
+        Tests the process_many method for a batch of duplicate
+        documents.
+        """
+        alert_count = Alert.objects.count()
+        doc_objs = [
+            DocumentObj(data=self.data, doc_id=self.doc_id,
+                        collection='elasticsearch.test_index.test_docs')
+            for dummy_index in range(3)
+        ]
+        alerts = Watchdog.objects.process_many(doc_objs)
+        self.assertEqual(Alert.objects.count(), alert_count + 1)
+        self.assertEqual(len(alerts), 3)
+        alert = Alert.objects.get(pk=alerts[0].pk)
+        self.assertEqual(alert.level, 'HIGH')
+        self.assertEqual(alert.alarm, self.email_wdog)
+        self.assertEqual(alert.incidents, 3)
+
+    def test_process_many_no_alerts(self):
+        """
+        Tests the process_many method for documents that don't match
+        any Watchdogs.
+        """
+        alert_count = Alert.objects.count()
+        alerts = Watchdog.objects.process_many([self.doc_obj])
+        self.assertEqual(alerts, [])
+        self.assertEqual(Alert.objects.count(), alert_count)
+
+
+class WatchdogIndexTestCase(WatchdogBaseTestCase):
+    """
+    Tests the WatchdogIndex class.
+    """
+
+    def setUp(self):
+        super(WatchdogIndexTestCase, self).setUp()
+        self.index = WatchdogIndex(
+            watchdogs=Watchdog.objects.find_enabled(),
+            distilleries=Distillery.objects.all()
+        )
+
+    def _get_names(self, collection):
+        """
+        Takes a Collection string and returns the names of the relevant
+        Watchdogs in the index.
+        """
+        doc_obj = DocumentObj(data=self.data, collection=collection)
+        return [watchdog.name for watchdog
+                in self.index.get_watchdogs(doc_obj)]
+
+    def test_get_watchdogs_no_category(self):
+        """
+        Tests the get_watchdogs method for a Distillery that is not
+        associated with any categories.
+        """
+        with self.assertNumQueries(0):
+            names = self._get_names('mongodb.test_database.test_posts')
+        self.assertEqual(names, ['inspect_logs'])
+
+    def test_get_watchdogs_matches_find_relevant(self):
+        """
+        Tests that the get_watchdogs method returns the same Watchdogs
+        as the find_relevant method for each Distillery.
+        """
+        for distillery in Distillery.objects.all():
+            expected = [watchdog.name for watchdog
+                        in Watchdog.objects.find_relevant(distillery)]
+            with self.assertNumQueries(0):
+                names = self._get_names(str(distillery))
+            self.assertEqual(names, expected)
+
+    def test_get_watchdogs_new_distillery(self):
+        """
+        Tests the get_watchdogs method for a Distillery that isn't in
+        the index.
+        """
+        self.index._by_collection.clear()
+        names = self._get_names('elasticsearch.test_index.test_docs')
+        self.assertEqual(len(names), 2)
+        self.assertIn('inspect_emails', names)
+
+    def test_inspect_without_queries(self):
+        """
+        Tests that compiled Watchdogs inspect documents without
+        querying the database.
+        """
+        doc_obj = DocumentObj(data=self.data,
+                              collection='elasticsearch.test_index.test_docs')
+        with self.assertNumQueries(0):
+            levels = [watchdog.inspect(doc_obj.data) for watchdog
+                      in self.index.get_watchdogs(doc_obj)]
+            muzzled = [watchdog._is_muzzled() for watchdog
+                       in self.index.watchdogs]
+        self.assertIn('HIGH', levels)
+        self.assertEqual(len(muzzled), len(self.index))
+
+    def test_get_index_rebuilt(self):
+        """
+        Tests that the WatchdogManager's index is rebuilt when a
+        Watchdog is disabled.
+        """
+        self.assertIn(self.email_wdog.pk,
+                      [wdog.pk for wdog in Watchdog.objects.get_index().watchdogs])
+        self.email_wdog.enabled = False
+        self.email_wdog.save()
+        self.assertNotIn(self.email_wdog.pk,
+                         [wdog.pk for wdog in Watchdog.objects.get_index().watchdogs])
+
+    def test_protocol_invalidates_index(self):
+        """
+        Tests that saving a Protocol, which a Watchdog's sieve may use,
+        changes the version of the WatchdogManager's index.
+        """
+        key = Watchdog.objects._index_cache._key
+        Watchdog.objects.get_index()
+        version = cache.get(key)
+        Protocol.objects.create(name='test_protocol', package='sentiment',
+                                module='sentiment', function='analyze')
+        self.assertNotEqual(cache.get(key), version)
+
+
 class WatchdogTestCase(WatchdogBaseTestCase):
     """
     Tests the Watchdog class.
@@ -142,6 +267,15 @@ class WatchdogTestCase(WatchdogBaseTestCase):
         expected = 'HIGH'
         self.assertEqual(actual, expected)
 
+    def test_inspect_compiled(self):
+        """
+        Tests the inspect method for a compiled Watchdog.
+        """
+        self.email_wdog.compile()
+        self.assertEqual(self.email_wdog.inspect(self.data), 'HIGH')
+        self.log_wdog.compile()
+        self.assertEqual(self.log_wdog.inspect(self.data), None)
+
     def test_inspect_false(self):
         """
         Tests the inspect method for a case that doesn't match a ruleset.
@@ -21,9 +21,9 @@ Tests signals in the Watchdog app.
 # standard library
 import logging
 try:
-    from unittest.mock import Mock
+    from unittest.mock import Mock, patch
 except ImportError:
-    from mock import Mock
+    from mock import Mock, patch
 
 # third party
 from django.test import TransactionTestCase
@@ -33,6 +33,7 @@ from alerts.models import Alert
 from distilleries.models import Distillery
 from tests.fixture_manager import get_fixtures
 from tests.mock import patch_find_by_id
+from watchdogs.dispatch import InspectionQueue
 from watchdogs.models import Watchdog
 from watchdogs.tests.test_models import DATA
 
@@ -114,3 +115,26 @@ class SignalRecieverTestCase(TransactionTestCase):
         self.assertEqual(alerts[0].alarm, watchdog)
         self.assertEqual(alerts[0].level, 'HIGH')
         self.assertEqual(doc_id, self.mock_doc_id)
+
+    @patch_find_by_id(data)
+    def test_watchdogs_async(self):
+        """
+        Tests that an alert is created by a background thread when
+        asynchronous inspection is enabled.
+        """
+        inspection_queue = InspectionQueue(
+            consumer=Watchdog.objects.process_many,
+            batch_interval=0
+        )
+        distillery = Distillery.objects.get_by_natural_key('elasticsearch.test_index.test_docs')
+        distillery.collection.insert = Mock(return_value=self.mock_doc_id)
+
+        with patch('watchdogs.signals.ASYNC_INSPECTION', True), \
+                patch('watchdogs.signals.INSPECTION_QUEUE', inspection_queue):
+            doc_id = distillery._save_and_send_signal(self.data)
+            inspection_queue.stop(timeout=5)
+
+        alerts = Alert.objects.all()
+        self.assertEqual(alerts.count(), 1)
+        self.assertEqual(alerts[0].level, 'HIGH')
+        self.assertEqual(doc_id, self.mock_doc_id)